@@ -6,6 +6,7 @@ Provides command-line tools for managing vMCP servers and configurations.
 """
 
 import traceback
+from typing import Optional
 
 import typer
 from rich import print as rprint
@@ -222,7 +223,11 @@ def serve(
     host: str = typer.Option("0.0.0.0", "--host", "-h", help="Host to bind to"),
     port: int = typer.Option(8000, "--port", "-p", help="Port to bind to"),
     reload: bool = typer.Option(False, "--reload", "-r", help="Enable auto-reload (development)"),
-    log_level: str = typer.Option("info", "--log-level", "-l", help="Log level (debug, info, warning, error)")
+    log_level: str = typer.Option("info", "--log-level", "-l", help="Log level (debug, info, warning, error)"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w",
+        help="Worker processes (default: VMCP_WORKERS or 1). More than one switches MCP sessions to stateless mode"
+    )
 ):
     """
     Start the vMCP server (without automatic setup).
@@ -230,27 +235,54 @@ def serve(
     Example:
         vmcp serve
         vmcp serve --port 8080 --reload
+        vmcp serve --workers 4
     """
-    import uvicorn
-
-    # Register OSS services before importing proxy_server
-    from vmcp.core.services import register_oss_services
-    register_oss_services()
+    import os
 
-    from vmcp.proxy_server import create_app
+    import uvicorn
 
-    fastapi_app = create_app()
+    workers = workers or settings.workers
+    if workers > 1 and reload:
+        console.print("[red]✗[/red] --reload cannot be combined with --workers")
+        raise typer.Exit(code=1)
 
     console.print(Panel.fit(
         f"[bold green]Starting vMCP Server[/bold green]\n\n"
         f"Host: [cyan]{host}[/cyan]\n"
         f"Port: [cyan]{port}[/cyan]\n"
         f"Reload: [cyan]{reload}[/cyan]\n"
+        f"Workers: [cyan]{workers}[/cyan]\n"
         f"Log Level: [cyan]{log_level}[/cyan]",
         title="vMCP Server",
         border_style="green"
     ))
 
+    if workers > 1:
+        # Worker processes build their settings from the environment
+        os.environ["VMCP_WORKERS"] = str(workers)
+
+        # Create and migrate the schema once, before the workers start
+        from vmcp.storage.database import init_db
+        init_db()
+
+        uvicorn.run(
+            "vmcp.cli.main:create_worker_app",
+            factory=True,
+            host=settings.host,
+            port=settings.port,
+            workers=workers,
+            log_level=log_level
+        )
+        return
+
+    # Register OSS services before importing proxy_server
+    from vmcp.core.services import register_oss_services
+    register_oss_services()
+
+    from vmcp.proxy_server import create_app
+
+    fastapi_app = create_app()
+
     uvicorn.run(
         fastapi_app,
         host=settings.host,
@@ -260,6 +292,16 @@ def serve(
     )
 
 
+def create_worker_app():
+    """App factory run in each worker process started by ``vmcp serve --workers``."""
+    from vmcp.core.services import register_oss_services
+    register_oss_services()
+
+    from vmcp.proxy_server import create_app
+
+    return create_app()
+
+
 @app.command("version")
 def version():
     """Show vMCP version information."""
@@ -561,6 +603,100 @@ def vmcp_info(
         console.print(f"[red]✗[/red] Failed to get vMCP info: {e}")
         raise typer.Exit(code=1) from e
 
+# ============================================================================
+# Blob Commands
+# ============================================================================
+
+blobs_app = typer.Typer(help="Uploaded file storage commands")
+app.add_typer(blobs_app, name="blobs")
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count for display."""
+    if abs(size) < 1024:
+        return f"{size} B"
+    value = float(size)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1024
+        if abs(value) < 1024:
+            break
+    return f"{value:.1f} {unit}"
+
+
+@blobs_app.command("stats")
+def blobs_stats():
+    """
+    Show blob storage usage and deduplication savings.
+
+    Example:
+        vmcp blobs stats
+    """
+    try:
+        from vmcp.storage.blob_gc import blob_storage_report
+        from vmcp.storage.database import init_db
+
+        init_db()
+        report = blob_storage_report()
+
+        table = Table(title="Blob Storage", show_header=True, header_style="bold cyan")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right", style="green")
+        table.add_row("Blobs", str(report["blobs"]))
+        table.add_row("Logical size", _format_bytes(report["logical_bytes"]))
+        table.add_row("Unique contents", str(report["unique_contents"]))
+        table.add_row("Stored size", _format_bytes(report["stored_bytes"]))
+        table.add_row("Saved by deduplication", _format_bytes(report["dedup_saved_bytes"]))
+        table.add_row("Awaiting GC", f"{report['unreferenced_contents']} ({_format_bytes(report['unreferenced_bytes'])})")
+
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]✗[/red] Failed to get blob storage stats: {e}")
+        raise typer.Exit(code=1) from e
+
+
+@blobs_app.command("gc")
+def blobs_gc(
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Report what would be removed without deleting"),
+    grace: Optional[int] = typer.Option(None, "--grace", "-g", help="Minimum age in seconds of unreferenced data")
+):
+    """
+    Remove unreferenced blob content and report reclaimed space.
+
+    Example:
+        vmcp blobs gc
+        vmcp blobs gc --dry-run --grace 0
+    """
+    try:
+        from vmcp.storage.blob_gc import collect_blob_garbage
+        from vmcp.storage.database import init_db
+
+        init_db()
+        report = collect_blob_garbage(dry_run=dry_run, grace_seconds=grace)
+
+        table = Table(
+            title="Blob GC (dry run)" if dry_run else "Blob GC",
+            show_header=True,
+            header_style="bold cyan"
+        )
+        table.add_column("Backend", style="cyan")
+        table.add_column("Chunks Removed", justify="right", style="yellow")
+        table.add_column("Reclaimed", justify="right", style="green")
+        for backend, stats in report["backends"].items():
+            table.add_row(backend, str(stats["chunks_removed"]), _format_bytes(stats["bytes_reclaimed"]))
+
+        console.print(table)
+        verb = "Would reclaim" if dry_run else "Reclaimed"
+        console.print(
+            f"[green]✓[/green] {verb} {_format_bytes(report['bytes_reclaimed'])} "
+            f"({report['contents_removed']} content entries, {report['chunks_removed']} chunks)"
+        )
+
+    except Exception as e:
+        console.print(f"[red]✗[/red] Failed to collect blob garbage: {e}")
+        raise typer.Exit(code=1) from e
+
+
 # ============================================================================
 # Config Commands
 # ============================================================================
@@ -33,6 +33,28 @@ class Settings(BaseSettings):
     port: int = Field(default=8000, description="Server port")
     base_url: str = Field(default="http://localhost:8000", description="Base URL for the application")
 
+    # Workers (see "Multi-worker deployment" in the backend README)
+    workers: int = Field(default=1, description="Number of server worker processes")
+    mcp_session_mode: str = Field(
+        default="auto",
+        description="MCP HTTP sessions: 'stateful' (held by one worker, needs sticky routing), "
+                    "'stateless' (any worker serves any request) or 'auto' (stateless when workers > 1)"
+    )
+    session_store: str = Field(
+        default="auto",
+        description="Session store for stateless mode: 'memory', 'database' or 'auto' (database when workers > 1)"
+    )
+    mcp_session_idle_timeout: int = Field(
+        default=24 * 3600,
+        description="Seconds after which an idle stateless MCP session is forgotten"
+    )
+    cache_bus: str = Field(
+        default="auto",
+        description="Cache invalidation bus: 'local', 'database' or 'auto' (database when workers > 1)"
+    )
+    cache_bus_poll_interval: float = Field(default=1.0, description="Seconds between cache bus polls")
+    cache_bus_retention: int = Field(default=300, description="Seconds cache invalidation events are kept")
+
     # Database (SQLite by default, like Langflow)
     database_url: str = Field(
         default_factory=lambda: f"sqlite:///{Path.home() / '.vmcp' / 'vmcp.db'}",
@@ -40,6 +62,13 @@ class Settings(BaseSettings):
     )
     database_echo: bool = Field(default=False, description="Echo SQL queries")
 
+    # SQLite tuning (ignored for other databases)
+    sqlite_journal_mode: str = Field(default="WAL", description="SQLite journal_mode pragma")
+    sqlite_synchronous: str = Field(default="NORMAL", description="SQLite synchronous pragma")
+    sqlite_busy_timeout_ms: int = Field(default=5000, description="Milliseconds a SQLite writer waits for the lock")
+    sqlite_cache_size_kb: int = Field(default=16384, description="SQLite page cache per connection in KiB")
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, description="SQLite memory-mapped I/O size in bytes")
+
     # Dummy User (No Auth)
     dummy_user_id: str = Field(default="local-user", description="Dummy user ID for local mode")
     dummy_user_email: str = Field(default="user@local.vmcp", description="Dummy user email")
@@ -50,6 +79,204 @@ class Settings(BaseSettings):
         default=Path.home() / ".vmcp" / "storage",
         description="Path for storing MCP configurations and data"
     )
+    storage_write_delay: float = Field(
+        default=1.0,
+        description="Seconds deferred writes (upstream session ids, last_connected) are batched before flushing"
+    )
+
+    # Blob storage
+    blob_storage_backend: str = Field(
+        default="filesystem",
+        description="Backend for uploaded file chunks: 'filesystem' or 'database'"
+    )
+    blob_storage_path: Optional[Path] = Field(
+        default=None,
+        description="Directory for filesystem blob chunks (defaults to <storage_path>/blobs)"
+    )
+    blob_chunk_size: int = Field(default=1024 * 1024, description="Blob chunk size in bytes")
+    blob_max_upload_size: int = Field(default=10 * 1024 * 1024, description="Maximum upload size in bytes")
+    blob_public_cache_max_age: int = Field(
+        default=3600,
+        description="Cache-Control max-age in seconds for public blob downloads"
+    )
+    blob_gc_interval: int = Field(
+        default=3600,
+        description="Seconds between background blob garbage collection runs (0 disables)"
+    )
+    blob_gc_grace_period: int = Field(
+        default=3600,
+        description="Minimum age in seconds before unreferenced blob content is collected"
+    )
+    derived_cache_on_upload: bool = Field(
+        default=True,
+        description="Compute derived renditions (e.g. xlsx to CSV) in the background after upload"
+    )
+    derived_cache_memory_size: int = Field(
+        default=32 * 1024 * 1024,
+        description="Bytes of derived renditions kept in the in-process cache"
+    )
+
+    # Serialization
+    json_codec: str = Field(
+        default="auto",
+        description="JSON codec: 'auto' (orjson if installed), 'orjson' or 'json'"
+    )
+
+    # Upstream request coalescing
+    single_flight: bool = Field(
+        default=True,
+        description="Share one upstream call among concurrent identical MCP requests"
+    )
+    single_flight_tool_calls: str = Field(
+        default="read_only",
+        description="Which tool calls are coalesced: 'read_only' (readOnlyHint tools), 'all' or 'off'"
+    )
+    single_flight_exclude_tools: str = Field(
+        default="",
+        description="Comma-separated 'tool' or 'server:tool' names never coalesced (non-idempotent tools)"
+    )
+
+    # Tool result cache
+    tool_cache: str = Field(
+        default="overrides",
+        description="Tool result caching: 'overrides' (tools with a cache_ttl override), "
+                    "'annotated' (also readOnlyHint/idempotentHint tools) or 'off'"
+    )
+    tool_cache_ttl: float = Field(default=60.0, description="Seconds annotated tool results are cached")
+    tool_cache_memory_size: int = Field(
+        default=32 * 1024 * 1024,
+        description="Bytes of tool results kept in the in-process cache"
+    )
+    tool_cache_spill_dir: Optional[Path] = Field(
+        default=None,
+        description="Directory for tool results evicted from memory (unset disables spilling)"
+    )
+    tool_cache_spill_size: int = Field(
+        default=256 * 1024 * 1024,
+        description="Bytes of spilled tool results kept on disk"
+    )
+
+    # Resource content cache
+    resource_cache: bool = Field(default=True, description="Cache upstream resources/read results across requests")
+    resource_cache_ttl: float = Field(
+        default=30.0,
+        description="Seconds resources are cached when the server does not send update notifications"
+    )
+    resource_cache_subscribed_ttl: float = Field(
+        default=600.0,
+        description="Seconds resources are cached while subscribed to their update notifications"
+    )
+    resource_cache_subscribe: bool = Field(
+        default=True,
+        description="Subscribe to resource updates on servers that support it (one extra session per server and user)"
+    )
+    resource_cache_max_watchers: int = Field(
+        default=64,
+        description="Maximum upstream sessions held open for resource subscriptions"
+    )
+    resource_cache_memory_size: int = Field(
+        default=32 * 1024 * 1024,
+        description="Bytes of resource contents kept in the in-process cache"
+    )
+
+    # Prompt render cache
+    prompt_render_cache_ttl: float = Field(
+        default=3600.0,
+        description="Seconds rendered pure prompts (no @resource/@tool/@prompt) are memoized (0 disables)"
+    )
+    prompt_render_cache_memory_size: int = Field(
+        default=8 * 1024 * 1024,
+        description="Bytes of rendered prompts kept in the in-process cache"
+    )
+
+    # Upstream circuit breakers and timeouts
+    circuit_breaker: bool = Field(
+        default=True,
+        description="Fail calls to an upstream server fast after repeated connection failures"
+    )
+    circuit_breaker_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive failed calls that open a server's circuit"
+    )
+    circuit_breaker_open_seconds: float = Field(
+        default=10.0,
+        description="Seconds an open circuit fails fast before letting one probe call through"
+    )
+    circuit_breaker_max_open_seconds: float = Field(
+        default=300.0,
+        description="Upper bound for the open period, which doubles after every failed probe"
+    )
+    upstream_timeout: float = Field(
+        default=120.0,
+        description="Seconds an upstream call may take before enough latency is observed, "
+                    "and the upper bound of adaptive timeouts (0 disables timeouts)"
+    )
+    upstream_timeout_min: float = Field(
+        default=5.0,
+        description="Lower bound of adaptive upstream timeouts"
+    )
+    upstream_timeout_multiplier: float = Field(
+        default=3.0,
+        description="Adaptive timeout as a multiple of the observed p99 latency of the operation"
+    )
+
+    # Upstream admission control
+    upstream_max_in_flight: int = Field(
+        default=32,
+        description="Concurrent calls per upstream server unless its config sets max_in_flight (0 = unlimited)"
+    )
+    upstream_queue_size: int = Field(
+        default=256,
+        description="Calls that may wait for a busy server before new calls are rejected"
+    )
+    upstream_queue_timeout: float = Field(
+        default=30.0,
+        description="Seconds a call may wait for a busy server before it is rejected"
+    )
+
+    # Upstream replicas
+    upstream_balancing: str = Field(
+        default="round_robin",
+        description="Replica balancing unless the server config sets one: round_robin, least_outstanding or ewma"
+    )
+    upstream_hedge: bool = Field(
+        default=False,
+        description="Hedge read-only tool calls on a second replica once they exceed the tool's p95 latency"
+    )
+    upstream_eject_failures: int = Field(
+        default=3,
+        description="Consecutive failures after which a replica is ejected from balancing"
+    )
+    upstream_eject_seconds: float = Field(
+        default=30.0,
+        description="Seconds an ejected replica is skipped before it gets traffic again"
+    )
+    upstream_prewarm: str = Field(
+        default="lazy",
+        description="When agent sessions warm their vMCP's upstream sessions: none, lazy (first tools/list) or eager (initialize)"
+    )
+    upstream_prewarm_concurrency: int = Field(
+        default=4,
+        description="Upstream sessions prewarmed at the same time"
+    )
+    upstream_prewarm_ttl: float = Field(
+        default=60.0,
+        description="Seconds after a prewarm of a vMCP during which new agent sessions on it start none"
+    )
+
+    # Upstream health monitor
+    health_check_interval: float = Field(
+        default=30.0,
+        description="Seconds between background probes of a watched server (0 disables; status checks then ping live)"
+    )
+    health_check_concurrency: int = Field(
+        default=8,
+        description="Background probes run at the same time"
+    )
+    health_check_idle_seconds: float = Field(
+        default=600.0,
+        description="Seconds without a status request after which a server is no longer probed"
+    )
 
     # Logging
     log_level: str = Field(
@@ -59,13 +286,30 @@ class Settings(BaseSettings):
     )
     log_format: str = Field(
         default="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        description="Log format string"
+        description="Log format string, or 'json' for one JSON object per line"
+    )
+    log_levels: str = Field(
+        default="",
+        description="Per-logger level overrides, e.g. 'PROXY_SERVER=DEBUG,CACHE_BUS=INFO'"
+    )
+    log_async: bool = Field(
+        default=True,
+        description="Write log output from a background thread instead of the calling thread"
+    )
+    log_rate_limit: float = Field(
+        default=0.0,
+        description="Max DEBUG/INFO records per second from each logging call site (0 = unlimited)"
     )
 
     # Tracing (OpenTelemetry)
     enable_tracing: bool = Field(default=False, description="Enable OpenTelemetry tracing")
     otlp_endpoint: Optional[str] = Field(default=None, description="OTLP endpoint for traces")
     service_name: str = Field(default="vmcp", description="Service name for tracing")
+    tracing_sample_ratio: float = Field(default=1.0, description="Fraction of traces sampled (head-based)")
+    tracing_always_sample_errors: bool = Field(
+        default=True,
+        description="Record a span for failed calls even when their trace was not sampled"
+    )
 
     # CORS
     cors_origins: list[str] = Field(
@@ -81,6 +325,8 @@ class Settings(BaseSettings):
         super().__init__(**kwargs)
         # Create storage directory if it doesn't exist
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        if self.blob_storage_path is None:
+            self.blob_storage_path = self.storage_path / "blobs"
 
         # ======= Normalize database URL if someone set a literal template like "{Path.home()}"
 
@@ -112,6 +358,15 @@ class Settings(BaseSettings):
 
         # ======= End of database URL normalization ======= 
 
+        # Resolve worker-dependent defaults
+        multi_worker = self.workers > 1
+        if self.mcp_session_mode == "auto":
+            self.mcp_session_mode = "stateless" if multi_worker else "stateful"
+        if self.session_store == "auto":
+            self.session_store = "database" if multi_worker else "memory"
+        if self.cache_bus == "auto":
+            self.cache_bus = "database" if multi_worker else "local"
+
         # Set frontend path if not specified
         if self.frontend_path is None:
             # Look for frontend build in package
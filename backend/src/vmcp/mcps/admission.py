@@ -0,0 +1,259 @@
+"""
+Per-server concurrency limits with fair admission.
+
+At most ``max_in_flight`` calls (from the server config, default
+``VMCP_UPSTREAM_MAX_IN_FLIGHT``) run against one upstream server at a time in
+this process. Further calls wait in a fair queue:
+
+- Deficit round robin across users. A call costs its expected service time
+  (the operation's observed p50 latency, see circuit_breaker), so a user
+  running slow tools gets the same share of upstream time as a user running
+  fast ones.
+- Round robin across the agent sessions of one user, so one runaway agent
+  cannot starve the user's other agents.
+
+A call that arrives while ``VMCP_UPSTREAM_QUEUE_SIZE`` calls are already
+waiting, or that waits longer than ``VMCP_UPSTREAM_QUEUE_TIMEOUT`` seconds,
+fails with ServerBusyError (HTTP 429 on the REST API).
+
+The caller identity is MCPClientManager.caller, a (user, flow) pair set by
+the MCP proxy from the agent name and MCP session id; other callers (REST
+API, background tasks) share one flow per user.
+"""
+
+import asyncio
+import functools
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.mcps.circuit_breaker import get_upstream_health, operation_key
+from vmcp.mcps.models import ServerBusyError
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("ADMISSION")
+
+# Seconds of expected upstream time a user may use per round
+_QUANTUM = 1.0
+# Recent queue waits kept for percentiles
+_WAIT_WINDOW = 200
+
+
+class _Waiter:
+    __slots__ = ("future", "cost", "user", "flow")
+
+    def __init__(self, future: "asyncio.Future[None]", cost: float, user: str, flow: Hashable):
+        self.future = future
+        self.cost = cost
+        self.user = user
+        self.flow = flow
+
+
+class FairQueue:
+    """Deficit round robin over users, round robin over each user's flows."""
+
+    def __init__(self):
+        self._users: Deque[str] = deque()
+        self._deficit: Dict[str, float] = {}
+        self._flows: Dict[str, Deque[Hashable]] = {}
+        self._waiters: Dict[Tuple[str, Hashable], Deque[_Waiter]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, waiter: _Waiter) -> None:
+        key = (waiter.user, waiter.flow)
+        queue = self._waiters.get(key)
+        if queue is None:
+            queue = self._waiters[key] = deque()
+            flows = self._flows.get(waiter.user)
+            if flows is None:
+                flows = self._flows[waiter.user] = deque()
+                self._users.append(waiter.user)
+                self._deficit[waiter.user] = 0.0
+            flows.append(waiter.flow)
+        queue.append(waiter)
+        self._size += 1
+
+    def remove(self, waiter: _Waiter) -> None:
+        queue = self._waiters.get((waiter.user, waiter.flow))
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._size -= 1
+        if not queue:
+            self._drop_flow(waiter.user, waiter.flow)
+
+    def _drop_flow(self, user: str, flow: Hashable) -> None:
+        del self._waiters[(user, flow)]
+        flows = self._flows[user]
+        flows.remove(flow)
+        if not flows:
+            # An idle user keeps no credit (standard DRR)
+            del self._flows[user]
+            del self._deficit[user]
+            self._users.remove(user)
+
+    def pop(self) -> Optional[_Waiter]:
+        """Next waiter to admit, or None if the queue is empty."""
+        while self._users:
+            user = self._users[0]
+            flows = self._flows[user]
+            flow = flows[0]
+            queue = self._waiters[(user, flow)]
+            waiter = queue[0]
+            if self._deficit[user] < waiter.cost:
+                self._deficit[user] += _QUANTUM
+                self._users.rotate(-1)
+                continue
+            self._deficit[user] -= waiter.cost
+            queue.popleft()
+            self._size -= 1
+            flows.rotate(-1)
+            if not queue:
+                self._drop_flow(user, flow)
+            return waiter
+        return None
+
+
+class ServerLimiter:
+    """Concurrency limit and fair admission queue of one upstream server."""
+
+    def __init__(self, server_id: str, name: str):
+        self.server_id = server_id
+        self.name = name
+        self.limit = settings.upstream_max_in_flight
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_depth = 0
+        self._queue = FairQueue()
+        self._waits: Deque[float] = deque(maxlen=_WAIT_WINDOW)
+        self._counts = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+
+    def set_limit(self, limit: int) -> None:
+        if limit != self.limit:
+            self.limit = limit
+            self._dispatch()
+
+    def _start(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._counts["admitted"] += 1
+
+    def _retry_after(self) -> float:
+        waits = sorted(self._waits)
+        return max(1.0, math.ceil(waits[len(waits) // 2])) if waits else 1.0
+
+    async def acquire(self, user: str, flow: Hashable, cost: float) -> None:
+        """Wait for a slot; raises ServerBusyError if the queue is full or the wait times out."""
+        if self.limit <= 0 or (self.in_flight < self.limit and not self._queue):
+            self._start()
+            self._waits.append(0.0)
+            return
+        if len(self._queue) >= settings.upstream_queue_size:
+            self._counts["rejected"] += 1
+            raise ServerBusyError(
+                f"Server {self.name} is busy ({self.in_flight} calls in flight, {len(self._queue)} queued)",
+                retry_after=self._retry_after(),
+            )
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), cost, user, flow)
+        self._queue.push(waiter)
+        self._counts["queued"] += 1
+        self.peak_depth = max(self.peak_depth, len(self._queue))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), settings.upstream_queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                self._queue.remove(waiter)
+                self._counts["timed_out"] += 1
+                raise ServerBusyError(
+                    f"Server {self.name} is busy (waited {settings.upstream_queue_timeout:.0f}s for a slot)",
+                    retry_after=self._retry_after(),
+                ) from None
+            # Admitted just as the deadline passed: keep the slot
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                self.release()
+            else:
+                self._queue.remove(waiter)
+            raise
+        self._waits.append(time.monotonic() - started)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.limit <= 0 or self.in_flight < self.limit:
+            waiter = self._queue.pop()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue
+            self._start()
+            waiter.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limit, in-flight and queue depth (current and peak), counters and wait percentiles."""
+        waits = sorted(self._waits)
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queue_depth": len(self._queue),
+            "peak_queue_depth": self.peak_depth,
+            **self._counts,
+            "wait_p50": round(waits[len(waits) // 2], 4) if waits else 0.0,
+            "wait_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 4) if waits else 0.0,
+        }
+
+
+_limiters: Dict[str, ServerLimiter] = {}
+
+
+def get_limiter(server_config: Any) -> ServerLimiter:
+    """Get (or create) the limiter of a server, applying its configured limit."""
+    server_id = server_config.server_id or server_config.name
+    limiter = _limiters.get(server_id)
+    if limiter is None:
+        limiter = _limiters[server_id] = ServerLimiter(server_id, server_config.name)
+    limit = server_config.max_in_flight
+    limiter.set_limit(settings.upstream_max_in_flight if limit is None else limit)
+    return limiter
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Admission metrics per server_id in this process."""
+    return {server_id: limiter.stats() for server_id, limiter in list(_limiters.items())}
+
+
+def admission_controlled(func):
+    """
+    Hold a slot of the server's concurrency limit for an MCPClientManager operation.
+
+    Apply inside @single_flight (coalesced callers share the leader's slot) and
+    outside @mcp_operation (queued calls do not hold a connection).
+    """
+    @functools.wraps(func)
+    async def wrapper(self, server_name: str, *args, **kwargs):
+        if self.config_manager is None:
+            return await func(self, server_name, *args, **kwargs)
+        server_config = self.config_manager.get_server(server_name) or \
+            self.config_manager.get_server_by_name(server_name)
+        if server_config is None:
+            return await func(self, server_name, *args, **kwargs)
+
+        user, flow = self.caller or (str(getattr(self.config_manager, "user_id", None)), None)
+        cost = get_upstream_health(server_config).latency(operation_key(func.__name__, args), 0.5)
+        limiter = get_limiter(server_config)
+        await limiter.acquire(user, flow, cost if cost is not None else _QUANTUM)
+        try:
+            return await func(self, server_name, *args, **kwargs)
+        finally:
+            limiter.release()
+    return wrapper
@@ -0,0 +1,269 @@
+"""
+Per-upstream circuit breakers and adaptive timeouts.
+
+Every MCP operation on an upstream server reports its outcome to that
+server's ``UpstreamHealth``:
+
+- closed: calls go through. ``VMCP_CIRCUIT_BREAKER_FAILURE_THRESHOLD``
+  consecutive failures open the circuit.
+- open: calls fail immediately with CircuitOpenError (no connect attempt)
+  for ``VMCP_CIRCUIT_BREAKER_OPEN_SECONDS``.
+- half-open: one probe call goes through. Success closes the circuit; failure
+  opens it again for twice as long (up to
+  ``VMCP_CIRCUIT_BREAKER_MAX_OPEN_SECONDS``). Long-lived calls (resource
+  watchers) are let through but never act as the probe.
+
+Only failures to reach the server count: connection errors, timeouts and
+5xx responses. Authentication errors, JSON-RPC errors and tool errors show
+that the server is up.
+
+Timeouts adapt per operation (and per tool for ``tools/call``): once enough
+successful calls are observed, an operation may take
+``VMCP_UPSTREAM_TIMEOUT_MULTIPLIER`` times its p99 latency, bounded by
+``VMCP_UPSTREAM_TIMEOUT_MIN`` and ``VMCP_UPSTREAM_TIMEOUT``. Latency covers
+the whole call including connect and handshake.
+
+Health is tracked per server_id (derived from the transport config, so it is
+shared by all users of the same upstream) in this process.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+from mcp.shared.exceptions import McpError
+
+from vmcp.config import settings
+from vmcp.mcps.models import (
+    AuthenticationError,
+    BadMCPRequestError,
+    CircuitOpenError,
+    InvalidSessionIdError,
+    OperationCancelledError,
+    OperationTimedOutError,
+)
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("CIRCUIT_BREAKER")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Successful calls kept per operation for latency percentiles
+_LATENCY_WINDOW = 100
+# Samples needed before the timeout adapts
+_MIN_SAMPLES = 20
+
+# Errors that prove the server answered
+_REACHABLE_ERRORS = (AuthenticationError, InvalidSessionIdError, BadMCPRequestError, McpError)
+
+
+def operation_key(operation: str, args: tuple) -> str:
+    """Latency/timeout key of an MCPClientManager operation (per tool for call_tool)."""
+    return f"call_tool:{args[0]}" if operation == "call_tool" and args else operation
+
+
+def cancelled_by_caller() -> bool:
+    """Whether the current task is being cancelled (assumed on Python < 3.11)."""
+    cancelling = getattr(asyncio.current_task(), "cancelling", None)
+    return cancelling() > 0 if cancelling is not None else True
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status_code = getattr(exc, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether an operation error means the server could not be reached (or failed with 5xx)."""
+    if isinstance(exc, OperationTimedOutError):
+        return True
+    if isinstance(exc, OperationCancelledError):
+        return False
+    pending = [exc]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, _REACHABLE_ERRORS):
+            return False
+        status_code = _status_code(current)
+        if status_code is not None:
+            return status_code >= 500
+        if isinstance(current, (httpx.TransportError, OSError)):
+            return True
+        pending.extend(getattr(current, "exceptions", ()))
+        pending.append(current.__cause__)
+    return True
+
+
+class UpstreamHealth:
+    """Circuit breaker state and latency statistics of one upstream server."""
+
+    def __init__(self, server_id: str, name: str):
+        self.server_id = server_id
+        self.name = name
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.open_for = 0.0
+        self.opened_at: Optional[float] = None
+        self.last_failure: Optional[str] = None
+        self._probe_in_flight = False
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts = {"succeeded": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+        self._lock = threading.Lock()
+
+    def admit(self, probe: bool = False, claim: bool = True) -> None:
+        """
+        Let a call through or raise CircuitOpenError.
+
+        Args:
+            probe: Explicit connectivity check (e.g. the connect endpoint);
+                always let through, as the half-open probe
+            claim: Whether the call may be the half-open probe. A long-lived
+                call (a resource watcher) would hold the probe slot for as
+                long as it runs, so it is only let through once the open
+                period is over, without taking the slot
+        """
+        if not settings.circuit_breaker:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self.opened_at + self.open_for - time.monotonic() if self.state == OPEN else 0.0
+            if not claim and not probe:
+                if remaining <= 0:
+                    return
+            elif probe or (self.state == OPEN and remaining <= 0) or \
+                    (self.state == HALF_OPEN and not self._probe_in_flight):
+                if self.state == OPEN:
+                    logger.info(f"Circuit for server {self.name} half-open: probing")
+                self.state = HALF_OPEN
+                self._probe_in_flight = True
+                return
+            self._counts["rejected"] += 1
+        raise CircuitOpenError(
+            f"Server {self.name} is unavailable (circuit open after {self.consecutive_failures} "
+            f"failures, retry in {max(remaining, 0.0):.0f}s): {self.last_failure}"
+        )
+
+    def record_success(self, operation: Optional[str] = None, latency: Optional[float] = None) -> None:
+        """Record a call that reached the server (latency only for complete successful calls)."""
+        with self._lock:
+            self._counts["succeeded"] += 1
+            if operation is not None and latency is not None:
+                self._latencies.setdefault(operation, deque(maxlen=_LATENCY_WINDOW)).append(latency)
+            if self.state != CLOSED:
+                logger.info(f"Circuit for server {self.name} closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.open_for = 0.0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        """Record a call that could not reach the server."""
+        with self._lock:
+            self._counts["failed"] += 1
+            if isinstance(exc, OperationTimedOutError):
+                self._counts["timed_out"] += 1
+            self.consecutive_failures += 1
+            self.last_failure = f"{type(exc).__name__}: {exc}"[:300]
+            failed_probe = self.state == HALF_OPEN
+            self._probe_in_flight = False
+            if failed_probe or self.consecutive_failures >= settings.circuit_breaker_failure_threshold:
+                self.open_for = min(
+                    self.open_for * 2 if failed_probe and self.open_for else settings.circuit_breaker_open_seconds,
+                    settings.circuit_breaker_max_open_seconds,
+                )
+                if self.state != OPEN:
+                    logger.warning(f"Circuit for server {self.name} open for {self.open_for:.0f}s: {self.last_failure}")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Record a call with no verdict (e.g. cancelled by the caller)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def timeout(self, operation: str) -> Optional[float]:
+        """Seconds operation may take, or None for no timeout."""
+        ceiling = settings.upstream_timeout
+        if ceiling <= 0:
+            return None
+        with self._lock:
+            samples = self._latencies.get(operation)
+            if not samples or len(samples) < _MIN_SAMPLES:
+                return ceiling
+            p99 = _percentile(sorted(samples), 0.99)
+        return min(ceiling, max(settings.upstream_timeout_min, p99 * settings.upstream_timeout_multiplier))
+
+    def latency(self, operation: str, q: float) -> Optional[float]:
+        """Observed latency percentile q (0-1) of operation, if enough samples exist."""
+        with self._lock:
+            samples = self._latencies.get(operation)
+            if not samples or len(samples) < _MIN_SAMPLES:
+                return None
+            return _percentile(sorted(samples), q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State, counters and per-operation latency percentiles (seconds)."""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.opened_at + self.open_for - time.monotonic()), 3)
+            operations = {}
+            for operation, samples in self._latencies.items():
+                ordered = sorted(samples)
+                operations[operation] = {
+                    "samples": len(ordered),
+                    "p50": round(_percentile(ordered, 0.5), 4),
+                    "p95": round(_percentile(ordered, 0.95), 4),
+                    "p99": round(_percentile(ordered, 0.99), 4),
+                }
+            snapshot = {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in": retry_in,
+                "last_failure": self.last_failure,
+                **self._counts,
+            }
+        for operation, stats in operations.items():
+            stats["timeout"] = self.timeout(operation)
+        snapshot["operations"] = operations
+        return snapshot
+
+
+_health: Dict[str, UpstreamHealth] = {}
+_health_lock = threading.Lock()
+
+
+def get_upstream_health(server_config: Any) -> UpstreamHealth:
+    """Get (or create) the health record of a server."""
+    server_id = server_config.server_id or server_config.name
+    health = _health.get(server_id)
+    if health is None:
+        with _health_lock:
+            health = _health.setdefault(server_id, UpstreamHealth(server_id, server_config.name))
+    return health
+
+
+def upstream_health_snapshot(server_id: str) -> Optional[Dict[str, Any]]:
+    """Snapshot of a server's health record, or None if no call was made in this process."""
+    health = _health.get(server_id)
+    return health.snapshot() if health is not None else None
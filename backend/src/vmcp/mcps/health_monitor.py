@@ -0,0 +1,221 @@
+"""
+Background health monitor for upstream servers.
+
+The status endpoints answer from memory instead of pinging upstreams inside
+the HTTP request. A server is watched per user from the first time its
+status is asked for:
+
+- It is probed every ``VMCP_HEALTH_CHECK_INTERVAL`` seconds, plus or minus
+  20% jitter so that probes of many servers spread out.
+- At most ``VMCP_HEALTH_CHECK_CONCURRENCY`` probes run at a time.
+- A probe is a ping on the user's persisted upstream session, so there is no
+  new MCP handshake. It respects the server's circuit breaker and admission
+  limit. A probe turned away by admission control says nothing about the
+  server, so the last status is kept and the probe retried next interval.
+- The latest status is kept in memory. Storage, and the vMCPs using the
+  server, are only written when the status changes.
+- A server stops being watched when it is disabled or deleted, or when
+  nobody has asked for its status for ``VMCP_HEALTH_CHECK_IDLE_SECONDS``.
+
+A status request with an explicit probe (``?probe=true``), or for a server
+that is not watched yet, pings it live. Concurrent live checks of one server
+share a single ping. State is kept in this process.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from vmcp.config import settings
+from vmcp.mcps.mcp_client import MCPClientManager
+from vmcp.mcps.mcp_configmanager import MCPConfigManager
+from vmcp.mcps.models import AuthenticationError, CircuitOpenError, MCPConnectionStatus, ServerBusyError
+from vmcp.utilities.logging import setup_logging
+from vmcp.vmcps.vmcp_config_manger import VMCPConfigManager
+
+logger = setup_logging("HEALTH_MONITOR")
+
+# Probe intervals vary by this fraction either way
+_JITTER = 0.2
+
+
+class ServerHealth:
+    """Last known status of one server for one user."""
+
+    def __init__(self, status: MCPConnectionStatus):
+        self.status = status
+        self.error: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+        self.next_due = 0.0
+        self.last_read = time.monotonic()
+        self.probing: Optional["asyncio.Future[ServerHealth]"] = None
+
+
+def _next_due() -> float:
+    return time.monotonic() + settings.health_check_interval * random.uniform(1 - _JITTER, 1 + _JITTER)
+
+
+class HealthMonitor:
+    """Watched servers, their cached status and the probes refreshing it."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, str], ServerHealth] = {}
+        self._counts = {"probes": 0, "busy": 0, "transitions": 0, "cache_hits": 0}
+        self._semaphore = asyncio.Semaphore(max(1, settings.health_check_concurrency))
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def cached(self, user_id: Any, server_id: str) -> Optional[ServerHealth]:
+        """The monitored status of a server, or None if it was not checked yet."""
+        entry = self._entries.get((int(user_id), server_id))
+        if entry is None or entry.checked_at is None or settings.health_check_interval <= 0:
+            return None
+        entry.last_read = time.monotonic()
+        self._counts["cache_hits"] += 1
+        return entry
+
+    async def status(self, config_manager: MCPConfigManager, server_id: str, probe: bool = False) -> ServerHealth:
+        """
+        Status of a server for the config manager's user.
+
+        Args:
+            config_manager: The caller's config manager; status changes are
+                applied to its server config
+            server_id: Server to check
+            probe: Ping the server now instead of answering from memory
+        """
+        entry = None if probe else self.cached(config_manager.user_id, server_id)
+        return entry or await self.check(config_manager, server_id, explicit=probe)
+
+    async def check(self, config_manager: MCPConfigManager, server_id: str, explicit: bool = False) -> ServerHealth:
+        """Ping a server now (joining a ping already in flight) and start watching it."""
+        key = (config_manager.user_id, server_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            server_config = config_manager.get_server(server_id)
+            entry = self._entries[key] = ServerHealth(
+                server_config.status if server_config else MCPConnectionStatus.UNKNOWN
+            )
+        entry.last_read = time.monotonic()
+        return await self._join_probe(config_manager, server_id, entry, explicit)
+
+    async def _join_probe(self, config_manager: MCPConfigManager, server_id: str, entry: ServerHealth,
+                          explicit: bool) -> ServerHealth:
+        if entry.probing is None:
+            entry.probing = asyncio.ensure_future(self._probe(config_manager, server_id, entry, explicit))
+        return await asyncio.shield(entry.probing)
+
+    async def _probe(self, config_manager: MCPConfigManager, server_id: str, entry: ServerHealth,
+                     explicit: bool) -> ServerHealth:
+        try:
+            server_config = config_manager.get_server(server_id)
+            if server_config is None or not server_config.enabled:
+                self._entries.pop((config_manager.user_id, server_id), None)
+                entry.status = server_config.status if server_config else MCPConnectionStatus.UNKNOWN
+                return entry
+
+            self._counts["probes"] += 1
+            error = None
+            try:
+                # An explicit check probes even an open circuit
+                status = await MCPClientManager(config_manager).ping_server(
+                    server_id, probe=explicit, record_status=False
+                )
+                if status is None:
+                    status = MCPConnectionStatus.UNKNOWN
+            except AuthenticationError as e:
+                logger.debug(f"Authentication error for server {server_id}: {e}")
+                status = MCPConnectionStatus.AUTH_REQUIRED
+            except CircuitOpenError as e:
+                status, error = MCPConnectionStatus.ERROR, str(e)
+            except ServerBusyError as e:
+                # Busy with real calls: no verdict, keep the last status
+                logger.debug(f"Skipped health check of busy server {server_id}: {e}")
+                self._counts["busy"] += 1
+                return entry
+            except Exception as e:
+                logger.debug(f"Error pinging server {server_id}: {e}")
+                status, error = MCPConnectionStatus.UNKNOWN, str(e)
+
+            if status != entry.status or status != server_config.status:
+                self._transition(config_manager, server_config, status, error)
+            entry.status = status
+            entry.error = error
+            entry.checked_at = datetime.now()
+            return entry
+        finally:
+            entry.next_due = _next_due()
+            entry.probing = None
+
+    def _transition(self, config_manager: MCPConfigManager, server_config: Any,
+                    status: MCPConnectionStatus, error: Optional[str]) -> None:
+        server_id = server_config.server_id
+        logger.info(f"Server {server_config.name} ({server_id}): {server_config.status.value} → {status.value}")
+        self._counts["transitions"] += 1
+        config_manager.update_server_status(server_id, status, error)
+        vmcp_ids = [vmcp_id for vmcp_id in server_config.vmcps_using_server or () if not vmcp_id.startswith('@')]
+        if vmcp_ids:
+            vmcp_config_manager = VMCPConfigManager(str(config_manager.user_id))
+            for vmcp_id in vmcp_ids:
+                if vmcp_config_manager.load_vmcp_config(specific_vmcp_id=vmcp_id):
+                    vmcp_config_manager.update_vmcp_server(vmcp_id, server_config)
+
+    def forget(self, user_id: Any, server_id: str) -> None:
+        """Stop watching a server (e.g. after it was disconnected or deleted)."""
+        self._entries.pop((int(user_id), server_id), None)
+
+    async def _background_probe(self, key: Tuple[int, str], entry: ServerHealth) -> None:
+        async with self._semaphore:
+            if self._entries.get(key) is not entry:
+                return
+            try:
+                await self._join_probe(MCPConfigManager(str(key[0])), key[1], entry, explicit=False)
+            except Exception as e:
+                entry.next_due = _next_due()
+                logger.error(f"Health check of server {key[1]} failed: {e}")
+
+    def run_once(self) -> float:
+        """Start probes of every due server; returns seconds until the next one is due."""
+        now = time.monotonic()
+        idle_cutoff = now - settings.health_check_idle_seconds
+        next_due = now + settings.health_check_interval
+        for key, entry in list(self._entries.items()):
+            if entry.last_read < idle_cutoff:
+                self._entries.pop(key, None)
+                continue
+            if entry.probing is None and entry.next_due <= now:
+                # Rescheduled when the probe finishes
+                entry.next_due = float("inf")
+                task = asyncio.ensure_future(self._background_probe(key, entry))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            next_due = min(next_due, entry.next_due)
+        return max(0.0, next_due - now)
+
+    def stats(self) -> Dict[str, int]:
+        """Watched servers, probes run and turned away busy, status transitions and status reads answered from memory."""
+        return {"watched": len(self._entries), **self._counts}
+
+
+_monitor = HealthMonitor()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get the process-wide health monitor."""
+    return _monitor
+
+
+async def run_health_monitor_loop() -> None:
+    """Probe watched servers in the background until cancelled."""
+    if settings.health_check_interval <= 0:
+        logger.info("Background health checks disabled")
+        return
+
+    while True:
+        try:
+            delay = _monitor.run_once()
+        except Exception as e:
+            logger.error(f"Background health check failed: {e}")
+            delay = settings.health_check_interval
+        await asyncio.sleep(max(delay, 1.0))
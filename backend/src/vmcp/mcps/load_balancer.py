@@ -0,0 +1,294 @@
+"""
+Load balancing over replicas of an upstream server.
+
+A server config may list ``endpoints``: replica URLs serving the same MCP
+server as ``url``. Each operation (see mcp_operation) runs on one replica,
+chosen by the server's ``balancing`` policy (default
+``VMCP_UPSTREAM_BALANCING``):
+
+- round_robin: replicas in turn.
+- least_outstanding: the replica with the fewest calls in flight.
+- ewma: the lowest exponentially weighted latency times (calls in flight + 1);
+  a replica with no latency yet is tried first.
+
+Ties go to the next replica in turn.
+
+Session affinity: an upstream ``mcp-session-id`` is only ever sent to the
+replica that issued it. The persisted session id belongs to ``url``;
+sessions on the other replicas are kept in memory per replica and caller.
+
+Passive ejection: ``VMCP_UPSTREAM_EJECT_FAILURES`` consecutive failures to
+reach a replica (see circuit_breaker.is_upstream_failure) take it out of
+rotation for ``VMCP_UPSTREAM_EJECT_SECONDS``. If every replica is ejected,
+all of them are used.
+
+Hedging (``hedge``, default ``VMCP_UPSTREAM_HEDGE``): a call to a tool
+annotated readOnlyHint that has not answered within the tool's p95 latency
+is also sent to a second replica. The first successful answer wins and the
+other call is cancelled.
+
+The circuit breaker, timeouts and admission limit still apply to the server
+as a whole. State is kept per server_id in this process.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.mcps.circuit_breaker import (
+    cancelled_by_caller,
+    get_upstream_health,
+    is_upstream_failure,
+    operation_key,
+)
+from vmcp.mcps.models import MCPTransportType, OperationCancelledError
+from vmcp.mcps.single_flight import auth_identity, is_read_only_tool
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("LOAD_BALANCER")
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+EWMA = "ewma"
+
+# Weight of the newest latency sample in a replica's EWMA
+_EWMA_ALPHA = 0.3
+
+# attempt(url) -> (result, errors mcp_operation turned into a None result)
+Attempt = Callable[[str], Awaitable[Tuple[Any, List[BaseException]]]]
+
+
+class Replica:
+    """Balancing state of one replica URL."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "ewma": round(self.ewma, 4) if self.ewma is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ejected": self.ejected(now),
+        }
+
+
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def _succeeded(task: "asyncio.Future[Tuple[Any, List[BaseException]]]") -> bool:
+    return not task.cancelled() and task.exception() is None and not task.result()[1]
+
+
+class ReplicaGroup:
+    """Replicas of one upstream server and the policy spreading calls over them."""
+
+    def __init__(self, server_id: str, name: str):
+        self.server_id = server_id
+        self.name = name
+        self.policy = ROUND_ROBIN
+        self.replicas: List[Replica] = []
+        self._next = 0
+        # (caller auth identity, replica url) -> upstream session id
+        self._sessions: Dict[Tuple[str, str], str] = {}
+        self._counts = {"hedged": 0, "hedge_wins": 0}
+
+    def configure(self, urls: List[str], policy: str) -> None:
+        """Apply the configured replica URLs and policy, keeping the state of known replicas."""
+        self.policy = policy
+        if [replica.url for replica in self.replicas] == urls:
+            return
+        known = {replica.url: replica for replica in self.replicas}
+        self.replicas = [known.get(url) or Replica(url) for url in urls]
+        self._next %= len(self.replicas)
+        self._sessions = {key: sid for key, sid in self._sessions.items() if key[1] in urls}
+
+    def pick(self, exclude: Optional[Replica] = None) -> Optional[Replica]:
+        """
+        Choose a replica for the next call.
+
+        Args:
+            exclude: Replica already serving the call (hedging); None is returned
+                if no other replica is in rotation
+        """
+        now = time.monotonic()
+        order = self.replicas[self._next:] + self.replicas[:self._next]
+        self._next = (self._next + 1) % len(self.replicas)
+        candidates = [r for r in order if r is not exclude and not r.ejected(now)]
+        if not candidates:
+            if exclude is not None:
+                return None
+            candidates = order
+        if self.policy == LEAST_OUTSTANDING:
+            return min(candidates, key=lambda r: r.outstanding)
+        if self.policy == EWMA:
+            return min(candidates, key=lambda r: (r.ewma or 0.0) * (r.outstanding + 1))
+        return candidates[0]
+
+    def session_id(self, scope: str, url: str) -> Optional[str]:
+        return self._sessions.get((scope, url))
+
+    def set_session_id(self, scope: str, url: str, session_id: Optional[str]) -> None:
+        if session_id:
+            self._sessions[(scope, url)] = session_id
+        else:
+            self._sessions.pop((scope, url), None)
+
+    def _finish(self, replica: Replica, latency: Optional[float], failed: bool) -> None:
+        replica.outstanding -= 1
+        if not failed:
+            replica.consecutive_failures = 0
+            if latency is not None:
+                replica.ewma = latency if replica.ewma is None else \
+                    _EWMA_ALPHA * latency + (1 - _EWMA_ALPHA) * replica.ewma
+            return
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= settings.upstream_eject_failures:
+            replica.consecutive_failures = 0
+            replica.ejections += 1
+            replica.ejected_until = time.monotonic() + settings.upstream_eject_seconds
+            logger.warning(
+                f"Ejected replica {replica.url} of server {self.name} for "
+                f"{settings.upstream_eject_seconds:.0f}s after {settings.upstream_eject_failures} failures"
+            )
+
+    async def _tracked(self, attempt: Attempt, replica: Replica) -> Tuple[Any, List[BaseException]]:
+        replica.outstanding += 1
+        replica.requests += 1
+        started = time.monotonic()
+        try:
+            result, errors = await attempt(replica.url)
+        except asyncio.CancelledError:
+            replica.outstanding -= 1
+            raise
+        except OperationCancelledError:
+            # As in mcp_operation: the transport cancels the operation when the connection fails
+            if cancelled_by_caller():
+                replica.outstanding -= 1
+            else:
+                self._finish(replica, None, failed=True)
+            raise
+        except Exception as e:
+            self._finish(replica, None, failed=is_upstream_failure(e))
+            raise
+        failed = bool(errors) and is_upstream_failure(errors[-1])
+        self._finish(replica, None if errors else time.monotonic() - started, failed)
+        return result, errors
+
+    async def call(self, attempt: Attempt, hedge_after: Optional[float] = None) -> Tuple[Any, List[BaseException]]:
+        """
+        Run attempt on a chosen replica.
+
+        Args:
+            attempt: The operation on one replica URL
+            hedge_after: Seconds after which a second replica also runs the
+                operation (None: no hedging)
+        """
+        primary = self.pick()
+        if hedge_after is None:
+            return await self._tracked(attempt, primary)
+
+        tasks = [asyncio.ensure_future(self._tracked(attempt, primary))]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                backup = self.pick(exclude=primary)
+                if backup is not None:
+                    self._counts["hedged"] += 1
+                    logger.debug(f"Hedging call to server {self.name} on {backup.url} after {hedge_after:.3f}s")
+                    tasks.append(asyncio.ensure_future(self._tracked(attempt, backup)))
+                pending = set(tasks)
+            while True:
+                winner = next((task for task in done if _succeeded(task)), None)
+                if winner is None and not pending:
+                    winner = next(iter(done))
+                if winner is not None:
+                    if winner is not tasks[0]:
+                        self._counts["hedge_wins"] += 1
+                    return winner.result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    task.add_done_callback(_retrieve_exception)
+
+    def stats(self) -> Dict[str, Any]:
+        """Policy, hedging counters and per-replica state."""
+        now = time.monotonic()
+        return {
+            "policy": self.policy,
+            **self._counts,
+            "replicas": [replica.stats(now) for replica in self.replicas],
+        }
+
+
+_groups: Dict[str, ReplicaGroup] = {}
+
+
+def _replica_urls(server_config: Any) -> List[str]:
+    if server_config.transport_type == MCPTransportType.STDIO:
+        return []
+    urls = [server_config.url] if server_config.url else []
+    for url in server_config.endpoints or ():
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def get_replica_group(server_config: Any) -> Optional[ReplicaGroup]:
+    """The replica group of a server, or None if it has a single endpoint."""
+    server_id = server_config.server_id or server_config.name
+    urls = _replica_urls(server_config)
+    if len(urls) < 2:
+        _groups.pop(server_id, None)
+        return None
+    group = _groups.get(server_id)
+    if group is None:
+        group = _groups[server_id] = ReplicaGroup(server_id, server_config.name)
+    group.configure(urls, server_config.balancing or settings.upstream_balancing)
+    return group
+
+
+def replica_group_stats(server_id: str) -> Optional[Dict[str, Any]]:
+    """Balancing state of a server's replicas, or None if it has a single endpoint."""
+    group = _groups.get(server_id)
+    return group.stats() if group is not None else None
+
+
+def replica_session_id(server_config: Any, user_id: Any, url: str) -> Optional[str]:
+    """Upstream session id the caller holds on a replica other than url."""
+    group = _groups.get(server_config.server_id or server_config.name)
+    return group.session_id(auth_identity(server_config, user_id), url) if group is not None else None
+
+
+def set_replica_session_id(server_config: Any, user_id: Any, url: str, session_id: Optional[str]) -> None:
+    """Remember (or forget, with None) the caller's upstream session on a replica other than url."""
+    group = _groups.get(server_config.server_id or server_config.name)
+    if group is not None:
+        group.set_session_id(auth_identity(server_config, user_id), url, session_id)
+
+
+def hedge_delay(server_config: Any, operation: str, args: tuple) -> Optional[float]:
+    """Seconds after which a call is hedged on a second replica, or None if it is not hedged."""
+    hedge = settings.upstream_hedge if server_config.hedge is None else server_config.hedge
+    if not hedge or operation != "call_tool" or not args or not is_read_only_tool(server_config, args[0]):
+        return None
+    return get_upstream_health(server_config).latency(operation_key(operation, args), 0.95)
@@ -1,6 +1,8 @@
 import asyncio
+import functools
+import time
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 import httpx
 from mcp import ClientSession
@@ -23,8 +25,22 @@ from pydantic import AnyHttpUrl, AnyUrl
 
 from vmcp.config import settings
 from vmcp.config import settings as AuthSettings
+from vmcp.mcps.admission import admission_controlled
+from vmcp.mcps.circuit_breaker import (
+    cancelled_by_caller,
+    get_upstream_health,
+    is_upstream_failure,
+    operation_key,
+)
+from vmcp.mcps.load_balancer import (
+    get_replica_group,
+    hedge_delay,
+    replica_session_id,
+    set_replica_session_id,
+)
 from vmcp.mcps.mcp_auth_manager import MCPAuthManager
 from vmcp.mcps.mcp_configmanager import MCPConfigManager
+from vmcp.mcps.resource_cache import cached_resource_read
 from vmcp.mcps.models import (
     AuthenticationError,
     BadMCPRequestError,
@@ -37,7 +53,8 @@ from vmcp.mcps.models import (
     OperationCancelledError,
     OperationTimedOutError,
 )
-from vmcp.utilities.logging.config import setup_logging
+from vmcp.mcps.single_flight import single_flight, tool_call_coalescable
+from vmcp.utilities.logging.config import lazy, redact_headers, setup_logging
 from vmcp.utilities.tracing import trace_method
 
 BACKEND_URL = AuthSettings.base_url
@@ -88,25 +105,61 @@ def safe_extract_response_info(response):
 
     return status_code, error_text
 
+# Operations that hold a session open indefinitely (never timed, never the half-open probe)
+_UNTIMED_OPERATIONS = frozenset({"watch_resources"})
+
+
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+async def _with_timeout(coro, timeout: Optional[float], server_name: str):
+    """Await coro, cancelling it and raising OperationTimedOutError after timeout seconds."""
+    if timeout is None:
+        return await coro
+    # Own task, so the operation's CancelledError handling cannot swallow the timeout
+    task = asyncio.ensure_future(coro)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except asyncio.CancelledError:
+        task.cancel()
+        task.add_done_callback(_retrieve_exception)
+        raise
+    if not done:
+        task.cancel()
+        task.add_done_callback(_retrieve_exception)
+        logger.error(f"Operation timed out for server {server_name} after {timeout:.1f}s")
+        raise OperationTimedOutError(f"Operation timed out for server {server_name} after {timeout:.1f}s")
+    return task.result()
+
+
 def mcp_operation(func):
     """Decorator for MCP operations that handles connection management"""
-    async def wrapper(self, server_name: str, *args, **kwargs):
+    async def wrapper(self, server_name: str, *args, fresh_session: bool = False, on_error=None,
+                      endpoint: Optional[str] = None, **kwargs):
         server_config = self.config_manager.get_server(server_name)
         if not server_config:
             server_config = self.config_manager.get_server_by_name(server_name)
             if not server_config:
                 raise ValueError(f"Server configuration not found for: {server_name}")
-        # Construct headers
-        headers = server_config.headers or {}
+        # Construct headers (copy: the configured headers must not pick up auth or session ids)
+        headers = dict(server_config.headers or {})
         headers["mcp-protocol-version"] = "2025-06-18"
         # Add authentication headers
         if server_config.auth and server_config.auth.access_token:
             headers['Authorization'] = f'Bearer {server_config.auth.access_token}'
-        if server_config.session_id:
-            headers['mcp-session-id'] = server_config.session_id
+        # A replica other than url keeps its own upstream sessions (see load_balancer.py)
+        replica = endpoint if endpoint and endpoint != server_config.url else None
+        url = replica or server_config.url
+        user_id = getattr(self.config_manager, "user_id", None)
+        stored_session_id = replica_session_id(server_config, user_id, replica) if replica else server_config.session_id
+        # A fresh session gets its own initialize (and server-to-client stream) instead of the shared one
+        if stored_session_id and not fresh_session:
+            headers['mcp-session-id'] = stored_session_id
         # headers['mcp-session-id'] = "kitemcp-07245b6c-77dc-4819-8798-3e8a8c1c7a39"
         # headers['mcp-session-id'] = "kitemcp-07245b6c-77dc-4819-8798-3e8a8c1c"
-        logger.info(f"✅ Headers: {headers}")
+        logger.debug("✅ Headers: %s", lazy(lambda: redact_headers(headers)))
 
         session = None
         context = None
@@ -115,36 +168,36 @@ def mcp_operation(func):
 
         try:
             if server_config.transport_type == MCPTransportType.SSE:
-                context = sse_client(server_config.url, headers)
+                context = sse_client(url, headers)
                 read_stream, write_stream = await context.__aenter__()
                 context_entered = True
-                session = ClientSession(read_stream, write_stream)
+                session = ClientSession(read_stream, write_stream, message_handler=self.message_handler)
                 await session.__aenter__()
                 session_entered = True
                 result = await session.initialize()
-                logger.info(f"✅ Initialized session: {result}")
+                logger.debug("✅ Initialized session: %r", result)
                 self.connections[server_config.name] = session
                 return await func(self, server_config, *args, **kwargs)
             elif server_config.transport_type == MCPTransportType.HTTP:
-                context = streamablehttp_client(server_config.url, headers=headers,terminate_on_close=False)
+                context = streamablehttp_client(url, headers=headers,terminate_on_close=False)
                 read_stream, write_stream, get_session_id = await context.__aenter__()
                 context_entered = True
-                session = ClientSession(read_stream, write_stream)
+                session = ClientSession(read_stream, write_stream, message_handler=self.message_handler)
                 await session.__aenter__()
                 session_entered = True
                 if not headers.get('mcp-session-id'):
                     result = await session.initialize()
                     session_id = get_session_id()
 
-                    server_config.session_id = session_id
-                    if self.config_manager:
-                        self.config_manager.update_server_config(server_config.server_id, server_config)
-                        logger.info(f"💾 [SESSION_PERSISTENCE: HTTP] Saved session ID to config for {server_config.name}: {session_id}")
-                    logger.info(f"✅ Session ID: {session_id}")
-                    logger.info(f"✅ Initialized session: {result}")
+                    if replica and not fresh_session:
+                        set_replica_session_id(server_config, user_id, replica, session_id)
+                    elif self.config_manager and not fresh_session:
+                        self.config_manager.defer_session_id(server_config, session_id)
+                        logger.debug("💾 [SESSION_PERSISTENCE: HTTP] Queued session ID save for %s", server_config.name)
+                    logger.debug("✅ Initialized session: %r", result)
                 else:
                     session_id = headers.get('mcp-session-id')
-                    logger.info(f"✅ Using existing session ID: {session_id}")
+                    logger.debug("✅ Using existing session for %s", server_config.name)
 
                 self.connections[server_config.name] = session
                 return await func(self, server_config, *args, **kwargs)
@@ -152,11 +205,11 @@ def mcp_operation(func):
                 context = stdio_client(server_config.server_params)
                 read_stream, write_stream = await context.__aenter__()
                 context_entered = True
-                session = ClientSession(read_stream, write_stream)
+                session = ClientSession(read_stream, write_stream, message_handler=self.message_handler)
                 await session.__aenter__()
                 session_entered = True
                 result = await session.initialize()
-                logger.info(f"✅ Initialized session: {result}")
+                logger.debug("✅ Initialized session: %r", result)
                 self.connections[server_config.name] = session
                 return await func(self, server_config, *args, **kwargs)
             else:
@@ -178,6 +231,8 @@ def mcp_operation(func):
             logger.error(f"Operation timed out for server {server_config.name}")
             raise OperationTimedOutError(f"Operation timed out for server {server_config.name}") from e
         except Exception as e:
+            if on_error is not None:
+                on_error(e)
             logger.debug(f"Failed to connect to server {server_config.name}: {e}")
             logger.debug(traceback.format_exc())
 
@@ -408,7 +463,8 @@ def mcp_operation(func):
             if server_config.name in self.connections:
                 del self.connections[server_config.name]
 
-    async def retry_wrapper(self, server_name: str, *args, **kwargs):
+    @functools.wraps(func)
+    async def retry_wrapper(self, server_name: str, *args, probe: bool = False, **kwargs):
         retries = 2
         server_config = self.config_manager.get_server(server_name)
         if not server_config:
@@ -416,17 +472,74 @@ def mcp_operation(func):
             if not server_config:
                 raise ValueError(f"Server configuration not found for: {server_name}")
 
-        for retry_count in range(retries):
-            try:
-                return await wrapper(self, server_name, *args, **kwargs)
-            except InvalidSessionIdError:
-                server_config.session_id = None
-                if self.config_manager:
-                    self.config_manager.update_server_config(server_config.server_id, server_config)
-                continue
-            except Exception as e:
-                logger.debug(f"Attempt {retry_count+1} of {retries} failed: {e}")
-                raise
+        # Fail fast while the server's circuit is open
+        health = get_upstream_health(server_config)
+        long_lived = func.__name__ in _UNTIMED_OPERATIONS
+        health.admit(probe=probe, claim=not long_lived)
+        operation = operation_key(func.__name__, args)
+        timeout = None if long_lived else health.timeout(operation)
+        group = get_replica_group(server_config)
+        started = time.monotonic()
+
+        async def attempt(endpoint: Optional[str]):
+            # Errors mcp_operation logs and turns into a None result
+            errors = []
+            for retry_count in range(retries):
+                try:
+                    result = await _with_timeout(
+                        wrapper(self, server_name, *args, endpoint=endpoint, on_error=errors.append, **kwargs),
+                        timeout, server_config.name
+                    )
+                    return result, errors
+                except InvalidSessionIdError:
+                    if endpoint and endpoint != server_config.url:
+                        set_replica_session_id(server_config, getattr(self.config_manager, "user_id", None), endpoint, None)
+                    elif self.config_manager:
+                        # Same deferred key as the save, so a pending stale id is replaced
+                        self.config_manager.defer_session_id(server_config, None)
+                    else:
+                        server_config.session_id = None
+                    continue
+                except Exception as e:
+                    logger.debug(f"Attempt {retry_count+1} of {retries} failed: {e}")
+                    raise
+            return None, errors
+
+        try:
+            if group is None:
+                result, errors = await attempt(None)
+            elif long_lived:
+                # Long-lived sessions would skew the in-flight counts
+                result, errors = await attempt(group.pick().url)
+            else:
+                result, errors = await group.call(attempt, hedge_delay(server_config, func.__name__, args))
+        except asyncio.CancelledError:
+            if not long_lived:
+                health.release()
+            raise
+        except OperationCancelledError as e:
+            # The transport cancels the operation when the connection fails; a timed
+            # operation runs in its own task, so there it cannot be the caller
+            if timeout is None and cancelled_by_caller():
+                if not long_lived:
+                    health.release()
+            else:
+                health.record_failure(e)
+            raise
+        except Exception as e:
+            if is_upstream_failure(e):
+                health.record_failure(e)
+            else:
+                health.record_success()
+            raise
+
+        if errors and is_upstream_failure(errors[-1]):
+            health.record_failure(errors[-1])
+        elif errors or timeout is None:
+            health.record_success()
+        else:
+            health.record_success(operation, time.monotonic() - started)
+        return result
 
     return retry_wrapper
 
@@ -434,17 +547,23 @@ def mcp_operation(func):
 class MCPClientManager:
     """Manages multiple MCP server connections"""
 
-    def __init__(self, config_manager: Optional[MCPConfigManager] = None):
+    def __init__(self, config_manager: Optional[MCPConfigManager] = None, message_handler=None):
         self.auth_manager = MCPAuthManager()
         self.config_manager = config_manager
         self.connections: Dict[str, ClientSession] = {}
+        # (user, flow) the admission queue schedules this manager's calls under (see admission.py)
+        self.caller: Optional[Tuple[str, Hashable]] = None
+        # Receives server notifications (e.g. notifications/resources/updated) on sessions this manager opens
+        self.message_handler = message_handler
 
+    @single_flight("tools/list")
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: List Tools", operation="list_tools")
     async def tools_list(self, server_config: MCPServerConfig, *args, **kwargs) -> Dict[str, Tool]:
         """List available tools from the MCP server"""
         session = self.connections[server_config.name]
-        logger.info(f"✅ Tools list: {self.connections}")
+        logger.debug("✅ Tools list: %s", self.connections)
         try:
             result = await session.list_tools()
             tool_details = {}
@@ -465,6 +584,8 @@ class MCPClientManager:
 
             raise MCPOperationError(f"Failed to list tools from server {server_config.name}: {e}") from e
 
+    @single_flight("prompts/list")
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: List Prompts", operation="list_prompts")
     async def prompts_list(self, server_config: MCPServerConfig, *args, **kwargs) -> Dict[str, Prompt]:
@@ -481,6 +602,8 @@ class MCPClientManager:
             logger.error(f"Failed to list prompts from server: {e}")
             raise MCPOperationError(f"Failed to list prompts from server: {e}") from e
 
+    @single_flight("resources/templates/list")
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: List Resource Templates", operation="list_resource_templates")
     async def resource_templates_list(self, server_config: MCPServerConfig, *args, **kwargs) -> Dict[str, ResourceTemplate]:
@@ -497,6 +620,8 @@ class MCPClientManager:
             logger.error(f"Failed to list resource templates from server: {e}")
             raise MCPOperationError(f"Failed to list resource templates from server: {e}") from e
 
+    @single_flight("resources/list")
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: List Resources", operation="list_resources")
     async def resources_list(self, server_config: MCPServerConfig, *args, **kwargs) -> Dict[str, Resource]:
@@ -513,6 +638,8 @@ class MCPClientManager:
             logger.error(f"Failed to list resources from server: {e}")
             raise MCPOperationError(f"Failed to list resources from server: {e}") from e
 
+    @single_flight("capabilities/discover")
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: Discover Capabilities", operation="discover_capabilities")
     async def discover_capabilities(self, server_config: MCPServerConfig, *args, **kwargs) -> Dict[str, Any]:
@@ -574,6 +701,10 @@ class MCPClientManager:
         logger.info(f"✅ Retrieved capabilities from server [ERRORS_IF_ANY: {errors_if_any}]")
         return capabilities
 
+    @single_flight("tools/call", lambda server_config, tool_name, arguments, *args, **kwargs: (
+        {"name": tool_name, "arguments": arguments} if tool_call_coalescable(server_config, tool_name) else None
+    ))
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: Call Tool", operation="call_tool")
     async def call_tool(self, server_config: MCPServerConfig, tool_name: str, arguments: dict, *args, **kwargs):
@@ -587,6 +718,9 @@ class MCPClientManager:
             logger.error(f"Failed to call tool {tool_name} on server: {e}")
             raise MCPOperationError(f"Failed to call tool {tool_name} on server: {e}") from e
 
+    @cached_resource_read
+    @single_flight("resources/read", lambda server_config, resource_uri, *args, **kwargs: {"uri": resource_uri})
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: Read Resource", operation="read_resource")
     async def read_resource(self, server_config: MCPServerConfig, resource_uri: str, *args, **kwargs):
@@ -603,6 +737,10 @@ class MCPClientManager:
             logger.error(f"Failed to read resource {resource_uri} from server: {e}")
             raise MCPOperationError(f"Failed to read resource {resource_uri} from server: {e}") from e
 
+    @single_flight("prompts/get", lambda server_config, prompt_name, arguments, *args, **kwargs: (
+        {"name": prompt_name, "arguments": arguments}
+    ))
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: Get Prompt", operation="get_prompt")
     async def get_prompt(self, server_config: MCPServerConfig, prompt_name: str, arguments: dict, *args, **kwargs):
@@ -616,21 +754,27 @@ class MCPClientManager:
             logger.error(f"Failed to get prompt {prompt_name} from server: {e}")
             raise MCPOperationError(f"Failed to get prompt {prompt_name} from server: {e}") from e
 
+    @mcp_operation
+    async def watch_resources(self, server_config: MCPServerConfig, watcher, *args, **kwargs):
+        """Hold a session open for a resource_cache.ResourceWatcher until it fails or is cancelled"""
+        session = self.connections[server_config.name]
+        await watcher.serve(session)
+
+    @admission_controlled
     @mcp_operation
     @trace_method("[MCPClientManager]: Ping Server", operation="ping_server")
-    async def ping_server(self, server_config: MCPServerConfig, *args, **kwargs):
-        """Ping the MCP server to check connectivity"""
+    async def ping_server(self, server_config: MCPServerConfig, *args, record_status: bool = True, **kwargs):
+        """Ping the MCP server to check connectivity (record_status=False leaves the stored status alone)"""
         session = self.connections[server_config.name]
         try:
             await session.send_ping()
             logger.info("✅ Pinged server")
-            # Update the server config status to CONNECTED
-            if self.config_manager and server_config.server_id:
-                server_config.status = MCPConnectionStatus.CONNECTED
-                self.config_manager.update_server_config(server_config.server_id, server_config)
-                logger.info(f"💾 [SESSION_PERSISTENCE: HTTP] Saved session ID to config for {server_config.name}: {server_config.session_id}")
-            else:
-                logger.warning(f"No config manager or server_id available for {server_config.name}")
+            # Update the server config status to CONNECTED (a narrow write, deferred if it already was)
+            if record_status:
+                if self.config_manager and server_config.server_id:
+                    self.config_manager.update_server_status(server_config.server_id, MCPConnectionStatus.CONNECTED)
+                else:
+                    logger.warning(f"No config manager or server_id available for {server_config.name}")
             return MCPConnectionStatus.CONNECTED
         except Exception as e:
             logger.error(f"Failed to ping server: {e}")
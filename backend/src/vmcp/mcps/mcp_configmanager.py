@@ -9,8 +9,10 @@ from typing import Any, Dict, List, Optional
 
 from mcp.types import Prompt, Resource, ResourceTemplate, Tool
 
-from vmcp.mcps.models import AuthenticationError, MCPConnectionStatus, MCPServerConfig
+from vmcp.mcps.models import STATUS_FIELDS, AuthenticationError, MCPConnectionStatus, MCPServerConfig
 from vmcp.storage.base import StorageBase
+from vmcp.storage.cache_bus import get_cache_bus
+from vmcp.storage.write_behind import get_write_behind
 from vmcp.utilities.tracing import trace_method
 
 # Setup centralized logging for config module with span correlation
@@ -18,18 +20,36 @@ from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging("1xN_MCP_CONFIG")
 
+# Cache bus topic keyed by server_id, published when a server's connection,
+# credentials or capabilities change so caches of its results are dropped
+SERVER_CACHE_TOPIC = "mcp_server"
+
+# Fields whose change makes previously fetched upstream results stale
+_CACHE_RELEVANT_FIELDS = frozenset({
+    "url", "headers", "auth", "command", "args", "env", "transport_type",
+    "tools", "tool_details", "resources", "resource_details",
+    "resource_templates", "resource_template_details", "prompts", "prompt_details",
+})
+
 class MCPConfigManager:
-    """Manages MCP server configurations"""
+    """
+    Manages MCP server configurations
+
+    Servers are loaded lazily: get_server() fetches a single row on first use,
+    and the full set is only read for operations that need every server
+    (list_servers, lookups by name). Capability details stay raw JSON inside
+    MCPServerConfig until they are accessed.
+    """
 
     def __init__(self, user_id: str):
         self._servers: Dict[str, MCPServerConfig] = {}
+        self._all_loaded = False
         try:
             self.user_id = int(user_id)
         except ValueError:
             logger.error(f"user_id '{user_id}' is not convertible to int, cannot initialize StorageBase.")
             raise
         self.storage = StorageBase(self.user_id)
-        self.load_mcp_servers()
 
         # OSS - no analytics tracking
 
@@ -37,9 +57,13 @@ class MCPConfigManager:
     def load_mcp_servers(self) -> None:
         servers_data = self.storage.get_mcp_servers()
         logger.debug(f"Loaded {len(servers_data)} MCP servers {servers_data.keys()}")
-        # Convert dictionaries back to MCPServerConfig objects
-        self._servers = {}
+        # Convert dictionaries back to MCPServerConfig objects, keeping servers
+        # that were already loaded individually
+        loaded, self._servers = self._servers, {}
         for id_, server_data in servers_data.items():
+            if id_ in loaded:
+                self._servers[id_] = loaded[id_]
+                continue
             try:
                 # logger.info(f"Loading server config for {id_}: {server_data}")
                 self._servers[id_] = MCPServerConfig.from_dict(server_data)
@@ -48,12 +72,52 @@ class MCPConfigManager:
                 logger.error(f"❌ Traceback: {traceback.format_exc()}")
                 logger.warning(f"⚠️  Failed to load server config for {id_}: {e}")
                 continue
+        self._all_loaded = True
         logger.debug(f"Loaded {len(self._servers)} MCP servers {self._servers.keys()}")
+
+    def _ensure_all_loaded(self) -> None:
+        if not self._all_loaded:
+            self.load_mcp_servers()
+
+    def _load_server(self, id_: str) -> Optional[MCPServerConfig]:
+        """Load a single server config from storage into the cache"""
+        server_data = self.storage.get_mcp_server_config(id_)
+        if not server_data:
+            return None
+        try:
+            config = MCPServerConfig.from_dict(server_data)
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to load server config for {id_}: {e}")
+            return None
+        self._servers[id_] = config
+        return config
     
     def save_mcp_servers(self):
-        # Convert MCPServerConfig objects to dictionaries for JSON serialization
-        # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
-        return self.storage.save_mcp_servers([x.to_dict() for x in list(self._servers.values())])
+        """Persist every loaded server that has unsaved changes"""
+        return self._persist(list(self._servers.values()))
+
+    def _persist(self, servers: List[MCPServerConfig], full: bool = False) -> bool:
+        """
+        Write changed servers in one transaction.
+
+        Servers whose only changes are status fields get a narrow UPDATE of the
+        status columns; any other change (or full=True) rewrites the config JSON.
+        Servers without changes are skipped.
+        """
+        configs = []
+        status_updates = []
+        for server in servers:
+            dirty = server.dirty_fields
+            if full or not dirty <= STATUS_FIELDS:
+                configs.append(server.to_dict())
+            elif dirty:
+                status_updates.append(server.status_columns())
+
+        success = self.storage.save_mcp_server_changes(configs, status_updates)
+        if success:
+            for server in servers:
+                server.mark_clean()
+        return success
 
     @trace_method("[MCPConfigManager]: Add Server")
     def add_server(self, config: MCPServerConfig) -> bool:
@@ -61,7 +125,7 @@ class MCPConfigManager:
         # # Convert MCPServerConfig objects to dictionaries for JSON serialization
         # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
         # logger.info(f"Saving servers to storage: {servers_dict}")
-        success = self.storage.save_mcp_servers([config.to_dict()])
+        success = self._persist([config], full=True)
 
         # Update AllServers_vMCP after adding server
         # if success:
@@ -80,11 +144,12 @@ class MCPConfigManager:
             return False
     
     def remove_server(self, id_: str) -> bool:
-        if id_ in self._servers:
+        if self.get_server(id_):
             del self._servers[id_]
             # Convert MCPServerConfig objects to dictionaries for JSON serialization
             # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
             success = self.storage.delete_mcp_server(id_)
+            get_cache_bus().publish(SERVER_CACHE_TOPIC, id_)
             
             # Update AllServers_vMCP after removing server
             # if success:
@@ -104,8 +169,9 @@ class MCPConfigManager:
         
         if vmcp_id not in server.vmcps_using_server:
             server.vmcps_using_server.append(vmcp_id)
+            server.mark_dirty('vmcps_using_server')
             # Save the updated server configuration
-            return self.storage.save_mcp_servers([server.to_dict()])
+            return self._persist([server])
         
         return True  # Already exists, no need to save
     
@@ -118,6 +184,7 @@ class MCPConfigManager:
         
         if vmcp_id in server.vmcps_using_server:
             server.vmcps_using_server.remove(vmcp_id)
+            server.mark_dirty('vmcps_using_server')
             
             # If no vMCPs are using this server, remove it entirely
             if len(server.vmcps_using_server) == 0:
@@ -125,16 +192,18 @@ class MCPConfigManager:
                 return self.remove_server(server_id)
             else:
                 # Save the updated server configuration
-                return self.storage.save_mcp_servers([server.to_dict()])
+                return self._persist([server])
         
         return True  # vMCP not in list, no need to save
     
     def get_servers_by_vmcp(self, vmcp_id: str) -> List[MCPServerConfig]:
         """Get all servers that are being used by a specific vMCP"""
+        self._ensure_all_loaded()
         return [server for server in self._servers.values() if vmcp_id in server.vmcps_using_server]
     
     def rename_server(self, old_id_: str, new_name: str) -> bool:
         """Rename a server while preserving its configuration and ID"""
+        self._ensure_all_loaded()
         if old_id_ not in self._servers:
             logger.warning(f"⚠️  Cannot rename unknown server: {old_id_}")
             return False
@@ -152,8 +221,7 @@ class MCPConfigManager:
         self._servers[new_name] = server_config
         
         # Save to storage
-        # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
-        success = self.storage.save_mcp_servers([x.to_dict() for x in list(self._servers.values())])
+        success = self._persist([server_config])
         
         if success:
             logger.info(f"✅ Successfully renamed server from '{old_id_}' to '{new_name}' (ID: {server_config.server_id})")
@@ -165,10 +233,13 @@ class MCPConfigManager:
     @trace_method("[MCPConfigManager]: Get Server")
     def get_server(self, id_: str) -> Optional[MCPServerConfig]:
         config = self._servers.get(id_)
+        if config is None and not self._all_loaded:
+            config = self._load_server(id_)
         return config
     
     def get_server_by_name(self, name: str) -> Optional[MCPServerConfig]:
         """Get a server configuration by its name"""
+        self._ensure_all_loaded()
         for server_config in self._servers.values():
             if server_config.name == name:
                 return server_config
@@ -178,12 +249,11 @@ class MCPConfigManager:
         """Get a server configuration by its unique ID"""
         if from_db:
             logger.info(f"   🔍 Getting server from db: {server_id}")
-            server_data = self.storage.get_mcp_server(server_id)
-            if server_data:
-                _config = MCPServerConfig.from_dict(server_data["mcp_server_config"])
-                self._servers[server_id] = _config
-                return _config
-            return None
+            return self._load_server(server_id)
+        server = self.get_server(server_id)
+        if server is not None and server.server_id == server_id:
+            return server
+        self._ensure_all_loaded()
         for server in self._servers.values():
             if server.server_id == server_id:
                 return server
@@ -191,13 +261,15 @@ class MCPConfigManager:
     
     def list_servers(self) -> List[MCPServerConfig]:
         """Return a list of all server configurations"""
+        self._ensure_all_loaded()
         return list(self._servers.values())
     
     def update_server_status(self, id_: str, status: MCPConnectionStatus, 
                            error: Optional[str] = None) -> bool:    
-        if id_ in self._servers:
+        if self.get_server(id_):
             old_status = self._servers[id_].status
-            self._servers[id_].status = status
+            if old_status != status:
+                self._servers[id_].status = status
             if error:
                 self._servers[id_].last_error = error
             if status == MCPConnectionStatus.CONNECTED:
@@ -206,32 +278,57 @@ class MCPConfigManager:
             
             # Log status changes
             if old_status != status:
+                get_cache_bus().publish(SERVER_CACHE_TOPIC, id_)
                 old_status_str = old_status.value if hasattr(old_status, 'value') else str(old_status)
                 new_status_str = status.value if hasattr(status, 'value') else str(status)
                 logger.info(f"📊 Status change for {id_}: {old_status_str} → {new_status_str}")
             
-            # Convert MCPServerConfig objects to dictionaries for JSON serialization
-            # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
-            return self.storage.save_mcp_servers([x.to_dict() for x in list(self._servers.values())])
+            server = self._servers[id_]
+            if old_status == status and not error and server.dirty_fields <= {'last_connected'}:
+                # Only the last_connected time moved: coalesce with other refreshes
+                if server.dirty_fields:
+                    get_write_behind().defer(
+                        ("mcp_status", self.user_id, id_),
+                        self.storage.save_mcp_server_changes, [], [server.status_columns()]
+                    )
+                    server.mark_clean()
+                return True
+
+            # Only the status columns change unless other fields were edited
+            return self._persist([server])
         else:
             logger.warning(f"⚠️  Cannot update status for unknown server: {id_}")
             return False
     
     def update_server_config(self, id_: str, config: MCPServerConfig) -> bool:
-        if id_ in self._servers:
+        if self.get_server(id_):
             logger.info(f"""
                            📊 Updating server config for {id_} {config.name}: 
                            Tools: {len(config.tools)}
                            Resources: {len(config.resources)}
                            Prompts: {len(config.prompts)}""")
             self._servers[id_] = config
-            # self.save_mcp_server_config()
-            # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
-            return self.storage.save_mcp_servers([config.to_dict()])
+            if config.dirty_fields & _CACHE_RELEVANT_FIELDS:
+                get_cache_bus().publish(SERVER_CACHE_TOPIC, id_)
+            return self._persist([config], full=True)
         else:
             logger.warning(f"⚠️  Cannot update config for unknown server: {id_}")
             return False
         
+    def defer_session_id(self, server_config: MCPServerConfig, session_id: Optional[str]) -> None:
+        """
+        Record a server's upstream session id, persisting it with the next batch of deferred writes.
+
+        Only the session_id key of the stored config is written, so the
+        deferred write cannot overwrite changes made in the meantime.
+        """
+        server_config.session_id = session_id
+        server_config.dirty_fields.discard('session_id')
+        get_write_behind().defer(
+            ("mcp_session", self.user_id, server_config.server_id),
+            self.storage.save_mcp_server_session, server_config.server_id, session_id
+        )
+
     def update_server_capabilities(self, id_: str, capabilities: Dict[str, Any],
                                  tools: Optional[List[str]] = None,
                                  tool_details: Optional[List[Tool]] = None,
@@ -241,8 +338,8 @@ class MCPConfigManager:
                                  resource_template_details: Optional[List[ResourceTemplate]] = None,
                                  prompts: Optional[List[str]] = None,
                                  prompt_details: Optional[List[Prompt]] = None) -> None:
-        if id_ in self._servers:
-            server = self._servers[id_]
+        server = self.get_server(id_)
+        if server:
             server.capabilities = capabilities
             server.tools = tools or []
             server.tool_details = tool_details or []
@@ -263,9 +360,8 @@ class MCPConfigManager:
             if prompts:
                 logger.info(f"   📝 Available prompts: {', '.join(prompts)}")
             
-            # Convert MCPServerConfig objects to dictionaries for JSON serialization
-            # servers_dict = {name: server.to_dict() for name, server in self._servers.items()}
-            self.storage.save_mcp_servers([x.to_dict() for x in list(self._servers.values())])
+            get_cache_bus().publish(SERVER_CACHE_TOPIC, id_)
+            self._persist([server])
         else:
             logger.warning(f"⚠️  Cannot update capabilities for unknown server: {id_}")
 
@@ -285,8 +381,9 @@ class MCPConfigManager:
             current_status = MCPConnectionStatus.UNKNOWN
         
         # Update stored status if it changed
-        if current_status != self._servers[server_id].status:
-            logger.info(f"   🔄 Updating {server_id} status: {self._servers[server_id].status.value} → {current_status.value}")
+        server = self.get_server(server_id)
+        if server and current_status != server.status:
+            logger.info(f"   🔄 Updating {server_id} status: {server.status.value} → {current_status.value}")
         self.update_server_status(server_id, current_status)
 
         return current_status
@@ -330,30 +427,36 @@ class MCPConfigManager:
         return capabilities
 
 
+    def _require_server(self, id_: str) -> MCPServerConfig:
+        server = self.get_server(id_)
+        if server is None:
+            raise KeyError(id_)
+        return server
+
     @trace_method("[MCPConfigManager]: List Tools")
     def tools_list(self, id_: str) -> List[Tool]:
-        return self._servers[id_].tool_details or []
+        return self._require_server(id_).tool_details or []
     
     @trace_method("[MCPConfigManager]: List Prompts")
     def prompts_list(self, id_: str) -> List[Prompt]:
-        return self._servers[id_].prompt_details or []
+        return self._require_server(id_).prompt_details or []
 
     @trace_method("[MCPConfigManager]: List Resources")
     def resources_list(self, id_: str) -> List[Resource]:
-        return self._servers[id_].resource_details or []
+        return self._require_server(id_).resource_details or []
 
     @trace_method("[MCPConfigManager]: List Resource Templates")
     def resource_templates_list(self, id_: str) -> List[ResourceTemplate]:
-        return self._servers[id_].resource_template_details or []
+        return self._require_server(id_).resource_template_details or []
 
     @trace_method("[MCPConfigManager]: Tool Call")
     def tool_call(self, id_: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        return self._servers[id_].tool_call(arguments)
+        return self._require_server(id_).tool_call(arguments)
 
     @trace_method("[MCPConfigManager]: Get Resource")
     def get_resource(self, id_: str, uri: str) -> Dict[str, Any]:
-        return self._servers[id_].get_resource(uri, connect_if_needed=True)
+        return self._require_server(id_).get_resource(uri, connect_if_needed=True)
 
     @trace_method("[MCPConfigManager]: Get Prompt")
     def get_prompt(self, id_: str, prompt_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        return self._servers[id_].get_prompt(prompt_name, arguments, connect_if_needed=True)
\ No newline at end of file
+        return self._require_server(id_).get_prompt(prompt_name, arguments, connect_if_needed=True)
\ No newline at end of file
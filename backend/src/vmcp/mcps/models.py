@@ -6,7 +6,7 @@ the base shared models to provide type-safe API endpoints.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Set
 
 from mcp.types import Prompt, Resource, ResourceTemplate, Tool
 from pydantic import BaseModel, Field, validator
@@ -133,6 +133,9 @@ class MCPServerBase(ServerInfo):
 # MCP REQUEST MODELS
 # ============================================================================
 
+# Replica balancing policies (see load_balancer.py)
+BalancingPolicy = Literal["round_robin", "least_outstanding", "ewma"]
+
 class MCPInstallRequest(MCPBaseRequest):
     """Request model for installing an MCP server."""
     
@@ -161,6 +164,18 @@ class MCPInstallRequest(MCPBaseRequest):
     # Settings
     auto_connect: bool = Field(True, description="Auto-connect on startup")
     enabled: bool = Field(True, description="Server enabled")
+    max_in_flight: Optional[int] = Field(
+        None, ge=0, description="Concurrent calls allowed to this server (default VMCP_UPSTREAM_MAX_IN_FLIGHT, 0 = unlimited)"
+    )
+    endpoints: Optional[List[str]] = Field(
+        None, description="Replica URLs of the same server, balanced together with url"
+    )
+    balancing: Optional[BalancingPolicy] = Field(
+        None, description="Replica balancing: round_robin, least_outstanding or ewma (default VMCP_UPSTREAM_BALANCING)"
+    )
+    hedge: Optional[bool] = Field(
+        None, description="Hedge slow read-only tool calls on a second replica (default VMCP_UPSTREAM_HEDGE)"
+    )
     
     @validator('name')
     def validate_name(cls, v):
@@ -256,6 +271,18 @@ class MCPUpdateRequest(MCPBaseRequest):
     # Settings
     auto_connect: bool = Field(True, description="Auto-connect on startup")
     enabled: bool = Field(True, description="Server enabled")
+    max_in_flight: Optional[int] = Field(
+        None, ge=0, description="Concurrent calls allowed to this server (default VMCP_UPSTREAM_MAX_IN_FLIGHT, 0 = unlimited)"
+    )
+    endpoints: Optional[List[str]] = Field(
+        None, description="Replica URLs of the same server, balanced together with url"
+    )
+    balancing: Optional[BalancingPolicy] = Field(
+        None, description="Replica balancing: round_robin, least_outstanding or ewma (default VMCP_UPSTREAM_BALANCING)"
+    )
+    hedge: Optional[bool] = Field(
+        None, description="Hedge slow read-only tool calls on a second replica (default VMCP_UPSTREAM_HEDGE)"
+    )
     
     @validator('name')
     def validate_name(cls, v):
@@ -810,7 +837,51 @@ MCPAuthConfig = AuthConfig
 # Keep the old dataclass for backward compatibility (will be deprecated)
 import hashlib
 import json
-from dataclasses import asdict, dataclass, field
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+
+
+class _LazyCapabilityDetails:
+    """
+    Dataclass field descriptor for capability detail lists.
+
+    Values assigned from stored JSON stay raw dicts until the attribute is
+    first read; only then are they converted to the MCP pydantic model. Loading
+    a server config therefore costs no model validation for capabilities the
+    request never looks at.
+    """
+
+    def __init__(self, model: type):
+        self.model = model
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.raw_name = f"_{name}_raw"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # Dataclass default; __set__ turns it into a fresh list per instance
+            return ()
+        values = instance.__dict__
+        if self.raw_name in values:
+            values[self.name] = self._decode(values.pop(self.raw_name))
+        return values.get(self.name)
+
+    def __set__(self, instance, value):
+        instance.__dict__.pop(self.name, None)
+        instance.__dict__[self.raw_name] = list(value) if isinstance(value, tuple) else value
+
+    def _decode(self, raw: Optional[List[Any]]) -> Optional[List[Any]]:
+        if not raw or not any(isinstance(item, dict) for item in raw):
+            return raw
+        return [self.model(**item) if isinstance(item, dict) else item for item in raw]
+
+    def is_decoded(self, instance) -> bool:
+        return self.raw_name not in instance.__dict__
+
+    def raw(self, instance) -> Optional[List[Any]]:
+        """Return the undecoded value (only meaningful while not decoded)."""
+        return instance.__dict__.get(self.raw_name)
 
 
 @dataclass
@@ -846,20 +917,55 @@ class MCPServerConfig:
     # Capabilities discovered from server
     capabilities: Optional[Dict[str, Any]] = field(default_factory=dict)
     tools: Optional[List[str]] = field(default_factory=list)
-    tool_details: Optional[List[Tool]] = field(default_factory=list)
+    tool_details: Optional[List[Tool]] = _LazyCapabilityDetails(Tool)
     resources: Optional[List[str]] = field(default_factory=list)
-    resource_details: Optional[List[Resource]] = field(default_factory=list)
+    resource_details: Optional[List[Resource]] = _LazyCapabilityDetails(Resource)
     resource_templates: Optional[List[str]] = field(default_factory=list)
-    resource_template_details: Optional[List[ResourceTemplate]] = field(default_factory=list)
+    resource_template_details: Optional[List[ResourceTemplate]] = _LazyCapabilityDetails(ResourceTemplate)
     prompts: Optional[List[str]] = field(default_factory=list)
-    prompt_details: Optional[List[Prompt]] = field(default_factory=list)
+    prompt_details: Optional[List[Prompt]] = _LazyCapabilityDetails(Prompt)
     
     # Auto-connect settings
     auto_connect: bool = True
     enabled: bool = True
+
+    # Concurrent calls allowed to this server (None: VMCP_UPSTREAM_MAX_IN_FLIGHT)
+    max_in_flight: Optional[int] = None
+
+    # Replicas of the server besides url, and how calls are spread over them
+    # (None: VMCP_UPSTREAM_BALANCING / VMCP_UPSTREAM_HEDGE); see load_balancer.py
+    endpoints: Optional[List[str]] = None
+    balancing: Optional[str] = None
+    hedge: Optional[bool] = None
     
     # vMCP usage tracking
     vmcps_using_server: List[str] = field(default_factory=list)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            self.__dict__.setdefault('_dirty_fields', set()).add(name)
+
+    @property
+    def dirty_fields(self) -> Set[str]:
+        """Fields assigned since the config was loaded or last persisted."""
+        return self.__dict__.get('_dirty_fields', set())
+
+    def mark_dirty(self, *names: str) -> None:
+        """Flag fields changed in place (e.g. list appends) that __setattr__ cannot see."""
+        self.__dict__.setdefault('_dirty_fields', set()).update(names)
+
+    def mark_clean(self) -> None:
+        self.__dict__['_dirty_fields'] = set()
+
+    def status_columns(self) -> Dict[str, Any]:
+        """Values for the narrow status columns of the mcp_servers row."""
+        return {
+            "server_id": self.server_id,
+            "status": self.status.value if self.status else 'unknown',
+            "last_error": self.last_error,
+            "last_connected": self.last_connected,
+        }
     
     def to_mcp_registry_config(self) -> 'MCPRegistryConfig':
         """Convert to MCPRegistryConfig for registry operations."""
@@ -905,7 +1011,17 @@ class MCPServerConfig:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
+        # Like asdict(), but capability details are serialized below without
+        # decoding raw JSON entries just to re-encode them
+        data = {}
+        for f in fields(self):
+            lazy = _CAPABILITY_DETAIL_FIELDS.get(f.name)
+            if lazy is not None:
+                details = getattr(self, f.name) if lazy.is_decoded(self) else lazy.raw(self)
+                data[f.name] = list(details) if details is not None else None
+                continue
+            value = getattr(self, f.name)
+            data[f.name] = asdict(value) if is_dataclass(value) else deepcopy(value)
         data['transport_type'] = self.transport_type.value
         data['status'] = self.status.value if self.status else 'unknown'
         
@@ -917,7 +1033,6 @@ class MCPServerConfig:
         
         # Handle auth serialization (could be dataclass, Pydantic model, or dict)
         if self.auth:
-            from dataclasses import is_dataclass
             from pydantic import BaseModel
             
             if is_dataclass(self.auth):
@@ -935,47 +1050,16 @@ class MCPServerConfig:
                 # Unknown type, try to convert to dict
                 data['auth'] = dict(self.auth) if hasattr(self.auth, '__dict__') else self.auth
 
-        # Convert Pydantic models (Tool, Prompt, Resource, ResourceTemplate) to dicts
+        # Convert Pydantic models (Tool, Prompt, Resource, ResourceTemplate) to dicts;
+        # mode='json' turns AnyUrl and other non-JSON values into strings natively
         from pydantic import BaseModel
 
-        def serialize_pydantic(obj):
-            """Serialize Pydantic model to dict, converting AnyUrl to string"""
-            if isinstance(obj, BaseModel):
-                # Use mode='python' to get Python objects, then convert AnyUrl to str
-                result = obj.model_dump(mode='python')
-                # Recursively convert any AnyUrl objects to strings
-                return convert_anyurl_to_str(result)
-            return obj
-        
-        def convert_anyurl_to_str(obj):
-            """Recursively convert AnyUrl objects to strings in nested structures"""
-            if hasattr(obj, '__class__') and obj.__class__.__name__ == 'AnyUrl':
-                return str(obj)
-            elif isinstance(obj, dict):
-                return {k: convert_anyurl_to_str(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_anyurl_to_str(item) for item in obj]
-            return obj
-        
-        if self.tool_details:
-            data['tool_details'] = [
-                serialize_pydantic(tool) for tool in self.tool_details
-            ]
-        
-        if self.prompt_details:
-            data['prompt_details'] = [
-                serialize_pydantic(prompt) for prompt in self.prompt_details
-            ]
-        
-        if self.resource_details:
-            data['resource_details'] = [
-                serialize_pydantic(resource) for resource in self.resource_details
-            ]
-        
-        if self.resource_template_details:
-            data['resource_template_details'] = [
-                serialize_pydantic(template) for template in self.resource_template_details
-            ]
+        for name in _CAPABILITY_DETAIL_FIELDS:
+            if data.get(name):
+                data[name] = [
+                    item.model_dump(mode='json') if isinstance(item, BaseModel) else deepcopy(item)
+                    for item in data[name]
+                ]
         
         return data
     
@@ -988,9 +1072,12 @@ class MCPServerConfig:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MCPServerConfig':
-        """Create from dictionary (JSON deserialization)."""
-        from mcp.types import Tool, Resource, ResourceTemplate, Prompt
-        
+        """
+        Create from dictionary (JSON deserialization).
+
+        Capability details (tool_details, prompt_details, ...) are kept as raw
+        dicts and converted to pydantic models on first access.
+        """
         data['transport_type'] = MCPTransportType(data['transport_type'])
         data['status'] = MCPConnectionStatus(data['status'])
         
@@ -1003,31 +1090,6 @@ class MCPServerConfig:
                 auth_data['expires_at'] = datetime.fromisoformat(auth_data['expires_at'])
             data['auth'] = MCPAuthConfig(**auth_data)
         
-        # Convert dictionaries back to Pydantic models for tool_details, prompt_details, etc.
-        if data.get('tool_details'):
-            data['tool_details'] = [
-                Tool(**tool) if isinstance(tool, dict) else tool
-                for tool in data['tool_details']
-            ]
-        
-        if data.get('prompt_details'):
-            data['prompt_details'] = [
-                Prompt(**prompt) if isinstance(prompt, dict) else prompt
-                for prompt in data['prompt_details']
-            ]
-        
-        if data.get('resource_details'):
-            data['resource_details'] = [
-                Resource(**resource) if isinstance(resource, dict) else resource
-                for resource in data['resource_details']
-            ]
-        
-        if data.get('resource_template_details'):
-            data['resource_template_details'] = [
-                ResourceTemplate(**template) if isinstance(template, dict) else template
-                for template in data['resource_template_details']
-            ]
-        
         list_fields = [
             'args', 'tools', 'resources', 
             'resource_templates', 'prompts',
@@ -1042,7 +1104,18 @@ class MCPServerConfig:
             if data.get(field) is None:
                 data[field] = {}
         
-        return cls(**data)
+        config = cls(**data)
+        config.mark_clean()
+        return config
+
+
+# Fields persisted in narrow mcp_servers columns instead of rewriting the config JSON
+STATUS_FIELDS = frozenset({'status', 'last_error', 'last_connected'})
+
+_CAPABILITY_DETAIL_FIELDS: Dict[str, _LazyCapabilityDetails] = {
+    name: MCPServerConfig.__dict__[name]
+    for name in ('tool_details', 'resource_details', 'resource_template_details', 'prompt_details')
+}
 
 @dataclass
 class MCPRegistryConfig:
@@ -1176,6 +1249,17 @@ class MCPOperationError(Exception):
     """Raised when operations fail"""
     pass
 
+class CircuitOpenError(MCPOperationError):
+    """Raised without contacting a server whose circuit breaker is open"""
+    pass
+
+class ServerBusyError(MCPOperationError):
+    """Raised when a server's concurrency limit and admission queue are full"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 class InvalidSessionIdError(Exception):
     """Raised when session id is invalid"""
     pass
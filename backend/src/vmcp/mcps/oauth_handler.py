@@ -158,6 +158,9 @@ async def oauth_callback_page(code: str, state: str):
                     # Save the updated config
                     config_manager.update_server_config(server_name, server_config)
                     logger.info(f"💾 Saved updated config for {server_name}")
+                    # The monitored status predates the new tokens
+                    from vmcp.mcps.health_monitor import get_health_monitor
+                    get_health_monitor().forget(config_manager.user_id, server_config.server_id)
                     
                     # Try to connect to the server now that we have tokens
                     try:
@@ -0,0 +1,212 @@
+"""
+Upstream session prewarming for agent sessions.
+
+Without prewarming, the first tool call an agent makes to each of a vMCP's
+servers pays for the connect and MCP handshake. When an agent opens a session on a
+vMCP, the servers in its ``selected_servers`` can be warmed in the
+background instead. When this happens depends on the vMCP's ``prewarm``
+policy (``vmcp_config.prewarm``, default ``VMCP_UPSTREAM_PREWARM``):
+
+- none: no prewarming.
+- lazy: on the agent's first ``tools/list``, which clients send before
+  calling tools. Sessions that only initialize (inspectors, liveness checks)
+  cost nothing.
+- eager: on ``initialize``.
+
+Warming a server is a health monitor check (see health_monitor). It pings
+the server, which opens an upstream session if the user has none or
+validates the stored one, and records the server's status. The server is
+then watched, so background probes keep the session alive. The new session
+ids are written to storage once the prewarm ends, rather than deferred, so
+that the first tool call finds them, even in another worker.
+
+Which servers are warmed:
+
+- Only streamable HTTP servers. SSE and stdio connections are opened per
+  call and cannot be kept ready.
+- Disabled servers are skipped, as are disconnected servers and servers
+  waiting for authorization.
+- A server is skipped if the monitor already sees it connected: its
+  background probes keep the session alive.
+
+Limits: at most ``VMCP_UPSTREAM_PREWARM_CONCURRENCY`` pings run at a time
+across all vMCPs, and a vMCP is warmed once at a time per user. After a
+prewarm (or a check that found nothing to do), further agent sessions on the
+vMCP start none for ``VMCP_UPSTREAM_PREWARM_TTL`` seconds, or until one of
+the user's vMCPs is saved: the monitor keeps warmed sessions alive
+meanwhile, and ``tools/list`` stays free of config loads. Prewarms run as background tasks, with their storage reads on worker
+threads, so they never delay the agent's request or block the event loop.
+They are cancelled on shutdown. State is kept in this process.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.mcps.health_monitor import get_health_monitor
+from vmcp.mcps.mcp_configmanager import MCPConfigManager
+from vmcp.mcps.models import MCPConnectionStatus, MCPTransportType
+from vmcp.storage.base import VMCP_CACHE_TOPIC, StorageBase
+from vmcp.storage.cache_bus import ALL_KEYS, get_cache_bus
+from vmcp.storage.db_writer import get_db_writer
+from vmcp.storage.write_behind import get_write_behind
+from vmcp.utilities.logging import setup_logging
+from vmcp.vmcps.vmcp_config_manger import VMCPConfigManager
+
+logger = setup_logging("PREWARM")
+
+NONE = "none"
+LAZY = "lazy"
+EAGER = "eager"
+
+# Statuses the user (or the server) must change before a ping can succeed
+_NOT_WARMABLE = (MCPConnectionStatus.DISCONNECTED, MCPConnectionStatus.AUTH_REQUIRED)
+
+
+class Prewarmer:
+    """Background prewarms of vMCP upstream sessions."""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[int, str, str], "asyncio.Task[None]"] = {}
+        # (user, vMCP, policy) -> monotonic time until which start() does nothing
+        self._recent: Dict[Tuple[int, str, str], float] = {}
+        # Saves are dispatched on the cache bus thread
+        self._recent_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(max(1, settings.upstream_prewarm_concurrency))
+        self._counts = {"started": 0, "recent": 0, "warmed": 0, "already_warm": 0, "failed": 0, "cancelled": 0}
+        get_cache_bus().subscribe(VMCP_CACHE_TOPIC, self._on_vmcp_changed)
+
+    def start(self, user_id: Any, vmcp_name: Optional[str], policy: str) -> None:
+        """
+        Warm a vMCP's upstream sessions in the background if its prewarm policy is policy.
+
+        Args:
+            user_id: User the agent session belongs to
+            vmcp_name: vMCP name from the request path
+            policy: The policy triggered by the request (LAZY or EAGER)
+        """
+        if not vmcp_name or vmcp_name in ("vmcp", "unknown"):
+            return
+        try:
+            key = (int(user_id), vmcp_name, policy)
+        except (TypeError, ValueError):
+            return
+        if key in self._tasks:
+            return
+        with self._recent_lock:
+            recent = self._recent.get(key, 0.0) > time.monotonic()
+        if recent:
+            self._counts["recent"] += 1
+            return
+        task = asyncio.ensure_future(self._prewarm(key))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    async def _prewarm(self, key: Tuple[int, str, str]) -> None:
+        user_id, vmcp_name, policy = key
+        try:
+            loaded = await asyncio.to_thread(self._load, user_id, vmcp_name, policy)
+            self._remember(key)
+            if loaded is None:
+                return
+            config_manager, server_ids = loaded
+            server_ids = self._servers_to_warm(config_manager, server_ids)
+            if not server_ids:
+                return
+            self._counts["started"] += 1
+            logger.debug(f"Prewarming {len(server_ids)} upstream sessions of vMCP {vmcp_name} ({policy})")
+            await asyncio.gather(*(self._warm(config_manager, server_id) for server_id in server_ids))
+            # Make the new session ids visible to the agent's next request now
+            session_keys = [("mcp_session", config_manager.user_id, server_id) for server_id in server_ids]
+            await get_db_writer().run(get_write_behind().flush_keys, session_keys)
+        except asyncio.CancelledError:
+            self._counts["cancelled"] += 1
+            raise
+        except Exception as e:
+            logger.error(f"Prewarm of vMCP {vmcp_name} failed: {e}")
+
+    def _remember(self, key: Tuple[int, str, str]) -> None:
+        now = time.monotonic()
+        with self._recent_lock:
+            self._recent = {k: until for k, until in self._recent.items() if until > now}
+            self._recent[key] = now + settings.upstream_prewarm_ttl
+
+    def _on_vmcp_changed(self, key: str) -> None:
+        # vMCPs are published by id, the recent prewarms are keyed by name
+        user_id = None if key == ALL_KEYS else key.partition(":")[0]
+        with self._recent_lock:
+            self._recent = {
+                k: until for k, until in self._recent.items() if user_id is not None and str(k[0]) != user_id
+            }
+
+    @staticmethod
+    def _load(user_id: int, vmcp_name: str, policy: str) -> Optional[Tuple[MCPConfigManager, List[str]]]:
+        """
+        Load a vMCP and its warmable servers (blocking; runs on a worker thread).
+
+        Returns:
+            The vMCP's config manager and the ids of its servers that can be
+            warmed, or None if the vMCP does not exist or has another policy
+        """
+        vmcp_id = StorageBase(user_id=user_id).find_vmcp_name(vmcp_name)
+        if not vmcp_id:
+            return None
+        vmcp_config_manager = VMCPConfigManager(user_id, vmcp_id)
+        vmcp_config = vmcp_config_manager.load_vmcp_config()
+        if not vmcp_config:
+            return None
+        config = vmcp_config.vmcp_config or {}
+        if (config.get("prewarm") or settings.upstream_prewarm) != policy:
+            return None
+
+        config_manager = vmcp_config_manager.mcp_config_manager
+        server_ids = []
+        for server in config.get("selected_servers") or []:
+            server_id = server.get("server_id")
+            server_config = config_manager.get_server(server_id) if server_id else None
+            if server_config is None or not server_config.enabled or \
+                    server_config.transport_type != MCPTransportType.HTTP or \
+                    server_config.status in _NOT_WARMABLE:
+                continue
+            server_ids.append(server_id)
+        return config_manager, server_ids
+
+    def _servers_to_warm(self, config_manager: MCPConfigManager, candidate_ids: List[str]) -> List[str]:
+        monitor = get_health_monitor()
+        server_ids = []
+        for server_id in candidate_ids:
+            health = monitor.cached(config_manager.user_id, server_id)
+            if health is not None and health.status == MCPConnectionStatus.CONNECTED:
+                self._counts["already_warm"] += 1
+                continue
+            server_ids.append(server_id)
+        return server_ids
+
+    async def _warm(self, config_manager: MCPConfigManager, server_id: str) -> None:
+        async with self._semaphore:
+            try:
+                health = await get_health_monitor().check(config_manager, server_id)
+            except Exception as e:
+                logger.debug(f"Prewarm of server {server_id} failed: {e}")
+                self._counts["failed"] += 1
+                return
+        self._counts["warmed" if health.status == MCPConnectionStatus.CONNECTED else "failed"] += 1
+
+    def stop(self) -> None:
+        """Cancel every running prewarm (on shutdown)."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Running prewarms, starts skipped as recent, and servers warmed, already warm or failing to warm."""
+        return {"running": len(self._tasks), **self._counts}
+
+
+_prewarmer = Prewarmer()
+
+
+def get_prewarmer() -> Prewarmer:
+    """Get the process-wide prewarmer."""
+    return _prewarmer
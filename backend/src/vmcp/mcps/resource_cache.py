@@ -0,0 +1,268 @@
+"""
+Cross-request cache of upstream resource contents.
+
+``resources/read`` results are cached per (auth scope, server, URI), so every
+vMCP that exposes a server's resource (and every ``@resource`` directive
+rendered in a prompt) shares one copy. Identical contents read under several
+auth scopes are stored once (``ResultCache(dedupe=True)``).
+
+Freshness:
+- For servers that advertise ``resources.subscribe``, a watcher keeps one
+  upstream session per (server, auth scope) open, subscribes to every URI
+  read through the cache and drops an entry when the server sends
+  ``notifications/resources/updated`` for it (``list_changed`` drops all of
+  the server's entries). Subscribed entries live for
+  ``VMCP_RESOURCE_CACHE_SUBSCRIBED_TTL`` seconds as a safety net.
+- Other resources expire after ``VMCP_RESOURCE_CACHE_TTL`` seconds.
+
+When a watcher's session fails (detected by a periodic ping) the entries it
+was keeping fresh are dropped and a new watcher is started by a later read
+after a back-off. Entries and watchers for a server are dropped when its
+connection, credentials or capabilities change (SERVER_CACHE_TOPIC on the
+cache bus). Errors and OAuth prompts are never cached.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from mcp.types import (
+    ReadResourceResult,
+    ResourceListChangedNotification,
+    ResourceUpdatedNotification,
+    ServerNotification,
+)
+from pydantic import AnyUrl
+
+from vmcp.config import settings
+from vmcp.mcps.mcp_configmanager import SERVER_CACHE_TOPIC
+from vmcp.mcps.single_flight import auth_identity
+from vmcp.storage.cache_bus import ALL_KEYS, get_cache_bus
+from vmcp.storage.result_cache import ResultCache
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("RESOURCE_CACHE")
+
+# Placeholder content returned by mcp_operation when a server needs OAuth
+_AUTH_ERROR_URI = "https://1xn.ai/auth-error"
+
+# Seconds between pings on an idle watcher session (detects lost sessions)
+_PING_INTERVAL = 30.0
+# Seconds before a failed watcher may be restarted
+_RETRY_DELAY = 30.0
+# Subscriptions held by one watcher
+_MAX_SUBSCRIPTIONS = 1000
+
+_cache = ResultCache("resource_content", settings.resource_cache_memory_size, dedupe=True)
+
+# (server_id, scope) -> running watcher
+_watchers: Dict[Tuple[str, str], "ResourceWatcher"] = {}
+# (server_id, scope) -> monotonic time before which no watcher is started
+_retry_after: Dict[Tuple[str, str], float] = {}
+# (server_id, scope) pairs whose server does not support subscriptions
+_unsupported: Set[Tuple[str, str]] = set()
+# Guards the three above: server changes arrive on the cache bus thread
+_state_lock = threading.Lock()
+
+
+def _key(scope: str, server_id: str, uri: str) -> str:
+    return "\x1f".join((scope, server_id, uri))
+
+
+def _drop(server_id: str, scope: Optional[str] = None) -> int:
+    def matches(key: str) -> bool:
+        key_scope, key_server, _ = key.split("\x1f", 2)
+        return key_server == server_id and (scope is None or key_scope == scope)
+    return _cache.invalidate_where(matches)
+
+
+class ResourceWatcher:
+    """Holds an upstream session that invalidates cached resources on update notifications."""
+
+    def __init__(self, client_class: Any, config_manager: Any, server_config: Any, scope: str):
+        self.server_id = server_config.server_id or server_config.name
+        self.server_name = server_config.name
+        self.scope = scope
+        self.subscribed: Set[str] = set()
+        # Bumped on every invalidation, so reads that raced one are not cached
+        self.generation = 0
+        self._wanted: Set[str] = set()
+        self._pending: "asyncio.Queue[str]" = asyncio.Queue()
+        self._client = client_class(config_manager, message_handler=self.handle_message)
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+
+    def watch(self, uri: str) -> bool:
+        """Ask for updates to uri; True if the server is already subscribed to it."""
+        if uri in self.subscribed:
+            return True
+        if uri not in self._wanted and len(self._wanted) < _MAX_SUBSCRIPTIONS:
+            self._wanted.add(uri)
+            self._pending.put_nowait(uri)
+        return False
+
+    def stop(self) -> None:
+        """Cancel the watcher (safe to call from any thread)."""
+        self._stopping = True
+        try:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    async def serve(self, session: Any) -> None:
+        """Subscribe to requested URIs on session until it fails (run inside mcp_operation)."""
+        capabilities = session.get_server_capabilities()
+        if not (capabilities and capabilities.resources and capabilities.resources.subscribe):
+            with _state_lock:
+                _unsupported.add((self.server_id, self.scope))
+            logger.debug("Server %s does not support resource subscriptions", self.server_name)
+            return
+        logger.debug("Watching resources on server %s", self.server_name)
+        while True:
+            try:
+                uri = await asyncio.wait_for(self._pending.get(), timeout=_PING_INTERVAL)
+            except asyncio.TimeoutError:
+                await session.send_ping()
+                continue
+            await session.subscribe_resource(AnyUrl(uri))
+            self.subscribed.add(uri)
+
+    async def handle_message(self, message: Any) -> None:
+        """ClientSession message handler: invalidate on resource notifications."""
+        if not isinstance(message, ServerNotification):
+            return
+        notification = message.root
+        if isinstance(notification, ResourceUpdatedNotification):
+            self.generation += 1
+            _cache.invalidate(_key(self.scope, self.server_id, str(notification.params.uri)))
+            logger.debug("Resource %s updated on server %s", notification.params.uri, self.server_name)
+        elif isinstance(notification, ResourceListChangedNotification):
+            self.generation += 1
+            _drop(self.server_id, self.scope)
+
+    async def _run(self) -> None:
+        try:
+            await self._client.watch_resources(self.server_name, self, fresh_session=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("Resource watcher for server %s stopped: %s", self.server_name, e)
+        finally:
+            watcher_key = (self.server_id, self.scope)
+            with _state_lock:
+                # mcp_operation returns None for most failures, so any end counts
+                if not self._stopping:
+                    _retry_after[watcher_key] = time.monotonic() + _RETRY_DELAY
+                if _watchers.get(watcher_key) is self:
+                    del _watchers[watcher_key]
+            if self.subscribed:
+                # Nothing keeps these entries fresh any more
+                self.generation += 1
+                self.subscribed.clear()
+                _drop(self.server_id, self.scope)
+
+
+def _watcher_for(client: Any, server_config: Any, scope: str) -> Optional[ResourceWatcher]:
+    if not settings.resource_cache_subscribe:
+        return None
+    watcher_key = (server_config.server_id or server_config.name, scope)
+    with _state_lock:
+        watcher = _watchers.get(watcher_key)
+        if watcher is not None or watcher_key in _unsupported:
+            return watcher
+        if len(_watchers) >= settings.resource_cache_max_watchers:
+            return None
+        if _retry_after.get(watcher_key, 0) > time.monotonic():
+            return None
+        _retry_after.pop(watcher_key, None)
+        watcher = ResourceWatcher(type(client), client.config_manager, server_config, scope)
+        _watchers[watcher_key] = watcher
+    return watcher
+
+
+def _on_server_changed(server_id: str) -> None:
+    # Runs on the cache bus thread for events from other workers
+    if server_id == ALL_KEYS:
+        _cache.clear()
+        with _state_lock:
+            stopping = list(_watchers.values())
+            _unsupported.clear()
+            _retry_after.clear()
+    else:
+        dropped = _drop(server_id)
+        if dropped:
+            logger.debug("Dropped %d cached resources for server %s", dropped, server_id)
+        with _state_lock:
+            stopping = [watcher for (watched, _), watcher in _watchers.items() if watched == server_id]
+            _unsupported.difference_update([k for k in _unsupported if k[0] == server_id])
+            for watcher_key in [k for k in _retry_after if k[0] == server_id]:
+                del _retry_after[watcher_key]
+    for watcher in stopping:
+        watcher.stop()
+
+
+get_cache_bus().subscribe(SERVER_CACHE_TOPIC, _on_server_changed)
+
+
+def get_resource_cache() -> ResultCache:
+    """Get the process-wide resource content cache."""
+    return _cache
+
+
+def stop_resource_watchers() -> None:
+    """Stop every resource watcher (on shutdown)."""
+    with _state_lock:
+        stopping = list(_watchers.values())
+    for watcher in stopping:
+        watcher.stop()
+
+
+def _cacheable(result: Any) -> bool:
+    if not isinstance(result, ReadResourceResult):
+        return False
+    return not any(str(content.uri) == _AUTH_ERROR_URI for content in result.contents)
+
+
+def cached_resource_read(func):
+    """
+    Serve MCPClientManager.read_resource from the resource cache.
+
+    Apply outside @single_flight so that cache hits never reach it.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, server_name: str, resource_uri: str, *args, **kwargs):
+        if not settings.resource_cache or self.config_manager is None:
+            return await func(self, server_name, resource_uri, *args, **kwargs)
+        server_config = self.config_manager.get_server(server_name) or \
+            self.config_manager.get_server_by_name(server_name)
+        if server_config is None:
+            return await func(self, server_name, resource_uri, *args, **kwargs)
+
+        server_id = server_config.server_id or server_config.name
+        scope = auth_identity(server_config, getattr(self.config_manager, "user_id", None))
+        key = _key(scope, server_id, str(resource_uri))
+
+        entry = await _cache.aget(key)
+        if entry is not None:
+            try:
+                return ReadResourceResult.model_validate_json(entry.data)
+            except ValueError as e:
+                logger.warning(f"Dropping unreadable cached resource {resource_uri}: {e}")
+                _cache.invalidate(key)
+
+        watcher = _watcher_for(self, server_config, scope)
+        subscribed = watcher is not None and watcher.watch(str(resource_uri))
+        generation = watcher.generation if watcher is not None else 0
+
+        result = await func(self, server_name, resource_uri, *args, **kwargs)
+        if not _cacheable(result):
+            return result
+        if watcher is not None and watcher.generation != generation:
+            return result  # Updated (or watcher lost) while reading
+        ttl = settings.resource_cache_subscribed_ttl if subscribed else settings.resource_cache_ttl
+        _cache.put(key, result.model_dump_json(by_alias=True, exclude_none=True).encode(), ttl)
+        return result
+    return wrapper
@@ -9,9 +9,13 @@ import traceback
 from datetime import datetime
 from typing import Dict, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 
 # Import type-safe models
+from vmcp.mcps.admission import admission_stats
+from vmcp.mcps.circuit_breaker import upstream_health_snapshot
+from vmcp.mcps.health_monitor import get_health_monitor
+from vmcp.mcps.load_balancer import replica_group_stats
 from vmcp.mcps.mcp_client import AuthenticationError, MCPClientManager
 from vmcp.mcps.mcp_configmanager import MCPConfigManager
 from vmcp.mcps.models import (
@@ -51,7 +55,10 @@ from vmcp.mcps.models import (
     # Registry models
     RegistryServersResponse,
     RenameServerRequest,
+    ServerBusyError,
 )
+from vmcp.mcps.prewarm import get_prewarmer
+from vmcp.mcps.single_flight import get_single_flight
 from vmcp.shared.mcp_content_models import (
     MCPCapabilitiesStats,
     MCPConnectionInfo,
@@ -62,7 +69,10 @@ from vmcp.shared.mcp_content_models import (
     MCPToolsDiscovery,
 )
 from vmcp.shared.models import BaseResponse
+from vmcp.storage.base import StorageBase
 from vmcp.storage.dummy_user import UserContext, get_user_context
+from vmcp.storage.result_cache import result_cache_stats
+from vmcp.storage.write_behind import get_write_behind
 from vmcp.utilities.logging.config import setup_logging
 from vmcp.vmcps.vmcp_config_manger import VMCPConfigManager
 
@@ -96,6 +106,14 @@ def get_server_not_found_error_by_id(server_id: str, config_manager: MCPConfigMa
 
     return HTTPException(status_code=404, detail=error_detail)
 
+def get_server_busy_error(error: ServerBusyError) -> HTTPException:
+    """Helper function to turn a full admission queue into a 429 response"""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(int(error.retry_after))}
+    )
+
 router = APIRouter(prefix="/mcps", tags=["MCPs"])
 
 # ============================================================================
@@ -178,7 +196,11 @@ async def install_mcp_server(
         headers=request.headers,
         auth=auth_config,
         auto_connect=request.auto_connect,
-        enabled=request.enabled
+        enabled=request.enabled,
+        max_in_flight=request.max_in_flight,
+        endpoints=request.endpoints,
+        balancing=request.balancing,
+        hedge=request.hedge
     )
 
     # Generate server ID
@@ -391,7 +413,11 @@ async def update_mcp_server(
             headers=request.headers,
             auth=auth_config,
             auto_connect=request.auto_connect,
-            enabled=request.enabled
+            enabled=request.enabled,
+            max_in_flight=request.max_in_flight,
+            endpoints=request.endpoints,
+            balancing=request.balancing,
+            hedge=request.hedge
         )
 
         # Preserve the server ID and connection status
@@ -409,6 +435,8 @@ async def update_mcp_server(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update server configuration")
         logger.info(f"   ✅ Successfully updated server '{server_config.name}' '{server_config.server_id}'")
+        # The monitored status may not hold for the new settings
+        get_health_monitor().forget(user_context.user_id, server_config.server_id)
 
         # Create response with proper type-safe model
         server_info = MCPServerInfo(
@@ -472,6 +500,7 @@ async def uninstall_mcp_server(
     success = config_manager.remove_server(server_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to remove server configuration")
+    get_health_monitor().forget(user_context.user_id, server_id)
 
     return MCPUninstallResponse(
         success=True,
@@ -489,6 +518,7 @@ async def uninstall_mcp_server(
 @router.post("/{server_id}/connect", response_model=MCPConnectionResponse)
 async def connect_mcp_server_with_capabilities(
     server_id: str,
+    probe: bool = Query(False, description="Ping the server even if the health monitor reports it connected"),
     user_context: UserContext = Depends(get_user_context)
 ) -> MCPConnectionResponse:
     """Connect to an MCP server by pinging and discovering capabilities with type-safe response model."""
@@ -508,33 +538,16 @@ async def connect_mcp_server_with_capabilities(
         if not server_config.enabled:
             raise HTTPException(status_code=400, detail=f"Server '{server_id}' is disabled")
 
-        # Try to ping the server first
-        try:
-            current_status = await client_manager.ping_server(server_id)
-            logger.info(f"   🔍 Server {server_id}: ping result = {current_status.value if current_status else 'None'}")
-        except AuthenticationError as e:
-            logger.debug(f"   ❌ Authentication error for server {server_id}: {e}")
-            current_status = MCPConnectionStatus.AUTH_REQUIRED
-        except Exception as e:
-            logger.error(f"   ❌ Error pinging server {server_id}: {traceback.format_exc()}")
-            logger.error(f"   ❌ Error pinging server {server_id}: {e}")
-            current_status = MCPConnectionStatus.ERROR
-            config_manager.update_server_status(server_id, current_status, str(e))
-            return MCPConnectionResponse(
-                success=False,
-                message=f"Failed to connect to server '{server_id}'",
-                data=MCPConnectionInfo(
-                    server_id=server_id,
-                    server_name=server_config.name,
-                    status=current_status.value,
-                    error=str(e),
-                    requires_auth=False,
-                    auth_url=None
-                )
-            )
-
-        # Update server status
-        config_manager.update_server_status(server_id, current_status)
+        # A server the health monitor reports connected is not pinged again; otherwise
+        # try it now (an explicit connect probes even an open circuit)
+        monitor = get_health_monitor()
+        health = None if probe else monitor.cached(user_context.user_id, server_id)
+        if health is None or health.status != MCPConnectionStatus.CONNECTED:
+            health = await monitor.check(config_manager, server_id, explicit=True)
+        current_status = health.status
+        logger.info(f"   🔍 Server {server_id}: status = {current_status.value}")
+        if server_config.status != current_status:
+            config_manager.update_server_status(server_id, current_status, health.error)
 
         # If connected, discover capabilities
         if current_status == MCPConnectionStatus.CONNECTED:
@@ -620,7 +633,7 @@ async def connect_mcp_server_with_capabilities(
                     status=current_status.value,
                     requires_auth=False,
                     auth_url=None,
-                    error=None
+                    error=health.error
                 )
             )
 
@@ -656,6 +669,7 @@ async def disconnect_mcp_server(
 
         # Set status to disconnected
         config_manager.update_server_status(server_id, MCPConnectionStatus.DISCONNECTED)
+        get_health_monitor().forget(user_context.user_id, server_id)
 
         # Update vMCPs using server status
         vmcps_using_server = server_config.vmcps_using_server
@@ -728,50 +742,26 @@ async def ping_mcp_server(
 @router.get("/{server_id}/status", response_model=MCPStatusResponse)
 async def get_server_status(
     server_id: str,
+    probe: bool = Query(False, description="Ping the server now instead of returning the monitored status"),
     user_context: UserContext = Depends(get_user_context)
 ) -> MCPStatusResponse:
-    """Get real-time status for a specific server by pinging it with type-safe response model."""
+    """Get the status of a specific server from the health monitor (or a live ping) with type-safe response model."""
     logger.info(f"📋 Get server status endpoint called for: {server_id}")
     logger.info(f"   👤 User context: {user_context.user_id if user_context else 'None'}")
 
     try:
         # Get managers from global connection manager
         config_manager = MCPConfigManager(str(user_context.user_id))
-        client_manager = MCPClientManager(config_manager)
 
         # Check if server exists
         server_config = config_manager.get_server(server_id)
         if not server_config:
             raise get_server_not_found_error(server_id, config_manager)
 
-        # Ping the server to get current status
-        try:
-            current_status = await client_manager.ping_server(server_id)
-            logger.info(f"   🔍 Server {server_id}: ping result = {current_status.value}")
-        except AuthenticationError as e:
-            logger.debug(f"   ❌ Authentication error for server {server_id}: {e}")
-            current_status = MCPConnectionStatus.AUTH_REQUIRED
-        except Exception as e:
-            logger.error(f"   ❌ Error pinging server {server_id}: {e}")
-            current_status = MCPConnectionStatus.UNKNOWN
-
-        # Update stored status if it changed
-        if current_status != server_config.status:
-            logger.info(f"   🔄 Updating {server_id} status: {server_config.status.value} → {current_status.value}")
-            config_manager.update_server_status(server_id, current_status)
-
-        # Update vMCPs using server status
-        vmcps_using_server = server_config.vmcps_using_server
-        logger.info(f"   🔄 vMCPs using server {server_id}: {vmcps_using_server}")
-        if vmcps_using_server:
-            logger.info(f"   🔄 Updating vMCPs using {server_id} status: {current_status.value}")
-            vmcp_config_manager = VMCPConfigManager(str(user_context.user_id))
-            for vmcp_id in vmcps_using_server:
-                if vmcp_id.startswith('@'):
-                    continue
-                vmcp_config = vmcp_config_manager.load_vmcp_config(specific_vmcp_id=vmcp_id)
-                if vmcp_config:
-                    vmcp_config_manager.update_vmcp_server(vmcp_id, server_config)
+        # The health monitor stores status changes (and updates the vMCPs using the server)
+        health = await get_health_monitor().status(config_manager, server_id, probe=probe)
+        current_status = health.status
+        logger.info(f"   🔍 Server {server_id}: status = {current_status.value}")
 
         return MCPStatusResponse(
             success=True,
@@ -780,10 +770,12 @@ async def get_server_status(
                 server_id=server_id,
                 name=server_config.name,
                 status=current_status.value,
-                last_updated=datetime.now(),
+                last_updated=health.checked_at or datetime.now(),
                 last_connected=server_config.last_connected,
                 last_error=server_config.last_error,
-                requires_auth=current_status == MCPConnectionStatus.AUTH_REQUIRED
+                requires_auth=current_status == MCPConnectionStatus.AUTH_REQUIRED,
+                circuit=upstream_health_snapshot(server_config.server_id or server_config.name),
+                replicas=replica_group_stats(server_config.server_id or server_config.name)
             )
         )
     except HTTPException:
@@ -981,6 +973,8 @@ async def call_mcp_tool(
         )
     except HTTPException:
         raise
+    except ServerBusyError as e:
+        raise get_server_busy_error(e) from e
     except Exception as e:
         logger.error(f"   ❌ Error calling MCP tool: {e}")
         logger.error(f"   ❌ Exception type: {type(e).__name__}")
@@ -1033,6 +1027,8 @@ async def get_mcp_resource(
             message=f"Resource '{request.uri}' retrieved successfully",
             data=mcp_content
         )
+    except ServerBusyError as e:
+        raise get_server_busy_error(e) from e
     except Exception as e:
         logger.error(f"   ❌ Error getting MCP resource: {e}")
         logger.error(f"   ❌ Exception type: {type(e).__name__}")
@@ -1091,6 +1087,8 @@ async def get_mcp_prompt(
             message=f"Prompt '{request.prompt_name}' retrieved successfully",
             data=mcp_result
         )
+    except ServerBusyError as e:
+        raise get_server_busy_error(e) from e
     except Exception as e:
         logger.error(f"   ❌ Error getting MCP prompt: {e}")
         logger.error(f"   ❌ Exception type: {type(e).__name__}")
@@ -1314,13 +1312,52 @@ async def list_server_prompts(
 @router.get("/list", response_model=MCPListResponse)
 async def list_mcp_servers(
     user_context: UserContext = Depends(get_user_context),
-    background_tasks: BackgroundTasks = None
+    background_tasks: BackgroundTasks = None,
+    details: bool = Query(True, description="Include auth, transport settings and capability details")
 ) -> MCPListResponse:
-    """List all configured MCP servers without pinging (fast response) with type-safe response model."""
+    """List all configured MCP servers without pinging (fast response) with type-safe response model.
+
+    With ``details=false`` only names, statuses and capability names are
+    returned, read with a projected query that never decodes capability details.
+    """
     logger.info("📋 List servers endpoint called (fast mode)")
     logger.info(f"   👤 User context: {user_context.user_id if user_context else 'None'}")
 
     try:
+        if not details:
+            summaries = StorageBase(user_id=int(user_context.user_id)).get_mcp_server_summaries()
+            server_info = [
+                MCPServerInfo(
+                    id=summary["server_id"],
+                    name=summary["name"],
+                    description=summary["description"],
+                    status=summary["status"],
+                    transport_type=summary["transport_type"],  # type: ignore  # Validated from string
+                    url=summary["url"],
+                    enabled=summary["enabled"],
+                    last_connected=summary["last_connected"],
+                    last_error=summary["last_error"],
+                    tools=summary["tools"],
+                    resources=summary["resources"],
+                    resource_templates=summary["resource_templates"],
+                    prompts=summary["prompts"],
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+                for summary in summaries
+            ]
+            return MCPListResponse(
+                success=True,
+                message="Servers retrieved successfully",
+                data=server_info,
+                pagination={
+                    "page": 1,
+                    "limit": len(server_info),
+                    "total": len(server_info),
+                    "pages": 1
+                }
+            )
+
         # Get managers from global connection manager
         logger.info("   🔧 Getting managers from global connection manager...")
         config_manager = MCPConfigManager(str(user_context.user_id))
@@ -1420,10 +1457,8 @@ async def get_mcp_stats(
     logger.info(f"   👤 User context: {user_context.user_id if user_context else 'None'}")
 
     try:
-        # Get managers from global connection manager
-        config_manager = MCPConfigManager(str(user_context.user_id))
-
-        servers = config_manager.list_servers()
+        # Names, statuses and counts only - no need to build server configs
+        servers = StorageBase(user_id=int(user_context.user_id)).get_mcp_server_summaries()
 
         total_tools = 0
         total_resources = 0
@@ -1431,14 +1466,11 @@ async def get_mcp_stats(
         connected_count = 0
 
         for server in servers:
-            if server.status == MCPConnectionStatus.CONNECTED:
+            if server["status"] == MCPConnectionStatus.CONNECTED.value:
                 connected_count += 1
-                if server.tools:
-                    total_tools += len(server.tools)
-                if server.resources:
-                    total_resources += len(server.resources)
-                if server.prompts:
-                    total_prompts += len(server.prompts)
+                total_tools += len(server["tools"])
+                total_resources += len(server["resources"])
+                total_prompts += len(server["prompts"])
 
         logger.info(f"   ✅ Successfully retrieved stats: {len(servers)} servers, {connected_count} connected")
 
@@ -1449,15 +1481,21 @@ async def get_mcp_stats(
                 servers=MCPServerStats(
                     total=len(servers),
                     connected=connected_count,
-                    disconnected=len([s for s in servers if s.status == MCPConnectionStatus.DISCONNECTED]),
-                    auth_required=len([s for s in servers if s.status == MCPConnectionStatus.AUTH_REQUIRED]),
-                    errors=len([s for s in servers if s.status == MCPConnectionStatus.ERROR])
+                    disconnected=len([s for s in servers if s["status"] == MCPConnectionStatus.DISCONNECTED.value]),
+                    auth_required=len([s for s in servers if s["status"] == MCPConnectionStatus.AUTH_REQUIRED.value]),
+                    errors=len([s for s in servers if s["status"] == MCPConnectionStatus.ERROR.value])
                 ),
                 capabilities=MCPCapabilitiesStats(
                     tools=total_tools,
                     resources=total_resources,
                     prompts=total_prompts
-                )
+                ),
+                upstream_requests=get_single_flight().stats(),
+                result_caches=result_cache_stats(),
+                deferred_writes=get_write_behind().stats(),
+                admission=admission_stats(),
+                health_monitor=get_health_monitor().stats(),
+                prewarm=get_prewarmer().stats()
             )
         )
     except Exception as e:
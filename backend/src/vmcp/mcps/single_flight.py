@@ -0,0 +1,173 @@
+"""
+Single-flight coalescing of identical concurrent upstream MCP requests.
+
+When several agents attached to the same vMCP start at once they send the
+same ``tools/list``, ``resources/read`` or read-only ``tools/call`` requests.
+Without coalescing each one opens its own upstream connection. With it, the
+first caller runs the request and identical callers that arrive while it is
+in flight wait for the same result.
+
+Requests are identical when they share the server, the MCP method, the
+canonical JSON of their parameters and the auth identity (user, access
+token and configured headers), so one user's call never answers another's.
+
+Coalesced callers receive the same result object, so callers must not
+mutate results in place. Completed results are not reused: a request that
+arrives after the leader finished goes upstream again.
+
+Tool calls are only coalesced when settings.single_flight_tool_calls allows
+it ("read_only" by default: tools annotated with readOnlyHint). Tools can be
+opted out with settings.single_flight_exclude_tools.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("SINGLE_FLIGHT")
+
+
+class SingleFlight:
+    """Share one execution among concurrent calls with the same key."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        # method -> {"executed": n, "coalesced": n}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"executed": 0, "coalesced": 0})
+
+    async def do(self, key: Tuple[Any, ...], method: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run func once for all concurrent callers with the same key.
+
+        The upstream call runs in its own task, so a caller that is cancelled
+        does not cancel the request for the others.
+
+        Args:
+            key: Identity of the request
+            method: MCP method name, for metrics
+            func: Zero-argument coroutine function performing the request
+
+        Returns:
+            The shared result (or raises the shared exception)
+        """
+        loop = asyncio.get_running_loop()
+        full_key = (id(loop),) + key
+        task = self._inflight.get(full_key)
+        if task is not None:
+            self._stats[method]["coalesced"] += 1
+            logger.debug("Coalesced %s onto an in-flight request", method)
+            return await asyncio.shield(task)
+
+        self._stats[method]["executed"] += 1
+        task = loop.create_task(func())
+        self._inflight[full_key] = task
+        task.add_done_callback(functools.partial(self._finished, full_key))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Executed vs coalesced call counts per MCP method in this process."""
+        return {method: dict(counts) for method, counts in self._stats.items()}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group."""
+    return _single_flight
+
+
+def canonical_params(params: Any) -> str:
+    """Serialize request parameters so that equal parameters give equal strings."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+# Per-connection headers that do not change what the server returns
+_TRANSPORT_HEADERS = frozenset({"mcp-session-id", "mcp-protocol-version"})
+
+
+def auth_identity(server_config: Any, user_id: Any) -> str:
+    """Digest of everything that decides what the upstream server returns for a caller."""
+    token = server_config.auth.access_token if server_config.auth else None
+    headers = {
+        name: value for name, value in (server_config.headers or {}).items()
+        if name.lower() not in _TRANSPORT_HEADERS
+    }
+    material = canonical_params([user_id, token, headers])
+    return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+@functools.lru_cache(maxsize=8)
+def _excluded_tools(raw: str) -> frozenset:
+    """Parse VMCP_SINGLE_FLIGHT_EXCLUDE_TOOLS (cached per value, so changes apply on the next call)."""
+    return frozenset(name.strip() for name in raw.split(",") if name.strip())
+
+
+def tool_call_coalescable(server_config: Any, tool_name: str) -> bool:
+    """Whether concurrent identical calls to this tool may share one upstream call."""
+    mode = settings.single_flight_tool_calls
+    if mode == "off":
+        return False
+    excluded = _excluded_tools(settings.single_flight_exclude_tools)
+    if tool_name in excluded or f"{server_config.name}:{tool_name}" in excluded:
+        return False
+    if mode == "all":
+        return True
+    return is_read_only_tool(server_config, tool_name)
+
+
+def is_read_only_tool(server_config: Any, tool_name: str) -> bool:
+    """Whether the server annotates the tool with readOnlyHint."""
+    for tool in server_config.tool_details or ():
+        if tool.name == tool_name:
+            return bool(tool.annotations and tool.annotations.readOnlyHint)
+    return False
+
+
+def single_flight(method: str, params: Optional[Callable[..., Any]] = None):
+    """
+    Coalesce concurrent identical calls to an MCPClientManager operation.
+
+    Apply outside @mcp_operation so that coalesced callers never open a
+    connection.
+
+    Args:
+        method: MCP method name (e.g. "tools/list")
+        params: Maps the operation's arguments (after server_name) to the
+            request parameters; return None to bypass coalescing for the call
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, server_name: str, *args, **kwargs):
+            if not settings.single_flight or self.config_manager is None:
+                return await func(self, server_name, *args, **kwargs)
+            server_config = self.config_manager.get_server(server_name) or \
+                self.config_manager.get_server_by_name(server_name)
+            if server_config is None:
+                return await func(self, server_name, *args, **kwargs)
+
+            request_params = params(server_config, *args, **kwargs) if params else {}
+            if request_params is None:
+                return await func(self, server_name, *args, **kwargs)
+            key = (
+                server_config.server_id or server_config.name,
+                method,
+                canonical_params(request_params),
+                auth_identity(server_config, getattr(self.config_manager, "user_id", None)),
+            )
+            return await _single_flight.do(key, method, lambda: func(self, server_name, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,136 @@
+"""
+Result cache for upstream tool calls.
+
+Caching is opt-in per tool:
+- A ``cache_ttl`` (seconds) in the tool's entry in a vMCP's
+  ``selected_tool_overrides`` enables caching for that tool (0 disables it,
+  overriding annotations)
+- With ``VMCP_TOOL_CACHE=annotated`` tools annotated ``readOnlyHint`` or
+  ``idempotentHint`` are cached for ``VMCP_TOOL_CACHE_TTL`` seconds
+- ``VMCP_TOOL_CACHE=off`` disables the cache entirely
+
+Entries are keyed on the caller's auth scope (user, token and headers, see
+single_flight.auth_identity), the server, the tool and the canonical JSON of
+the arguments. Error results are never cached. Entries for a server are
+dropped when its connection, credentials or capabilities change
+(SERVER_CACHE_TOPIC on the cache bus).
+
+Cached and cacheable results report their status in
+``CallToolResult._meta["vmcp/cache"]``: ``{"status": "hit"|"miss", "age": s, "ttl": s}``.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mcp.types import CallToolResult
+
+from vmcp.config import settings
+from vmcp.mcps.mcp_configmanager import SERVER_CACHE_TOPIC
+from vmcp.mcps.single_flight import auth_identity, canonical_params
+from vmcp.storage.cache_bus import ALL_KEYS, get_cache_bus
+from vmcp.storage.result_cache import ResultCache
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("TOOL_RESULT_CACHE")
+
+CACHE_META_KEY = "vmcp/cache"
+
+_cache = ResultCache(
+    "tool_result",
+    settings.tool_cache_memory_size,
+    spill_dir=settings.tool_cache_spill_dir,
+    spill_max_bytes=settings.tool_cache_spill_size,
+)
+
+
+def _on_server_changed(server_id: str) -> None:
+    if server_id == ALL_KEYS:
+        _cache.clear()
+        return
+    dropped = _cache.invalidate_where(lambda key: key.split("\x1f", 2)[1] == server_id)
+    if dropped:
+        logger.debug("Dropped %d cached tool results for server %s", dropped, server_id)
+
+
+get_cache_bus().subscribe(SERVER_CACHE_TOPIC, _on_server_changed)
+
+
+def get_tool_result_cache() -> ResultCache:
+    """Get the process-wide tool result cache."""
+    return _cache
+
+
+def tool_cache_ttl(server_config: Any, tool_name: str, tool_override: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Seconds a tool's results may be cached, or 0 if the tool is not cacheable.
+
+    Args:
+        server_config: MCPServerConfig of the upstream server
+        tool_name: Original (unprefixed) tool name
+        tool_override: The tool's entry in the vMCP's selected_tool_overrides
+    """
+    if settings.tool_cache == "off":
+        return 0
+    if tool_override and tool_override.get("cache_ttl") is not None:
+        try:
+            return max(0.0, float(tool_override["cache_ttl"]))
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid cache_ttl for tool {tool_name}: {tool_override['cache_ttl']!r}")
+            return 0
+    if settings.tool_cache != "annotated":
+        return 0
+    for tool in server_config.tool_details or ():
+        if tool.name == tool_name:
+            annotations = tool.annotations
+            if annotations and (annotations.readOnlyHint or annotations.idempotentHint):
+                return settings.tool_cache_ttl
+            return 0
+    return 0
+
+
+def _with_cache_meta(result: CallToolResult, status: str, age: float, ttl: float) -> CallToolResult:
+    meta = dict(result.meta or {})
+    meta[CACHE_META_KEY] = {"status": status, "age": round(age, 3), "ttl": ttl}
+    # Copy: the result may be shared with coalesced callers
+    return result.model_copy(update={"meta": meta})
+
+
+async def call_tool_cached(
+    server_config: Any,
+    user_id: Any,
+    tool_name: str,
+    arguments: Optional[Dict[str, Any]],
+    ttl: float,
+    call: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Serve a tool call from the cache, or run it and cache a successful result.
+
+    Args:
+        server_config: MCPServerConfig of the upstream server
+        user_id: Calling user (part of the auth scope)
+        tool_name: Original (unprefixed) tool name
+        arguments: Tool arguments
+        ttl: Seconds to cache the result (from tool_cache_ttl)
+        call: Performs the upstream call
+    """
+    key = "\x1f".join((
+        auth_identity(server_config, user_id),
+        server_config.server_id or server_config.name,
+        tool_name,
+        canonical_params(arguments or {}),
+    ))
+
+    entry = await _cache.aget(key)
+    if entry is not None:
+        try:
+            result = CallToolResult.model_validate_json(entry.data)
+            return _with_cache_meta(result, "hit", entry.age, ttl)
+        except ValueError as e:
+            logger.warning(f"Dropping unreadable cached result for tool {tool_name}: {e}")
+            _cache.invalidate(key)
+
+    result = await call()
+    if not isinstance(result, CallToolResult) or result.isError:
+        return result
+    await _cache.aput(key, result.model_dump_json(by_alias=True, exclude_none=True).encode(), ttl)
+    return _with_cache_meta(result, "miss", 0.0, ttl)
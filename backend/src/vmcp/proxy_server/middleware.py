@@ -18,7 +18,7 @@ from starlette.requests import Request as StarletteRequest
 
 from vmcp.config import settings
 from vmcp.core.services import TokenInfo, get_jwt_service
-from vmcp.utilities.logging import get_logger
+from vmcp.utilities.logging import get_logger, lazy, redact_headers
 
 # Setup centralized logging for middleware
 logger = get_logger("vMCP Server Middleware")
@@ -175,6 +175,10 @@ async def handle_agent_initialize(request: Request, json_body: dict, bearer_toke
     request.state.agent_name = agent_name
     request.state.agent_user_id = int(user_id)
 
+    # Warm the vMCP's upstream sessions in the background (see mcps/prewarm.py)
+    from vmcp.mcps.prewarm import EAGER, get_prewarmer
+    get_prewarmer().start(user_id, request.headers.get("vmcp-name"), EAGER)
+
     # Handle agent management
     try:
         from vmcp.storage.base import StorageBase
@@ -235,10 +239,22 @@ async def handle_agent_initialize(request: Request, json_body: dict, bearer_toke
     logger.info("✅ MCP INITIALIZE REQUEST PROCESSED")
 
 
+def start_lazy_prewarm(request: Request, bearer_token: str) -> None:
+    """Warm the upstream sessions of a vMCP with the lazy prewarm policy on the agent's tools/list"""
+    try:
+        user_id = get_jwt_service().extract_token_info(bearer_token).get("user_id", "")
+    except (ValueError, KeyError):
+        return
+
+    from vmcp.mcps.prewarm import LAZY, get_prewarmer
+    get_prewarmer().start(user_id, request.headers.get("vmcp-name"), LAZY)
+
+
 async def log_mcp_call_for_agent(request: Request, json_body: dict, bearer_token: str) -> None:
     """Log MCP calls for agents (non-initialize requests)"""
     try:
         from vmcp.storage.base import StorageBase
+        from vmcp.storage.db_writer import get_db_writer
 
         # Extract mcp-session-id from request headers (REQUIRED)
         session_id = request.headers.get("mcp-session-id")
@@ -289,13 +305,48 @@ async def log_mcp_call_for_agent(request: Request, json_body: dict, bearer_token
             "user_agent": request.headers.get("user-agent", "unknown"),
         }
 
-        user_storage.save_agent_logs(agent_name, log_entry)  # type: ignore
+        # Queue the write so the request does not wait for it
+        get_db_writer().submit(user_storage.save_agent_logs, agent_name, log_entry)  # type: ignore
 
     except Exception as e:
         # Silently fail for logging - don't affect the main request
         logger.debug(f"Could not log MCP call for agent: {e}")
 
 
+def handle_stateless_session(request: Request) -> Optional[Response]:
+    """
+    Session handling for stateless MCP mode (multi-worker deployments).
+
+    Returns a response when the request is answered here: GET (no standalone
+    SSE stream without a worker-bound session), DELETE (session termination)
+    and requests carrying a session id that is unknown or belongs to another
+    user. Returns None to pass the request on to the MCP transport.
+    """
+    from vmcp.proxy_server.session_store import get_session_store
+
+    session_id = request.headers.get("mcp-session-id")
+    if request.method == "GET":
+        return Response(status_code=status.HTTP_405_METHOD_NOT_ALLOWED, headers={"Allow": "POST, DELETE"})
+
+    # Sessions belong to the user who initialized them
+    user_id = int(request.state.user_id)
+    if request.method == "DELETE":
+        if session_id:
+            if not get_session_store().delete(session_id, user_id):
+                return Response(status_code=status.HTTP_404_NOT_FOUND)
+            logger.info(f"🗑️ Terminated stateless MCP session {session_id[:8]}...")
+        return Response(status_code=status.HTTP_200_OK)
+
+    if session_id and getattr(request.state, "mcp_method", None) != "initialize":
+        if not get_session_store().exists(session_id, user_id):
+            logger.info(f"⚠️ Unknown MCP session {session_id[:8]}... - client must re-initialize")
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"jsonrpc": "2.0", "id": "server-error", "error": {"code": -32600, "message": "Session not found"}},
+            )
+    return None
+
+
 async def vmcp_routing_middleware(request: Request, call_next):
     """Middleware to handle vMCP URL patterns and route them to MCP endpoint"""
 
@@ -416,45 +467,25 @@ async def mcp_auth_middleware(request: Request, call_next):
             logger.info(f"📋 Preserved headers in redirect: {list(request.headers.keys())}")
             return redirect_response
 
-        # Comprehensive MCP request logging
-        logger.info("=" * 80)
-        logger.info("🔄 MCP REQUEST RECEIVED")
-        logger.info("=" * 80)
-        logger.info("📋 Request Details:")
-        logger.info(f"   Method: {request.method}")
-        logger.info(f"   Full URL: {request.url}")
-        logger.info(f"   Client Host: {request.client.host if request.client else 'Unknown'}")
-        logger.info(f"   User Agent: {request.headers.get('user-agent', 'Unknown')}")
-
-        # Log all headers
-        logger.info("📋 Request Headers:")
-        for header_name, header_value in request.headers.items():
-            # Mask sensitive headers
-            if header_name.lower() in ["authorization", "cookie"]:
-                masked_value = f"{header_value[:10]}..." if len(header_value) > 10 else "***"
-                logger.info(f"   {header_name}: {masked_value}")
-            else:
-                logger.info(f"   {header_name}: {header_value}")
-
-        # Log query parameters if any
-        if request.query_params:
-            logger.info("📋 Query Parameters:")
-            for key, value in request.query_params.items():
-                logger.info(f"   {key}: {value}")
+        logger.debug(
+            "🔄 MCP request: %s %s from %s, headers: %s, query: %s",
+            request.method,
+            request.url.path,
+            request.client.host if request.client else "Unknown",
+            lazy(lambda: redact_headers(request.headers)),
+            lazy(lambda: dict(request.query_params)),
+        )
 
-        # Log request body for POST/PUT requests
+        # Read the JSON-RPC body of POST/PUT requests
         if request.method in ["POST", "PUT", "PATCH"]:
             try:
                 body = await request.body()
                 if body:
-                    body_str = body.decode("utf-8", errors="replace") if isinstance(body, bytes) else str(body)
-                    logger.info(f"📋 Request Body: {body_str}")
-                    # Try to parse as JSON for better readability
+                    # Try to parse as JSON for the agent bookkeeping below
                     try:
                         json_body = json.loads(body)
-                        logger.info("📋 Parsed JSON Body:")
-                        for key, value in json_body.items():
-                            logger.info(f"   {key}: {value}")
+                        request.state.mcp_method = json_body.get("method") if isinstance(json_body, dict) else None
+                        logger.debug("📋 MCP request body: %s", lazy(lambda: body.decode("utf-8", errors="replace")))
 
                         # ==================== Check if this is an initialize request and handle agent management
                         if json_body.get("method") == "initialize":
@@ -470,14 +501,14 @@ async def mcp_auth_middleware(request: Request, call_next):
                             # Extract Bearer token and try to log the call
                             bearer_token = request.headers.get("Authorization", "").replace("Bearer ", "").strip()
                             if bearer_token:
+                                if json_body.get("method") == "tools/list":
+                                    start_lazy_prewarm(request, bearer_token)
                                 await log_mcp_call_for_agent(request, json_body, bearer_token)
                         # ==================== End of agent management check
                     except json.JSONDecodeError:
-                        logger.info(f"📋 Body is not JSON: {body_str}")
-                else:
-                    logger.info("📋 Request Body: Empty")
+                        logger.debug("📋 MCP request body is not JSON (%d bytes)", len(body))
             except Exception as e:
-                logger.info(f"📋 Could not read request body: {e}")
+                logger.debug("📋 Could not process MCP request body: %s", e)
 
         # Handle CORS preflight
         if request.method == "OPTIONS":
@@ -495,7 +526,6 @@ async def mcp_auth_middleware(request: Request, call_next):
         # MCP Authorization specification: "When authorization is required and not yet proven by the client,
         # servers MUST respond with HTTP 401 Unauthorized"
         auth_header = request.headers.get("Authorization")
-        logger.info(f"🔄 MCP AUTH: Authorization header: {auth_header}")
         vmcp_name = request.headers.get("vmcp-name")
         vmcp_username = request.headers.get("vmcp-username")
         share_vMCP_str = request.headers.get("share-vMCP", "false")
@@ -543,12 +573,7 @@ async def mcp_auth_middleware(request: Request, call_next):
 
         # Extract token for validation
         token = auth_header.replace("Bearer", "").strip()
-
-        # Add detailed token logging
-        logger.info(
-            f"🔍 MCP AUTH: Extracted token: {token[:20]}...{token[-10:] if len(token) > 30 else token}"
-        )
-        logger.info(f"🔍 MCP AUTH: Token length: {len(token)}")
+        logger.debug("🔍 MCP AUTH: Token length: %d", len(token))
 
         # Validate access token directly using JWT service
         try:
@@ -627,9 +652,28 @@ async def mcp_auth_middleware(request: Request, call_next):
                 content={"error": "auth_service_error"},
             )
 
+    # Stateless MCP sessions: vMCP issues and validates mcp-session-id itself
+    stateless_mcp = is_mcp_request and settings.mcp_session_mode == "stateless"
+    if stateless_mcp:
+        session_response = handle_stateless_session(request)
+        if session_response is not None:
+            return session_response
+
     # Process the request
     response = await call_next(request)
 
+    if stateless_mcp and getattr(request.state, "mcp_method", None) == "initialize" and response.status_code == 200:
+        from vmcp.proxy_server.session_store import get_session_store, new_session_id
+
+        session_id = new_session_id()
+        get_session_store().create(
+            session_id,
+            int(request.state.user_id),
+            vmcp_username=request.headers.get("vmcp-username"),
+            vmcp_name=request.headers.get("vmcp-name"),
+        )
+        response.headers["mcp-session-id"] = session_id
+
     # Handle session mapping for initialize requests
     # Session ID is created by server and returned in response headers
     if is_mcp_request and hasattr(request.state, 'agent_name'):
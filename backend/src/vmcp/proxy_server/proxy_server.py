@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import os
 import re
 import traceback
@@ -35,7 +36,8 @@ from vmcp.proxy_server.mcp_dependencies import get_http_request
 from vmcp.proxy_server.middleware import register_middleware
 from vmcp.proxy_server.tool_descriptions import CREATE_PROMPT_HELPER_TEXT, UPLOAD_PROMPT_DESCRIPTION
 from vmcp.storage.blob_router import router as blob_router
-from vmcp.utilities.logging import get_logger
+from vmcp.utilities.json_codec import CodecJSONResponse
+from vmcp.utilities.logging import get_logger, lazy, redact_headers
 from vmcp.utilities.tracing import add_tracing_middleware, trace_method
 from vmcp.vmcps.models import VMCPToolCallRequest
 from vmcp.vmcps.router_typesafe import router as vmcp_router
@@ -61,7 +63,9 @@ class ProxyServer(FastMCP):
         # Validate log level is one of the allowed values
         valid_log_levels: tuple[Literal['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'], ...] = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
         log_level: Literal['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'] = log_level_str if log_level_str in valid_log_levels else 'INFO'  # type: ignore
-        super().__init__(name, streamable_http_path="/mcp", instructions="1xn v(irtual)MCP server", log_level=log_level, debug=settings.debug)
+        # Stateless sessions let any worker serve any request (session ids come from session_store.py)
+        super().__init__(name, streamable_http_path="/mcp", instructions="1xn v(irtual)MCP server", log_level=log_level, debug=settings.debug,
+                         stateless_http=settings.mcp_session_mode == "stateless")
         self._mcp_server.create_initialization_options(
             notification_options=NotificationOptions(prompts_changed=True, resources_changed=True, tools_changed=True),
             experimental_capabilities={"1xn": {"vmcp": True}})
@@ -80,13 +84,12 @@ class ProxyServer(FastMCP):
             jwt_service = get_jwt_service()
             UserContext = get_user_context_class()
 
-            # Debug: Log all headers to see what's available
+            # Debug: Log headers (credentials masked) to see what's available
             request = get_http_request()
-            logger.info(f"🔍 DEBUG: All headers during tool call: {dict(request.headers)}")
+            logger.debug("🔍 Request headers: %s", lazy(lambda: redact_headers(request.headers)))
             auth_header = request.headers.get('Authorization', '')
-            logger.info(f"🔍 DEBUG: Authorization header: '{auth_header}'")
             token = auth_header.replace('Bearer ', '').strip()
-            logger.info(f"🔍 DEBUG: Extracted token: '{token[:20] if token else 'EMPTY'}...')")
+            logger.debug("🔍 Bearer token present: %s", bool(token))
 
             # Extract and normalize token info
             try:
@@ -122,9 +125,9 @@ class ProxyServer(FastMCP):
                 user_storage = StorageBase(user_id=int(user_id))
                 agent_name = user_storage.get_agent_name_from_session(session_id)
                 if agent_name:
-                    logger.info(f"🔍 Found agent name for session {session_id[:20]}...: {agent_name}")
+                    logger.debug("🔍 Found agent name for session %.8s...: %s", session_id, agent_name)
                 else:
-                    logger.debug(f"🔍 No agent mapping found for session {session_id[:20]}...")
+                    logger.debug("🔍 No agent mapping found for session %.8s...", session_id)
             else:
                 logger.debug("🔍 No mcp-session-id in headers - agent name unavailable")
 
@@ -151,7 +154,13 @@ class ProxyServer(FastMCP):
                     "agent_id": agent_name,
                     "client_id": client_id or "unknown"
                 }
-                logger.info(f"✅ Updated vmcp_config_manager logging_config with agent_name: {agent_name}")
+                logger.debug("✅ Updated vmcp_config_manager logging_config with agent_name: %s", agent_name)
+
+            # Queue this agent session's upstream calls fairly against other agents and users
+            if user_context.vmcp_config_manager:
+                user_context.vmcp_config_manager.mcp_client_manager.caller = (
+                    str(user_id), (agent_name or client_id, session_id)
+                )
 
             # The UserContext now has vmcp_config_manager initialized
             return user_context
@@ -290,9 +299,7 @@ class ProxyServer(FastMCP):
     @trace_method("[PROXY_SERVER]: List Tools")
     async def proxy_list_tools(self) -> List[Tool]:
         """Aggregate tools from all connected servers filtered by active agent or vMCP"""
-        logger.info("=" * 60)
-        logger.info("🔍 MCP: proxy_list_tools called")
-        logger.info("=" * 60)
+        logger.debug("🔍 MCP: proxy_list_tools called")
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -304,14 +311,13 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"🔍 MCP: Listing tools for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("🔍 MCP: Listing tools for user %s, client %s, agent %s", user_id, client_id, agent_name)
 
         # Get vMCP tools
         if deps.vmcp_config_manager:
             tools = await deps.vmcp_config_manager.tools_list()
         else:
             tools = []
-        logger.info(f"🔍 MCP: Found {len(tools)} vMCP tools")
 
         # Create preset tools manually
         if not(deps.vmcp_username_header and deps.vmcp_username_header.startswith("@")):
@@ -370,27 +376,25 @@ class ProxyServer(FastMCP):
             ]
         else:
             preset_tools = []
-        logger.info(f"🔍 MCP: Found {len(preset_tools)} preset tools")
 
         # Combine preset tools with vMCP tools
         all_tools = preset_tools + tools
 
-        logger.info(f"🔍 MCP: Returning {len(all_tools)} total tools ({len(preset_tools)} preset + {len(tools)} vMCP)")
         # Tools are already Tool objects, no conversion needed
-        logger.info(f"🔍 MCP: Returning {len(tools)} tools")
-        logger.info("=" * 60)
+        logger.info("🔍 MCP: Returning %d total tools (%d preset + %d vMCP)", len(all_tools), len(preset_tools), len(tools))
 
         # Log tool details
-        for i, tool in enumerate(all_tools):
-            tool_type = "PRESET" if i < len(preset_tools) else "vMCP"
-            logger.info(f"🔍 MCP: Tool {i+1} [{tool_type}]: {tool.name} - {tool.description[:50] if tool.description else 'No description'}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, tool in enumerate(all_tools):
+                tool_type = "PRESET" if i < len(preset_tools) else "vMCP"
+                logger.debug("🔍 MCP: Tool %d [%s]: %s - %.50s...", i + 1, tool_type, tool.name, tool.description or 'No description')
 
         return all_tools
 
     @trace_method("[PROXY_SERVER]: List Resources")
     async def proxy_list_resources(self) -> List[Resource]:
         """Aggregate resources from all connected servers filtered by active agent or vMCP"""
-        logger.info("🔍 Listing resources from all connected servers...")
+        logger.debug("🔍 Listing resources from all connected servers...")
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -402,7 +406,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"🔍 MCP: Listing resources for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("🔍 MCP: Listing resources for user %s, client %s, agent %s", user_id, client_id, agent_name)
 
         if deps.vmcp_config_manager:
             resources = await deps.vmcp_config_manager.resources_list()
@@ -414,7 +418,7 @@ class ProxyServer(FastMCP):
     @trace_method("[PROXY_SERVER]: List Resource Templates")
     async def proxy_list_resource_templates(self) -> List[ResourceTemplate]:
         """Aggregate resource templates from all connected servers filtered by active agent or vMCP"""
-        logger.info("🔍 Listing resource templates from all connected servers...")
+        logger.debug("🔍 Listing resource templates from all connected servers...")
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -426,7 +430,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"🔍 MCP: Listing resource templates for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("🔍 MCP: Listing resource templates for user %s, client %s, agent %s", user_id, client_id, agent_name)
 
         if deps.vmcp_config_manager:
             resource_templates = await deps.vmcp_config_manager.resource_templates_list()
@@ -434,15 +438,16 @@ class ProxyServer(FastMCP):
             resource_templates = []
 
         # Log resource template details
-        for i, template in enumerate(resource_templates):
-            logger.info(f"🔍 MCP: Resource Template {i+1}: {template.name} - {template.description[:50] if template.description else 'No description'}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, template in enumerate(resource_templates):
+                logger.debug("🔍 MCP: Resource Template %d: %s - %.50s...", i + 1, template.name, template.description or 'No description')
 
         return resource_templates
 
     @trace_method("[PROXY_SERVER]: List Prompts")
     async def proxy_list_prompts(self) -> List[Prompt]:
         """Aggregate prompts from all connected servers filtered by active agent or vMCP"""
-        logger.info("🔍 Listing prompts from all connected servers...")
+        logger.debug("🔍 Listing prompts from all connected servers...")
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -454,7 +459,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"🔍 MCP: Listing prompts for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("🔍 MCP: Listing prompts for user %s, client %s, agent %s", user_id, client_id, agent_name)
 
         if deps.vmcp_config_manager:
             prompts = await deps.vmcp_config_manager.prompts_list()
@@ -482,8 +487,9 @@ class ProxyServer(FastMCP):
             prompts.append(upload_prompt_helper_prompt)
 
         # Log prompt details
-        for i, prompt in enumerate(prompts):
-            logger.info(f"🔍 MCP: Prompt {i+1}: {prompt.name} - {prompt.description[:50] if prompt.description else 'No description'}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, prompt in enumerate(prompts):
+                logger.debug("🔍 MCP: Prompt %d: %s - %.50s...", i + 1, prompt.name, prompt.description or 'No description')
 
         return prompts
 
@@ -491,19 +497,17 @@ class ProxyServer(FastMCP):
     async def root_proxy_call_tool(self, req: CallToolRequest):
         tool_name = req.params.name
         arguments = req.params.arguments or {}
-        logger.info(f"🔧 DEBUG root_proxy_call_tool: tool={tool_name}, arguments={arguments}, types={[(k, type(v).__name__) for k, v in arguments.items()]}")
+        logger.debug(
+            "🔧 root_proxy_call_tool: tool=%s, argument types=%s",
+            tool_name, lazy(lambda: [(k, type(v).__name__) for k, v in arguments.items()])
+        )
         result = await self.proxy_call_tool(tool_name, arguments)
         return result
 
     @trace_method("[PROXY_SERVER]: Tool Call", operation="call_tool")
     async def proxy_call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """Route tool calls to appropriate server"""
-        logger.info("=" * 60)
-        logger.info("🛠️  MCP: Tool call requested")
-        logger.info("=" * 60)
-        logger.info("📋 Tool Details:")
-        logger.info(f"   Name: {name}")
-        logger.info(f"   Arguments: {arguments}")
+        logger.debug("🛠️  MCP: Tool call requested: %s, arguments: %s", name, arguments)
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -515,12 +519,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info("📋 User Context:")
-        logger.info(f"   User ID: {user_id}")
-        logger.info(f"   Client ID: {client_id}")
-        logger.info(f"   Agent Name: {agent_name}")
-
-        logger.info(f"🛠️  MCP: Executing tool '{name}' for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("🛠️  MCP: Executing tool '%s' for user %s, client %s, agent %s", name, user_id, client_id, agent_name)
 
         # Track tool execution start (OSS - analytics disabled)
         # analytics.track_mcp_tool_call(
@@ -534,13 +533,11 @@ class ProxyServer(FastMCP):
         try:
             # For now, check if this is the vmcp_create_prompt tool
             if name == "upload_prompt":
-                logger.info(f"🔧 MCP: Executing PRESET tool '{name}'")
+                logger.debug("🔧 MCP: Executing PRESET tool '%s'", name)
                 # Execute the preset tool directly (manually for now)
                 result = await self._execute_upload_prompt(arguments)
-                logger.info(f"✅ MCP: Preset tool '{name}' executed successfully")
-                logger.info(f"📋 Result type: {type(result)}")
-                logger.info(f"📋 Result: {result}")
-                logger.info("=" * 60)
+                logger.info("✅ MCP: Preset tool '%s' executed successfully", name)
+                logger.debug("📋 Result: %r", result)
 
                 # Track successful tool execution
                 # analytics.track_mcp_tool_call()  # OSS - analytics disabled
@@ -552,29 +549,24 @@ class ProxyServer(FastMCP):
                     isError=False
                 )
             else:
-                logger.info(f"🔧 MCP: Executing vMCP tool '{name}'")
+                logger.debug("🔧 MCP: Executing vMCP tool '%s'", name)
                 if deps.vmcp_config_manager:
                     result = await deps.vmcp_config_manager.call_tool(
                         vmcp_tool_call_request=VMCPToolCallRequest(tool_name=name, arguments=arguments)
                     )
                 else:
                     raise Exception("No vMCP manager available for tool execution")
-                logger.info(f"✅ MCP: vMCP tool '{name}' executed successfully")
-                logger.info(f"📋 Result type: {type(result)}")
-                logger.info(f"📋 Result: {result}")
-                if isinstance(result, list):
-                    logger.info(f"📋 Result count: {len(result)}")
-                logger.info("=" * 60)
+                logger.info("✅ MCP: vMCP tool '%s' executed successfully", name)
+                logger.debug("📋 Result: %r", result)
 
                 # Track successful vMCP tool execution
                 # analytics.track_mcp_tool_call()  # OSS - analytics disabled
 
                 return result
         except Exception as e:
-            logger.error(f"❌ MCP: Tool '{name}' failed with error: {e}")
+            logger.error("❌ MCP: Tool '%s' failed with error: %s", name, e)
             # Add traceback to logger
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            logger.info("=" * 60)
+            logger.debug("Full traceback: %s", lazy(traceback.format_exc))
 
             # Track failed tool execution
             # analytics.track_mcp_tool_call()  # OSS - analytics disabled
@@ -584,8 +576,7 @@ class ProxyServer(FastMCP):
     @trace_method("[PROXY_SERVER]: Get Prompt")
     async def proxy_get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
         """Get prompt content from appropriate server or agent"""
-        logger.info(f"📝 Prompt request: {name}")
-        logger.debug(f"   📋 Arguments: {arguments}")
+        logger.debug("📝 Prompt request: %s, arguments: %s", name, arguments)
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -597,7 +588,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"📝 MCP: Getting prompt '{name}' for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("📝 MCP: Getting prompt '%s' for user %s, client %s, agent %s", name, user_id, client_id, agent_name)
 
         # Handle built-in prompts
         if name == "upload_prompt_helper":
@@ -635,7 +626,7 @@ class ProxyServer(FastMCP):
     async def proxy_read_resource(self, req: ReadResourceRequest) -> ServerResult:
         """Route resource reads to appropriate server"""
         uri = req.params.uri
-        logger.info(f"📦 Resource read requested: {uri}")
+        logger.debug("📦 Resource read requested: %s", uri)
 
         # Build dependencies from current request
         deps = await self.get_user_context_proxy_server()
@@ -647,7 +638,7 @@ class ProxyServer(FastMCP):
         user_id = getattr(deps, 'user_id', 'unknown')
         client_id = getattr(deps, 'client_id', 'unknown')
         agent_name = getattr(deps, 'agent_name', 'unknown')
-        logger.info(f"📦 MCP: Reading resource '{uri}' for user {user_id}, client {client_id}, agent {agent_name}")
+        logger.info("📦 MCP: Reading resource '%s' for user %s, client %s, agent %s", uri, user_id, client_id, agent_name)
 
 
         # For other resources, use the vmcp_config_manager to handle them
@@ -657,9 +648,8 @@ class ProxyServer(FastMCP):
             else:
                 raise Exception("No vMCP manager available for resource retrieval")
             if resource_result:
-                logger.info(f"✅ Resource read successful: {uri}")
-                logger.info(f"🔍 Proxy Server: Resource result type: {type(resource_result)}")
-                logger.debug(f"🔍 Proxy Server: Resource result structure: {resource_result}")
+                logger.info("✅ Resource read successful: %s", uri)
+                logger.debug("🔍 Proxy Server: Resource result structure: %r", resource_result)
                 # if isinstance(resource_result, ReadResourceResult):
                     # return ServerResult(resource_result) #[ReadResourceContents(content=c.text, mime_type=c.mimeType, meta=c.meta) if hasattr(c, 'text') else ReadResourceContents(content=c.blob, mime_type=c.mimeType, meta=c.meta) for c in resource_result.contents]
                 # else:
@@ -726,11 +716,39 @@ async def lifespan(app: FastAPI):
     # Start the session manager task
     session_task = asyncio.create_task(run_session_manager())
 
+    # Periodically reclaim unreferenced blob content
+    from vmcp.storage.blob_gc import run_blob_gc_loop
+    blob_gc_task = asyncio.create_task(run_blob_gc_loop())
+
+    # Apply cache invalidations published by other workers
+    from vmcp.storage.cache_bus import run_cache_bus_loop
+    cache_bus_task = asyncio.create_task(run_cache_bus_loop())
+
+    # Probe watched upstream servers so status checks answer from memory
+    from vmcp.mcps.health_monitor import run_health_monitor_loop
+    health_monitor_task = asyncio.create_task(run_health_monitor_loop())
+
     try:
         logger.info("✅ MCP session manager started")
         yield
     finally:
         logger.info("🛑 Shutting down MCP session manager...")
+        blob_gc_task.cancel()
+        cache_bus_task.cancel()
+        health_monitor_task.cancel()
+
+        from vmcp.mcps.resource_cache import stop_resource_watchers
+        stop_resource_watchers()
+
+        from vmcp.mcps.prewarm import get_prewarmer
+        get_prewarmer().stop()
+
+        # Flush deferred writes, then let queued log writes finish
+        from vmcp.storage.db_writer import get_db_writer
+        from vmcp.storage.write_behind import get_write_behind
+        await asyncio.to_thread(get_write_behind().flush)
+        await asyncio.to_thread(get_db_writer().stop)
+
         # Signal shutdown
         shutdown_event.set()
 
@@ -753,7 +771,8 @@ app = FastAPI(
     title="1xN MCP Proxy Server",
     description="MCP proxy server with management API",
     lifespan=lifespan,
-    redirect_slashes=False  # Prevent automatic redirects that lose Authorization headers
+    redirect_slashes=False,  # Prevent automatic redirects that lose Authorization headers
+    default_response_class=CodecJSONResponse,  # Render JSON with the shared codec (orjson if installed)
 )
 
 # Add CORS middleware
@@ -0,0 +1,242 @@
+"""
+Session store for stateless MCP HTTP sessions.
+
+In stateful mode the MCP SDK keeps each streamable-HTTP session (and its
+transport) in the memory of the worker that created it, so follow-up
+requests must reach that worker. In stateless mode (the default when
+``VMCP_WORKERS`` > 1) every request is handled by a fresh transport on
+whichever worker receives it; vMCP then issues the ``mcp-session-id`` itself
+and records it here so any worker can validate it. A session id is only
+valid for the user who created it.
+
+Backends:
+- ``memory``: process-local dict, for single-worker stateless setups and tests
+- ``database``: ``mcp_sessions`` table, shared by all workers; known ids are
+  cached per worker and dropped through the cache bus when a session ends
+"""
+
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.storage.cache_bus import get_cache_bus
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("SESSION_STORE")
+
+SESSION_CACHE_TOPIC = "mcp_session"
+
+# Seconds between refreshes of a session's last_seen_at / prunes of idle sessions
+_TOUCH_INTERVAL = 300
+_PRUNE_INTERVAL = 3600
+
+
+def new_session_id() -> str:
+    """Generate an mcp-session-id (visible ASCII, as the MCP spec requires)."""
+    return secrets.token_hex(16)
+
+
+class SessionStore(ABC):
+    """Interface for stateless-mode MCP session records."""
+
+    @abstractmethod
+    def create(self, session_id: str, user_id: int, vmcp_username: Optional[str] = None,
+               vmcp_name: Optional[str] = None) -> None:
+        """Record a new session owned by user_id."""
+
+    @abstractmethod
+    def exists(self, session_id: str, user_id: int) -> bool:
+        """Whether the session is live and owned by user_id (refreshes its idle timer)."""
+
+    @abstractmethod
+    def delete(self, session_id: str, user_id: int) -> bool:
+        """End a session owned by user_id; False if there was none."""
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local session store."""
+
+    def __init__(self):
+        # session_id -> (owning user, monotonic time last seen)
+        self._sessions: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, session_id: str, user_id: int, vmcp_username: Optional[str] = None,
+               vmcp_name: Optional[str] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = (int(user_id), now)
+            idle_cutoff = now - settings.mcp_session_idle_timeout
+            for expired in [sid for sid, (_, seen) in self._sessions.items() if seen < idle_cutoff]:
+                del self._sessions[expired]
+
+    def exists(self, session_id: str, user_id: int) -> bool:
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None or record[0] != int(user_id):
+                return False
+            self._sessions[session_id] = (record[0], time.monotonic())
+            return True
+
+    def delete(self, session_id: str, user_id: int) -> bool:
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None or record[0] != int(user_id):
+                return False
+            del self._sessions[session_id]
+            return True
+
+
+class DatabaseSessionStore(SessionStore):
+    """Session store backed by the mcp_sessions table."""
+
+    def __init__(self, max_cached: int = 4096):
+        self.max_cached = max_cached
+        # session_id -> (owning user, monotonic time last_seen_at was written)
+        self._known: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_prune = -float(_PRUNE_INTERVAL)
+        get_cache_bus().subscribe(SESSION_CACHE_TOPIC, self._forget)
+
+    def _remember(self, session_id: str, user_id: int, touched_at: float) -> None:
+        with self._lock:
+            self._known[session_id] = (user_id, touched_at)
+            self._known.move_to_end(session_id)
+            while len(self._known) > self.max_cached:
+                self._known.popitem(last=False)
+
+    def _forget(self, session_id: str) -> None:
+        with self._lock:
+            if session_id == "*":
+                self._known.clear()
+            else:
+                self._known.pop(session_id, None)
+
+    def create(self, session_id: str, user_id: int, vmcp_username: Optional[str] = None,
+               vmcp_name: Optional[str] = None) -> None:
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import MCPSession
+
+        session = SessionLocal()
+        try:
+            session.add(MCPSession(
+                session_id=session_id,
+                user_id=int(user_id),
+                vmcp_username=vmcp_username,
+                vmcp_name=vmcp_name,
+                created_at=datetime.utcnow(),
+                last_seen_at=datetime.utcnow(),
+            ))
+            session.commit()
+            self._remember(session_id, int(user_id), time.monotonic())
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to store MCP session {session_id[:8]}...: {e}")
+        finally:
+            session.close()
+        self._prune_idle()
+
+    def exists(self, session_id: str, user_id: int) -> bool:
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self._lock:
+            known = self._known.get(session_id)
+            if known is not None:
+                self._known.move_to_end(session_id)
+        if known is not None and known[0] != user_id:
+            return False
+        touched_at = known[1] if known is not None else None
+        if touched_at is not None and now - touched_at < _TOUCH_INTERVAL:
+            return True
+
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import MCPSession
+
+        # Unknown to this worker, or due for a last_seen_at refresh
+        session = SessionLocal()
+        try:
+            updated = (
+                session.query(MCPSession)
+                .filter(MCPSession.session_id == session_id, MCPSession.user_id == user_id)
+                .update({MCPSession.last_seen_at: datetime.utcnow()}, synchronize_session=False)
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to look up MCP session {session_id[:8]}...: {e}")
+            # Don't fail requests on a transient database error if we've seen the session before
+            return touched_at is not None
+        finally:
+            session.close()
+
+        if not updated:
+            self._forget(session_id)
+            return False
+        self._remember(session_id, user_id, now)
+        return True
+
+    def delete(self, session_id: str, user_id: int) -> bool:
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import MCPSession
+
+        session = SessionLocal()
+        try:
+            deleted = session.query(MCPSession).filter(
+                MCPSession.session_id == session_id,
+                MCPSession.user_id == int(user_id),
+            ).delete()
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to delete MCP session {session_id[:8]}...: {e}")
+            return False
+        finally:
+            session.close()
+        if deleted:
+            get_cache_bus().publish(SESSION_CACHE_TOPIC, session_id)
+        return bool(deleted)
+
+    def _prune_idle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_prune < _PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import MCPSession
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.mcp_session_idle_timeout)
+        session = SessionLocal()
+        try:
+            removed = session.query(MCPSession).filter(MCPSession.last_seen_at < cutoff).delete()
+            session.commit()
+            if removed:
+                logger.info(f"Pruned {removed} idle MCP sessions")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to prune idle MCP sessions: {e}")
+        finally:
+            session.close()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Get the process-wide session store selected by settings.session_store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.session_store == "database":
+                _store = DatabaseSessionStore()
+            elif settings.session_store == "memory":
+                _store = InMemorySessionStore()
+            else:
+                raise ValueError(f"Unknown session store: {settings.session_store}")
+        return _store
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON codecs on a representative large MCP server config.
+
+Builds a server config with 500 tools (plus resources and prompts) and times
+MCPServerConfig.to_dict(), encoding/decoding the stored config and rendering
+an API response for each available codec.
+
+Usage: python -m vmcp.scripts.benchmark_json_codec [--tools 500] [--rounds 50]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from mcp.types import Prompt, PromptArgument, Resource, Tool
+
+from vmcp.mcps.models import MCPConnectionStatus, MCPServerConfig, MCPTransportType
+from vmcp.utilities import json_codec
+
+
+def build_config(tool_count: int) -> MCPServerConfig:
+    """Create a server config shaped like a large upstream server."""
+    tools = [
+        Tool(
+            name=f"tool_{i}",
+            description=f"Tool number {i} " + "does something useful. " * 8,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Search query"},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+                    "filters": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["query"],
+            },
+        )
+        for i in range(tool_count)
+    ]
+    resources = [
+        Resource(uri=f"file:///data/resource_{i}.txt", name=f"resource_{i}", mimeType="text/plain")
+        for i in range(tool_count // 10)
+    ]
+    prompts = [
+        Prompt(name=f"prompt_{i}", description="Prompt", arguments=[PromptArgument(name="topic", required=True)])
+        for i in range(tool_count // 10)
+    ]
+    return MCPServerConfig(
+        name="benchmark",
+        transport_type=MCPTransportType.HTTP,
+        url="http://localhost:9000/mcp",
+        status=MCPConnectionStatus.CONNECTED,
+        last_connected=datetime.now(),
+        tools=[tool.name for tool in tools],
+        tool_details=tools,
+        resources=[str(resource.uri) for resource in resources],
+        resource_details=resources,
+        prompts=[prompt.name for prompt in prompts],
+        prompt_details=prompts,
+    )
+
+
+def timed(func, rounds: int) -> float:
+    """Return the mean runtime of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tools", type=int, default=500, help="Number of tools in the config")
+    parser.add_argument("--rounds", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    config = build_config(args.tools)
+    print(f"\n📊 JSON codec benchmark ({args.tools} tools, {args.rounds} rounds, mean ms)")
+    print("=" * 60)
+    print(f"{'to_dict':<28}{timed(config.to_dict, args.rounds):>10.2f}")
+
+    data = config.to_dict()
+    response = [data] * 10
+    codecs = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+    for name in codecs:
+        codec = json_codec.get_codec(name)
+        encoded = codec.dumps(data)
+        print(f"\n{name} ({len(encoded) / 1024:.0f} KiB per config)")
+        print(f"  {'encode config':<26}{timed(lambda: codec.dumps(data), args.rounds):>10.2f}")
+        print(f"  {'decode config':<26}{timed(lambda: codec.loads(encoded), args.rounds):>10.2f}")
+        print(f"  {'render 10-server response':<26}{timed(lambda: codec.dumpb(response), args.rounds):>10.2f}")
+
+    if json_codec.orjson is None:
+        print("\n💡 Install orjson to benchmark (and use) the faster codec")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite under a mixed read/write workload.
+
+Runs reader threads (recent stats queries) alongside writer threads
+(stats inserts, like operation logging) against a scratch database. Each
+scenario pairs an engine profile with a write path:
+
+- legacy: rollback journal, default synchronous, foreign_keys only
+- tuned:  the production profile from storage.database.sqlite_pragmas()
+- tuned + writer queue: tuned profile with writes funnelled through DatabaseWriter
+
+Usage: python -m vmcp.scripts.benchmark_sqlite_concurrency [--readers 8] [--writers 8] [--seconds 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from vmcp.storage.database import create_db_engine, sqlite_pragmas
+from vmcp.storage.db_writer import DatabaseWriter
+from vmcp.storage.models import VMCP, Base, User, VMCPStats
+
+LEGACY_PRAGMAS = {"foreign_keys": "ON"}
+
+
+def _seed(Session) -> str:
+    session = Session()
+    try:
+        user = User(username="bench", email="bench@local", first_name="Bench", last_name="User")
+        session.add(user)
+        session.flush()
+        vmcp = VMCP(id=f"{user.id}_bench", user_id=user.id, vmcp_id="bench", name="bench", vmcp_config={})
+        session.add(vmcp)
+        session.commit()
+        return vmcp.id
+    finally:
+        session.close()
+
+
+def _insert_stat(Session, vmcp_pk: str, i: int) -> None:
+    session = Session()
+    try:
+        session.add(VMCPStats(
+            vmcp_id=vmcp_pk,
+            operation_type="tool_call",
+            operation_name=f"tool_{i % 50}",
+            mcp_server_id="bench",
+            operation_metadata={"agent_name": f"agent_{i % 5}", "arguments": {"i": i}, "result": "ok" * 50},
+        ))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def run_scenario(label: str, pragmas: Dict[str, object], use_queue: bool,
+                 readers: int, writers: int, seconds: float) -> Dict[str, float]:
+    """Run one scenario and return throughput, latency and error counts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", pragmas=pragmas)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        vmcp_pk = _seed(Session)
+
+        writer = DatabaseWriter(name=f"bench-writer-{label}") if use_queue else None
+        stop = threading.Event()
+        lock = threading.Lock()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        write_latencies: List[float] = []
+
+        def reader():
+            while not stop.is_set():
+                session = Session()
+                try:
+                    session.execute(text(
+                        "SELECT id, operation_name, operation_metadata FROM vmcp_stats ORDER BY id DESC LIMIT 50"
+                    )).fetchall()
+                    with lock:
+                        counts["reads"] += 1
+                except OperationalError:
+                    with lock:
+                        counts["errors"] += 1
+                finally:
+                    session.close()
+
+        def writer_thread(offset: int):
+            i = offset
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    if writer:
+                        writer.submit(_insert_stat, Session, vmcp_pk, i).result()
+                    else:
+                        _insert_stat(Session, vmcp_pk, i)
+                    with lock:
+                        counts["writes"] += 1
+                        write_latencies.append(time.perf_counter() - start)
+                except OperationalError:
+                    with lock:
+                        counts["errors"] += 1
+                i += writers
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer_thread, args=(n,)) for n in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if writer:
+            writer.stop()
+        engine.dispose()
+
+    write_latencies.sort()
+    p95 = write_latencies[int(len(write_latencies) * 0.95)] * 1000 if write_latencies else 0.0
+    return {
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "write_p95_ms": p95,
+        "errors": counts["errors"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--readers", type=int, default=8, help="Reader threads")
+    parser.add_argument("--writers", type=int, default=8, help="Writer threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each scenario")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("legacy", LEGACY_PRAGMAS, False),
+        ("tuned", sqlite_pragmas(), False),
+        ("tuned + writer queue", sqlite_pragmas(), True),
+    ]
+
+    print(f"\n📊 SQLite mixed workload ({args.readers} readers, {args.writers} writers, {args.seconds:g}s each)")
+    print("=" * 72)
+    print(f"{'scenario':<24}{'reads/s':>12}{'writes/s':>12}{'write p95 ms':>14}{'errors':>10}")
+    for label, pragmas, use_queue in scenarios:
+        result = run_scenario(label, pragmas, use_queue, args.readers, args.writers, args.seconds)
+        print(
+            f"{label:<24}{result['reads_per_s']:>12.0f}{result['writes_per_s']:>12.0f}"
+            f"{result['write_p95_ms']:>14.1f}{result['errors']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark the overhead of the tracing helpers.
+
+Times a small function that calls log_to_span the way the protocol handlers
+do, in these modes:
+
+- baseline: undecorated function, no span logging
+- disabled (guarded): same, with the builder behind ``if TRACING_ENABLED``
+  as the protocol handlers use it, tracing off
+- disabled (lazy): @trace_method + log_to_span with a lambda builder, tracing off
+- disabled (eager): same, but building the f-string and dict at the call site
+- enabled, ratio 0 / ratio 1: OpenTelemetry SDK installed, no exporter
+
+Usage: python -m vmcp.scripts.benchmark_tracing [--calls 200000]
+"""
+
+import argparse
+import sys
+import time
+
+from vmcp.utilities.tracing import telemetry
+
+
+def build_functions():
+    """Create the benchmarked functions under the current tracing mode."""
+    tools = [f"tool_{i}" for i in range(20)]
+
+    # Bound when the functions are built, like a module-level import of the flag
+    enabled = telemetry.TRACING_ENABLED
+
+    def baseline(vmcp_id):
+        return len(tools)
+
+    @telemetry.trace_method("[Benchmark]: Guarded")
+    def guarded(vmcp_id):
+        if enabled:
+            telemetry.log_to_span(lambda: (
+                f"Successfully listed {len(tools)} tools for vMCP {vmcp_id}",
+                {
+                    "operation_type": "tools_list",
+                    "operation_id": f"tools_list_{vmcp_id}",
+                    "result": {"success": True, "tool_count": len(tools), "tools": tools[:5]},
+                    "level": "info",
+                }
+            ))
+        return len(tools)
+
+    @telemetry.trace_method("[Benchmark]: Lazy")
+    def lazy(vmcp_id):
+        telemetry.log_to_span(lambda: (
+            f"Successfully listed {len(tools)} tools for vMCP {vmcp_id}",
+            {
+                "operation_type": "tools_list",
+                "operation_id": f"tools_list_{vmcp_id}",
+                "result": {"success": True, "tool_count": len(tools), "tools": tools[:5]},
+                "level": "info",
+            }
+        ))
+        return len(tools)
+
+    @telemetry.trace_method("[Benchmark]: Eager")
+    def eager(vmcp_id):
+        telemetry.log_to_span(
+            f"Successfully listed {len(tools)} tools for vMCP {vmcp_id}",
+            operation_type="tools_list",
+            operation_id=f"tools_list_{vmcp_id}",
+            result={"success": True, "tool_count": len(tools), "tools": tools[:5]},
+            level="info"
+        )
+        return len(tools)
+
+    return baseline, guarded, lazy, eager
+
+
+def configure(enabled: bool, ratio: float = 1.0) -> None:
+    """Switch the tracing mode the decorators and helpers see."""
+    telemetry.TRACING_ENABLED = enabled
+    telemetry._tracer = None
+    if enabled:
+        from opentelemetry.sdk.trace import TracerProvider
+
+        provider = TracerProvider(sampler=telemetry._build_sampler(ratio))
+        telemetry._tracer = provider.get_tracer("benchmark")
+
+
+def per_call_ns(func, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func("vmcp-1234")
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200_000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print(f"\n📊 Tracing overhead ({args.calls} calls, ns per call)")
+    print("=" * 60)
+
+    configure(enabled=False)
+    baseline, guarded, lazy, eager = build_functions()
+    base_ns = per_call_ns(baseline, args.calls)
+    rows = [
+        ("baseline", base_ns),
+        ("disabled (guarded)", per_call_ns(guarded, args.calls)),
+        ("disabled (lazy builder)", per_call_ns(lazy, args.calls)),
+        ("disabled (eager args)", per_call_ns(eager, args.calls)),
+    ]
+    undecorated = lazy.__wrapped__ if hasattr(lazy, "__wrapped__") else lazy
+    print(f"decorator returns the raw function when disabled: {undecorated is lazy}")
+
+    try:
+        import opentelemetry.sdk  # noqa: F401
+    except ImportError:
+        opentelemetry_sdk = False
+    else:
+        opentelemetry_sdk = True
+
+    if opentelemetry_sdk:
+        enabled_calls = max(args.calls // 10, 1)
+        for ratio in (0.0, 1.0):
+            configure(enabled=True, ratio=ratio)
+            _, guarded_enabled, _, _ = build_functions()
+            rows.append((f"enabled, ratio {ratio:g}", per_call_ns(guarded_enabled, enabled_calls)))
+        configure(enabled=False)
+
+    for label, ns in rows:
+        print(f"{label:<30}{ns:>10.0f}{ns - base_ns:>+12.0f}")
+
+    if not opentelemetry_sdk:
+        print("\n💡 Install the OpenTelemetry SDK to benchmark the enabled path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
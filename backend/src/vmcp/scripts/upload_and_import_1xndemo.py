@@ -20,13 +20,14 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from vmcp.vmcps.models import VMCPConfig
+from vmcp.storage.blob_service import acquire_blob_content
+from vmcp.storage.blob_store import get_blob_store
 from vmcp.storage.database import init_db, SessionLocal
 from vmcp.storage.models import GlobalPublicVMCPRegistry, Blob
 from vmcp.vmcps.vmcp_config_manager.config_core import VMCPConfigManager
 from vmcp.utilities.logging import setup_logging
 from rich.console import Console
 import uuid
-import base64
 from datetime import datetime
 
 # Setup logging
@@ -83,11 +84,13 @@ def upload_and_update_custom_resources_for_1xndemo(session, json_data: Dict[str,
                     updated_resources.append(resource)
                     continue
             
-            # Read file content
+            # Stream file content into the chunk store
+            store = get_blob_store()
             with open(file_path, 'rb') as f:
-                file_content = f.read()
+                written = store.write_stream(f)
             
-            file_size = len(file_content)
+            content = acquire_blob_content(session, written, store.backend_name)
+            file_size = written["size"]
             normalized_name = Path(original_filename).stem
             
             # Generate unique blob ID
@@ -97,12 +100,7 @@ def upload_and_update_custom_resources_for_1xndemo(session, json_data: Dict[str,
             file_ext = Path(original_filename).suffix
             stored_filename = f"{normalized_name}_{blob_id}{file_ext}"
             
-            # Encode binary content as base64
             content_type = resource.get("content_type", "application/octet-stream")
-            if content_type.startswith('text/'):
-                content_str = file_content.decode('utf-8')
-            else:
-                content_str = base64.b64encode(file_content).decode('utf-8')
             
             # Create Blob record in user's storage (OSS doesn't have public vMCPs)
             new_blob = Blob(
@@ -112,10 +110,13 @@ def upload_and_update_custom_resources_for_1xndemo(session, json_data: Dict[str,
                 original_filename=original_filename,
                 filename=stored_filename,
                 resource_name=resource.get("resource_name", original_filename),
-                content=content_str,
+                content="",
+                chunks=content.chunks,
+                storage_backend=content.storage_backend,
+                content_hash=content.sha256,
                 content_type=content_type,
                 size=file_size,
-                checksum=None,  # Could calculate MD5 if needed
+                checksum=written["md5"],
                 is_public=False,
                 widget_id=None,
                 created_at=datetime.now(),
@@ -10,7 +10,6 @@ Usage:
 
 import json
 import sys
-import base64
 import uuid
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -34,6 +33,8 @@ def load_vmcp_config(json_file_path: Path) -> Optional[Dict[str, Any]]:
 
 def upload_logo_file(user_id: int, vmcp_id: str, session) -> Optional[str]:
     """Upload the logo file as a blob and return the blob ID"""
+    from vmcp.storage.blob_service import acquire_blob_content
+    from vmcp.storage.blob_store import get_blob_store
     from vmcp.storage.models import Blob
     
     try:
@@ -50,11 +51,13 @@ def upload_logo_file(user_id: int, vmcp_id: str, session) -> Optional[str]:
             else:
                 return None
         
-        # Read file content
+        # Stream file content into the chunk store
         with open(logo_file, 'rb') as f:
-            file_content = f.read()
+            store = get_blob_store()
+            written = store.write_stream(f)
         
-        file_size = len(file_content)
+        content = acquire_blob_content(session, written, store.backend_name)
+        file_size = written["size"]
         original_filename = "1xn_logo-med-size.png"
         normalized_name = "1xn_logo-med-size"
         
@@ -64,9 +67,6 @@ def upload_logo_file(user_id: int, vmcp_id: str, session) -> Optional[str]:
         # Create stored filename
         stored_filename = f"{normalized_name}_{blob_id}.png"
         
-        # Encode binary content as base64
-        content_str = base64.b64encode(file_content).decode('utf-8')
-        
         # Create blob record
         new_blob = Blob(
             id=blob_id,
@@ -74,9 +74,13 @@ def upload_logo_file(user_id: int, vmcp_id: str, session) -> Optional[str]:
             original_filename=original_filename,
             filename=stored_filename,
             resource_name=f"file://{normalized_name}",
-            content=content_str,
+            content="",
+            chunks=content.chunks,
+            storage_backend=content.storage_backend,
+            content_hash=content.sha256,
             content_type="image/png",
             size=file_size,
+            checksum=written["md5"],
             vmcp_id=vmcp_id,
             widget_id=None,
             is_public=False,
@@ -144,6 +148,15 @@ def upload_vmcp_to_database(vmcp_config: Dict[str, Any], user_id: int):
         
         # Extract VMCP ID from config (e.g., "1xndemo" from metadata or name)
         vmcp_id = vmcp_config.get("name", "1xndemo")
+
+        # Names are unique per user: leave a vMCP the user created under this name alone
+        name_taken = session.query(VMCP.id).filter(
+            VMCP.user_id == user_id,
+            VMCP.name == vmcp_config.get("name", vmcp_id),
+            VMCP.vmcp_id != vmcp_id
+        ).first()
+        if name_taken:
+            return False, "name conflict"
         
         # Upload logo file as blob
         logo_blob_id = upload_logo_file(user_id, vmcp_id, session)
@@ -247,6 +260,7 @@ def upload_vmcp_to_all_users(vmcp_config: Dict[str, Any]):
 
             success_count = 0
             failed_count = 0
+            conflict_count = 0
             created_count = 0
             updated_count = 0
 
@@ -259,6 +273,8 @@ def upload_vmcp_to_all_users(vmcp_config: Dict[str, Any]):
                             created_count += 1
                         else:
                             updated_count += 1
+                    elif action == "name conflict":
+                        conflict_count += 1
                     progress.update(upload_task, advance=1)
                 except Exception as e:
                     failed_count += 1
@@ -272,6 +288,8 @@ def upload_vmcp_to_all_users(vmcp_config: Dict[str, Any]):
             console.print(f"   [green]+[/green] Created: {created_count}")
         if updated_count > 0:
             console.print(f"   [blue]~[/blue] Updated: {updated_count}")
+        if conflict_count > 0:
+            console.print(f"[yellow]⚠[/yellow] {conflict_count} user(s) skipped: a vMCP named '{vmcp_config.get('name')}' already exists")
         if failed_count > 0:
             console.print(f"[yellow]⚠[/yellow] {failed_count} user(s) failed to process")
 
@@ -254,6 +254,14 @@ class MCPServerStatus(BaseModel):
     last_connected: Optional[datetime] = Field(None, description="Last connection time")
     last_error: Optional[str] = Field(None, description="Last error message")
     requires_auth: bool = Field(False, description="Whether server requires authentication")
+    circuit: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Circuit breaker state, failure counters and per-operation latency/timeouts (this worker)"
+    )
+    replicas: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Balancing policy, hedging counters and per-replica state, for servers with endpoints (this worker)"
+    )
 
 class MCPConnectionInfo(BaseModel):
     """MCP connection operation details."""
@@ -310,6 +318,30 @@ class MCPSystemStats(BaseModel):
     
     servers: MCPServerStats = Field(..., description="Server statistics")
     capabilities: MCPCapabilitiesStats = Field(..., description="Capabilities statistics")
+    upstream_requests: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Upstream MCP calls executed vs coalesced per method (this worker)"
+    )
+    result_caches: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Hit/miss/eviction counters and size per result cache (this worker)"
+    )
+    deferred_writes: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Deferred, coalesced and written counts of write-behind database writes (this worker)"
+    )
+    admission: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Concurrency limit, queue depth, admission counters and wait percentiles per server_id (this worker)"
+    )
+    health_monitor: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Watched servers, background probes, status transitions and status reads served from memory (this worker)"
+    )
+    prewarm: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Running upstream session prewarms, and servers warmed, already warm or failing to warm (this worker)"
+    )
 
 # ============================================================================
 # MCP REGISTRY MODELS
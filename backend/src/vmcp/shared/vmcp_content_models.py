@@ -8,7 +8,7 @@ shape and validation where we know the structure, while remaining permissive.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -90,5 +90,8 @@ class VMCPConfigData(_PermissiveBaseModel):
     selected_tools: Dict[str, List[str]] = Field(default_factory=dict)
     selected_prompts: Dict[str, List[str]] = Field(default_factory=dict)
     selected_resources: Dict[str, List[str]] = Field(default_factory=dict)
+    prewarm: Optional[Literal["none", "lazy", "eager"]] = Field(
+        None, description="When agent sessions warm upstream sessions: none, lazy or eager (default VMCP_UPSTREAM_PREWARM)"
+    )
 
 
@@ -7,14 +7,19 @@ This is a simplified version for OSS - single user, no complex authentication.
 
 import hashlib
 import logging
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import unquote
 
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from vmcp.storage.cache_bus import get_cache_bus
 from vmcp.storage.database import SessionLocal
 from vmcp.storage.models import (
     VMCP,
@@ -32,13 +37,107 @@ from vmcp.storage.models import (
     VMCPEnvironment,
     VMCPMCPMapping,
     VMCPStats,
+    json_field,
+    vmcp_summary_columns,
 )
 from vmcp.vmcps.models import VMCPConfig
+from vmcp.utilities import json_codec
 from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging(__name__)
 
 
+def _unchanged(stored: Any, value: Any) -> bool:
+    """Whether storing value in a JSON column would leave the stored document as it is."""
+    if stored == value:
+        return True
+    try:
+        # Compare in stored form (pydantic models, datetimes, tuples become JSON)
+        return json_codec.loads(json_codec.dumps(value)) == stored
+    except (TypeError, ValueError):
+        return False
+
+
+def _apply_server_status(config: Dict[str, Any], row) -> Dict[str, Any]:
+    """Overlay the narrow status columns of an MCPServer row onto its config JSON."""
+    if row.status is not None:
+        config["status"] = row.status
+        config["last_error"] = row.last_error
+        config["last_connected"] = row.last_connected.isoformat() if row.last_connected else None
+    return config
+
+
+def _server_status_columns(server_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the narrow status column values from a serialized server config."""
+    last_connected = server_config.get("last_connected")
+    if isinstance(last_connected, str):
+        try:
+            last_connected = datetime.fromisoformat(last_connected)
+        except ValueError:
+            last_connected = None
+    return {
+        "status": server_config.get("status") or "unknown",
+        "last_error": server_config.get("last_error"),
+        "last_connected": last_connected,
+    }
+
+
+class _VMCPNameCache:
+    """
+    LRU of resolved vMCP names: (user_id, vmcp_username, vmcp_name) -> vMCP ID.
+
+    Only successful lookups are cached. Entries are dropped by target ID when
+    a vMCP is saved (it may have been renamed) or deleted, in every worker via
+    the cache bus topic ``VMCP_CACHE_TOPIC`` (key ``"<user_id>:<vmcp_id>"``).
+    The topic is also published when a vMCP's environment is saved.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[Tuple[str, Optional[str], str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, Optional[str], str]) -> Optional[str]:
+        with self._lock:
+            vmcp_id = self._items.get(key)
+            if vmcp_id is not None:
+                self._items.move_to_end(key)
+            return vmcp_id
+
+    def put(self, key: Tuple[str, Optional[str], str], vmcp_id: str) -> None:
+        with self._lock:
+            self._items[key] = vmcp_id
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def forget(self, user_id: Any, vmcp_id: str) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key, value in self._items.items() if key[0] == user_id and value == vmcp_id]:
+                del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_vmcp_name_cache = _VMCPNameCache()
+
+VMCP_CACHE_TOPIC = "vmcp"
+
+
+def _on_vmcp_invalidated(key: str) -> None:
+    if key == "*":
+        _vmcp_name_cache.clear()
+        return
+    user_id, _, vmcp_id = key.partition(":")
+    _vmcp_name_cache.forget(user_id, vmcp_id)
+
+
+get_cache_bus().subscribe(VMCP_CACHE_TOPIC, _on_vmcp_invalidated)
+
+
 def sanitize_agent_name(agent_name: str) -> str:
     """Sanitize agent name to avoid file path issues"""
     return agent_name.replace("/", "_").replace("\\", "_").replace("..", "_")
@@ -72,13 +171,16 @@ class StorageBase:
         """Get all MCP servers for the user."""
         session = self._get_session()
         try:
-            servers = session.query(MCPServer).filter(
+            servers = session.query(
+                MCPServer.server_id, MCPServer.mcp_server_config,
+                MCPServer.status, MCPServer.last_error, MCPServer.last_connected
+            ).filter(
                 MCPServer.user_id == self.user_id
             ).all()
 
             servers_dict = {}
             for server in servers:
-                servers_dict[server.server_id] = server.mcp_server_config
+                servers_dict[server.server_id] = _apply_server_status(server.mcp_server_config, server)
 
             logger.debug(f"Found {len(servers_dict)} MCP servers for user {self.user_id}")
             return servers_dict
@@ -107,6 +209,68 @@ class StorageBase:
         finally:
             session.close()
 
+    def get_mcp_server_config(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """Get only the stored MCP server config JSON for one server."""
+        session = self._get_session()
+        try:
+            row = session.query(
+                MCPServer.mcp_server_config,
+                MCPServer.status, MCPServer.last_error, MCPServer.last_connected
+            ).filter(
+                MCPServer.user_id == self.user_id,
+                MCPServer.server_id == server_id
+            ).first()
+            return _apply_server_status(row.mcp_server_config, row) if row else None
+
+        except Exception as e:
+            logger.error(f"Error getting MCP server config {server_id}: {e}")
+            return None
+        finally:
+            session.close()
+
+    def get_mcp_server_summaries(self) -> List[Dict[str, Any]]:
+        """
+        Get a lightweight summary of each MCP server for listings and stats.
+
+        Only the name, status, transport and capability counts are taken from
+        the stored config; capability details are never turned into models.
+        """
+        session = self._get_session()
+        try:
+            rows = session.query(
+                MCPServer.server_id, MCPServer.name, MCPServer.mcp_server_config,
+                MCPServer.status, MCPServer.last_error, MCPServer.last_connected
+            ).filter(
+                MCPServer.user_id == self.user_id
+            ).all()
+
+            summaries = []
+            for row in rows:
+                config = _apply_server_status(row.mcp_server_config or {}, row)
+                summaries.append({
+                    "server_id": row.server_id,
+                    "name": config.get("name") or row.name,
+                    "description": config.get("description"),
+                    "status": config.get("status") or "unknown",
+                    "transport_type": config.get("transport_type"),
+                    "url": config.get("url"),
+                    "enabled": config.get("enabled", True),
+                    "last_connected": config.get("last_connected"),
+                    "last_error": config.get("last_error"),
+                    "tools": config.get("tools") or [],
+                    "resources": config.get("resources") or [],
+                    "resource_templates": config.get("resource_templates") or [],
+                    "prompts": config.get("prompts") or [],
+                })
+            logger.debug(f"Summarized {len(summaries)} MCP servers for user {self.user_id}")
+            return summaries
+
+        except Exception as e:
+            logger.error(f"Error getting MCP server summaries: {e}")
+            return []
+        finally:
+            session.close()
+
     def get_mcp_server(self, server_id: str) -> Dict[str, Any]:
         """Get MCP server configuration by ID."""
         session = self._get_session()
@@ -124,7 +288,7 @@ class StorageBase:
                 "server_id": server.server_id,
                 "name": server.name,
                 "description": server.description,
-                "mcp_server_config": server.mcp_server_config,
+                "mcp_server_config": _apply_server_status(server.mcp_server_config, server),
                 "oauth_state": server.oauth_state,
             }
 
@@ -134,35 +298,46 @@ class StorageBase:
         finally:
             session.close()
 
+    def _upsert_mcp_server(self, session: Session, server_id: str, server_config: Dict[str, Any]) -> bool:
+        """Insert or update one MCP server row in the given session (no commit); False if nothing changed."""
+        status_columns = _server_status_columns(server_config)
+        server = session.query(MCPServer).filter(
+            MCPServer.user_id == self.user_id,
+            MCPServer.server_id == server_id
+        ).first()
+
+        if server and _unchanged(server.mcp_server_config, server_config) and all(
+            getattr(server, column) == value for column, value in status_columns.items()
+        ):
+            return False
+        if server:
+            # Update existing server
+            server.name = server_config.get("name", server.name)
+            server.description = server_config.get("description")
+            server.mcp_server_config = server_config
+            for column, value in status_columns.items():
+                setattr(server, column, value)
+            logger.info(f"Updated MCP server: {server_id}")
+        else:
+            # Create new server
+            server = MCPServer(
+                id=f"{self.user_id}_{server_id}",
+                user_id=self.user_id,
+                server_id=server_id,
+                name=server_config.get("name", server_id),
+                description=server_config.get("description"),
+                mcp_server_config=server_config,
+                **status_columns,
+            )
+            session.add(server)
+            logger.info(f"Created new MCP server: {server_id}")
+        return True
+
     def save_mcp_server(self, server_id: str, server_config: Dict[str, Any]) -> bool:
         """Save or update MCP server configuration."""
         session = self._get_session()
         try:
-            # Check if server exists
-            server = session.query(MCPServer).filter(
-                MCPServer.user_id == self.user_id,
-                MCPServer.server_id == server_id
-            ).first()
-
-            if server:
-                # Update existing server
-                server.name = server_config.get("name", server.name)
-                server.description = server_config.get("description")
-                server.mcp_server_config = server_config
-                logger.info(f"Updated MCP server: {server_id}")
-            else:
-                # Create new server
-                server = MCPServer(
-                    id=f"{self.user_id}_{server_id}",
-                    user_id=self.user_id,
-                    server_id=server_id,
-                    name=server_config.get("name", server_id),
-                    description=server_config.get("description"),
-                    mcp_server_config=server_config,
-                )
-                session.add(server)
-                logger.info(f"Created new MCP server: {server_id}")
-
+            self._upsert_mcp_server(session, server_id, server_config)
             session.commit()
             return True
 
@@ -174,32 +349,80 @@ class StorageBase:
             session.close()
 
     def save_mcp_servers(self, servers: List[Dict[str, Any]]) -> bool:
-        """Save multiple MCP servers to database."""
+        """Save multiple MCP servers to database in a single transaction."""
+        return self.save_mcp_server_changes(servers, [])
+
+    def save_mcp_server_changes(self, servers: List[Dict[str, Any]],
+                                status_updates: List[Dict[str, Any]]) -> bool:
+        """
+        Persist a batch of MCP server changes in one transaction.
+
+        Args:
+            servers: Full server configs to upsert (config JSON and status columns)
+            status_updates: Dicts with server_id, status, last_error and
+                last_connected; only the narrow status columns are updated
+
+        Returns:
+            True if the whole batch was committed
+        """
+        if not servers and not status_updates:
+            return True
+
+        session = self._get_session()
         try:
-            logger.info(f"Saving {len(servers)} MCP servers")
-            
-            success = True
-            for server in servers:
-                server_id = server.get("server_id")
-                if server_id:
-                    # Use the existing save_mcp_server method for each server
-                    if not self.save_mcp_server(server_id, server):
-                        success = False
-                        logger.error(f"Failed to save MCP server: {server_id}")
-                else:
+            written = 0
+            for server_config in servers:
+                server_id = server_config.get("server_id")
+                if not server_id:
                     logger.error("No server_id found in server config")
-                    success = False
-            
-            if success:
-                logger.info(f"Successfully saved {len(servers)} MCP servers")
-            else:
-                logger.error("Some MCP servers failed to save")
-            
-            return success
-            
+                    session.rollback()
+                    return False
+                written += self._upsert_mcp_server(session, server_id, server_config)
+
+            for update in status_updates:
+                session.query(MCPServer).filter(
+                    MCPServer.user_id == self.user_id,
+                    MCPServer.server_id == update["server_id"]
+                ).update({
+                    MCPServer.status: update["status"],
+                    MCPServer.last_error: update.get("last_error"),
+                    MCPServer.last_connected: update.get("last_connected"),
+                }, synchronize_session=False)
+
+            session.commit()
+            logger.info(f"Saved {written} of {len(servers)} MCP server configs and {len(status_updates)} status updates")
+            return True
+
         except Exception as e:
             logger.error(f"Error saving MCP servers: {e}")
+            session.rollback()
             return False
+        finally:
+            session.close()
+
+    def save_mcp_server_session(self, server_id: str, session_id: Optional[str]) -> bool:
+        """Set the upstream session id inside a server's config JSON, leaving other fields as stored."""
+        session = self._get_session()
+        try:
+            server = session.query(MCPServer).filter(
+                MCPServer.user_id == self.user_id,
+                MCPServer.server_id == server_id
+            ).first()
+            if not server:
+                logger.warning(f"MCP server not found for session update: {server_id}")
+                return False
+            if server.mcp_server_config.get("session_id") == session_id:
+                return True
+            server.mcp_server_config = {**server.mcp_server_config, "session_id": session_id}
+            session.commit()
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving session id for MCP server {server_id}: {e}")
+            session.rollback()
+            return False
+        finally:
+            session.close()
 
     def delete_mcp_server(self, server_id: str) -> bool:
         """Delete MCP server by ID."""
@@ -238,11 +461,19 @@ class StorageBase:
                 VMCP.vmcp_id == vmcp_id
             ).first()
 
+            summary = vmcp_summary_columns(vmcp_config)
+            vmcp_uuid = vmcp_config.get("id") or vmcp_id
+            if vmcp and vmcp.uuid == vmcp_uuid and _unchanged(vmcp.vmcp_config, vmcp_config):
+                # Nothing to write (and no cached copy to invalidate)
+                return True
             if vmcp:
                 # Update existing vMCP
                 vmcp.name = vmcp_config.get("name", vmcp.name)
                 vmcp.description = vmcp_config.get("description")
+                vmcp.uuid = vmcp_uuid
                 vmcp.vmcp_config = vmcp_config
+                for column, value in summary.items():
+                    setattr(vmcp, column, value)
                 logger.info(f"Updated vMCP: {vmcp_id}")
             else:
                 # Create new vMCP
@@ -250,16 +481,25 @@ class StorageBase:
                     id=f"{self.user_id}_{vmcp_id}",
                     user_id=self.user_id,
                     vmcp_id=vmcp_id,
+                    uuid=vmcp_uuid,
                     name=vmcp_config.get("name", vmcp_id),
                     description=vmcp_config.get("description"),
                     vmcp_config=vmcp_config,
+                    **summary,
                 )
                 session.add(vmcp)
                 logger.info(f"Created new vMCP: {vmcp_id}")
 
             session.commit()
+            # The vMCP may have been renamed
+            get_cache_bus().publish(VMCP_CACHE_TOPIC, f"{self.user_id}:{vmcp_uuid}")
             return True
 
+        except IntegrityError:
+            # idx_vmcp_user_name: another vMCP of this user has the name
+            logger.warning(f"Cannot save vMCP {vmcp_id}: vMCP with name '{vmcp_config.get('name')}' already exists")
+            session.rollback()
+            return False
         except Exception as e:
             logger.error(f"Error saving vMCP {vmcp_id}: {e}")
             session.rollback()
@@ -523,67 +763,67 @@ class StorageBase:
             return None
 
     def list_vmcps(self) -> List[Dict[str, Any]]:
-        """List all vMCP configurations for the user."""
+        """List all vMCP configurations for the user.
+
+        Reads only the denormalized summary columns; vmcp_config is loaded
+        just for rows whose summary has not been computed yet (e.g. written
+        by a script that bypassed save_vmcp), and those rows are backfilled.
+        """
         session = self._get_session()
         try:
-            vmcps = session.query(VMCP).filter(
+            rows = session.query(
+                VMCP.id,
+                VMCP.vmcp_id,
+                VMCP.name,
+                VMCP.description,
+                VMCP.created_at,
+                VMCP.updated_at,
+                VMCP.total_tools,
+                VMCP.total_resources,
+                VMCP.total_resource_templates,
+                VMCP.total_prompts,
+                VMCP.server_count,
+                VMCP.server_summaries,
+                VMCP.is_public,
+                VMCP.public_at,
+                VMCP.public_tags,
+            ).filter(
                 VMCP.user_id == self.user_id,
                 VMCP.vmcp_id.isnot(None)  # Only include records with valid vmcp_id
             ).all()
 
             vmcp_list = []
-            for vmcp in vmcps:
+            for row in rows:
                 # Skip if vmcp_id is None (safety check)
-                if not vmcp.vmcp_id:
-                    logger.warning(f"Skipping vMCP with None vmcp_id: {vmcp.id}")
+                if not row.vmcp_id:
+                    logger.warning(f"Skipping vMCP with None vmcp_id: {row.id}")
                     continue
 
-                config = vmcp.vmcp_config or {}
-                
-                # Extract selected_servers for server count and basic info
-                # Check both top-level and nested in vmcp_config (VMCPConfig structure)
-                selected_servers = config.get("selected_servers") or config.get("vmcp_config", {}).get("selected_servers", [])
-                server_count = len(selected_servers) if isinstance(selected_servers, list) else 0
-                
-                # Create lightweight server summaries (id, name, status, url, favicon_url)
-                server_summaries = []
-                if isinstance(selected_servers, list):
-                    for server in selected_servers:
-                        if isinstance(server, dict):
-                            server_summaries.append({
-                                "id": server.get("server_id") or server.get("id"),
-                                "name": server.get("name", ""),
-                                "status": server.get("status", "unknown"),
-                                "url": server.get("url"),
-                                "favicon_url": server.get("favicon_url")
-                            })
-                
-                # Extract public status fields (check both top-level and nested in config)
-                is_public = config.get("is_public", False)
-                public_at = config.get("public_at")
-                public_tags = config.get("public_tags", [])
-                
+                summary = row._asdict()
+                if row.server_count is None:
+                    summary = self._backfill_vmcp_summary(session, row.id)
+
                 # Build vmcp_config with selected_servers for frontend compatibility
-                vmcp_config_data = {}
-                if selected_servers:
-                    vmcp_config_data["selected_servers"] = server_summaries
-                
+                vmcp_config_data = None
+                if summary["server_count"]:
+                    vmcp_config_data = {"selected_servers": summary["server_summaries"] or []}
+
                 vmcp_list.append({
-                    "id": vmcp.vmcp_id,
-                    "vmcp_id": vmcp.vmcp_id,
-                    "name": vmcp.name or "Unnamed vMCP",
-                    "description": vmcp.description,
-                    "total_tools": config.get("total_tools", 0),
-                    "total_resources": config.get("total_resources", 0),
-                    "total_resource_templates": config.get("total_resource_templates", 0),
-                    "total_prompts": config.get("total_prompts", 0),
-                    "created_at": vmcp.created_at.isoformat() if vmcp.created_at else None,
-                    "updated_at": vmcp.updated_at.isoformat() if vmcp.updated_at else None,
-                    "is_public": is_public,
-                    "public_at": public_at,
-                    "public_tags": public_tags if isinstance(public_tags, list) else [],
-                    "server_count": server_count,
-                    "vmcp_config": vmcp_config_data if vmcp_config_data else None,
+                    "id": row.vmcp_id,
+                    "vmcp_id": row.vmcp_id,
+                    "name": row.name or "Unnamed vMCP",
+                    "description": row.description,
+                    "total_tools": summary["total_tools"] or 0,
+                    "total_resources": summary["total_resources"] or 0,
+                    "total_resource_templates": summary["total_resource_templates"] or 0,
+                    "total_prompts": summary["total_prompts"] or 0,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                    "is_public": bool(summary["is_public"]),
+                    "public_at": summary["public_at"],
+                    "public_tags": summary["public_tags"] or [],
+                    "server_count": summary["server_count"],
+                    "vmcp_config": vmcp_config_data,
                 })
 
             logger.debug(f"Found {len(vmcp_list)} vMCPs for user {self.user_id}")
@@ -595,6 +835,18 @@ class StorageBase:
         finally:
             session.close()
 
+    def _backfill_vmcp_summary(self, session, row_id: str) -> Dict[str, Any]:
+        """Compute and store the summary columns of one VMCP row from its config."""
+        vmcp_config = session.query(VMCP.vmcp_config).filter(VMCP.id == row_id).scalar()
+        summary = vmcp_summary_columns(vmcp_config)
+        # Keep updated_at as is: the vMCP itself did not change
+        session.query(VMCP).filter(VMCP.id == row_id).update(
+            {**summary, "updated_at": VMCP.updated_at}, synchronize_session=False
+        )
+        session.commit()
+        logger.info(f"Backfilled listing summary for vMCP {row_id}")
+        return summary
+
     def delete_vmcp(self, vmcp_id: str) -> bool:
         """Delete vMCP by ID.
         
@@ -725,6 +977,7 @@ class StorageBase:
             return False
         finally:
             session.close()
+            get_cache_bus().publish(VMCP_CACHE_TOPIC, f"{self.user_id}:{decoded_vmcp_id}")
 
     def update_vmcp(self, vmcp_config: VMCPConfig) -> bool:
         """Update an existing VMCP configuration."""
@@ -765,6 +1018,8 @@ class StorageBase:
                 VMCPEnvironment.vmcp_id == vmcp.id
             ).first()
 
+            if env and _unchanged(env.environment_vars, environment_vars):
+                return True
             if env:
                 # Update existing environment
                 env.environment_vars = environment_vars
@@ -781,6 +1036,8 @@ class StorageBase:
                 logger.info(f"Created environment for vMCP: {vmcp_id}")
 
             session.commit()
+            # Renders memoized with the old environment are stale
+            get_cache_bus().publish(VMCP_CACHE_TOPIC, f"{self.user_id}:{vmcp_id}")
             return True
 
         except Exception as e:
@@ -1607,27 +1864,36 @@ class StorageBase:
         
         Returns:
             vMCP ID (UUID for private vMCPs, public_vmcp_id for public vMCPs) or None if not found
+
+        Successful lookups are cached per (user_id, vmcp_username, vmcp_name)
+        until the vMCP is saved or deleted.
         """
+        cache_key = (str(self.user_id), vmcp_username, vmcp_name)
+        cached_vmcp_id = _vmcp_name_cache.get(cache_key)
+        if cached_vmcp_id:
+            return cached_vmcp_id
+
+        vmcp_id = self._find_vmcp_name(vmcp_name, vmcp_username)
+        if vmcp_id:
+            _vmcp_name_cache.put(cache_key, vmcp_id)
+        return vmcp_id
+
+    def _find_vmcp_name(self, vmcp_name: str, vmcp_username: Optional[str] = None) -> Optional[str]:
+        """Resolve a vMCP name without the cache (see find_vmcp_name)."""
+        session = self._get_session()
         try:
-            # Query the database directly to get the actual vmcp_config
-            session = self._get_session()
-            vmcps = session.query(VMCP).filter(
+            # Indexed (user_id, name) lookup; rows written before the uuid
+            # column existed fall back to the id inside vmcp_config
+            vmcp = session.query(
+                func.coalesce(VMCP.uuid, json_field(VMCP.vmcp_config, "id")).label("uuid"),
+            ).filter(
                 VMCP.user_id == self.user_id,
                 VMCP.name == vmcp_name
-            ).all()
-            
-            logger.info(f"🔍 Searching for vMCP with name '{vmcp_name}' in {len(vmcps)} vMCPs")
-            
-            for vmcp in vmcps:
-                vmcp_config = vmcp.vmcp_config or {}
-                actual_vmcp_id = vmcp_config.get('id')  # This is the UUID from the JSON
-                table_vmcp_id = vmcp.vmcp_id  # This is the composite ID from the table
-                
-                logger.info(f"🔍 Checking vMCP: table_id={table_vmcp_id}, actual_id={actual_vmcp_id}, name={vmcp.name}")
-                
-                if vmcp.name == vmcp_name and actual_vmcp_id:
-                    logger.info(f"✅ Found vMCP: {vmcp_name} -> {actual_vmcp_id}")
-                    return actual_vmcp_id  # Return the UUID from vmcp_config, not the table ID
+            ).first()
+
+            if vmcp and vmcp.uuid:
+                logger.info(f"✅ Found vMCP: {vmcp_name} -> {vmcp.uuid}")
+                return vmcp.uuid  # Return the UUID from vmcp_config, not the table ID
             
             # If not found in private registry, check user_public_vmcp_registry (enterprise mode)
             # This follows the same pattern as delete_vmcp method
@@ -1697,6 +1963,8 @@ class StorageBase:
         except Exception as e:
             logger.error(f"Error finding vMCP by name '{vmcp_name}': {e}")
             return None
+        finally:
+            session.close()
     
     def save_user_vmcp_logs(self, log_entry: Dict[str, Any], log_suffix: str = "") -> bool:
         """Save vMCP operation logs (OSS version - using save_vmcp_stats method)"""
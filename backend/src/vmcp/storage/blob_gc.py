@@ -0,0 +1,210 @@
+"""
+Garbage collection for deduplicated blob content.
+
+Deleting a blob only decrements the refcount of its ``BlobContent`` entry.
+The collector removes entries whose refcount has stayed at zero for longer
+than the grace period, drops derived renditions (see derived_cache.py) whose
+source or converter version is gone, then sweeps chunks that nothing
+references anymore (which also covers chunks left behind by interrupted or
+deduplicated uploads).
+
+The grace period protects uploads that are in flight: their chunks are
+written before the content row is committed, and reused chunks are touched
+by ``BlobStore.write_stream`` so they look recently used.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import func
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("BLOB_GC")
+
+
+def collect_blob_garbage(dry_run: bool = False, grace_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Remove unreferenced blob content and chunks.
+
+    Args:
+        dry_run: Only report what would be removed
+        grace_seconds: Minimum age of unreferenced data (defaults to settings.blob_gc_grace_period)
+
+    Returns:
+        Report with removed content entries, removed chunks and bytes reclaimed per backend
+    """
+    from vmcp.storage.blob_store import get_blob_store
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.derived_cache import current_converter_versions
+    from vmcp.storage.models import BlobContent, BlobDerivative
+
+    grace = settings.blob_gc_grace_period if grace_seconds is None else grace_seconds
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+    report: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "contents_removed": 0,
+        "derivatives_removed": 0,
+        "chunks_removed": 0,
+        "bytes_reclaimed": 0,
+        "backends": {},
+    }
+
+    session = SessionLocal()
+    try:
+        dead = session.query(BlobContent.sha256).filter(
+            BlobContent.ref_count <= 0,
+            BlobContent.updated_at < cutoff,
+        ).all()
+        for (sha256,) in dead:
+            if dry_run:
+                report["contents_removed"] += 1
+                continue
+            # Re-check the refcount in the DELETE so a concurrent upload that
+            # just took a reference keeps its content
+            report["contents_removed"] += session.query(BlobContent).filter(
+                BlobContent.sha256 == sha256,
+                BlobContent.ref_count <= 0,
+            ).delete(synchronize_session=False)
+        if not dry_run:
+            session.commit()
+
+        live_query = session.query(BlobContent.sha256, BlobContent.storage_backend, BlobContent.chunks)
+        if dry_run:
+            live_query = live_query.filter(BlobContent.sha256.notin_([sha256 for (sha256,) in dead]))
+        live: Dict[str, Set[str]] = {}
+        live_hashes: Set[str] = set()
+        for sha256, backend, manifest in live_query.all():
+            live_hashes.add(sha256)
+            live.setdefault(backend, set()).update(entry["digest"] for entry in manifest or [])
+
+        # Derived renditions live as long as their source content and converter version
+        versions = current_converter_versions()
+        stale = []
+        for derivative in session.query(BlobDerivative).all():
+            if derivative.content_hash in live_hashes and versions.get(derivative.converter) == derivative.converter_version:
+                live.setdefault(derivative.storage_backend, set()).update(
+                    entry["digest"] for entry in derivative.chunks or []
+                )
+            else:
+                stale.append(derivative)
+        report["derivatives_removed"] = len(stale)
+        if not dry_run and stale:
+            for derivative in stale:
+                session.delete(derivative)
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    # Also include blobs that were never deduplicated (rows without content_hash)
+    _add_unhashed_blob_chunks(live)
+
+    cutoff_ts = time.time() - grace
+    backends = {settings.blob_storage_backend} | set(live)
+    for backend in sorted(backends):
+        try:
+            store = get_blob_store(backend)
+        except ValueError as e:
+            logger.warning(f"Skipping blob GC for backend {backend}: {e}")
+            continue
+
+        referenced = live.get(backend, set())
+        removed = reclaimed = 0
+        for digest, size, last_used in list(store.iter_chunks()):
+            if digest in referenced or last_used > cutoff_ts:
+                continue
+            if not dry_run:
+                try:
+                    store.delete_chunk(digest)
+                except Exception as e:
+                    logger.warning(f"Failed to delete blob chunk {digest}: {e}")
+                    continue
+            removed += 1
+            reclaimed += size
+
+        report["backends"][backend] = {"chunks_removed": removed, "bytes_reclaimed": reclaimed}
+        report["chunks_removed"] += removed
+        report["bytes_reclaimed"] += reclaimed
+
+    logger.info(
+        f"Blob GC {'(dry run) ' if dry_run else ''}removed {report['contents_removed']} content entries, "
+        f"{report['derivatives_removed']} renditions and {report['chunks_removed']} chunks, reclaiming {report['bytes_reclaimed']} bytes"
+    )
+    return report
+
+
+def _add_unhashed_blob_chunks(live: Dict[str, Set[str]]) -> None:
+    """Mark chunks of blobs without a content_hash as live."""
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.models import Blob
+
+    session = SessionLocal()
+    try:
+        rows = session.query(Blob.storage_backend, Blob.chunks).filter(
+            Blob.content_hash.is_(None),
+            Blob.chunks.isnot(None),
+        ).all()
+        for backend, manifest in rows:
+            live.setdefault(backend, set()).update(entry["digest"] for entry in manifest or [])
+    finally:
+        session.close()
+
+
+def blob_storage_report() -> Dict[str, Any]:
+    """
+    Summarize logical vs. stored blob size.
+
+    Returns:
+        Dict with blob count, logical bytes (sum over blob rows), unique content
+        entries, stored bytes and bytes saved by deduplication
+    """
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.models import Blob, BlobContent
+
+    session = SessionLocal()
+    try:
+        blob_count, logical_bytes = session.query(func.count(Blob.id), func.coalesce(func.sum(Blob.size), 0)).one()
+        content_count, stored_bytes = session.query(
+            func.count(BlobContent.sha256), func.coalesce(func.sum(BlobContent.size), 0)
+        ).filter(BlobContent.ref_count > 0).one()
+        unreferenced_count, unreferenced_bytes = session.query(
+            func.count(BlobContent.sha256), func.coalesce(func.sum(BlobContent.size), 0)
+        ).filter(BlobContent.ref_count <= 0).one()
+        inline_bytes = session.query(func.coalesce(func.sum(Blob.size), 0)).filter(
+            Blob.content_hash.is_(None)
+        ).scalar()
+    finally:
+        session.close()
+
+    return {
+        "blobs": blob_count,
+        "logical_bytes": int(logical_bytes),
+        "unique_contents": content_count,
+        "stored_bytes": int(stored_bytes) + int(inline_bytes),
+        "dedup_saved_bytes": int(logical_bytes) - int(stored_bytes) - int(inline_bytes),
+        "unreferenced_contents": unreferenced_count,
+        "unreferenced_bytes": int(unreferenced_bytes),
+    }
+
+
+async def run_blob_gc_loop(interval: Optional[int] = None) -> None:
+    """Run blob garbage collection periodically until cancelled."""
+    interval = settings.blob_gc_interval if interval is None else interval
+    if interval <= 0:
+        logger.info("Background blob GC disabled")
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(collect_blob_garbage)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background blob GC failed: {e}")
@@ -1,20 +1,32 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query
-from fastapi.responses import FileResponse, Response
-from typing import List, Optional, Union, Any
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Form, Depends, Query, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import Dict, List, Optional, Tuple, Union, Any
 from pydantic import BaseModel
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+from sqlalchemy.orm import defer
 import uuid
 import base64
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 # OSS-specific imports
-from .blob_service import BlobMetadata
+from .blob_service import (
+    BlobMetadata,
+    BlobStorageManager,
+    iter_blob_content,
+    read_blob_bytes,
+    release_blob_content,
+)
+from .derived_cache import find_converter, populate_derived_rendition
 from .dummy_user import get_user_context, UserContext
 from .database import get_db
 from .models import Blob
 from ..vmcps.vmcp_config_manager.config_core import VMCPConfigManager
 
 import logging
+from vmcp.config import settings
 from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging("BLOB_ROUTER")
@@ -70,19 +82,25 @@ def get_blob_from_db(db, blob_id: str, vmcp_id: Optional[str], user_id: str) ->
                     def __init__(self, global_blob):
                         self.id = global_blob.id
                         self.content = global_blob.content
+                        self.chunks = getattr(global_blob, 'chunks', None)
+                        self.storage_backend = getattr(global_blob, 'storage_backend', None)
+                        self.content_hash = getattr(global_blob, 'content_hash', None)
                         self.content_type = global_blob.content_type
                         self.original_filename = global_blob.original_filename
                         self.filename = global_blob.filename
                         self.resource_name = global_blob.resource_name
                         self.size = global_blob.size
+                        self.checksum = getattr(global_blob, 'checksum', None)
+                        self.updated_at = getattr(global_blob, 'updated_at', None)
+                        self.is_public = True
                 
                 logger.debug(f"Found global blob {blob_id} for public vMCP {vmcp_id}")
                 return BlobWrapper(global_blob)
         except Exception as e:
             logger.debug(f"Error querying GlobalBlob: {e}")
     
-    # Fall back to user's Blob table
-    query = db.query(Blob).filter(Blob.id == blob_id, Blob.user_id == user_id)
+    # Fall back to user's Blob table (legacy inline content is loaded only when accessed)
+    query = db.query(Blob).options(defer(Blob.content)).filter(Blob.id == blob_id, Blob.user_id == user_id)
     if vmcp_id:
         query = query.filter(Blob.vmcp_id == vmcp_id)
     
@@ -92,18 +110,164 @@ def get_blob_from_db(db, blob_id: str, vmcp_id: Optional[str], user_id: str) ->
     
     return blob
 
+def _parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single HTTP byte range ("bytes=start-end", "bytes=start-" or "bytes=-suffix").
+
+    Returns (start, end) inclusive, or None to serve the full content.
+    Raises 416 if the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        # Multipart ranges are not supported - fall back to the full body
+        return None
+
+    start_str, _, end_str = spec.partition("-")
+    try:
+        if start_str == "":
+            suffix_length = int(end_str)
+            start, end = max(size - suffix_length, 0), size - 1
+            if suffix_length <= 0:
+                start = size
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+
+@dataclass
+class BlobRequestHeaders:
+    """Range and conditional request headers for blob downloads"""
+    range: Optional[str] = None
+    if_none_match: Optional[str] = None
+    if_modified_since: Optional[str] = None
+    if_range: Optional[str] = None
+
+
+def get_blob_request_headers(
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    if_modified_since: Optional[str] = Header(None, alias="If-Modified-Since"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+) -> BlobRequestHeaders:
+    return BlobRequestHeaders(range_header, if_none_match, if_modified_since, if_range)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a stored timestamp to an aware UTC datetime truncated to seconds"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _blob_etag(blob) -> str:
+    """Strong ETag derived from the content checksum (identical bytes share an ETag)"""
+    digest = getattr(blob, 'content_hash', None) or getattr(blob, 'checksum', None) or f"{blob.id}-{blob.size}"
+    return f'"{digest}"'
+
+
+def _blob_cache_headers(blob) -> Dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for a blob"""
+    headers = {"ETag": _blob_etag(blob)}
+    last_modified = _as_utc(getattr(blob, 'updated_at', None))
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if getattr(blob, 'is_public', False):
+        headers["Cache-Control"] = f"public, max-age={settings.blob_public_cache_max_age}"
+    else:
+        # Private content may be cached but must be revalidated (a 304 round-trip)
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against an ETag"""
+    if header_value.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header_value.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _is_not_modified(blob, headers: BlobRequestHeaders, etag: str) -> bool:
+    """Evaluate If-None-Match (which takes precedence) or If-Modified-Since"""
+    if headers.if_none_match:
+        return _etag_matches(headers.if_none_match, etag)
+    if headers.if_modified_since:
+        last_modified = _as_utc(getattr(blob, 'updated_at', None))
+        try:
+            since = parsedate_to_datetime(headers.if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified and since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return last_modified <= since
+    return False
+
+
+def _blob_stream_response(blob, headers: Optional[BlobRequestHeaders] = None) -> Response:
+    """
+    Build a streaming (optionally partial) response for a blob without loading it into memory.
+
+    Returns 304 with only the validators when the client's cached copy is current.
+    """
+    headers = headers or BlobRequestHeaders()
+    cache_headers = _blob_cache_headers(blob)
+    etag = cache_headers["ETag"]
+    if _is_not_modified(blob, headers, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    if getattr(blob, 'chunks', None) is None:
+        # Legacy inline blob: load the deferred content now, the session is closed before the body streams
+        blob.content
+
+    response_headers = {
+        "Content-Disposition": f"attachment; filename={blob.original_filename}",
+        "Accept-Ranges": "bytes",
+        **cache_headers,
+    }
+    # A Range is only honoured if the client's If-Range validator is still current
+    range_header = headers.range
+    if range_header and headers.if_range and headers.if_range.strip() != etag:
+        range_header = None
+
+    byte_range = _parse_range_header(range_header, blob.size)
+    if byte_range is None:
+        response_headers["Content-Length"] = str(blob.size)
+        return StreamingResponse(iter_blob_content(blob), media_type=blob.content_type, headers=response_headers)
+
+    start, end = byte_range
+    response_headers["Content-Range"] = f"bytes {start}-{end}/{blob.size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_blob_content(blob, start, end),
+        status_code=206,
+        media_type=blob.content_type,
+        headers=response_headers
+    )
+
 @router.post("/upload")
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     vmcp_id: Optional[str] = Form(None),
     user_context = Depends(get_user_context)
 ):
     """Upload a file and return its URL (frontend compatibility)"""
     try:
-        # Validate file size (10MB limit)
-        if file.size and file.size > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-        
         # Validate vmcp_id if provided
         if vmcp_id:
             vmcp_manager = VMCPConfigManager(user_id=user_context.user_id, vmcp_id=vmcp_id)
@@ -111,96 +275,58 @@ async def upload_file(
             if not vmcp:
                 raise HTTPException(status_code=404, detail="vMCP not found")
         
-        # Generate unique blob ID
-        blob_id = str(uuid.uuid4())
-        
-        # Get file metadata
-        original_filename = file.filename or "unknown_file"
-        content_type = file.content_type or "application/octet-stream"
-        
-        # Normalize the original filename for resource_name
-        resource_name = "".join(c for c in original_filename if c.isalnum() or c in "._-").rstrip()
-        if not resource_name:
-            resource_name = "unknown_file"
-        
-        # Create stored filename
-        file_ext = Path(original_filename).suffix if original_filename else ""
-        if resource_name and resource_name != "unknown_file":
-            stored_filename = f"{resource_name}_{blob_id}{file_ext}"
-        else:
-            stored_filename = f"{blob_id}{file_ext}"
-        
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Stream the upload into the blob store (runs off the event loop)
+        blob_manager = BlobStorageManager(user_context.user_id)
+        metadata = await run_in_threadpool(
+            blob_manager.store_stream,
+            file.file,
+            file.filename,
+            file.content_type or "application/octet-stream",
+            vmcp_id,
+            file.size,
+        )
+        blob_id = metadata.id
+        original_filename = metadata.original_filename
+        stored_filename = metadata.filename
+        content_type = metadata.content_type
+        file_size = metadata.size
+        resource_name = metadata.resource_name[len("file://"):]
+
+        # Precompute derived renditions (e.g. xlsx as CSV) so the first resource read is fast
+        if settings.derived_cache_on_upload and find_converter(content_type, original_filename):
+            background_tasks.add_task(populate_derived_rendition, blob_id)
         
-        # Store directly in database using OSS database session
-        db = next(get_db())
-        try:
-            # Encode binary content as base64 for SQLite Text storage
-            if content_type.startswith('text/'):
-                # For text files, store as-is
-                content_str = file_content.decode('utf-8')
-            else:
-                # For binary files, encode as base64
-                content_str = base64.b64encode(file_content).decode('utf-8')
-            
-            # Create blob record
-            new_blob = Blob(
-                id=blob_id,
-                user_id=user_context.user_id,
-                original_filename=original_filename,
-                filename=stored_filename,
-                resource_name=f"file://{resource_name}",
-                content=content_str,
-                content_type=content_type,
-                size=file_size,
-                vmcp_id=vmcp_id,
-                widget_id=None,  # Not a widget file
-                is_public=False,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-            
-            db.add(new_blob)
-            db.commit()
-            db.refresh(new_blob)
-            
-            logger.info(f"Successfully stored blob {blob_id} for user {user_context.user_id}")
-            
-            # Add to vMCP resources if vmcp_id provided
-            if vmcp_id:
-                vmcp_manager = VMCPConfigManager(user_id=user_context.user_id, vmcp_id=vmcp_id)
-                blob_dict = {
-                    "id": blob_id,
-                    "original_filename": original_filename,
-                    "filename": stored_filename,
-                    "resource_name": f"file://{resource_name}",
-                    "content_type": content_type,
-                    "size": file_size,
-                    "vmcp_id": vmcp_id,
-                    "user_id": str(user_context.user_id),
-                    "created_at": new_blob.created_at.isoformat() if new_blob.created_at else None
-                }
-                result = vmcp_manager.add_resource(vmcp_id, blob_dict)
-                if not result:
-                    logger.warning(f"Failed to add resource {blob_id} to vMCP {vmcp_id}")
-                else:
-                    logger.info(f"Successfully added resource {blob_id} to vMCP {vmcp_id}")
-            
-            return {
-                "blob_id": blob_id,
-                "url": f"/api/blob/{blob_id}",
-                "original_name": original_filename,
-                "normalized_name": stored_filename,
-                "stored_filename": stored_filename,
-                "resource_name": resource_name,
+        # Add to vMCP resources if vmcp_id provided
+        if vmcp_id:
+            vmcp_manager = VMCPConfigManager(user_id=user_context.user_id, vmcp_id=vmcp_id)
+            blob_dict = {
+                "id": blob_id,
+                "original_filename": original_filename,
+                "filename": stored_filename,
+                "resource_name": f"file://{resource_name}",
+                "content_type": content_type,
                 "size": file_size,
                 "vmcp_id": vmcp_id,
-                "user_id": user_context.user_id
+                "user_id": str(user_context.user_id),
+                "created_at": metadata.created_at.isoformat() if metadata.created_at else None
             }
-        finally:
-            db.close()
+            result = vmcp_manager.add_resource(vmcp_id, blob_dict)
+            if not result:
+                logger.warning(f"Failed to add resource {blob_id} to vMCP {vmcp_id}")
+            else:
+                logger.info(f"Successfully added resource {blob_id} to vMCP {vmcp_id}")
+        
+        return {
+            "blob_id": blob_id,
+            "url": f"/api/blob/{blob_id}",
+            "original_name": original_filename,
+            "normalized_name": stored_filename,
+            "stored_filename": stored_filename,
+            "resource_name": resource_name,
+            "size": file_size,
+            "vmcp_id": vmcp_id,
+            "user_id": user_context.user_id
+        }
         
     except HTTPException:
         raise
@@ -229,10 +355,12 @@ async def get_blob_content(
         if not blob:
             raise HTTPException(status_code=404, detail="Blob not found")
         
+        content = read_blob_bytes(blob)
+        
         # For text files, return the content as text
         if blob.content_type and blob.content_type.startswith('text/'):
             return {
-                "content": blob.content,
+                "content": content.decode('utf-8'),
                 "content_type": blob.content_type,
                 "size": blob.size,
                 "filename": blob.original_filename
@@ -240,7 +368,7 @@ async def get_blob_content(
         
         # For binary files, return the content as base64 encoded string
         return {
-            "content": blob.content,  # Already base64 encoded
+            "content": base64.b64encode(content).decode('ascii'),
             "content_type": blob.content_type,
             "size": blob.size,
             "filename": blob.original_filename,
@@ -253,7 +381,8 @@ async def get_blob_content(
 async def get_file(
     blob_id: str,
     user_context = Depends(get_user_context),
-    vmcp_id: Optional[str] = Query(None)
+    vmcp_id: Optional[str] = Query(None),
+    request_headers: BlobRequestHeaders = Depends(get_blob_request_headers)
 ):
     """Serve a file by its blob ID (frontend compatibility)"""
     if vmcp_id:
@@ -270,23 +399,8 @@ async def get_file(
         if not blob:
             raise HTTPException(status_code=404, detail="Blob not found")
         
-        # Decode content based on type
-        if blob.content_type.startswith('text/'):
-            # Text files are stored as-is
-            content = blob.content.encode('utf-8')
-        else:
-            # Binary files are stored as base64
-            content = base64.b64decode(blob.content)
-        
-        # Return the file content directly
-        return Response(
-            content=content,
-            media_type=blob.content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={blob.original_filename}",
-                "Content-Length": str(blob.size)
-            }
-        )
+        # Stream the file content chunk by chunk
+        return _blob_stream_response(blob, request_headers)
     finally:
         db.close()
 
@@ -294,7 +408,8 @@ async def get_file(
 async def get_resource(
     resource_id: str,
     user_context = Depends(get_user_context),
-    vmcp_id: Optional[str] = Query(None)
+    vmcp_id: Optional[str] = Query(None),
+    request_headers: BlobRequestHeaders = Depends(get_blob_request_headers)
 ):
     """Serve a resource by its resource ID directly from database"""
     if vmcp_id:
@@ -311,23 +426,8 @@ async def get_resource(
         if not blob:
             raise HTTPException(status_code=404, detail="Resource not found")
         
-        # Decode content based on type
-        if blob.content_type.startswith('text/'):
-            # Text files are stored as-is
-            content = blob.content.encode('utf-8')
-        else:
-            # Binary files are stored as base64
-            content = base64.b64decode(blob.content)
-        
-        # Return the resource content directly
-        return Response(
-            content=content,
-            media_type=blob.content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={blob.original_filename}",
-                "Content-Length": str(blob.size)
-            }
-        )
+        # Stream the resource content chunk by chunk
+        return _blob_stream_response(blob, request_headers)
         
     finally:
         db.close()
@@ -357,7 +457,8 @@ async def delete_file(
         if not blob:
             raise HTTPException(status_code=404, detail="Blob not found")
         
-        # Delete the blob
+        # Delete the blob and drop its reference on the shared content
+        release_blob_content(db, blob)
         db.delete(blob)
         db.commit()
 
@@ -527,43 +628,24 @@ async def list_blobs_general(
 async def download_blob(
     blob_id: str,
     user_context: UserContext = Depends(get_user_context),
-    vmcp_id: Optional[str] = Query(None)
+    vmcp_id: Optional[str] = Query(None),
+    request_headers: BlobRequestHeaders = Depends(get_blob_request_headers)
 ):
-    """Download a blob file"""
+    """Download a blob file (supports single HTTP byte ranges)"""
     if vmcp_id:
         # Validate vmcp_id if provided
-        from vmcps.vmcp_config_manger import VMCPConfigManager
-        vmcp_manager = VMCPConfigManager(user_context.user_id)
+        vmcp_manager = VMCPConfigManager(user_id=user_context.user_id, vmcp_id=vmcp_id)
         vmcp = vmcp_manager.load_vmcp_config(specific_vmcp_id=vmcp_id)
         if not vmcp:
             raise HTTPException(status_code=404, detail="vMCP not found")
     
-    # Get blob from database
-    from auth_service.models import Blob
-    from auth_service.database import SessionLocal
-    from fastapi.responses import Response
-    
-    db = SessionLocal()
+    db = next(get_db())
     try:
-        query = db.query(Blob).filter(Blob.blob_id == blob_id, Blob.user_id == user_context.user_id)
-        if vmcp_id:
-            query = query.filter(Blob.vmcp_id == vmcp_id)
-        
-        blob = query.first()
+        blob = get_blob_from_db(db, blob_id, vmcp_id, user_context.user_id)
         if not blob:
             raise HTTPException(status_code=404, detail="Blob not found")
         
-        # Create a response with the content
-        headers = {
-            "Content-Disposition": f"attachment; filename={blob.original_filename}",
-            "Content-Length": str(blob.size)
-        }
-        
-        return Response(
-            content=blob.file_data,
-            media_type=blob.content_type,
-            headers=headers
-        )
+        return _blob_stream_response(blob, request_headers)
         
     finally:
         db.close()
@@ -626,19 +708,14 @@ async def delete_blob(
     """Delete a blob"""
     if vmcp_id:
         # Validate vmcp_id if provided
-        from vmcps.vmcp_config_manger import VMCPConfigManager
-        vmcp_manager = VMCPConfigManager(user_context.user_id)
+        vmcp_manager = VMCPConfigManager(user_id=user_context.user_id, vmcp_id=vmcp_id)
         vmcp = vmcp_manager.load_vmcp_config(specific_vmcp_id=vmcp_id)
         if not vmcp:
             raise HTTPException(status_code=404, detail="vMCP not found")
     
-    # Delete blob from database
-    from auth_service.models import Blob
-    from auth_service.database import SessionLocal
-    
-    db = SessionLocal()
+    db = next(get_db())
     try:
-        query = db.query(Blob).filter(Blob.blob_id == blob_id, Blob.user_id == user_context.user_id)
+        query = db.query(Blob).filter(Blob.id == blob_id, Blob.user_id == user_context.user_id)
         if vmcp_id:
             query = query.filter(Blob.vmcp_id == vmcp_id)
         
@@ -646,7 +723,8 @@ async def delete_blob(
         if not blob:
             raise HTTPException(status_code=404, detail="Blob not found")
         
-        # Delete the blob
+        # Delete the blob and drop its reference on the shared content
+        release_blob_content(db, blob)
         db.delete(blob)
         db.commit()
         
@@ -654,4 +732,4 @@ async def delete_blob(
         return {"message": f"Blob {blob_id} deleted successfully"}
         
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
@@ -3,15 +3,19 @@ import mimetypes
 import base64
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
 from fastapi import UploadFile, HTTPException
 from dataclasses import dataclass
 import logging
 
+from sqlalchemy.exc import IntegrityError
+
 # OSS-specific imports
 from .database import get_db
-from .models import Blob
+from .models import Blob, BlobContent
+from .blob_store import BlobTooLargeError, get_blob_store
 
+from vmcp.config import settings
 from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging("BLOB_SERVICE")
@@ -41,25 +45,126 @@ class BlobMetadata:
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
 
+def _decode_inline_content(blob) -> bytes:
+    """Decode legacy inline content (text stored as-is, binary stored as base64)"""
+    if blob.content_type and blob.content_type.startswith('text/'):
+        return (blob.content or "").encode('utf-8')
+    return base64.b64decode(blob.content or "")
+
+
+def iter_blob_content(blob, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Stream blob bytes in [start, end] (inclusive) with bounded memory.
+
+    Chunked blobs are read one chunk at a time from their blob store; legacy
+    blobs with inline base64/text content are decoded once and sliced.
+    """
+    manifest = getattr(blob, 'chunks', None)
+    if manifest is not None:
+        store = get_blob_store(getattr(blob, 'storage_backend', None))
+        yield from store.iter_range(manifest, start, end)
+        return
+
+    data = _decode_inline_content(blob)
+    yield data[start:] if end is None else data[start:end + 1]
+
+
+def read_blob_bytes(blob) -> bytes:
+    """Read the full blob content into memory (for callers that need the whole file)"""
+    return b"".join(iter_blob_content(blob))
+
+
+def acquire_blob_content(db, written: Dict[str, Any], backend: str) -> BlobContent:
+    """
+    Take a reference on deduplicated content, creating it on first upload.
+
+    Runs inside the caller's transaction so the refcount and the new ``Blob``
+    row commit together. If identical content already exists, its manifest is
+    reused and the chunks just written are left for garbage collection.
+
+    Args:
+        db: Open database session
+        written: Result of ``BlobStore.write_stream``
+        backend: Name of the blob store the chunks were written to
+
+    Returns:
+        The BlobContent entry the new blob should point at
+    """
+    sha256 = written["sha256"]
+    for _ in range(2):
+        updated = db.query(BlobContent).filter(BlobContent.sha256 == sha256).update(
+            {BlobContent.ref_count: BlobContent.ref_count + 1}, synchronize_session=False
+        )
+        if updated:
+            return db.get(BlobContent, sha256)
+
+        try:
+            with db.begin_nested():
+                content = BlobContent(
+                    sha256=sha256,
+                    size=written["size"],
+                    chunks=written["chunks"],
+                    storage_backend=backend,
+                    ref_count=1,
+                )
+                db.add(content)
+            return content
+        except IntegrityError:
+            # A concurrent upload created the same content first - take a reference on it instead
+            continue
+    raise RuntimeError(f"Could not acquire blob content {sha256}")
+
+
+def release_blob_content(db, blob) -> None:
+    """
+    Drop a blob's reference on its deduplicated content.
+
+    Chunks are not removed here; content whose refcount reaches zero is
+    reclaimed by the background garbage collector (see storage/blob_gc.py).
+    """
+    content_hash = getattr(blob, 'content_hash', None)
+    if not content_hash:
+        return
+    db.query(BlobContent).filter(BlobContent.sha256 == content_hash).update(
+        {BlobContent.ref_count: BlobContent.ref_count - 1}, synchronize_session=False
+    )
+
+
+def _normalize_filename(original_name: str) -> str:
+    """Normalize a filename for use in resource names"""
+    return "".join(c for c in original_name if c.isalnum() or c in "._-").rstrip()
+
+
 class BlobStorageManager:
-    """Manages blob storage operations using SQLite database"""
+    """Manages blob storage operations (metadata in the database, content in the blob store)"""
     
     def __init__(self, user_id: int):
         self.user_id = user_id
         
     def store_blob(self, file: UploadFile, vmcp_id: Optional[str] = None) -> BlobMetadata:
-        """Store a file as a blob in SQLite database"""
+        """Store an uploaded file as a chunked blob"""
+        return self.store_stream(file.file, file.filename, file.content_type, vmcp_id, declared_size=file.size)
+
+    def store_stream(
+        self,
+        stream: BinaryIO,
+        filename: Optional[str],
+        content_type: Optional[str] = None,
+        vmcp_id: Optional[str] = None,
+        declared_size: Optional[int] = None,
+    ) -> BlobMetadata:
+        """Stream file content into the blob store and record the blob row"""
         try:
-            # Validate file size (10MB limit)
-            if file.size and file.size > 10 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
+            max_size = settings.blob_max_upload_size
+            if declared_size and declared_size > max_size:
+                raise HTTPException(status_code=400, detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit")
             
             # Generate unique blob ID
             blob_id = str(uuid.uuid4())
             
             # Normalize the original filename
-            original_name = file.filename or "unknown_file"
-            normalized_name = "".join(c for c in original_name if c.isalnum() or c in "._-").rstrip()
+            original_name = filename or "unknown_file"
+            normalized_name = _normalize_filename(original_name) or "unknown_file"
             
             # Get file extension
             file_ext = Path(original_name).suffix if original_name else ""
@@ -71,42 +176,41 @@ class BlobStorageManager:
                 stored_filename = f"{blob_id}{file_ext}"
             
             # Detect MIME type if not provided
-            content_type = file.content_type
             if not content_type:
-                content_type, _ = mimetypes.guess_type(file.filename or stored_filename)
+                content_type, _ = mimetypes.guess_type(original_name or stored_filename)
                 if not content_type:
                     content_type = "application/octet-stream"
             
-            # Read file content
-            file_content = file.file.read()
-            file_size = len(file_content)
+            # Stream file content into the chunk store
+            store = get_blob_store()
+            try:
+                written = store.write_stream(stream, max_size=max_size)
+            except BlobTooLargeError:
+                raise HTTPException(status_code=400, detail=f"File size exceeds {max_size // (1024 * 1024)}MB limit")
             
             # Store in database
             db = next(get_db())
             try:
-                # Encode binary content as base64 for SQLite Text storage
-                if content_type.startswith('text/'):
-                    # For text files, store as-is
-                    content_str = file_content.decode('utf-8')
-                else:
-                    # For binary files, encode as base64
-                    content_str = base64.b64encode(file_content).decode('utf-8')
-                
-                # Create blob record
+                content = acquire_blob_content(db, written, store.backend_name)
+                now = datetime.now()
                 new_blob = Blob(
                     id=blob_id,
                     user_id=self.user_id,
                     original_filename=original_name,
                     filename=stored_filename,
                     resource_name=f"file://{normalized_name}",
-                    content=content_str,
+                    content="",
+                    chunks=content.chunks,
+                    storage_backend=content.storage_backend,
+                    content_hash=content.sha256,
                     content_type=content_type,
-                    size=file_size,
+                    size=written["size"],
+                    checksum=written["md5"],
                     vmcp_id=vmcp_id,
                     widget_id=None,  # Not a widget file
                     is_public=False,
-                    created_at=datetime.now(),
-                    updated_at=datetime.now()
+                    created_at=now,
+                    updated_at=now
                 )
                 
                 db.add(new_blob)
@@ -120,10 +224,10 @@ class BlobStorageManager:
                     filename=stored_filename,
                     resource_name=f"file://{normalized_name}",
                     content_type=content_type,
-                    size=file_size,
+                    size=written["size"],
                     vmcp_id=vmcp_id,
                     user_id=str(self.user_id),
-                    created_at=datetime.now()
+                    created_at=new_blob.created_at
                 )
                 
                 logger.info(f"Successfully stored blob {blob_id} for user {self.user_id}")
@@ -131,6 +235,8 @@ class BlobStorageManager:
             finally:
                 db.close()
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error storing blob: {e}")
             raise HTTPException(status_code=500, detail="Failed to store blob")
@@ -179,12 +285,10 @@ class BlobStorageManager:
                     logger.error(f"Blob not found for {blob_id}")
                     return None
                 
+                content = read_blob_bytes(blob)
                 if blob.content_type and "text" in blob.content_type:
-                    # Text files are stored as-is
-                    return blob.content
-                else:
-                    # Binary files are stored as base64
-                    return base64.b64decode(blob.content)
+                    return content.decode('utf-8')
+                return content
             finally:
                 db.close()
         except Exception as e:
@@ -235,6 +339,7 @@ class BlobStorageManager:
                     logger.error(f"Blob {blob_id} not found for deletion")
                     return False
                 
+                release_blob_content(db, blob)
                 db.delete(blob)
                 db.commit()
                 logger.info(f"Successfully deleted blob {blob_id}")
@@ -263,7 +368,7 @@ class BlobStorageManager:
                 blob.original_filename = new_original_filename
                 
                 # Update resource_name (normalized version)
-                resource_name = "".join(c for c in new_original_filename if c.isalnum() or c in "._-").rstrip()
+                resource_name = _normalize_filename(new_original_filename)
                 if not resource_name:
                     resource_name = "unknown_file"
                 blob.resource_name = f"file://{resource_name}"
@@ -295,4 +400,91 @@ class BlobStorageManager:
                 db.close()
         except Exception as e:
             logger.error(f"Error renaming blob {blob_id}: {e}")
-            return None 
\ No newline at end of file
+            return None
+
+    def clone_blob(self, blob_id: str, target_vmcp_id: str, source_vmcp_id: Optional[str] = None) -> Optional[BlobMetadata]:
+        """Copy a blob into another vMCP by reference (metadata-only, content is shared)"""
+        try:
+            db = next(get_db())
+            try:
+                query = db.query(Blob).filter(Blob.id == blob_id, Blob.user_id == self.user_id)
+                if source_vmcp_id:
+                    query = query.filter(Blob.vmcp_id == source_vmcp_id)
+
+                source = query.first()
+                if not source:
+                    logger.error(f"Blob {blob_id} not found for cloning")
+                    return None
+
+                new_blob_id = str(uuid.uuid4())
+                normalized_name = source.resource_name[len("file://"):] if source.resource_name else ""
+                file_ext = Path(source.original_filename).suffix if source.original_filename else ""
+                if normalized_name and normalized_name != "unknown_file":
+                    stored_filename = f"{normalized_name}_{new_blob_id}{file_ext}"
+                else:
+                    stored_filename = f"{new_blob_id}{file_ext}"
+
+                if source.content_hash:
+                    db.query(BlobContent).filter(BlobContent.sha256 == source.content_hash).update(
+                        {BlobContent.ref_count: BlobContent.ref_count + 1}, synchronize_session=False
+                    )
+
+                now = datetime.now()
+                new_blob = Blob(
+                    id=new_blob_id,
+                    user_id=self.user_id,
+                    original_filename=source.original_filename,
+                    filename=stored_filename,
+                    resource_name=source.resource_name,
+                    content=source.content or "",  # Only non-empty for legacy inline blobs
+                    chunks=source.chunks,
+                    storage_backend=source.storage_backend,
+                    content_hash=source.content_hash,
+                    content_type=source.content_type,
+                    size=source.size,
+                    checksum=source.checksum,
+                    vmcp_id=target_vmcp_id,
+                    widget_id=None,
+                    is_public=False,
+                    created_at=now,
+                    updated_at=now
+                )
+                db.add(new_blob)
+                db.commit()
+
+                logger.info(f"Cloned blob {blob_id} to {new_blob_id} for vMCP {target_vmcp_id}")
+                return BlobMetadata(
+                    id=new_blob.id,
+                    original_filename=new_blob.original_filename,
+                    filename=new_blob.filename,
+                    resource_name=new_blob.resource_name,
+                    content_type=new_blob.content_type,
+                    size=new_blob.size,
+                    vmcp_id=new_blob.vmcp_id,
+                    user_id=str(self.user_id),
+                    created_at=now
+                )
+            finally:
+                db.close()
+        except Exception as e:
+            logger.error(f"Error cloning blob {blob_id}: {e}")
+            return None
+
+    def delete_vmcp_blobs(self, vmcp_id: str) -> int:
+        """Delete all blobs attached to a vMCP, releasing their content references"""
+        try:
+            db = next(get_db())
+            try:
+                blobs = db.query(Blob).filter(Blob.user_id == self.user_id, Blob.vmcp_id == vmcp_id).all()
+                for blob in blobs:
+                    release_blob_content(db, blob)
+                    db.delete(blob)
+                db.commit()
+                if blobs:
+                    logger.info(f"Deleted {len(blobs)} blobs for vMCP {vmcp_id}")
+                return len(blobs)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.error(f"Error deleting blobs for vMCP {vmcp_id}: {e}")
+            return 0
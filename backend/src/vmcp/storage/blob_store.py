@@ -0,0 +1,300 @@
+"""
+Content-addressed chunk storage for uploaded blobs.
+
+File content is split into fixed-size chunks keyed by their SHA-256 digest.
+A ``Blob`` row keeps only the ordered chunk manifest, so uploads and downloads
+can be streamed chunk by chunk with bounded memory instead of holding the
+whole file (plus a base64 copy) in memory.
+
+Two backends are available, selected by ``settings.blob_storage_backend``:
+- ``filesystem`` (default): chunks are files under ``settings.blob_storage_path``
+- ``database``: chunks are ``LargeBinary``/bytea rows in the ``blob_chunks`` table
+
+Whole files are additionally deduplicated by their SHA-256 in ``blob_contents``
+(refcounted, see ``blob_service.acquire_blob_content``); chunks that are no
+longer referenced are removed by ``storage/blob_gc.py``.
+"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+
+class BlobTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds the configured size limit."""
+
+
+class BlobStore(ABC):
+    """Base class for chunk stores. Chunks are immutable and keyed by SHA-256."""
+
+    backend_name = ""
+
+    @abstractmethod
+    def put_chunk(self, digest: str, data: bytes) -> None:
+        """Store a chunk under its digest."""
+
+    @abstractmethod
+    def get_chunk(self, digest: str) -> bytes:
+        """Read a chunk; raises FileNotFoundError if it is missing."""
+
+    @abstractmethod
+    def has_chunk(self, digest: str) -> bool:
+        """Whether a chunk is stored."""
+
+    @abstractmethod
+    def delete_chunk(self, digest: str) -> None:
+        """Remove a chunk if it is stored."""
+
+    def touch_chunk(self, digest: str) -> None:
+        """Mark an existing chunk as recently used so garbage collection keeps it."""
+
+    @abstractmethod
+    def iter_chunks(self) -> Iterator[Tuple[str, int, float]]:
+        """Yield ``(digest, size, last_used_timestamp)`` for every stored chunk."""
+
+    def write_stream(self, stream: BinaryIO, chunk_size: Optional[int] = None,
+                     max_size: Optional[int] = None) -> Dict[str, object]:
+        """
+        Split a binary stream into chunks and store any that are not present yet.
+
+        Args:
+            stream: File-like object opened in binary mode
+            chunk_size: Chunk size in bytes (defaults to settings.blob_chunk_size)
+            max_size: Optional upper bound on the total size
+
+        Returns:
+            Dict with ``chunks`` (manifest), ``size``, ``md5`` and ``sha256`` of the full content
+        """
+        chunk_size = chunk_size or settings.blob_chunk_size
+        manifest: List[Dict[str, object]] = []
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        total = 0
+
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            total += len(data)
+            if max_size is not None and total > max_size:
+                raise BlobTooLargeError(f"Blob exceeds maximum size of {max_size} bytes")
+
+            md5.update(data)
+            sha256.update(data)
+            digest = hashlib.sha256(data).hexdigest()
+            if self.has_chunk(digest):
+                self.touch_chunk(digest)
+            else:
+                self.put_chunk(digest, data)
+            manifest.append({"digest": digest, "size": len(data)})
+
+        return {
+            "chunks": manifest,
+            "size": total,
+            "md5": md5.hexdigest(),
+            "sha256": sha256.hexdigest(),
+        }
+
+    def iter_range(self, manifest: List[Dict[str, object]], start: int = 0,
+                   end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Yield the bytes in ``[start, end]`` (inclusive) reading one chunk at a time.
+
+        Args:
+            manifest: Ordered chunk manifest from ``write_stream``
+            start: First byte offset
+            end: Last byte offset (inclusive), or None for end of content
+        """
+        offset = 0
+        for entry in manifest:
+            chunk_len = int(entry["size"])
+            chunk_start, chunk_end = offset, offset + chunk_len - 1
+            offset += chunk_len
+
+            if chunk_end < start:
+                continue
+            if end is not None and chunk_start > end:
+                break
+
+            data = self.get_chunk(str(entry["digest"]))
+            lo = max(start - chunk_start, 0)
+            hi = chunk_len if end is None else min(end - chunk_start + 1, chunk_len)
+            yield data if lo == 0 and hi == chunk_len else data[lo:hi]
+
+
+class FilesystemBlobStore(BlobStore):
+    """Stores chunks as files under ``root/<aa>/<bb>/<digest>``."""
+
+    backend_name = "filesystem"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def put_chunk(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never observe partial chunks
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def get_chunk(self, digest: str) -> bytes:
+        return self._path(digest).read_bytes()
+
+    def has_chunk(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def delete_chunk(self, digest: str) -> None:
+        try:
+            self._path(digest).unlink()
+        except FileNotFoundError:
+            pass
+
+    def touch_chunk(self, digest: str) -> None:
+        try:
+            os.utime(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def iter_chunks(self) -> Iterator[Tuple[str, int, float]]:
+        for path in self.root.glob("*/*/*"):
+            if path.name.startswith(".tmp-") or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path.name, stat.st_size, stat.st_mtime
+
+
+class DatabaseBlobStore(BlobStore):
+    """Stores chunks as binary rows in the ``blob_chunks`` table."""
+
+    backend_name = "database"
+
+    def _get_session(self):
+        from vmcp.storage.database import SessionLocal
+        return SessionLocal()
+
+    def put_chunk(self, digest: str, data: bytes) -> None:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            if session.get(BlobChunk, digest) is None:
+                session.add(BlobChunk(digest=digest, size=len(data), data=data))
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_chunk(self, digest: str) -> bytes:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            row = session.query(BlobChunk.data).filter(BlobChunk.digest == digest).first()
+            if row is None:
+                raise FileNotFoundError(f"Blob chunk not found: {digest}")
+            return bytes(row.data)
+        finally:
+            session.close()
+
+    def has_chunk(self, digest: str) -> bool:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            return session.query(BlobChunk.digest).filter(BlobChunk.digest == digest).first() is not None
+        finally:
+            session.close()
+
+    def delete_chunk(self, digest: str) -> None:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            session.query(BlobChunk).filter(BlobChunk.digest == digest).delete()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def touch_chunk(self, digest: str) -> None:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            session.query(BlobChunk).filter(BlobChunk.digest == digest).update(
+                {BlobChunk.created_at: datetime.now(timezone.utc)}, synchronize_session=False
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def iter_chunks(self) -> Iterator[Tuple[str, int, float]]:
+        from vmcp.storage.models import BlobChunk
+
+        session = self._get_session()
+        try:
+            rows = session.query(BlobChunk.digest, BlobChunk.size, BlobChunk.created_at).all()
+        finally:
+            session.close()
+        for row in rows:
+            created_at = row.created_at
+            if created_at is not None and created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            yield row.digest, row.size, created_at.timestamp() if created_at else 0.0
+
+
+_stores: Dict[str, BlobStore] = {}
+
+
+def get_blob_store(backend: Optional[str] = None) -> BlobStore:
+    """
+    Get the chunk store for a backend name (defaults to the configured backend).
+
+    Args:
+        backend: 'filesystem' or 'database'
+
+    Returns:
+        Shared BlobStore instance
+    """
+    backend = backend or settings.blob_storage_backend
+    store = _stores.get(backend)
+    if store is None:
+        if backend == "filesystem":
+            store = FilesystemBlobStore(settings.blob_storage_path)
+        elif backend == "database":
+            store = DatabaseBlobStore()
+        else:
+            raise ValueError(f"Unknown blob storage backend: {backend}")
+        _stores[backend] = store
+        logger.info(f"Initialized {backend} blob store")
+    return store
@@ -0,0 +1,168 @@
+"""
+Cache invalidation bus.
+
+In-process caches (resolved vMCP names, session lookups, ...) subscribe to a
+topic and drop entries when something publishes a key on it. Handlers in the
+publishing process run immediately. With the ``database`` backend (used when
+``VMCP_WORKERS`` > 1) the event is also written to the ``cache_invalidations``
+table, and every worker polls that table and replays events published by the
+other workers. With the ``local`` backend events never leave the process.
+
+Delivery to other workers is eventually consistent (one poll interval), so
+caches on the bus must tolerate briefly stale entries.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("CACHE_BUS")
+
+# Identifies this process as the origin of the events it publishes
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# Key meaning "everything on this topic"
+ALL_KEYS = "*"
+
+# Ids below the cursor that are re-read on each poll. On PostgreSQL a lower id
+# can commit after a higher one, so the cursor alone could skip it.
+_LOOKBACK_IDS = 100
+
+Handler = Callable[[str], None]
+
+
+class CacheBus:
+    """Topic-based invalidation fan-out within and across worker processes."""
+
+    def __init__(self, backend: str = "local"):
+        if backend not in ("local", "database"):
+            raise ValueError(f"Unknown cache bus backend: {backend}")
+        self.backend = backend
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._lock = threading.Lock()
+        self._cursor: Optional[int] = None
+        self._seen: Deque[int] = deque(maxlen=_LOOKBACK_IDS * 10)
+        self._seen_set: Set[int] = set()
+        self._last_prune = datetime.min
+
+    @property
+    def shared(self) -> bool:
+        """Whether events reach other worker processes."""
+        return self.backend == "database"
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Call handler(key) for every event published on topic."""
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+
+    def publish(self, topic: str, key: str = ALL_KEYS) -> None:
+        """Invalidate key on topic in this process and, if shared, in every other worker."""
+        self._dispatch(topic, key)
+        if not self.shared:
+            return
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import CacheInvalidation
+
+        session = SessionLocal()
+        try:
+            session.add(CacheInvalidation(topic=topic, key=key[:512], origin=WORKER_ID, created_at=datetime.utcnow()))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to broadcast invalidation {topic}:{key}: {e}")
+        finally:
+            session.close()
+
+    def _dispatch(self, topic: str, key: str) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(topic, ()))
+        for handler in handlers:
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Cache invalidation handler for {topic} failed: {e}")
+
+    def _remember(self, event_id: int) -> None:
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_set.discard(self._seen[0])
+        self._seen.append(event_id)
+        self._seen_set.add(event_id)
+
+    def poll_once(self) -> int:
+        """
+        Apply events published by other workers since the last poll.
+
+        The first call only positions the cursor at the newest event.
+
+        Returns:
+            Number of events applied
+        """
+        from sqlalchemy import func
+
+        from vmcp.storage.database import SessionLocal
+        from vmcp.storage.models import CacheInvalidation
+
+        session = SessionLocal()
+        try:
+            if self._cursor is None:
+                self._cursor = session.query(func.max(CacheInvalidation.id)).scalar() or 0
+                return 0
+
+            rows = (
+                session.query(CacheInvalidation.id, CacheInvalidation.topic, CacheInvalidation.key, CacheInvalidation.origin)
+                .filter(CacheInvalidation.id > self._cursor - _LOOKBACK_IDS)
+                .order_by(CacheInvalidation.id)
+                .all()
+            )
+            applied = 0
+            for event_id, topic, key, origin in rows:
+                if event_id in self._seen_set:
+                    continue
+                self._remember(event_id)
+                self._cursor = max(self._cursor, event_id)
+                if origin != WORKER_ID:
+                    self._dispatch(topic, key)
+                    applied += 1
+
+            now = datetime.utcnow()
+            if now - self._last_prune > timedelta(seconds=settings.cache_bus_retention):
+                self._last_prune = now
+                cutoff = now - timedelta(seconds=settings.cache_bus_retention)
+                session.query(CacheInvalidation).filter(CacheInvalidation.created_at < cutoff).delete()
+                session.commit()
+            return applied
+        finally:
+            session.close()
+
+
+_bus = CacheBus(settings.cache_bus)
+
+
+def get_cache_bus() -> CacheBus:
+    """Get the process-wide cache invalidation bus."""
+    return _bus
+
+
+async def run_cache_bus_loop(interval: Optional[float] = None) -> None:
+    """Poll for invalidations from other workers until cancelled (no-op for the local backend)."""
+    bus = get_cache_bus()
+    if not bus.shared:
+        return
+    interval = settings.cache_bus_poll_interval if interval is None else interval
+    logger.info(f"Cache bus polling every {interval}s as worker {WORKER_ID}")
+
+    while True:
+        try:
+            await asyncio.to_thread(bus.poll_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache bus poll failed: {e}")
+        await asyncio.sleep(interval)
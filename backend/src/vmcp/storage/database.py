@@ -1,18 +1,20 @@
 """
 Database connection and session management.
 
-This module handles PostgreSQL database connections using SQLAlchemy.
+This module handles PostgreSQL and SQLite database connections using SQLAlchemy.
 """
 
 import logging
 from pathlib import Path
-from typing import Generator
+from typing import Any, Dict, Generator, Optional
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import Pool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from vmcp.config import settings
 from vmcp.storage.models import Base
+from vmcp.utilities import json_codec
 from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging(__name__)
@@ -34,29 +36,80 @@ def _ensure_db_directory():
 # Ensure directory exists before creating engine
 _ensure_db_directory()
 
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA values applied to every new SQLite connection."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_kb,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+
+def create_db_engine(database_url: str, pragmas: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Create an engine with the profile for its database.
+
+    SQLite gets WAL journaling and the tuned pragmas from sqlite_pragmas()
+    (or ``pragmas``). File databases keep a pool of connections so
+    per-connection caches and mmap survive between sessions, and in-memory
+    databases share one connection. Other databases get a pre-pinged
+    connection pool.
+    """
+    if not database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            echo=settings.database_echo,
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+            # Used by drivers with native JSON columns (PostgreSQL JSONB)
+            json_serializer=json_codec.dumps,
+            json_deserializer=json_codec.loads,
+        )
+
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": pragmas.get("busy_timeout", settings.sqlite_busy_timeout_ms) / 1000,
+    }
+    in_memory = database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+    if in_memory:
+        sqlite_engine = create_engine(
+            database_url, echo=settings.database_echo, connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        sqlite_engine = create_engine(
+            database_url,
+            echo=settings.database_echo,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=10,
+            max_overflow=20,
+        )
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return sqlite_engine
+
+
 # Create engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+engine = create_db_engine(settings.database_url)
 
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@event.listens_for(Pool, "connect")
-def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Set SQLite pragma for foreign keys if using SQLite."""
-    if "sqlite" in settings.database_url:
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-
-
 def get_engine():
     """Get the SQLAlchemy engine."""
     return engine
@@ -80,15 +133,21 @@ def init_db() -> None:
     """
     Initialize the database by creating all tables and running migrations.
 
-    This should be called on application startup.
+    This should be called on application startup. An up-to-date database
+    (all tables present, latest migration recorded) is left untouched.
     """
+    from vmcp.storage.migrations import run_migrations, schema_is_current
+
     try:
+        if schema_is_current():
+            logger.info("Database schema is current, skipping table creation and migrations")
+            return
+
         logger.info("Initializing database...")
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
         
         # Run migrations to handle schema changes
-        from vmcp.storage.migrations import run_migrations
         run_migrations()
         
         logger.info("Database initialized successfully")
@@ -0,0 +1,92 @@
+"""
+Background database writer.
+
+Fire-and-forget writes (operation stats, agent call logs) are queued to a
+single dedicated thread instead of running on the event loop or racing
+each other for the SQLite write lock. Writes run in submission order.
+Callers either drop the returned future (fire and forget) or await
+``run()`` to get the write's result.
+
+Writes whose result the caller needs immediately (CRUD endpoints, status
+updates) still run inline; WAL mode and busy_timeout let them coexist with
+the writer thread.
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("DB_WRITER")
+
+# Log a warning when this many writes are waiting
+BACKLOG_WARNING = 1000
+
+_STOP = object()
+
+
+class DatabaseWriter:
+    """Runs queued write callables one at a time on a background thread."""
+
+    def __init__(self, name: str = "vmcp-db-writer"):
+        self.name = name
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a write and return a future for its result."""
+        self.start()
+        future: Future = Future()
+        self._queue.put((future, func, args, kwargs))
+        backlog = self._queue.qsize()
+        if backlog and backlog % BACKLOG_WARNING == 0:
+            logger.warning(f"Database writer backlog at {backlog} pending writes")
+        return future
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Queue a write and wait for its result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Finish queued writes and stop the thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"Database writer did not drain within {timeout}s ({self._queue.qsize()} writes pending)")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            future, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                logger.error(f"Queued database write {getattr(func, '__qualname__', func)} failed: {e}")
+                future.set_exception(e)
+
+
+_writer = DatabaseWriter()
+
+
+def get_db_writer() -> DatabaseWriter:
+    """Get the process-wide database writer."""
+    return _writer
@@ -0,0 +1,251 @@
+"""
+Cache of derived renditions for uploaded blobs.
+
+Some uploads are not useful to MCP clients as raw bytes (e.g. spreadsheets),
+so resource reads serve a converted rendition instead. Renditions are keyed
+by (content SHA-256, converter name, converter version): they are computed
+once per unique file, either in the background after upload or lazily on the
+first read, and stored in the blob chunk store with a ``BlobDerivative`` row.
+A small in-process LRU serves repeated reads without touching the database.
+
+Bump a converter's ``version`` whenever its output changes; stale renditions
+are then ignored and removed by blob garbage collection.
+"""
+
+import io
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("DERIVED_CACHE")
+
+XLSX_MIME_TYPES = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.ms-excel.sheet.macroenabled.12",
+)
+DOCX_MIME_TYPES = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+)
+
+
+def _convert_xlsx(source: BinaryIO, filename: str) -> Optional[str]:
+    from vmcp.vmcps.utilities import convert_openxml_to_csv
+
+    csv_content, mime_type = convert_openxml_to_csv(source, filename)
+    return csv_content if mime_type == "text/csv" else None
+
+
+def _convert_docx(source: BinaryIO, filename: str) -> Optional[str]:
+    from vmcp.vmcps.utilities import extract_docx_text
+
+    return extract_docx_text(source, filename)
+
+
+@dataclass(frozen=True)
+class Converter:
+    """A named, versioned conversion from an uploaded file type to text."""
+
+    name: str
+    version: int
+    mime_type: str
+    content_types: Tuple[str, ...]
+    extensions: Tuple[str, ...]
+    convert: Callable[[BinaryIO, str], Optional[str]]
+
+    def matches(self, content_type: Optional[str], filename: Optional[str]) -> bool:
+        if content_type and content_type.lower() in self.content_types:
+            return True
+        return bool(filename) and Path(filename).suffix.lower() in self.extensions
+
+
+CONVERTERS = (
+    Converter("xlsx-csv", 1, "text/csv", XLSX_MIME_TYPES, (".xlsx", ".xlsm"), _convert_xlsx),
+    Converter("docx-text", 1, "text/plain", DOCX_MIME_TYPES, (".docx",), _convert_docx),
+)
+
+
+def find_converter(content_type: Optional[str], filename: Optional[str]) -> Optional[Converter]:
+    """Return the converter for a file type, if any."""
+    for converter in CONVERTERS:
+        if converter.matches(content_type, filename):
+            return converter
+    return None
+
+
+class _RenditionLRU:
+    """Thread-safe LRU of renditions bounded by total text size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Tuple[str, str, int], Tuple[str, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: Tuple[str, str, int], item: Tuple[str, str]) -> None:
+        size = len(item[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._items[key] = item
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+
+_memory_cache = _RenditionLRU(settings.derived_cache_memory_size)
+
+
+def _spool_blob(blob) -> BinaryIO:
+    """Copy blob content into a seekable temp file (spills to disk for large files)."""
+    from vmcp.storage.blob_service import iter_blob_content
+
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * settings.blob_chunk_size)
+    for data in iter_blob_content(blob):
+        spool.write(data)
+    spool.seek(0)
+    return spool
+
+
+def _load_stored(content_hash: str, converter: Converter) -> Optional[Tuple[str, str]]:
+    from vmcp.storage.blob_store import get_blob_store
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.models import BlobDerivative
+
+    session = SessionLocal()
+    try:
+        row = session.get(BlobDerivative, (content_hash, converter.name, converter.version))
+        if row is None:
+            return None
+        manifest, backend, mime_type = row.chunks, row.storage_backend, row.mime_type
+    finally:
+        session.close()
+
+    data = b"".join(get_blob_store(backend).iter_range(manifest))
+    return data.decode("utf-8"), mime_type
+
+
+def _store(content_hash: str, converter: Converter, text: str) -> None:
+    from vmcp.storage.blob_store import get_blob_store
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.models import BlobDerivative
+
+    store = get_blob_store()
+    written = store.write_stream(io.BytesIO(text.encode("utf-8")))
+
+    session = SessionLocal()
+    try:
+        session.add(BlobDerivative(
+            content_hash=content_hash,
+            converter=converter.name,
+            converter_version=converter.version,
+            mime_type=converter.mime_type,
+            size=written["size"],
+            chunks=written["chunks"],
+            storage_backend=store.backend_name,
+        ))
+        session.commit()
+    except IntegrityError:
+        # Another worker stored the same rendition first
+        session.rollback()
+    finally:
+        session.close()
+
+
+def get_derived_rendition(blob, content_type: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Get the derived text rendition of a blob, computing and caching it on a miss.
+
+    Args:
+        blob: Blob row (or wrapper with the same attributes)
+        content_type: Content type override (defaults to blob.content_type)
+
+    Returns:
+        (text, mime_type) or None if the blob has no converter or conversion failed
+    """
+    converter = find_converter(content_type or blob.content_type, blob.original_filename)
+    if converter is None:
+        return None
+
+    content_hash = getattr(blob, "content_hash", None)
+    key = (content_hash, converter.name, converter.version) if content_hash else None
+    if key is not None:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            stored = _load_stored(content_hash, converter)
+        except Exception as e:
+            logger.warning(f"Failed to load cached rendition for blob {blob.id}: {e}")
+            stored = None
+        if stored is not None:
+            _memory_cache.put(key, stored)
+            return stored
+
+    with _spool_blob(blob) as source:
+        text = converter.convert(source, blob.original_filename or "")
+    if text is None:
+        return None
+
+    rendition = (text, converter.mime_type)
+    if key is not None:
+        try:
+            _store(content_hash, converter, text)
+        except Exception as e:
+            logger.warning(f"Failed to store rendition for blob {blob.id}: {e}")
+        _memory_cache.put(key, rendition)
+    logger.info(f"Derived {converter.name} rendition for blob {blob.id} ({len(text)} chars)")
+    return rendition
+
+
+def populate_derived_rendition(blob_id: str) -> None:
+    """Compute the rendition for a freshly uploaded blob (run in the background)."""
+    from vmcp.storage.database import SessionLocal
+    from vmcp.storage.models import Blob
+
+    session = SessionLocal()
+    try:
+        blob = session.get(Blob, blob_id)
+        if blob is None or find_converter(blob.content_type, blob.original_filename) is None:
+            return
+        session.expunge(blob)
+    finally:
+        session.close()
+
+    try:
+        get_derived_rendition(blob)
+    except Exception as e:
+        logger.warning(f"Failed to derive rendition for blob {blob_id}: {e}")
+
+
+def clear_memory_cache() -> None:
+    """Drop all in-process renditions."""
+    _memory_cache.clear()
+
+
+def current_converter_versions() -> Dict[str, int]:
+    """Map converter name to its current version."""
+    return {converter.name: converter.version for converter in CONVERTERS}
@@ -4,10 +4,16 @@ Database migration system for vMCP OSS version.
 Handles schema changes while preserving existing data.
 """
 
+import base64
+import hashlib
+import io
+import json
 import logging
+import warnings
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 from sqlalchemy import text, inspect
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, SAWarning
 
 from vmcp.storage.database import get_engine
 from vmcp.config import settings
@@ -16,8 +22,28 @@ from vmcp.utilities.logging import setup_logging
 logger = setup_logging(__name__)
 
 
+def _index_names(inspector, table_name: str) -> List[str]:
+    """Index names of a table, without warnings about expression indexes SQLAlchemy cannot reflect."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*expression-based index.*", category=SAWarning)
+        return [idx['name'] for idx in inspector.get_indexes(table_name)]
+
+
 class DatabaseMigrator:
     """Handles database schema migrations."""
+
+    # (version, method) in the order they are applied
+    MIGRATIONS = [
+        (1, "_migration_001_add_blob_columns"),
+        (2, "_migration_002_fix_widget_id_constraint"),
+        (3, "_migration_003_add_blob_chunk_columns"),
+        (4, "_migration_004_deduplicate_blob_content"),
+        (5, "_migration_005_add_mcp_server_status_columns"),
+        (6, "_migration_006_native_json_columns"),
+        (7, "_migration_007_add_vmcp_summary_columns"),
+        (8, "_migration_008_add_vmcp_uuid_and_name_index"),
+    ]
+    LATEST_VERSION = MIGRATIONS[-1][0]
     
     def __init__(self):
         self.engine = get_engine()
@@ -82,18 +108,12 @@ class DatabaseMigrator:
         current_version = self.get_migration_version()
         logger.info(f"Current migration version: {current_version}")
         
-        # Define migrations
-        migrations = [
-            (1, self._migration_001_add_blob_columns),
-            (2, self._migration_002_fix_widget_id_constraint),
-        ]
-        
         # Run pending migrations
-        for version, migration_func in migrations:
+        for version, migration_name in self.MIGRATIONS:
             if version > current_version:
                 logger.info(f"Running migration {version}...")
                 try:
-                    migration_func()
+                    getattr(self, migration_name)()
                     self.set_migration_version(version)
                     logger.info(f"Migration {version} completed successfully")
                 except Exception as e:
@@ -250,6 +270,395 @@ class DatabaseMigrator:
             logger.error(f"Migration 002 failed: {e}")
             raise
 
+    def _migration_003_add_blob_chunk_columns(self) -> None:
+        """Add chunk manifest columns to blobs for content-addressed chunk storage.
+
+        Existing rows keep their inline base64/text content (chunks stays NULL)
+        and are still served through the legacy decode path.
+        """
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                if 'blobs' not in inspector.get_table_names():
+                    logger.info("blobs table does not exist, skipping migration")
+                    return
+
+                existing_columns = [col['name'] for col in inspector.get_columns('blobs')]
+                columns_to_add = [
+                    ("chunks", "TEXT", "NULL"),
+                    ("storage_backend", "VARCHAR(20)", "NULL"),
+                ]
+
+                for column_name, column_type, constraints in columns_to_add:
+                    if column_name not in existing_columns:
+                        logger.info(f"Adding column {column_name} to blobs table")
+                        conn.execute(text(f"ALTER TABLE blobs ADD COLUMN {column_name} {column_type} {constraints}"))
+                    else:
+                        logger.info(f"Column {column_name} already exists, skipping")
+
+                conn.commit()
+                logger.info("Migration 003 completed: Added blob chunk columns")
+
+        except Exception as e:
+            logger.error(f"Migration 003 failed: {e}")
+            raise
+
+    def _migration_004_deduplicate_blob_content(self) -> None:
+        """Add content_hash to blobs and backfill refcounted blob_contents entries.
+
+        Legacy inline rows are moved into the chunk store on the way, so every
+        blob ends up pointing at one shared, SHA-256 addressed content entry.
+        """
+        from vmcp.storage.blob_store import get_blob_store
+
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                if 'blobs' not in inspector.get_table_names():
+                    logger.info("blobs table does not exist, skipping migration")
+                    return
+
+                existing_columns = [col['name'] for col in inspector.get_columns('blobs')]
+                if 'content_hash' not in existing_columns:
+                    logger.info("Adding column content_hash to blobs table")
+                    conn.execute(text("ALTER TABLE blobs ADD COLUMN content_hash VARCHAR(64) NULL"))
+
+                existing_indexes = [idx['name'] for idx in inspector.get_indexes('blobs')]
+                if 'idx_blob_content_hash' not in existing_indexes:
+                    conn.execute(text("CREATE INDEX idx_blob_content_hash ON blobs (content_hash)"))
+
+                rows = conn.execute(text(
+                    "SELECT id, content, content_type, chunks, storage_backend FROM blobs WHERE content_hash IS NULL"
+                )).fetchall()
+                # The database chunk store writes through its own sessions, which
+                # SQLite would lock out while this connection holds a transaction
+                conn.commit()
+                logger.info(f"Backfilling content hashes for {len(rows)} blobs")
+
+                contents: Dict[str, Dict[str, Any]] = {}
+                backfilled = []
+                for blob_id, content, content_type, chunks, storage_backend in rows:
+                    if chunks:
+                        manifest = json.loads(chunks) if isinstance(chunks, str) else chunks
+                        store = get_blob_store(storage_backend)
+                        sha256 = hashlib.sha256()
+                        size = 0
+                        for data in store.iter_range(manifest):
+                            sha256.update(data)
+                            size += len(data)
+                        written = {"chunks": manifest, "size": size, "sha256": sha256.hexdigest()}
+                    else:
+                        # Legacy inline content: move it into the chunk store
+                        if content_type and content_type.startswith('text/'):
+                            raw = (content or "").encode('utf-8')
+                        else:
+                            raw = base64.b64decode(content or "")
+                        store = get_blob_store()
+                        written = store.write_stream(io.BytesIO(raw))
+
+                    entry = contents.setdefault(written["sha256"], {
+                        "size": written["size"],
+                        "chunks": written["chunks"],
+                        "storage_backend": store.backend_name,
+                        "ref_count": 0,
+                    })
+                    entry["ref_count"] += 1
+                    backfilled.append((blob_id, written["sha256"]))
+
+                for blob_id, content_hash in backfilled:
+                    entry = contents[content_hash]
+                    conn.execute(text("""
+                        UPDATE blobs
+                        SET content_hash = :content_hash, chunks = :chunks,
+                            storage_backend = :storage_backend, content = ''
+                        WHERE id = :id
+                    """), {
+                        "content_hash": content_hash,
+                        "chunks": json.dumps(entry["chunks"]),
+                        "storage_backend": entry["storage_backend"],
+                        "id": blob_id,
+                    })
+
+                now = datetime.now(timezone.utc)
+                for sha256, entry in contents.items():
+                    updated = conn.execute(text(
+                        "UPDATE blob_contents SET ref_count = ref_count + :refs WHERE sha256 = :sha256"
+                    ), {"refs": entry["ref_count"], "sha256": sha256})
+                    if updated.rowcount == 0:
+                        conn.execute(text("""
+                            INSERT INTO blob_contents (sha256, size, chunks, storage_backend, ref_count, created_at, updated_at)
+                            VALUES (:sha256, :size, :chunks, :storage_backend, :ref_count, :now, :now)
+                        """), {
+                            "sha256": sha256,
+                            "size": entry["size"],
+                            "chunks": json.dumps(entry["chunks"]),
+                            "storage_backend": entry["storage_backend"],
+                            "ref_count": entry["ref_count"],
+                            "now": now,
+                        })
+
+                conn.commit()
+                logger.info(
+                    f"Migration 004 completed: {len(rows)} blobs now share {len(contents)} content entries"
+                )
+
+        except Exception as e:
+            logger.error(f"Migration 004 failed: {e}")
+            raise
+
+    def _migration_005_add_mcp_server_status_columns(self) -> None:
+        """Add narrow status columns to mcp_servers and backfill them from the config JSON.
+
+        Status changes then update these columns instead of rewriting the whole
+        mcp_server_config blob.
+        """
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                if 'mcp_servers' not in inspector.get_table_names():
+                    logger.info("mcp_servers table does not exist, skipping migration")
+                    return
+
+                existing_columns = [col['name'] for col in inspector.get_columns('mcp_servers')]
+                columns_to_add = [
+                    ("status", "VARCHAR(50)", "NULL"),
+                    ("last_error", "TEXT", "NULL"),
+                    ("last_connected", "TIMESTAMP", "NULL"),
+                ]
+
+                for column_name, column_type, constraints in columns_to_add:
+                    if column_name not in existing_columns:
+                        logger.info(f"Adding column {column_name} to mcp_servers table")
+                        conn.execute(text(f"ALTER TABLE mcp_servers ADD COLUMN {column_name} {column_type} {constraints}"))
+                    else:
+                        logger.info(f"Column {column_name} already exists, skipping")
+
+                rows = conn.execute(text(
+                    "SELECT id, mcp_server_config FROM mcp_servers WHERE status IS NULL"
+                )).fetchall()
+                for server_pk, raw_config in rows:
+                    config = json.loads(raw_config) if isinstance(raw_config, str) else (raw_config or {})
+                    last_connected = config.get("last_connected")
+                    try:
+                        last_connected = datetime.fromisoformat(last_connected) if last_connected else None
+                    except (TypeError, ValueError):
+                        last_connected = None
+                    conn.execute(text("""
+                        UPDATE mcp_servers
+                        SET status = :status, last_error = :last_error, last_connected = :last_connected
+                        WHERE id = :id
+                    """), {
+                        "status": config.get("status") or "unknown",
+                        "last_error": config.get("last_error"),
+                        "last_connected": last_connected,
+                        "id": server_pk,
+                    })
+
+                conn.commit()
+                logger.info(f"Migration 005 completed: Backfilled status columns for {len(rows)} MCP servers")
+
+        except Exception as e:
+            logger.error(f"Migration 005 failed: {e}")
+            raise
+
+    def _migration_006_native_json_columns(self) -> None:
+        """Convert JSON columns to JSONB on PostgreSQL and index the JSON keys we filter on.
+
+        On PostgreSQL every JSONType column stored as TEXT is converted in place
+        (``USING column::jsonb``); on SQLite the columns stay TEXT and the
+        expression indexes use JSON1's json_extract. Index expressions match
+        what models.json_field() compiles to.
+        """
+        from vmcp.storage.models import Base, JSONType
+
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                tables = set(inspector.get_table_names())
+                is_postgres = self.engine.dialect.name == "postgresql"
+
+                if is_postgres:
+                    for table in Base.metadata.sorted_tables:
+                        if table.name not in tables:
+                            continue
+                        column_types = {col['name']: str(col['type']).upper() for col in inspector.get_columns(table.name)}
+                        for column in table.columns:
+                            if not isinstance(column.type, JSONType):
+                                continue
+                            if column_types.get(column.name) in (None, "JSONB"):
+                                continue
+                            logger.info(f"Converting {table.name}.{column.name} to JSONB")
+                            conn.execute(text(
+                                f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" '
+                                f'TYPE JSONB USING NULLIF("{column.name}", \'\')::jsonb'
+                            ))
+
+                def json_key(column: str, key: str) -> str:
+                    if is_postgres:
+                        return f"(({column} ->> '{key}'))"
+                    return f"(json_extract({column}, '$.{key}'))"
+
+                indexes = [
+                    ("vmcp_stats", "idx_stats_agent_name", json_key("operation_metadata", "agent_name")),
+                    ("vmcps", "idx_vmcp_config_id", json_key("vmcp_config", "id")),
+                ]
+                if is_postgres:
+                    indexes.append(("vmcp_stats", "idx_stats_metadata_gin", "USING GIN (operation_metadata jsonb_path_ops)"))
+
+                for table_name, index_name, definition in indexes:
+                    if table_name not in tables:
+                        continue
+                    existing_indexes = _index_names(inspector, table_name)
+                    if index_name in existing_indexes:
+                        logger.info(f"Index {index_name} already exists, skipping")
+                        continue
+                    logger.info(f"Creating index {index_name} on {table_name}")
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {definition}"))
+
+                conn.commit()
+                logger.info("Migration 006 completed: Native JSON columns and JSON key indexes")
+
+        except Exception as e:
+            logger.error(f"Migration 006 failed: {e}")
+            raise
+
+    def _migration_007_add_vmcp_summary_columns(self) -> None:
+        """Add listing summary columns to vmcps and backfill them from vmcp_config.
+
+        list_vmcps reads these columns instead of loading every vMCP config.
+        """
+        from vmcp.storage.models import vmcp_summary_columns
+
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                if 'vmcps' not in inspector.get_table_names():
+                    logger.info("vmcps table does not exist, skipping migration")
+                    return
+
+                is_postgres = self.engine.dialect.name == "postgresql"
+                json_type = "JSONB" if is_postgres else "TEXT"
+                existing_columns = [col['name'] for col in inspector.get_columns('vmcps')]
+                columns_to_add = [
+                    ("total_tools", "INTEGER", "NULL"),
+                    ("total_resources", "INTEGER", "NULL"),
+                    ("total_resource_templates", "INTEGER", "NULL"),
+                    ("total_prompts", "INTEGER", "NULL"),
+                    ("server_count", "INTEGER", "NULL"),
+                    ("server_summaries", json_type, "NULL"),
+                    ("is_public", "BOOLEAN", "NULL"),
+                    ("public_at", "VARCHAR(64)", "NULL"),
+                    ("public_tags", json_type, "NULL"),
+                ]
+
+                for column_name, column_type, constraints in columns_to_add:
+                    if column_name not in existing_columns:
+                        logger.info(f"Adding column {column_name} to vmcps table")
+                        conn.execute(text(f"ALTER TABLE vmcps ADD COLUMN {column_name} {column_type} {constraints}"))
+                    else:
+                        logger.info(f"Column {column_name} already exists, skipping")
+
+                rows = conn.execute(text(
+                    "SELECT id, vmcp_config FROM vmcps WHERE server_count IS NULL"
+                )).fetchall()
+                json_cast = "CAST(:{} AS JSONB)" if is_postgres else ":{}"
+                for vmcp_pk, raw_config in rows:
+                    config = json.loads(raw_config) if isinstance(raw_config, str) else (raw_config or {})
+                    summary = vmcp_summary_columns(config)
+                    summary["server_summaries"] = json.dumps(summary["server_summaries"])
+                    summary["public_tags"] = json.dumps(summary["public_tags"])
+                    conn.execute(text(f"""
+                        UPDATE vmcps
+                        SET total_tools = :total_tools, total_resources = :total_resources,
+                            total_resource_templates = :total_resource_templates, total_prompts = :total_prompts,
+                            server_count = :server_count, server_summaries = {json_cast.format("server_summaries")},
+                            is_public = :is_public, public_at = :public_at, public_tags = {json_cast.format("public_tags")}
+                        WHERE id = :id
+                    """), {**summary, "id": vmcp_pk})
+
+                conn.commit()
+                logger.info(f"Migration 007 completed: Backfilled listing summaries for {len(rows)} vMCPs")
+
+        except Exception as e:
+            logger.error(f"Migration 007 failed: {e}")
+            raise
+
+    def _migration_008_add_vmcp_uuid_and_name_index(self) -> None:
+        """Add vmcps.uuid (mirror of vmcp_config.id) and a unique (user_id, name) index.
+
+        If existing data has duplicate names per user the index is created
+        non-unique and a warning is logged. The vmcp_config id expression
+        index from migration 006 is superseded by the uuid column and dropped.
+        """
+        try:
+            with self.engine.connect() as conn:
+                inspector = inspect(self.engine)
+                if 'vmcps' not in inspector.get_table_names():
+                    logger.info("vmcps table does not exist, skipping migration")
+                    return
+
+                existing_columns = [col['name'] for col in inspector.get_columns('vmcps')]
+                if 'uuid' not in existing_columns:
+                    logger.info("Adding column uuid to vmcps table")
+                    conn.execute(text("ALTER TABLE vmcps ADD COLUMN uuid VARCHAR(255) NULL"))
+                else:
+                    logger.info("Column uuid already exists, skipping")
+
+                rows = conn.execute(text("SELECT id, vmcp_id, vmcp_config FROM vmcps WHERE uuid IS NULL")).fetchall()
+                for vmcp_pk, vmcp_id, raw_config in rows:
+                    config = json.loads(raw_config) if isinstance(raw_config, str) else (raw_config or {})
+                    conn.execute(
+                        text("UPDATE vmcps SET uuid = :uuid WHERE id = :id"),
+                        {"uuid": config.get("id") or vmcp_id, "id": vmcp_pk},
+                    )
+
+                existing_indexes = _index_names(inspector, 'vmcps')
+                if 'idx_vmcp_user_name' not in existing_indexes:
+                    duplicates = conn.execute(text(
+                        "SELECT user_id, name FROM vmcps GROUP BY user_id, name HAVING COUNT(*) > 1"
+                    )).fetchall()
+                    if duplicates:
+                        logger.warning(
+                            f"Found {len(duplicates)} duplicate vMCP names, creating non-unique idx_vmcp_user_name; "
+                            f"rename duplicates to enforce uniqueness: {[name for _, name in duplicates]}"
+                        )
+                        conn.execute(text("CREATE INDEX idx_vmcp_user_name ON vmcps (user_id, name)"))
+                    else:
+                        logger.info("Creating unique index idx_vmcp_user_name on vmcps")
+                        conn.execute(text("CREATE UNIQUE INDEX idx_vmcp_user_name ON vmcps (user_id, name)"))
+
+                conn.execute(text("DROP INDEX IF EXISTS idx_vmcp_config_id"))
+
+                conn.commit()
+                logger.info(f"Migration 008 completed: Backfilled uuid for {len(rows)} vMCPs")
+
+        except Exception as e:
+            logger.error(f"Migration 008 failed: {e}")
+            raise
+
+
+def schema_is_current() -> bool:
+    """
+    Check whether the database needs no create_all() or migrations.
+
+    True when every model table exists and the recorded migration version is
+    the latest. Costs two small queries, so startup can skip reflecting and
+    migrating an up-to-date database.
+    """
+    from vmcp.storage.models import Base
+
+    engine = get_engine()
+    try:
+        existing_tables = set(inspect(engine).get_table_names())
+        if 'migrations' not in existing_tables or not set(Base.metadata.tables) <= existing_tables:
+            return False
+        with engine.connect() as conn:
+            version = conn.execute(text("SELECT MAX(version) FROM migrations")).scalar()
+        return (version or 0) >= DatabaseMigrator.LATEST_VERSION
+    except Exception as e:
+        logger.warning(f"Could not check schema version: {e}")
+        return False
+
 
 def run_migrations() -> None:
     """Run all pending database migrations."""
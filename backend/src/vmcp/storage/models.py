@@ -5,12 +5,28 @@ Simplified models without authentication - uses a single dummy user for all oper
 Only includes essential tables: User (dummy), MCP servers, VMCPs, stats, and logs.
 """
 
-import json
+import re
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, TypeDecorator
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    TypeDecorator,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
+from sqlalchemy.sql.functions import FunctionElement
+
+from vmcp.utilities import json_codec
 
 Base = declarative_base()
 
@@ -19,15 +35,24 @@ Base = declarative_base()
 class JSONType(TypeDecorator):
     """Platform-independent JSON type.
 
-    Uses JSON for PostgreSQL, Text for SQLite.
+    Uses JSONB for PostgreSQL (encoded by the driver with the engine's
+    json_serializer) and Text for SQLite; both use utilities.json_codec.
     """
     impl = Text
     cache_ok = True
 
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            # none_as_null keeps Python None as SQL NULL rather than JSON 'null'
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(Text())
+
     def process_bind_param(self, value, dialect):
+        if dialect.name == "postgresql":
+            return value
         if value is not None:
             try:
-                return json.dumps(value, default=self._json_serializer)
+                return json_codec.dumps(value)
             except (TypeError, ValueError) as e:
                 # Log the error for debugging
                 import logging
@@ -36,39 +61,51 @@ class JSONType(TypeDecorator):
                 logger.error(f"Problematic value: {value}")
                 raise
         return value
-    
-    @staticmethod
-    def _json_serializer(obj):
-        """Custom JSON serializer for objects not serializable by default json module."""
-        from datetime import datetime, date
-        from enum import Enum
-        from pydantic import BaseModel
-        
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, date):
-            return obj.isoformat()
-        elif isinstance(obj, Enum):
-            return obj.value
-        elif isinstance(obj, BaseModel):
-            return obj.model_dump(mode='python')
-        elif hasattr(obj, '__dict__'):
-            return obj.__dict__
-        elif hasattr(obj, '__class__') and obj.__class__.__name__ == 'AnyUrl':
-            return str(obj)
-        else:
-            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
     def process_result_value(self, value, dialect):
+        if dialect.name == "postgresql":
+            # JSONB values are already deserialized by the driver
+            return value
         if value is not None:
-            # PostgreSQL JSONB columns are already deserialized by the driver
             # SQLite stores JSON as TEXT and needs parsing
             if isinstance(value, (dict, list)):
                 return value
-            return json.loads(value)
+            return json_codec.loads(value)
         return value
 
 
+class json_field(FunctionElement):
+    """
+    Text value of a top-level key in a JSONType column.
+
+    Compiles to ``(column ->> 'key')`` on PostgreSQL and to
+    ``json_extract(column, '$.key')`` elsewhere, matching the expression
+    indexes created by migration 006.
+    """
+    type = Text()
+    name = "json_field"
+    inherit_cache = True
+
+    def __init__(self, column, key: str):
+        if not re.fullmatch(r"\w+", key):
+            raise ValueError(f"Invalid JSON key: {key!r}")
+        # The key is rendered inline (and is part of the cache key) so the
+        # expression matches the index definition
+        super().__init__(column, literal_column(key))
+
+
+@compiles(json_field)
+def _compile_json_field(element, compiler, **kw):
+    column, key = list(element.clauses)
+    return f"json_extract({compiler.process(column, **kw)}, '$.{key.name}')"
+
+
+@compiles(json_field, "postgresql")
+def _compile_json_field_postgresql(element, compiler, **kw):
+    column, key = list(element.clauses)
+    return f"({compiler.process(column, **kw)} ->> '{key.name}')"
+
+
 class User(Base):
     """
     Dummy user model for OSS version.
@@ -123,6 +160,12 @@ class MCPServer(Base):
     # Contains: transport_type, command/url, args, env, auth_config, etc.
     mcp_server_config = Column(JSONType, nullable=False)
 
+    # Connection state, kept out of the JSON so status changes are narrow UPDATEs.
+    # When set, these take precedence over the copies inside mcp_server_config.
+    status = Column(String(50), nullable=True)
+    last_error = Column(Text, nullable=True)
+    last_connected = Column(DateTime, nullable=True)
+
     # OAuth state for MCP server authentication
     # Stores access tokens and refresh tokens for OAuth-enabled MCP servers
     oauth_state = Column(JSONType, nullable=True)
@@ -156,6 +199,8 @@ class VMCP(Base):
 
     # vMCP identification
     vmcp_id = Column(String(255), nullable=False, index=True)
+    # Mirrors vmcp_config["id"] so name -> ID resolution never reads the JSON
+    uuid = Column(String(255), nullable=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
 
@@ -163,6 +208,18 @@ class VMCP(Base):
     # Contains: list of mcp_server_ids, tool mappings, resource mappings, etc.
     vmcp_config = Column(JSONType, nullable=False)
 
+    # Listing summary derived from vmcp_config (see vmcp_summary_columns) so
+    # list endpoints never load the config JSON; NULL until first computed
+    total_tools = Column(Integer, nullable=True)
+    total_resources = Column(Integer, nullable=True)
+    total_resource_templates = Column(Integer, nullable=True)
+    total_prompts = Column(Integer, nullable=True)
+    server_count = Column(Integer, nullable=True)
+    server_summaries = Column(JSONType, nullable=True)
+    is_public = Column(Boolean, nullable=True)
+    public_at = Column(String(64), nullable=True)
+    public_tags = Column(JSONType, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -173,10 +230,54 @@ class VMCP(Base):
     environments = relationship("VMCPEnvironment", back_populates="vmcp", cascade="all, delete-orphan")
     stats = relationship("VMCPStats", back_populates="vmcp", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('idx_vmcp_user_name', 'user_id', 'name', unique=True),
+    )
+
     def __repr__(self):
         return f"<VMCP(id='{self.id}', vmcp_id='{self.vmcp_id}', name='{self.name}')>"
 
 
+def vmcp_summary_columns(vmcp_config: dict) -> dict:
+    """
+    Compute the VMCP listing summary columns from a serialized vMCP config.
+
+    Server summaries keep only what the list view shows (id, name, status,
+    url, favicon_url).
+    """
+    config = vmcp_config or {}
+    # selected_servers lives under vmcp_config in VMCPConfig, older configs keep it top-level
+    selected_servers = config.get("selected_servers") or (config.get("vmcp_config") or {}).get("selected_servers", [])
+    if not isinstance(selected_servers, list):
+        selected_servers = []
+
+    server_summaries = [
+        {
+            "id": server.get("server_id") or server.get("id"),
+            "name": server.get("name", ""),
+            "status": server.get("status", "unknown"),
+            "url": server.get("url"),
+            "favicon_url": server.get("favicon_url"),
+        }
+        for server in selected_servers
+        if isinstance(server, dict)
+    ]
+
+    public_at = config.get("public_at")
+    public_tags = config.get("public_tags", [])
+    return {
+        "total_tools": config.get("total_tools") or 0,
+        "total_resources": config.get("total_resources") or 0,
+        "total_resource_templates": config.get("total_resource_templates") or 0,
+        "total_prompts": config.get("total_prompts") or 0,
+        "server_count": len(selected_servers),
+        "server_summaries": server_summaries,
+        "is_public": bool(config.get("is_public", False)),
+        "public_at": str(public_at) if public_at is not None else None,
+        "public_tags": public_tags if isinstance(public_tags, list) else [],
+    }
+
+
 class VMCPMCPMapping(Base):
     """
     Mapping between VMCPs and MCP Servers.
@@ -561,11 +662,17 @@ class Blob(Base):
     file_path = Column(String, nullable=True)  # Relative path within resource
     resource_name = Column(String(500), nullable=True)  # Resource name for vMCPs
     
-    # File content - using BLOB for SQLite binary storage
-    content = Column(Text, nullable=False)  # File content (base64 encoded for binary files)
+    # Legacy inline content (base64 encoded for binary files). Empty for chunked blobs.
+    content = Column(Text, nullable=False, default="")
     content_type = Column(String(255), nullable=False)  # MIME type
     size = Column(Integer, nullable=False)  # File size in bytes
     checksum = Column(String)  # MD5 checksum
+
+    # Chunked storage: ordered list of {"digest": sha256, "size": bytes} entries
+    # resolved against the configured blob store (see storage/blob_store.py)
+    chunks = Column(JSONType, nullable=True)
+    storage_backend = Column(String(20), nullable=True)  # filesystem, database or NULL for inline
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the content, references BlobContent.sha256
     
     # Access control
     is_public = Column(Boolean, default=False, nullable=False)
@@ -578,6 +685,7 @@ class Blob(Base):
         Index('idx_blob_widget', 'widget_id'),
         Index('idx_blob_user', 'user_id'),
         Index('idx_blob_vmcp', 'vmcp_id'),
+        Index('idx_blob_content_hash', 'content_hash'),
     )
 
     def __repr__(self):
@@ -648,6 +756,11 @@ class Blob(Base):
         ]
         return self.content_type in archive_types
     
+    @property
+    def is_chunked(self):
+        """Check if content lives in the chunk store rather than the content column"""
+        return self.chunks is not None
+
     def get_file_extension(self):
         """Get file extension from original filename"""
         if '.' in self.original_filename:
@@ -659,6 +772,74 @@ class Blob(Base):
         return self.original_filename or self.filename or f"blob_{self.id}"
 
 
+class BlobChunk(Base):
+    """
+    Content-addressed chunk of blob data for the database blob backend.
+
+    Chunks are keyed by the SHA-256 of their bytes, so identical chunks
+    uploaded by different blobs are stored once.
+    """
+    __tablename__ = "blob_chunks"
+
+    digest = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<BlobChunk(digest='{self.digest[:12]}...', size={self.size})>"
+
+
+class BlobContent(Base):
+    """
+    Deduplicated blob content, addressed by the SHA-256 of the full file.
+
+    Every ``Blob`` row with the same ``content_hash`` shares one BlobContent
+    entry. ``ref_count`` tracks how many blob rows point at it; entries that
+    drop to zero are removed (together with their unreferenced chunks) by the
+    background blob garbage collector.
+    """
+    __tablename__ = "blob_contents"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    chunks = Column(JSONType, nullable=False)  # Ordered chunk manifest
+    storage_backend = Column(String(20), nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('idx_blob_content_ref_count', 'ref_count'),
+    )
+
+    def __repr__(self):
+        return f"<BlobContent(sha256='{self.sha256[:12]}...', size={self.size}, refs={self.ref_count})>"
+
+
+class BlobDerivative(Base):
+    """
+    Cached rendition derived from blob content (e.g. xlsx converted to CSV).
+
+    Keyed by the source content hash and the converter name/version, so a
+    rendition is computed once per unique file and recomputed only when the
+    converter changes. The rendition bytes live in the blob chunk store.
+    """
+    __tablename__ = "blob_derivatives"
+
+    content_hash = Column(String(64), primary_key=True)  # BlobContent.sha256 of the source
+    converter = Column(String(50), primary_key=True)
+    converter_version = Column(Integer, primary_key=True)
+    mime_type = Column(String(255), nullable=False)
+    size = Column(Integer, nullable=False)
+    chunks = Column(JSONType, nullable=False)
+    storage_backend = Column(String(20), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<BlobDerivative(content_hash='{self.content_hash[:12]}...', converter='{self.converter}@{self.converter_version}')>"
+
+
 # ========================== AGENT MANAGEMENT MODELS ==========================
 
 class SessionMapping(Base):
@@ -742,4 +923,49 @@ class AgentLogs(Base):
         return f"<AgentLogs(user_id={self.user_id}, agent_name='{self.agent_name}')>"
 
 
+# ========================== MULTI-WORKER MODELS ==========================
+
+class MCPSession(Base):
+    """
+    Stateless-mode MCP session issued by vMCP.
+
+    When MCP HTTP sessions run stateless (multi-worker deployments), vMCP
+    mints the mcp-session-id itself and records it here so any worker can
+    validate follow-up requests.
+    """
+    __tablename__ = "mcp_sessions"
+
+    session_id = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    vmcp_username = Column(String(255), nullable=True)
+    vmcp_name = Column(String(255), nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    last_seen_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<MCPSession(session_id='{self.session_id}', user_id={self.user_id})>"
+
+
+class CacheInvalidation(Base):
+    """
+    Cache invalidation event broadcast to the other workers.
+
+    Workers poll for rows newer than the last id they processed; rows are
+    pruned after the retention window (see storage/cache_bus.py).
+    """
+    __tablename__ = "cache_invalidations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic = Column(String(64), nullable=False)
+    key = Column(String(512), nullable=False)
+    origin = Column(String(64), nullable=False)  # Publishing worker
+    created_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+    # AUTOINCREMENT keeps ids increasing on SQLite even after pruning, so poll cursors stay valid
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    def __repr__(self):
+        return f"<CacheInvalidation(id={self.id}, topic='{self.topic}', key='{self.key}')>"
+
+
 # Blob model handles both widget files and general file resources
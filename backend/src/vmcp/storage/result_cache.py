@@ -0,0 +1,331 @@
+"""
+In-process cache of serialized upstream results with TTLs.
+
+Entries are opaque byte strings (callers serialize their results) stored in
+a memory LRU bounded by total size. When a spill directory is configured,
+entries evicted from memory before they expire are written there and
+promoted back on the next hit; the directory is bounded by size as well,
+dropping the oldest files first. Spilled files are indexed by key, so
+invalidations reach them too.
+
+With ``dedupe`` enabled, entries with identical data (e.g. the same resource
+read under several auth scopes) share one bytes object and count once
+against the memory budget.
+
+Caches are per worker process. Callers that need cross-worker invalidation
+subscribe to a cache bus topic and call ``invalidate``/``clear``.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("RESULT_CACHE")
+
+# Every ResultCache by name, for stats reporting
+_caches: Dict[str, "ResultCache"] = {}
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached result and its lifetime (wall-clock seconds)."""
+
+    data: bytes
+    stored_at: float
+    expires_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.stored_at)
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+class ResultCache:
+    """
+    Size-bounded LRU of byte results with per-entry TTL and optional disk spill.
+
+    Args:
+        name: Cache name, used in logs and stats
+        max_bytes: Memory budget for entry data
+        spill_dir: Directory for entries evicted from memory (None disables spilling)
+        spill_max_bytes: Disk budget for spilled entries
+        dedupe: Store identical data once (content-addressed by sha256)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        spill_dir: Optional[Path] = None,
+        spill_max_bytes: int = 0,
+        dedupe: bool = False,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir if spill_dir and spill_max_bytes > 0 else None
+        self.spill_max_bytes = spill_max_bytes
+        self._items: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        # dedupe: digest -> [data, number of entries using it], and each entry's digest
+        self._blobs: Optional[Dict[str, list]] = {} if dedupe else None
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._spill_bytes: Optional[int] = None
+        # Spilled file -> its key, built from the directory on first use
+        self._spilled: Dict[Path, str] = {}
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "spilled": 0, "spill_hits": 0}
+        _caches[name] = self
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a live entry in memory (does not touch the spill directory)."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry.expired():
+                self._remove(key)
+                return None
+            self._items.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, data: bytes, ttl: float, stored_at: Optional[float] = None) -> List[Tuple[str, CacheEntry]]:
+        """
+        Store an entry in memory.
+
+        Args:
+            key: Cache key
+            data: Serialized result
+            ttl: Seconds from now until the entry expires
+            stored_at: When the result was produced (defaults to now)
+
+        Returns:
+            Entries evicted to make room that have not expired yet
+        """
+        if ttl <= 0 or len(data) > self.max_bytes:
+            return []
+        now = time.time()
+        entry = CacheEntry(data=data, stored_at=stored_at or now, expires_at=now + ttl)
+        evicted = []
+        with self._lock:
+            self._remove(key)
+            self._add(key, entry)
+            while self._bytes > self.max_bytes:
+                old_key = next(iter(self._items))
+                old = self._remove(old_key)
+                self._stats["evictions"] += 1
+                if not old.expired(now):
+                    evicted.append((old_key, old))
+        return evicted
+
+    def _add(self, key: str, entry: CacheEntry) -> None:
+        if self._blobs is None:
+            self._items[key] = entry
+            self._bytes += len(entry.data)
+            return
+        digest = hashlib.sha256(entry.data).hexdigest()
+        blob = self._blobs.get(digest)
+        if blob is None:
+            self._blobs[digest] = [entry.data, 1]
+            self._bytes += len(entry.data)
+        else:
+            blob[1] += 1
+            entry = CacheEntry(data=blob[0], stored_at=entry.stored_at, expires_at=entry.expires_at)
+        self._items[key] = entry
+        self._digests[key] = digest
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        old = self._items.pop(key, None)
+        if old is None:
+            return None
+        if self._blobs is None:
+            self._bytes -= len(old.data)
+            return old
+        digest = self._digests.pop(key)
+        blob = self._blobs[digest]
+        blob[1] -= 1
+        if blob[1] == 0:
+            del self._blobs[digest]
+            self._bytes -= len(old.data)
+        return old
+
+    def invalidate(self, key: str) -> None:
+        """Drop one entry from memory and disk."""
+        with self._lock:
+            self._remove(key)
+        if self.spill_dir is not None:
+            self._unlink(self._spill_path(key))
+
+    def invalidate_where(self, predicate: Callable[[str], bool]) -> int:
+        """Drop entries whose key matches predicate from memory and disk; returns how many were in memory."""
+        with self._lock:
+            keys = [key for key in self._items if predicate(key)]
+            for key in keys:
+                self._remove(key)
+        if self.spill_dir is not None:
+            self._spill_usage()
+            with self._spill_lock:
+                paths = [path for path, key in self._spilled.items() if predicate(key)]
+            for path in paths:
+                self._unlink(path)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk."""
+        with self._lock:
+            self._items.clear()
+            self._digests.clear()
+            if self._blobs is not None:
+                self._blobs.clear()
+            self._bytes = 0
+        if self.spill_dir is not None and self.spill_dir.is_dir():
+            for path in self.spill_dir.glob("*.entry"):
+                self._unlink(path)
+            with self._spill_lock:
+                self._spill_bytes = 0
+                self._spilled.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._items), "bytes": self._bytes}
+
+    # ------------------------------------------------------------------
+    # Spill tier
+    # ------------------------------------------------------------------
+
+    def _spill_path(self, key: str) -> Path:
+        assert self.spill_dir is not None
+        return self.spill_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.entry"
+
+    def _unlink(self, path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return 0
+        with self._spill_lock:
+            self._spilled.pop(path, None)
+            if self._spill_bytes is not None:
+                self._spill_bytes -= size
+        return size
+
+    def _spill_usage(self) -> int:
+        with self._spill_lock:
+            if self._spill_bytes is None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                self._spill_bytes = 0
+                for path in self.spill_dir.glob("*.entry"):
+                    # Files left by an earlier process are indexed from their header
+                    try:
+                        self._spill_bytes += path.stat().st_size
+                        with path.open("rb") as f:
+                            self._spilled[path] = json.loads(f.readline())["key"]
+                    except (OSError, ValueError, KeyError, TypeError):
+                        continue
+            return self._spill_bytes
+
+    def spill(self, entries: List[Tuple[str, CacheEntry]]) -> None:
+        """Write evicted entries to the spill directory (blocking I/O)."""
+        if self.spill_dir is None or not entries:
+            return
+        usage = self._spill_usage()
+        for key, entry in entries:
+            header = json.dumps({"key": key, "stored_at": entry.stored_at, "expires_at": entry.expires_at})
+            payload = header.encode() + b"\n" + entry.data
+            path = self._spill_path(key)
+            usage -= self._unlink(path)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(payload)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Failed to spill {self.name} cache entry: {e}")
+                continue
+            usage += len(payload)
+            with self._spill_lock:
+                self._spill_bytes = (self._spill_bytes or 0) + len(payload)
+                self._spilled[path] = key
+            self._stats["spilled"] += 1
+        if usage > self.spill_max_bytes:
+            self._trim_spill()
+
+    def _trim_spill(self) -> None:
+        files = []
+        for path in self.spill_dir.glob("*.entry"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path))
+        files.sort()
+        for _, path in files:
+            if self._spill_usage() <= self.spill_max_bytes:
+                break
+            self._unlink(path)
+
+    def load_spilled(self, key: str) -> Optional[CacheEntry]:
+        """Read and promote a spilled entry (blocking I/O)."""
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        header, _, data = raw.partition(b"\n")
+        try:
+            meta = json.loads(header)
+        except ValueError:
+            self._unlink(path)
+            return None
+        if meta.get("key") != key:
+            return None
+        self._unlink(path)
+        entry = CacheEntry(data=data, stored_at=meta["stored_at"], expires_at=meta["expires_at"])
+        if entry.expired():
+            return None
+        self._stats["spill_hits"] += 1
+        self.spill(self.put(key, data, entry.expires_at - time.time(), stored_at=entry.stored_at))
+        return entry
+
+    # ------------------------------------------------------------------
+    # Async helpers (keep disk I/O off the event loop)
+    # ------------------------------------------------------------------
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry in memory, then in the spill directory."""
+        entry = self.get(key)
+        if entry is None and self.spill_dir is not None:
+            entry = await asyncio.to_thread(self.load_spilled, key)
+        if entry is None:
+            with self._lock:
+                self._stats["misses"] += 1
+        return entry
+
+    async def aput(self, key: str, data: bytes, ttl: float) -> None:
+        """Store an entry, spilling anything it evicts."""
+        evicted = self.put(key, data, ttl)
+        if evicted and self.spill_dir is not None:
+            await asyncio.to_thread(self.spill, evicted)
+
+
+def result_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Stats of every result cache in this process, by cache name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
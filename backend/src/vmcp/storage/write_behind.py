@@ -0,0 +1,103 @@
+"""
+Deferred, coalesced database writes.
+
+Some writes record state that changes on read paths but that no reader
+needs immediately: the upstream session id an MCP connection obtained, the
+``last_connected`` time of a server that was already connected. Instead of
+a write per request, callers ``defer`` them under a key; a later write for
+the same key replaces the pending one, and everything pending is flushed in
+one batch on the database writer thread ``VMCP_STORAGE_WRITE_DELAY`` seconds
+after the first deferral.
+
+Pending writes are lost if the process dies before the flush, so only use
+this for state that is safe to lose (it is re-derived on the next request).
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.storage.db_writer import get_db_writer
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("WRITE_BEHIND")
+
+
+class WriteBehind:
+    """Coalesces deferred writes by key and flushes them in batches."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._pending: Dict[Hashable, Tuple[Callable[..., Any], tuple]] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._stats: Dict[str, int] = {"deferred": 0, "coalesced": 0, "written": 0}
+
+    def defer(self, key: Hashable, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedule func(*args), replacing any write pending under key.
+
+        Args:
+            key: Identity of the stored value (e.g. ("mcp_session", user_id, server_id))
+            func: Blocking write to run on flush
+            *args: Arguments for func
+        """
+        if self.delay <= 0:
+            get_db_writer().submit(func, *args)
+            return
+        with self._lock:
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+            self._stats["deferred"] += 1
+            self._pending[key] = (func, args)
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._schedule_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        get_db_writer().submit(self.flush)
+
+    def flush(self) -> int:
+        """Run every pending write now (blocking); returns how many ran."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for key, (func, args) in pending.items():
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Deferred write {key!r} failed: {e}")
+        with self._lock:
+            self._stats["written"] += len(pending)
+        return len(pending)
+
+    def flush_keys(self, keys: Iterable[Hashable]) -> int:
+        """Run the writes pending under keys now (blocking), leaving the rest to the batch; returns how many ran."""
+        with self._lock:
+            pending = [(key, self._pending.pop(key)) for key in keys if key in self._pending]
+        for key, (func, args) in pending:
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Deferred write {key!r} failed: {e}")
+        with self._lock:
+            self._stats["written"] += len(pending)
+        return len(pending)
+
+    def stats(self) -> Dict[str, int]:
+        """Deferred, coalesced (replaced before flush) and written counts."""
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+
+_write_behind = WriteBehind(settings.storage_write_delay)
+
+
+def get_write_behind() -> WriteBehind:
+    """Get the process-wide write-behind queue."""
+    return _write_behind
@@ -0,0 +1,131 @@
+"""
+JSON codec shared by storage, operation logging and API responses.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise (``VMCP_JSON_CODEC`` forces one or the other). Both
+backends write compact UTF-8 JSON and handle the types found in vMCP
+payloads: datetimes, enums, UUIDs, dataclasses, pydantic models and URLs.
+"""
+
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from pydantic import AnyUrl, BaseModel
+from pydantic_core import Url
+from starlette.responses import JSONResponse
+
+from vmcp.config import settings
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging("JSON_CODEC")
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def default(obj: Any) -> Any:
+    """Convert objects the JSON backends cannot encode natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (AnyUrl, Url, UUID)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdlibCodec:
+    """Codec backed by the standard library json module."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec backed by orjson (native datetime, enum, UUID and dataclass support)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        # Non-string dict keys are stringified like the stdlib module does
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj, default=default, option=self._options).decode("utf-8")
+
+    def dumpb(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=default, option=self._options)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+def get_codec(name: Optional[str] = None):
+    """
+    Build a codec by name.
+
+    Args:
+        name: "orjson", "json" or "auto" (orjson if installed); defaults to settings.json_codec
+
+    Returns:
+        Codec instance with dumps/dumpb/loads
+    """
+    name = (name or settings.json_codec).lower()
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson":
+        if orjson is None:
+            logger.warning("orjson is not installed, falling back to the json module")
+            return StdlibCodec()
+        return OrjsonCodec()
+    if name == "json":
+        return StdlibCodec()
+    raise ValueError(f"Unknown JSON codec: {name}")
+
+
+codec = get_codec()
+
+
+def dumps(obj: Any) -> str:
+    """Encode obj as a JSON string."""
+    return codec.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode obj as UTF-8 JSON bytes."""
+    return codec.dumpb(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON string or bytes."""
+    return codec.loads(data)
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse rendered with the active codec (used as the app's default response class)."""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumpb(content)
+
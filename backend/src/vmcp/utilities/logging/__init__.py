@@ -1,5 +1,5 @@
 """Logging utilities for vMCP."""
 
-from vmcp.utilities.logging.config import setup_logging, get_logger
+from vmcp.utilities.logging.config import flush_logging, get_logger, lazy, redact_headers, setup_logging
 
-__all__ = ["setup_logging", "get_logger"]
+__all__ = ["setup_logging", "get_logger", "lazy", "redact_headers", "flush_logging"]
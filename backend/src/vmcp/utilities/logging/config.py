@@ -2,16 +2,46 @@
 Logging configuration for vMCP.
 
 Provides structured logging with proper log levels (DEBUG, INFO, WARNING, ERROR).
-Just clean, standard Python logging.
+Just clean, standard Python logging, plus a few controls for the request path:
+
+- Per-logger level overrides (``VMCP_LOG_LEVELS="PROXY_SERVER=DEBUG,CACHE_BUS=INFO"``)
+- Asynchronous output (``VMCP_LOG_ASYNC``): loggers hand records to a queue and a
+  background thread does the formatting and I/O, so the event loop never blocks
+  on stdout or a log file
+- Rate limiting (``VMCP_LOG_RATE_LIMIT``): DEBUG/INFO records are capped per
+  call site per second; warnings and errors always pass
+- JSON output (``VMCP_LOG_FORMAT=json``) including any ``extra`` fields
+
+Hot paths should log with %-style arguments so nothing is formatted for
+records below the logger's level, and wrap expensive values in ``lazy``:
+
+    logger.debug("Headers: %s", lazy(lambda: redact_headers(request.headers)))
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 
 from vmcp.config import settings
 
+# Header names whose values are never logged
+SENSITIVE_HEADERS = frozenset({
+    "authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key", "api-key",
+})
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 
 # Custom formatter with colors for console
 class ColoredFormatter(logging.Formatter):
@@ -29,10 +59,204 @@ class ColoredFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
         if record.levelname in self.COLORS:
+            # Color a copy so other handlers see the plain level name
+            record = logging.makeLogRecord(record.__dict__)
             record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.RESET}"
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": self.formatTime(record, _DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class lazy:
+    """
+    Defer computing a log argument until the record is actually formatted.
+
+    Args:
+        func: Zero-argument callable producing the value to log
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+    def __repr__(self) -> str:
+        return repr(self.func())
+
+
+def redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Copy headers with credential values masked."""
+    return {
+        key: ("***" if key.lower() in SENSITIVE_HEADERS else value)
+        for key, value in headers.items()
+    }
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Cap DEBUG/INFO records per call site per second.
+
+    Suppressed records are counted and the count is appended to the next
+    record that passes from the same call site.
+
+    Args:
+        rate: Records per second allowed from each call site
+        burst: Records allowed at once before the rate applies
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        # (logger, path, line) -> (tokens, last refill, suppressed count)
+        self._sites: Dict[Tuple[str, str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        site = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = [self.burst, now, 0]
+            state[0] = min(self.burst, state[0] + (now - state[1]) * self.rate)
+            state[1] = now
+            if state[0] < 1:
+                state[2] += 1
+                return False
+            state[0] -= 1
+            suppressed, state[2] = int(state[2]), 0
+        if suppressed:
+            record.msg = f"{record.msg} [+{suppressed} similar suppressed]"
+        return True
+
+
+def _parse_level_overrides(spec: str) -> Dict[str, str]:
+    """Parse "NAME=LEVEL,NAME=LEVEL" into a dict, ignoring malformed entries."""
+    overrides = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            overrides[name.strip()] = level.strip().upper()
+    return overrides
+
+
+_LEVEL_OVERRIDES = _parse_level_overrides(settings.log_levels)
+
+
+def level_for(name: str) -> str:
+    """Resolve the level for a logger: the longest matching override, else VMCP_LOG_LEVEL."""
+    candidate = name
+    while candidate:
+        if candidate in _LEVEL_OVERRIDES:
+            return _LEVEL_OVERRIDES[candidate]
+        candidate = candidate.rpartition(".")[0]
+    return settings.log_level.upper()
+
+
+def _console_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JsonFormatter()
+    # Use colored formatter for terminals, plain formatter otherwise
+    if sys.stdout.isatty():  # Only use colors if output is a terminal
+        return ColoredFormatter(settings.log_format, datefmt=_DATE_FORMAT)
+    return logging.Formatter(settings.log_format, datefmt=_DATE_FORMAT)
+
+
+def _file_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+        datefmt=_DATE_FORMAT
+    )
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records unformatted.
+
+    The stock prepare() formats the message on the logging thread and drops
+    exc_info, so the listener's formatter would never see the exception.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A copy per sink: each listener formats (and caches exc_text) on its own thread
+        return copy.copy(record)
+
+
+# Output handlers shared by all loggers, keyed by destination ("console" or a file path).
+# With async logging each maps to a QueueHandler drained by its own listener thread.
+_sinks: Dict[str, logging.Handler] = {}
+_listeners: List[logging.handlers.QueueListener] = []
+_sinks_lock = threading.Lock()
+_rate_limit_filter = RateLimitFilter(settings.log_rate_limit) if settings.log_rate_limit > 0 else None
+
+
+def _sink(key: str, factory: Callable[[], logging.Handler]) -> logging.Handler:
+    with _sinks_lock:
+        handler = _sinks.get(key)
+        if handler is None:
+            target = factory()
+            if settings.log_async:
+                record_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(record_queue, target)
+                listener.start()
+                _listeners.append(listener)
+                handler = _RecordQueueHandler(record_queue)
+            else:
+                handler = target
+            _sinks[key] = handler
+        return handler
+
+
+def _console_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_console_formatter())
+    return handler
+
+
+def _file_handler(log_file: Path) -> logging.Handler:
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(_file_formatter())
+    return handler
+
+
+@atexit.register
+def flush_logging() -> None:
+    """Drain queued records and stop the background log writers."""
+    with _sinks_lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+        _sinks.clear()
+    for listener in listeners:
+        listener.stop()
+
+
 def setup_logging(name: str = "vmcp", log_file: Optional[Path] = None) -> logging.Logger:
     """
     Setup logging configuration.
@@ -53,41 +277,18 @@ def setup_logging(name: str = "vmcp", log_file: Optional[Path] = None) -> loggin
     # Prevent propagation to root logger to avoid duplicates
     logger.propagate = False
 
-    # Set level from settings (ensure uppercase for compatibility)
-    log_level = settings.log_level.upper()
-    logger.setLevel(log_level)
+    # Level comes from per-logger overrides or settings (ensure uppercase for compatibility);
+    # handlers pass everything the logger lets through
+    logger.setLevel(level_for(name))
 
-    # Console handler with colors
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-
-    # Use colored formatter for terminals, plain formatter otherwise
-    console_formatter: Union[ColoredFormatter, logging.Formatter]
-    if sys.stdout.isatty():  # Only use colors if output is a terminal
-        console_formatter = ColoredFormatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    else:
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-
-    # File handler if specified
+    handlers: List[logging.Handler] = [_sink("console", _console_handler)]
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(_sink(str(log_file), lambda: _file_handler(log_file)))
+
+    for handler in handlers:
+        logger.addHandler(handler)
+    if _rate_limit_filter is not None:
+        logger.addFilter(_rate_limit_filter)
 
     return logger
 
@@ -8,6 +8,7 @@ from vmcp.utilities.tracing.telemetry import (
     add_tracing_middleware,
     log_to_span,
     add_event,
+    TRACING_ENABLED,
 )
 
-__all__ = ["setup_telemetry", "trace_method", "trace_async", "get_tracer", "add_tracing_middleware", "log_to_span", "add_event"]
+__all__ = ["setup_telemetry", "trace_method", "trace_async", "get_tracer", "add_tracing_middleware", "log_to_span", "add_event", "TRACING_ENABLED"]
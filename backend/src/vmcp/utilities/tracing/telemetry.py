@@ -6,25 +6,48 @@ Traces can be exported to Jaeger, Zipkin, or any OTLP-compatible backend.
 """
 
 import functools
+import inspect
 import logging
-from typing import Any, Callable, Optional
-
-from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
 
 from vmcp.config import settings
 
+# OpenTelemetry (SDK, OTLP exporter, instrumentors) is imported only when
+# tracing is enabled; it adds a couple hundred milliseconds to startup.
+if TYPE_CHECKING:
+    from opentelemetry import trace
+
 logger = logging.getLogger(__name__)
 
+# Read once: decorators applied at import time keep the choice for the process.
+# Hot call sites guard on this (``if TRACING_ENABLED: log_to_span(lambda: ...)``)
+# so a disabled build does not even create the builder closure.
+TRACING_ENABLED = settings.enable_tracing
+
+# Spans started with this attribute are sampled regardless of the ratio
+FORCE_SAMPLE_ATTRIBUTE = "vmcp.force_sample"
+
 # Global tracer
-_tracer: Optional[trace.Tracer] = None
+_tracer: Optional["trace.Tracer"] = None
+
+
+def _build_sampler(ratio: float) -> Any:
+    """Head-based ratio sampler (respecting the parent's decision) that always keeps forced spans."""
+    from opentelemetry.sdk.trace.sampling import Decision, ParentBased, Sampler, SamplingResult, TraceIdRatioBased
+
+    class ErrorAwareSampler(Sampler):
+        def __init__(self):
+            self._delegate = ParentBased(TraceIdRatioBased(ratio))
+
+        def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+            if attributes and attributes.get(FORCE_SAMPLE_ATTRIBUTE):
+                return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+            return self._delegate.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+
+        def get_description(self) -> str:
+            return f"ErrorAwareSampler{{{ratio}}}"
+
+    return ErrorAwareSampler()
 
 
 def setup_telemetry() -> None:
@@ -41,14 +64,22 @@ def setup_telemetry() -> None:
         return
 
     try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
         # Create resource with service information
         resource = Resource.create({
             "service.name": settings.service_name,
             "service.version": settings.app_version,
         })
 
-        # Setup tracer provider
-        provider = TracerProvider(resource=resource)
+        # Setup tracer provider with head-based sampling
+        provider = TracerProvider(resource=resource, sampler=_build_sampler(settings.tracing_sample_ratio))
 
         # Setup OTLP exporter if endpoint is configured
         if settings.otlp_endpoint:
@@ -84,6 +115,7 @@ def instrument_fastapi(app: Any) -> None:
     """
     if settings.enable_tracing:
         try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
             FastAPIInstrumentor.instrument_app(app)
             logger.info("FastAPI instrumentation enabled")
         except Exception as e:
@@ -99,13 +131,14 @@ def instrument_sqlalchemy(engine: Any) -> None:
     """
     if settings.enable_tracing:
         try:
+            from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
             SQLAlchemyInstrumentor().instrument(engine=engine)
             logger.info("SQLAlchemy instrumentation enabled")
         except Exception as e:
             logger.error(f"Failed to instrument SQLAlchemy: {e}")
 
 
-def get_tracer() -> trace.Tracer:
+def get_tracer() -> "trace.Tracer":
     """
     Get the global tracer instance.
 
@@ -114,13 +147,18 @@ def get_tracer() -> trace.Tracer:
     """
     global _tracer
     if _tracer is None:
+        from opentelemetry import trace
+
         _tracer = trace.get_tracer(__name__)
     return _tracer
 
 
 def trace_method(name: str = None, **trace_kwargs):
     """
-    Decorator to trace a function or method.
+    Decorator to trace a function or method (sync or async).
+
+    With tracing disabled the function is returned unchanged, so decorated
+    hot paths cost nothing.
 
     Args:
         name: Span name (defaults to function name)
@@ -132,28 +170,39 @@ def trace_method(name: str = None, **trace_kwargs):
             pass
     """
     def decorator(func: Callable) -> Callable:
-        if not settings.enable_tracing:
+        if not TRACING_ENABLED:
             return func
 
         span_name = name or f"{func.__module__}.{func.__name__}"
 
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().start_as_current_span(span_name, record_exception=False) as span:
+                    _start_span(span, trace_kwargs)
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        _record_error(span, span_name, trace_kwargs, e)
+                        raise
+                    if span.is_recording():
+                        span.set_attribute("success", True)
+                    return result
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            tracer = get_tracer()
-            with tracer.start_as_current_span(span_name) as span:
-                # Add custom attributes
-                for key, value in trace_kwargs.items():
-                    span.set_attribute(key, value)
-
+            with get_tracer().start_as_current_span(span_name, record_exception=False) as span:
+                _start_span(span, trace_kwargs)
                 try:
                     result = func(*args, **kwargs)
-                    span.set_attribute("success", True)
-                    return result
                 except Exception as e:
-                    span.set_attribute("success", False)
-                    span.set_attribute("error", str(e))
-                    span.record_exception(e)
+                    _record_error(span, span_name, trace_kwargs, e)
                     raise
+                if span.is_recording():
+                    span.set_attribute("success", True)
+                return result
 
         return wrapper
     return decorator
@@ -163,82 +212,113 @@ def trace_async(name: str = None, **trace_kwargs):
     """
     Decorator to trace an async function or method.
 
-    Args:
-        name: Span name (defaults to function name)
-        **trace_kwargs: Additional attributes to add to the span
+    Same as trace_method, which detects coroutine functions itself.
 
     Usage:
         @trace_async("async_operation")
         async def my_async_function():
             pass
     """
-    def decorator(func: Callable) -> Callable:
-        if not settings.enable_tracing:
-            return func
+    return trace_method(name, **trace_kwargs)
 
-        span_name = name or f"{func.__module__}.{func.__name__}"
 
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            tracer = get_tracer()
-            with tracer.start_as_current_span(span_name) as span:
-                # Add custom attributes
-                for key, value in trace_kwargs.items():
-                    span.set_attribute(key, value)
+def _start_span(span: Any, trace_kwargs: Dict[str, Any]) -> None:
+    if span.is_recording():
+        for key, value in trace_kwargs.items():
+            span.set_attribute(key, _attribute_value(value))
 
-                try:
-                    result = await func(*args, **kwargs)
-                    span.set_attribute("success", True)
-                    return result
-                except Exception as e:
-                    span.set_attribute("success", False)
-                    span.set_attribute("error", str(e))
-                    span.record_exception(e)
-                    raise
 
-        return wrapper
-    return decorator
+def _record_error(span: Any, span_name: str, trace_kwargs: Dict[str, Any], error: Exception) -> None:
+    """Record a failure on the span, or on a forced-sample span when the trace was not sampled."""
+    if not span.is_recording():
+        if not settings.tracing_always_sample_errors:
+            return
+        span = get_tracer().start_span(span_name, attributes={FORCE_SAMPLE_ATTRIBUTE: True})
+        _start_span(span, trace_kwargs)
+        try:
+            _record_error(span, span_name, trace_kwargs, error)
+        finally:
+            span.end()
+        return
+    span.set_attribute("success", False)
+    span.set_attribute("error", str(error))
+    span.record_exception(error)
+
+
+def _attribute_value(value: Any) -> Any:
+    """Span attributes must be primitives; anything else is recorded as JSON."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    try:
+        from vmcp.utilities import json_codec
+        return json_codec.dumps(value)
+    except Exception:
+        return str(value)
+
+
+def _build_payload(message: Any, attributes: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Evaluate a lazy message builder and convert attributes to span values."""
+    if callable(message):
+        message = message()
+        if isinstance(message, tuple):
+            message, built_attributes = message
+            attributes = {**attributes, **built_attributes}
+    return str(message), {key: _attribute_value(value) for key, value in attributes.items()}
 
 
-def add_event(event_name: str, **attributes):
+def add_event(event_name: Union[str, Callable[[], Any]], **attributes):
     """
     Add an event to the current span.
 
-    For OSS version: This is a no-op stub since tracing is disabled by default.
+    A no-op unless tracing is enabled and the current span is sampled.
+    ``event_name`` may be a zero-argument builder returning the name or a
+    ``(name, attributes)`` tuple, so formatting only happens when recorded.
+    A disabled call still costs the call and the builder closure, so hot
+    paths check ``TRACING_ENABLED`` first:
+
+        if TRACING_ENABLED:
+            add_event(lambda: (f"Calling {tool}", {"metadata": {"tool": tool}}))
 
     Args:
-        event_name: Name of the event
+        event_name: Name of the event, or a lazy builder
         **attributes: Additional attributes for the event
     """
-    if not settings.enable_tracing:
+    if not TRACING_ENABLED:
         return
 
     try:
+        from opentelemetry import trace
         span = trace.get_current_span()
         if span and span.is_recording():
-            span.add_event(event_name, attributes=attributes)
+            name, resolved = _build_payload(event_name, attributes)
+            span.add_event(name, attributes=resolved)
     except Exception as e:
         logger.debug(f"Failed to add event to span: {e}")
 
 
-def log_to_span(message: str, **attributes):
+def log_to_span(message: Union[str, Callable[[], Any]], **attributes):
     """
     Log a message to the current span with optional attributes.
 
-    For OSS version: This is a no-op stub since tracing is disabled by default.
+    A no-op unless tracing is enabled and the current span is sampled
+    (guard hot call sites with ``TRACING_ENABLED``, see add_event).
+    ``message`` may be a zero-argument builder returning the message or a
+    ``(message, attributes)`` tuple (see add_event).
 
     Args:
-        message: Message to log
+        message: Message to log, or a lazy builder
         **attributes: Additional attributes to add to the span
     """
-    if not settings.enable_tracing:
+    if not TRACING_ENABLED:
         return
 
     try:
+        from opentelemetry import trace
         span = trace.get_current_span()
         if span and span.is_recording():
-            span.add_event(message, attributes=attributes)
-            for key, value in attributes.items():
+            text, resolved = _build_payload(message, attributes)
+            span.add_event(text, attributes=resolved)
+            for key, value in resolved.items():
                 span.set_attribute(key, value)
     except Exception as e:
         logger.debug(f"Failed to log to span: {e}")
@@ -7,7 +7,7 @@ the base shared models to provide type-safe API endpoints.
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, model_validator, root_validator, validator
 
@@ -25,6 +25,7 @@ from vmcp.shared.models import (
     ToolInfo,
     TransportType,
 )
+from vmcp.mcps.models import BalancingPolicy
 from vmcp.shared.validators import (
     validate_args,
     validate_auth_type,
@@ -372,6 +373,18 @@ class VMCPAddServerData(BaseModel):
     # Settings
     auto_connect: Optional[bool] = Field(True, description="Auto-connect on startup")
     enabled: Optional[bool] = Field(True, description="Server enabled")
+    max_in_flight: Optional[int] = Field(
+        None, ge=0, description="Concurrent calls allowed to this server (default VMCP_UPSTREAM_MAX_IN_FLIGHT, 0 = unlimited)"
+    )
+    endpoints: Optional[List[str]] = Field(
+        None, description="Replica URLs of the same server, balanced together with url"
+    )
+    balancing: Optional[BalancingPolicy] = Field(
+        None, description="Replica balancing: round_robin, least_outstanding or ewma (default VMCP_UPSTREAM_BALANCING)"
+    )
+    hedge: Optional[bool] = Field(
+        None, description="Hedge slow read-only tool calls on a second replica (default VMCP_UPSTREAM_HEDGE)"
+    )
     favicon_url: Optional[str] = Field(None, description="Favicon URL for the server")
     
     class Config:
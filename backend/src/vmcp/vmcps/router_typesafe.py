@@ -10,13 +10,16 @@ import logging
 import random
 import re
 import traceback
+import uuid
+from copy import deepcopy
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from vmcp.mcps.health_monitor import get_health_monitor
 from vmcp.mcps.mcp_client import AuthenticationError, MCPClientManager
 from vmcp.mcps.mcp_configmanager import MCPConfigManager
 from vmcp.mcps.models import MCPConnectionStatus, MCPServerConfig, MCPTransportType
@@ -24,6 +27,7 @@ from vmcp.mcps.models import MCPConnectionStatus, MCPServerConfig, MCPTransportT
 # Import shared models
 from vmcp.shared.models import BaseResponse, ErrorResponse, PromptInfo, ServerInfo
 from vmcp.storage.base import StorageBase
+from vmcp.storage.blob_service import BlobStorageManager
 
 # Import dependencies
 from vmcp.storage.database import SessionLocal, get_db
@@ -440,6 +444,10 @@ async def create_vmcp(
         config_manager = MCPConfigManager(user_context.user_id)
         client_manager = MCPClientManager(config_manager)
         user_vmcp_manager = VMCPConfigManager(user_context.user_id)
+
+        # vMCP names address the vMCP in URLs and are unique per user
+        if user_vmcp_manager.storage.find_vmcp_name(request.name):
+            raise HTTPException(status_code=409, detail=f"vMCP with name '{request.name}' already exists")
         
         # Parse Python functions and update their variables
         updated_custom_tools = []
@@ -1422,6 +1430,7 @@ async def list_vmcps(user_context: UserContext = Depends(get_user_context)) -> V
 async def refresh_vmcp(
     vmcp_id: str,
     request: Optional[VMCPRefreshRequest] = None,
+    probe: bool = Query(False, description="Ping each server now instead of using the monitored status"),
     user_context: UserContext = Depends(get_user_context)
 ) -> VMCPRefreshResponse:
     """Refresh a vMCP configuration for the current user - checks servers and updates status/capabilities"""
@@ -1469,18 +1478,10 @@ async def refresh_vmcp(
             try:
                 logger.info(f"   🔗 Attempting to connect to server: {server_name}")
                 if mcp_server:
-                    # Ping the server to get current status
-                    try:
-                        current_status = await client_manager.ping_server(mcp_server.server_id)
-                        logger.info(f"   🔍 Server {mcp_server.name}: ping result = {current_status.value}")
-                    except AuthenticationError as e:
-                        logger.debug(f"   ❌ Traceback: {traceback.format_exc()}")
-                        logger.debug(f"   ❌ Authentication error for server {mcp_server.name}: {e}")
-                        current_status = MCPConnectionStatus.AUTH_REQUIRED
-                    except Exception as e:
-                        logger.debug(f"   ❌ Traceback: {traceback.format_exc()}")
-                        logger.error(f"   ❌ Error pinging server {mcp_server.name}: {mcp_server.server_id}: {e}")
-                        current_status = MCPConnectionStatus.UNKNOWN
+                    # Monitored status (a live ping if the server is not watched yet or probe is set)
+                    health = await get_health_monitor().status(config_manager, mcp_server.server_id, probe=probe)
+                    current_status = health.status
+                    logger.info(f"   🔍 Server {mcp_server.name}: status = {current_status.value}")
 
                     mcp_server.status = current_status
                     
@@ -1865,57 +1866,96 @@ async def fork_vmcp(
         if not original_vmcp:
             raise HTTPException(status_code=404, detail=f"vMCP '{vmcp_id}' not found")
         
-        # Create forked vMCP config
-        fork_name = request.name if request and request.name else f"{original_vmcp.name} (Fork)"
+        # vMCP names are unique per user: a requested name must be free, a
+        # default one is numbered past the forks that already exist
+        storage = vmcp_config_manager.storage
+        if request and request.name:
+            fork_name = request.name
+            if storage.find_vmcp_name(fork_name):
+                raise HTTPException(status_code=409, detail=f"vMCP with name '{fork_name}' already exists")
+        else:
+            fork_name = f"{original_vmcp.name} (Fork)"
+            fork_number = 1
+            while storage.find_vmcp_name(fork_name):
+                fork_number += 1
+                fork_name = f"{original_vmcp.name} (Fork {fork_number})"
+
+        # Create forked vMCP config from a copy of the original
         fork_description = request.description if request and request.description else f"Forked from {original_vmcp.name}: {original_vmcp.description}"
-        forked_vmcp = VMCPConfig(
-            name=fork_name,
-            description=fork_description,
-            servers=original_vmcp.servers.copy(),
-            tools=original_vmcp.tools.copy(),
-            resources=original_vmcp.resources.copy(),
-            prompts=original_vmcp.prompts.copy(),
-            environment_variables=original_vmcp.environment_variables.copy(),
-            auto_connect=original_vmcp.auto_connect,
-            enabled=original_vmcp.enabled,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        
-        # Generate new vMCP ID
-        forked_vmcp_id = forked_vmcp.generate_vmcp_id()
-        forked_vmcp.id = forked_vmcp_id
-        
+        fork_data = deepcopy(original_vmcp.to_dict())
+        fork_data.update({
+            "id": str(uuid.uuid4()),
+            "name": fork_name,
+            "description": fork_description,
+            "user_id": str(user_context.user_id),
+            "created_at": None,
+            "updated_at": None,
+            "is_public": False,
+            "public_tags": [],
+            "public_at": None,
+        })
+        forked_vmcp = VMCPConfig.from_dict(fork_data)
+        forked_vmcp_id = forked_vmcp.id
+
+        # Uploaded files are copied by reference: new blob rows share the original content
+        blob_manager = BlobStorageManager(user_context.user_id)
+        cloned_resources: Dict[str, Dict[str, Any]] = {}
+        for resource in forked_vmcp.custom_resources + forked_vmcp.uploaded_files:
+            blob_id = resource.get("id") if isinstance(resource, dict) else None
+            if not blob_id or blob_id in cloned_resources:
+                continue
+            metadata = blob_manager.clone_blob(blob_id, forked_vmcp_id, source_vmcp_id=vmcp_id)
+            if metadata:
+                cloned_resources[blob_id] = metadata.dict()
+            else:
+                logger.warning(f"   ⚠️ Could not clone resource blob {blob_id} into fork")
+
+        forked_vmcp.custom_resources = [
+            {**resource, **cloned_resources[resource["id"]]} if isinstance(resource, dict) and resource.get("id") in cloned_resources else resource
+            for resource in forked_vmcp.custom_resources
+        ]
+        forked_vmcp.uploaded_files = [
+            {**resource, **cloned_resources[resource["id"]]} if isinstance(resource, dict) and resource.get("id") in cloned_resources else resource
+            for resource in forked_vmcp.uploaded_files
+        ]
+
         # Save forked vMCP
         success = vmcp_config_manager.save_vmcp_config(forked_vmcp)
         if not success:
+            for metadata in cloned_resources.values():
+                blob_manager.delete_blob(metadata["id"], forked_vmcp_id)
+            if storage.find_vmcp_name(fork_name):
+                # Taken by a concurrent create or fork
+                raise HTTPException(status_code=409, detail=f"vMCP with name '{fork_name}' already exists")
             raise HTTPException(status_code=500, detail="Failed to save forked vMCP configuration")
         
-        logger.info(f"   ✅ Successfully forked vMCP '{vmcp_id}' to '{forked_vmcp_id}'")
+        logger.info(f"   ✅ Successfully forked vMCP '{vmcp_id}' to '{forked_vmcp_id}' ({len(cloned_resources)} shared files)")
         
         # Create response with proper type-safe model
         vmcp_info = VMCPInfo(
             id=forked_vmcp.id,
             name=forked_vmcp.name,
-            description=forked_vmcp.description,
-            servers=forked_vmcp.servers,
-            tools=forked_vmcp.tools,
-            resources=forked_vmcp.resources,
-            prompts=forked_vmcp.prompts,
-            environment_variables=forked_vmcp.environment_variables,
-            auto_connect=forked_vmcp.auto_connect,
-            enabled=forked_vmcp.enabled,
+            description=forked_vmcp.description or None,
+            status="active",
+            user_id=str(user_context.user_id),
+            system_prompt=forked_vmcp.system_prompt,
+            vmcp_config=forked_vmcp.vmcp_config or {},
+            custom_prompts=forked_vmcp.custom_prompts or [],
+            custom_tools=forked_vmcp.custom_tools or [],
+            custom_context=forked_vmcp.custom_context or [],
+            custom_resources=forked_vmcp.custom_resources or [],
+            custom_resource_templates=forked_vmcp.custom_resource_templates or [],
+            custom_widgets=forked_vmcp.custom_widgets or [],
+            custom_resource_uris=forked_vmcp.custom_resource_uris or [],
+            environment_variables=forked_vmcp.environment_variables or [],
+            uploaded_files=forked_vmcp.uploaded_files or [],
             created_at=forked_vmcp.created_at,
             updated_at=forked_vmcp.updated_at
         )
         
         return VMCPCreateResponse(
             success=True,
-            message=f"vMCP '{vmcp_id}' forked successfully",
-            data={
-                "original_vmcp_id": vmcp_id,
-                "forked_vmcp": vmcp_info
-            }
+            vMCP=vmcp_info
         )
         
     except HTTPException:
@@ -2527,6 +2567,10 @@ async def add_server_to_vmcp(
                 headers=server_data_dict.get('headers'),
                 auto_connect=server_data_dict.get('auto_connect', True),
                 enabled=server_data_dict.get('enabled', True),
+                max_in_flight=server_data_dict.get('max_in_flight'),
+                endpoints=server_data_dict.get('endpoints'),
+                balancing=server_data_dict.get('balancing'),
+                hedge=server_data_dict.get('hedge'),
                 status=MCPConnectionStatus.DISCONNECTED,
                 favicon_url=server_data_dict.get('favicon_url')
             )
@@ -1,115 +1,218 @@
 import zipfile
 import io
 import csv
+import posixpath
+import re
 import xml.etree.ElementTree as ET
-import logging
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from vmcp.utilities.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+WORDPROCESSING_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_S = f'{{{SPREADSHEET_NS}}}'
+_W = f'{{{WORDPROCESSING_NS}}}'
+_CELL_REF = re.compile(r'([A-Z]+)')
+
 
 def get_mime_type(filename: str) -> str:
     """Get MIME type using mimetypes library on the original filename"""
     import mimetypes
-    
+
     # Get MIME type using guess_type
     mime_type, encoding = mimetypes.guess_type(filename)
-    
+
     # Return the detected MIME type or default if not detected
     return mime_type or 'application/octet-stream'
 
-def convert_openxml_to_csv(file_content: bytes, filename: str) -> tuple[str, str]:
+
+def _column_index(cell_ref: Optional[str]) -> Optional[int]:
+    """Convert a cell reference like 'AB12' to a zero-based column index"""
+    if not cell_ref:
+        return None
+    match = _CELL_REF.match(cell_ref)
+    if not match:
+        return None
+    index = 0
+    for char in match.group(1):
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def _iter_shared_strings(zip_file: zipfile.ZipFile) -> Iterator[str]:
+    """Stream shared strings, joining rich-text runs and skipping phonetic hints"""
+    with zip_file.open('xl/sharedStrings.xml') as ss_file:
+        parts: List[str] = []
+        in_phonetic = 0
+        for event, elem in ET.iterparse(ss_file, events=('start', 'end')):
+            if elem.tag == f'{_S}rPh':
+                in_phonetic += 1 if event == 'start' else -1
+            elif event == 'end' and elem.tag == f'{_S}t' and not in_phonetic:
+                parts.append(elem.text or '')
+            elif event == 'end' and elem.tag == f'{_S}si':
+                yield ''.join(parts)
+                parts = []
+                elem.clear()
+
+
+def _workbook_sheets(zip_file: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """Return (sheet name, archive path) pairs in workbook order"""
+    names = set(zip_file.namelist())
+    workbook_path = 'xl/workbook.xml'
+    if workbook_path not in names:
+        workbook_path = next((name for name in names if name.endswith('workbook.xml')), None)
+        if not workbook_path:
+            return []
+
+    # Map relationship ids to worksheet paths
+    targets: Dict[str, str] = {}
+    workbook_dir = posixpath.dirname(workbook_path)
+    rels_path = posixpath.join(workbook_dir, '_rels', posixpath.basename(workbook_path) + '.rels')
+    if rels_path in names:
+        with zip_file.open(rels_path) as rels_file:
+            for rel in ET.parse(rels_file).getroot().iter(f'{{{PACKAGE_RELATIONSHIPS_NS}}}Relationship'):
+                target = rel.get('Target', '')
+                if target.startswith('/'):
+                    target = target.lstrip('/')
+                else:
+                    target = posixpath.normpath(posixpath.join(workbook_dir, target))
+                targets[rel.get('Id', '')] = target
+
+    sheets = []
+    with zip_file.open(workbook_path) as workbook_file:
+        for sheet in ET.parse(workbook_file).getroot().iter(f'{_S}sheet'):
+            sheet_name = sheet.get('name')
+            sheet_path = targets.get(sheet.get(f'{{{RELATIONSHIPS_NS}}}id', ''))
+            if not sheet_path:
+                sheet_path = f"xl/worksheets/sheet{sheet.get('sheetId')}.xml"
+            if sheet_name and sheet_path in names:
+                sheets.append((sheet_name, sheet_path))
+    return sheets
+
+
+def _iter_sheet_rows(zip_file: zipfile.ZipFile, sheet_path: str, shared_strings: List[str]) -> Iterator[List[str]]:
+    """Stream a worksheet row by row, clearing parsed elements as it goes"""
+    with zip_file.open(sheet_path) as sheet_file:
+        row: List[str] = []
+        value: Optional[str] = None
+        inline_parts: List[str] = []
+        for event, elem in ET.iterparse(sheet_file, events=('end',)):
+            tag = elem.tag
+            if tag == f'{_S}v':
+                value = elem.text
+            elif tag == f'{_S}t':
+                inline_parts.append(elem.text or '')
+            elif tag == f'{_S}c':
+                cell_type = elem.get('t')
+                if cell_type == 's' and value is not None:
+                    try:
+                        cell_value = shared_strings[int(value)]
+                    except (ValueError, IndexError):
+                        cell_value = ''
+                elif cell_type == 'inlineStr':
+                    cell_value = ''.join(inline_parts)
+                else:
+                    cell_value = value or ''
+
+                column = _column_index(elem.get('r'))
+                if column is not None and column > len(row):
+                    row.extend([''] * (column - len(row)))
+                row.append(cell_value)
+
+                value = None
+                inline_parts = []
+                elem.clear()
+            elif tag == f'{_S}row':
+                if row:  # Only emit non-empty rows
+                    yield row
+                row = []
+                elem.clear()
+
+
+def convert_openxml_to_csv(file_content: Union[bytes, BinaryIO], filename: str) -> tuple[str, str]:
     """
     Convert OpenXML Excel file to CSV format
     Returns tuple of (csv_content, mime_type)
+
+    Sheets are parsed incrementally with iterparse, so memory use is bounded
+    by the shared strings table and the CSV output rather than the sheet DOM.
+    ``file_content`` may be bytes or a seekable binary file object.
     """
+    source = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
     try:
         # Open the Excel file as a ZIP archive
-        with zipfile.ZipFile(io.BytesIO(file_content)) as zip_file:
-            # Find the workbook file
-            workbook_path = None
-            for name in zip_file.namelist():
-                if name.endswith('workbook.xml'):
-                    workbook_path = name
-                    break
-            
-            if not workbook_path:
-                return str(file_content), 'application/octet-stream'
-            
-            # Parse the workbook to get sheet names
-            with zip_file.open(workbook_path) as workbook_file:
-                workbook_tree = ET.parse(workbook_file)
-                workbook_root = workbook_tree.getroot()
-                
-                # Extract namespace
-                namespaces = {'w': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-                
-                # Get sheet names
-                sheets = []
-                for sheet in workbook_root.findall('.//w:sheet', namespaces):
-                    sheet_name = sheet.get('name')
-                    sheet_id = sheet.get('sheetId')
-                    if sheet_name and sheet_id:
-                        sheets.append((sheet_name, sheet_id))
-            
+        with zipfile.ZipFile(source) as zip_file:
+            sheets = _workbook_sheets(zip_file)
+            if not sheets:
+                return _unconverted(file_content), 'application/octet-stream'
+
+            shared_strings: List[str] = []
+            if 'xl/sharedStrings.xml' in zip_file.namelist():
+                shared_strings = list(_iter_shared_strings(zip_file))
+
             # Convert each sheet to CSV and concatenate
-            csv_parts = []
-            
-            for sheet_name, sheet_id in sheets:
-                # Find the sheet XML file
-                sheet_path = f'xl/worksheets/sheet{sheet_id}.xml'
-                if sheet_path not in zip_file.namelist():
-                    continue
-                
-                # Parse the sheet XML
-                with zip_file.open(sheet_path) as sheet_file:
-                    sheet_tree = ET.parse(sheet_file)
-                    sheet_root = sheet_tree.getroot()
-                    
-                    # Get shared strings if available
-                    shared_strings = []
-                    shared_strings_path = 'xl/sharedStrings.xml'
-                    if shared_strings_path in zip_file.namelist():
-                        with zip_file.open(shared_strings_path) as ss_file:
-                            ss_tree = ET.parse(ss_file)
-                            ss_root = ss_tree.getroot()
-                            for si in ss_root.findall('.//w:t', namespaces):
-                                shared_strings.append(si.text or '')
-                    
-                    # Extract data from sheet
-                    rows = []
-                    for row in sheet_root.findall('.//w:row', namespaces):
-                        row_data = []
-                        for cell in row.findall('.//w:c', namespaces):
-                            cell_value = ''
-                            v_elem = cell.find('.//w:v', namespaces)
-                            if v_elem is not None and v_elem.text:
-                                if cell.get('t') == 's':  # Shared string
-                                    try:
-                                        idx = int(v_elem.text)
-                                        if idx < len(shared_strings):
-                                            cell_value = shared_strings[idx]
-                                    except (ValueError, IndexError):
-                                        pass
-                                else:  # Direct value
-                                    cell_value = v_elem.text
-                            row_data.append(cell_value)
-                        if row_data:  # Only add non-empty rows
-                            rows.append(row_data)
-                    
-                    # Convert to CSV
-                    if rows:
-                        csv_parts.append(f"=== Sheet: {sheet_name} ===\n")
-                        csv_buffer = io.StringIO()
-                        csv_writer = csv.writer(csv_buffer)
-                        csv_writer.writerows(rows)
-                        csv_parts.append(csv_buffer.getvalue())
-                        csv_parts.append("\n")
-            
-            if csv_parts:
-                csv_content = ''.join(csv_parts)
+            csv_buffer = io.StringIO()
+            csv_writer = csv.writer(csv_buffer)
+            for sheet_name, sheet_path in sheets:
+                header_written = False
+                for row in _iter_sheet_rows(zip_file, sheet_path, shared_strings):
+                    if not header_written:
+                        csv_buffer.write(f"=== Sheet: {sheet_name} ===\n")
+                        header_written = True
+                    csv_writer.writerow(row)
+                if header_written:
+                    csv_buffer.write("\n")
+
+            csv_content = csv_buffer.getvalue()
+            if csv_content:
                 return csv_content, 'text/csv'
-            else:
-                return str(file_content), 'application/octet-stream'
-                
+            return _unconverted(file_content), 'application/octet-stream'
+
     except Exception as e:
         logger.warning(f"Failed to convert OpenXML file {filename} to CSV: {e}")
-        return str(file_content), 'application/octet-stream'
+        return _unconverted(file_content), 'application/octet-stream'
+
+
+def extract_docx_text(file_content: Union[bytes, BinaryIO], filename: str) -> Optional[str]:
+    """
+    Extract plain text from a Word (.docx) document, one paragraph per line.
+
+    Returns None if the file is not a readable .docx archive.
+    """
+    source = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+    try:
+        with zipfile.ZipFile(source) as zip_file:
+            if 'word/document.xml' not in zip_file.namelist():
+                return None
+
+            lines: List[str] = []
+            parts: List[str] = []
+            with zip_file.open('word/document.xml') as document_file:
+                for event, elem in ET.iterparse(document_file, events=('end',)):
+                    tag = elem.tag
+                    if tag == f'{_W}t':
+                        parts.append(elem.text or '')
+                    elif tag == f'{_W}tab':
+                        parts.append('\t')
+                    elif tag in (f'{_W}br', f'{_W}cr'):
+                        parts.append('\n')
+                    elif tag == f'{_W}p':
+                        lines.append(''.join(parts))
+                        parts = []
+                        elem.clear()
+            return '\n'.join(lines)
+    except Exception as e:
+        logger.warning(f"Failed to extract text from {filename}: {e}")
+        return None
+
 
-    
\ No newline at end of file
+def _unconverted(file_content: Union[bytes, BinaryIO]) -> str:
+    """Fallback representation when a file cannot be converted"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return str(file_content)
+    return ''
@@ -67,7 +67,7 @@ from vmcp.storage.base import StorageBase
 from vmcp.mcps.mcp_configmanager import MCPConfigManager
 from vmcp.mcps.mcp_client import MCPClientManager
 from vmcp.vmcps.models import VMCPConfig, VMCPToolCallRequest, VMCPResourceTemplateRequest
-from vmcp.utilities.tracing import trace_method, add_event, log_to_span
+from vmcp.utilities.tracing import trace_method, add_event, log_to_span, TRACING_ENABLED
 
 # Import our new typed models
 from vmcp.shared.vmcp_content_models import (
@@ -83,10 +83,24 @@ from . import server_manager
 from . import template_parser
 from . import logger as vmcp_logger
 from .custom_tool_engines import prompt_tool, python_tool, http_tool
+from vmcp.utilities import json_codec
 from vmcp.utilities.logging import setup_logging
 
 logger = setup_logging("1xN_vMCP_CONFIG_MANAGER")
 
+# Server fields that change with every connection; not worth rewriting a vMCP for
+_VOLATILE_SERVER_FIELDS = frozenset({"last_connected", "session_id"})
+
+
+def _same_server_entry(stored: Dict[str, Any], server_dict: Dict[str, Any]) -> bool:
+    """Whether a vMCP's selected_servers entry matches server_dict, ignoring volatile fields."""
+    def stable(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in entry.items() if key not in _VOLATILE_SERVER_FIELDS}
+    try:
+        return stable(stored) == stable(json_codec.loads(json_codec.dumps(server_dict)))
+    except (TypeError, ValueError):
+        return False
+
 
 class VMCPConfigManager:
     """
@@ -198,13 +212,16 @@ class VMCPConfigManager:
         vmcp_id_to_load = specific_vmcp_id or self.vmcp_id
 
         # Log the operation to span
-        log_to_span(
-            f"Loading vMCP config for {vmcp_id_to_load}",
-            operation_type="config_load",
-            operation_id=f"load_vmcp_config_{vmcp_id_to_load}",
-            arguments={"vmcp_id": vmcp_id_to_load},
-            metadata={"operation": "load_vmcp_config", "vmcp_id": vmcp_id_to_load}
-        )
+        if TRACING_ENABLED:
+            log_to_span(lambda: (
+                f"Loading vMCP config for {vmcp_id_to_load}",
+                {
+                    "operation_type": "config_load",
+                    "operation_id": f"load_vmcp_config_{vmcp_id_to_load}",
+                    "arguments": {"vmcp_id": vmcp_id_to_load},
+                    "metadata": {"operation": "load_vmcp_config", "vmcp_id": vmcp_id_to_load},
+                }
+            ))
 
         if specific_vmcp_id:
             result = self.storage.load_vmcp_config(specific_vmcp_id)
@@ -213,25 +230,31 @@ class VMCPConfigManager:
 
         # Log the result
         if result:
-            log_to_span(
-                f"Successfully loaded vMCP config for {vmcp_id_to_load}",
-                operation_type="config_load",
-                operation_id=f"load_vmcp_config_{vmcp_id_to_load}",
-                result={
-                    "success": True,
-                    "vmcp_name": result.name,
-                    "total_tools": getattr(result, 'total_tools', 0)
-                },
-                level="info"
-            )
+            if TRACING_ENABLED:
+                log_to_span(lambda: (
+                    f"Successfully loaded vMCP config for {vmcp_id_to_load}",
+                    {
+                        "operation_type": "config_load",
+                        "operation_id": f"load_vmcp_config_{vmcp_id_to_load}",
+                        "result": {
+                            "success": True,
+                            "vmcp_name": result.name,
+                            "total_tools": getattr(result, 'total_tools', 0)
+                        },
+                        "level": "info",
+                    }
+                ))
         else:
-            log_to_span(
-                f"Failed to load vMCP config for {vmcp_id_to_load}",
-                operation_type="config_load",
-                operation_id=f"load_vmcp_config_{vmcp_id_to_load}",
-                result={"success": False, "error": "Config not found"},
-                level="warning"
-            )
+            if TRACING_ENABLED:
+                log_to_span(lambda: (
+                    f"Failed to load vMCP config for {vmcp_id_to_load}",
+                    {
+                        "operation_type": "config_load",
+                        "operation_id": f"load_vmcp_config_{vmcp_id_to_load}",
+                        "result": {"success": False, "error": "Config not found"},
+                        "level": "warning",
+                    }
+                ))
 
         return result
 
@@ -709,6 +732,9 @@ class VMCPConfigManager:
         try:
             success = self.storage.delete_vmcp(vmcp_id)
             if success:
+                # Drop the vMCP's uploaded files; shared content is reclaimed by blob GC
+                from vmcp.storage.blob_service import BlobStorageManager
+                BlobStorageManager(self.user_id).delete_vmcp_blobs(vmcp_id)
                 return {
                     "success": True,
                     "message": f"Successfully deleted {vmcp_id}"
@@ -1217,7 +1243,11 @@ class VMCPConfigManager:
                 selected_servers = vmcp_config_dict.get('selected_servers', [])
                 for idx, server in enumerate(selected_servers):
                     if server.get('server_id') == server_id:
-                        vmcp_config_dict['selected_servers'][idx] = server_config.to_dict()
+                        server_dict = server_config.to_dict()
+                        if _same_server_entry(server, server_dict):
+                            # Status reads should not rewrite every vMCP using the server
+                            break
+                        vmcp_config_dict['selected_servers'][idx] = server_dict
                         
                         # BUGFIX: Save the complete vMCP configuration, not just vmcp_config part
                         # Get the complete vmcp_config as dict first
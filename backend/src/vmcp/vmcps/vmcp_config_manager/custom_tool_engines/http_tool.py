@@ -6,7 +6,6 @@ HTTP Tool Engine
 Execution engine for HTTP API-based custom tools with authentication support.
 """
 
-import aiohttp
 import json
 import urllib.parse
 import re
@@ -220,6 +219,9 @@ async def execute_http_tool(
         logger.info(f"🔍 Making {method} request to: {url}")
         logger.info(f"🔍 Headers: {processed_headers}")
 
+        # Imported on first use: aiohttp is slow to import and most vMCPs have no HTTP tools
+        import aiohttp
+
         async with aiohttp.ClientSession() as session:
             async with session.request(
                 method=method,
@@ -11,6 +11,8 @@ from typing import Dict, Any, Optional
 
 from mcp.types import TextContent, PromptMessage, GetPromptResult, CallToolResult
 
+from vmcp.vmcps.vmcp_config_manager import render_cache
+
 logger = logging.getLogger("1xN_vMCP_PROMPT_TOOL")
 
 
@@ -24,6 +26,9 @@ async def get_custom_prompt(
     """
     Get a custom prompt with variable substitution and tool call execution.
 
+    Renders of pure prompts (no @resource/@tool/@prompt) are memoized per
+    arguments and environment version, see render_cache.
+
     Args:
         prompt_id: Prompt identifier
         storage: Storage backend
@@ -53,19 +58,24 @@ async def get_custom_prompt(
     if arguments is None:
         arguments = {}
 
-    # Read the corresponding environment variable file for the vmcp_id from storage if available
-    environment_variables = storage.load_vmcp_environment(vmcp_id)
-    if not environment_variables:
-        environment_variables = {}
-
-    # Parse and substitute using regex patterns
-    prompt_text, _resource_content = await parse_vmcp_text_func(
-        prompt_text,
-        custom_prompt,
-        arguments,
-        environment_variables,
-        is_prompt=True
-    )
+    render_key = render_cache.render_key(storage.user_id, vmcp_id, prompt_text, arguments)
+    rendered_text = await render_cache.get_rendered(render_key)
+    if rendered_text is None:
+        # Read the corresponding environment variable file for the vmcp_id from storage if available
+        environment_variables = storage.load_vmcp_environment(vmcp_id)
+        if not environment_variables:
+            environment_variables = {}
+
+        # Parse and substitute using regex patterns
+        rendered_text, _resource_content = await parse_vmcp_text_func(
+            prompt_text,
+            custom_prompt,
+            arguments,
+            environment_variables,
+            is_prompt=True
+        )
+        render_cache.put_rendered(render_key, prompt_text, rendered_text, environment_variables)
+    prompt_text = rendered_text
 
     # Create the TextContent
     text_content = TextContent(
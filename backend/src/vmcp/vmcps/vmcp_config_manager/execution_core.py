@@ -34,11 +34,13 @@ from mcp.types import (
 
 from vmcp.storage.base import StorageBase
 from vmcp.mcps.mcp_client import MCPClientManager
+from vmcp.mcps.tool_result_cache import call_tool_cached, tool_cache_ttl
 from vmcp.vmcps.models import VMCPToolCallRequest, VMCPResourceTemplateRequest
 from vmcp.vmcps.default_prompts import handle_default_prompt
-from vmcp.utilities.tracing import trace_method, add_event
+from vmcp.vmcps.vmcp_config_manager import render_cache
+from vmcp.utilities.tracing import trace_method, add_event, TRACING_ENABLED
 
-from vmcp.utilities.logging import setup_logging
+from vmcp.utilities.logging import lazy, setup_logging
 
 logger = setup_logging("1xN_vMCP_EXECUTION_CORE")
 
@@ -110,15 +112,16 @@ async def call_tool(
     Raises:
         ValueError: If vMCP config not found or tool not found
     """
-    logger.info(f"🔍 VMCP Config Manager: call_tool called for '{vmcp_tool_call_request.tool_name}'")
-    add_event(
-        f"🔍 VMCP Config Manager: call_tool called for '{vmcp_tool_call_request.tool_name}'",
-        metadata={
-            "server": "vmcp",
-            "tool": vmcp_tool_call_request.tool_name,
-            "server_id": vmcp_id
-        }
-    )
+    logger.info("🔍 VMCP Config Manager: call_tool called for '%s'", vmcp_tool_call_request.tool_name)
+    if TRACING_ENABLED:
+        add_event(lambda: (
+            f"🔍 VMCP Config Manager: call_tool called for '{vmcp_tool_call_request.tool_name}'",
+            {"metadata": {
+                "server": "vmcp",
+                "tool": vmcp_tool_call_request.tool_name,
+                "server_id": vmcp_id
+            }}
+        ))
 
     vmcp_config = storage.load_vmcp_config(vmcp_id)
     if not vmcp_config:
@@ -133,7 +136,7 @@ async def call_tool(
                 vmcp_tool_call_request.arguments
             )
             # Add background task to log the tool call
-            logger.info(f"[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP {vmcp_id}")
+            logger.debug("[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP %s", vmcp_id)
             if user_id:
                 # Fire and forget - don't await, just call and let it run
                 asyncio.create_task(
@@ -154,12 +157,12 @@ async def call_tool(
     tool_server_name = vmcp_tool_call_request.tool_name.split('_')[0]
     tool_original_name = "_".join(vmcp_tool_call_request.tool_name.split('_')[1:])
 
-    logger.info(f"🔍 VMCP Config Manager: Parsed tool name - server: '{tool_server_name}', original: '{tool_original_name}'")
+    logger.debug("🔍 VMCP Config Manager: Parsed tool name - server: '%s', original: '%s'", tool_server_name, tool_original_name)
 
     vmcp_servers = vmcp_config.vmcp_config.get('selected_servers', [])
     vmcp_selected_tool_overrides = vmcp_config.vmcp_config.get('selected_tool_overrides', {})
-    logger.info(f"🔍 VMCP Config Manager: Found {len(vmcp_servers)} servers in vMCP config")
-    logger.info(f"🔍 VMCP Config Manager: Server details: {[(s.get('name'), s.get('name', '').replace('_', '')) for s in vmcp_servers]}")
+    logger.debug("🔍 VMCP Config Manager: Found %s servers in vMCP config", len(vmcp_servers))
+    logger.debug("🔍 VMCP Config Manager: Server details: %s", lazy(lambda: [(s.get('name'), s.get('name', '').replace('_', '')) for s in vmcp_servers]))
 
     # Find the matching server and execute tool call
     for server in vmcp_servers:
@@ -167,15 +170,16 @@ async def call_tool(
         server_id = server.get('server_id')
         server_name_clean = server_name.replace('_', '')
 
-        logger.info(f"🔍 VMCP Config Manager: Checking server '{server_name}' (clean: '{server_name_clean}') against '{tool_server_name}'")
+        logger.debug("🔍 VMCP Config Manager: Checking server '%s' (clean: '%s') against '%s'", server_name, server_name_clean, tool_server_name)
 
         if server_name_clean == tool_server_name:
-            logger.info(f"✅ VMCP Config Manager: Found matching server '{server_name}' for tool '{vmcp_tool_call_request.tool_name}'")
-            logger.info(f"🔍 VMCP Config Manager: Calling tool '{tool_original_name}' on server '{server_name}'")
-            logger.info(f"🔍 VMCP Config Manager: Tool overrides: {vmcp_selected_tool_overrides.get(server_id, {})}")
+            logger.debug("✅ VMCP Config Manager: Found matching server '%s' for tool '%s'", server_name, vmcp_tool_call_request.tool_name)
+            logger.debug("🔍 VMCP Config Manager: Calling tool '%s' on server '%s'", tool_original_name, server_name)
+            logger.debug("🔍 VMCP Config Manager: Tool overrides: %s", vmcp_selected_tool_overrides.get(server_id, {}))
 
             # Initialize widget_meta to empty dict for all code paths
             widget_meta = {}
+            tool_override_data = None
 
             # Check for tool overrides (widget attachments)
             if vmcp_selected_tool_overrides.get(server_id, {}):
@@ -185,25 +189,37 @@ async def call_tool(
                         tool_original_name = _original_tool
                         break
 
-                tool_override_data = server_tool_overrides[tool_original_name]
+                tool_override_data = server_tool_overrides.get(tool_original_name, {})
                 if "widget_id" in tool_override_data and tool_override_data["widget_id"]:
                     logger.info("Widget tool override detected but widgets are not supported in OSS version")
                     # Skip widget loading - widgets not supported in OSS
                     widget_meta = {}
                 else:
-                    logger.info(f"🔍 VMCP Config Manager: No tool overrides found for server '{server_name}'")
+                    logger.debug("🔍 VMCP Config Manager: No tool overrides found for server '%s'", server_name)
 
             # Execute the tool call via MCP client manager
-            result = await mcp_client_manager.call_tool(
-                server_id,
-                tool_original_name,
-                vmcp_tool_call_request.arguments
-            )
+            async def call_upstream():
+                return await mcp_client_manager.call_tool(
+                    server_id,
+                    tool_original_name,
+                    vmcp_tool_call_request.arguments
+                )
+
+            # Serve repeated calls from the result cache when caching is enabled for this tool
+            server_config = mcp_client_manager.config_manager.get_server(server_id) if mcp_client_manager.config_manager else None
+            cache_ttl = tool_cache_ttl(server_config, tool_original_name, tool_override_data) if server_config else 0
+            if cache_ttl:
+                result = await call_tool_cached(
+                    server_config, user_id, tool_original_name,
+                    vmcp_tool_call_request.arguments, cache_ttl, call_upstream
+                )
+            else:
+                result = await call_upstream()
 
-            logger.info(f"✅ VMCP Config Manager: Tool call successful, result type: {type(result)}")
+            logger.debug("✅ VMCP Config Manager: Tool call successful, result type: %s", type(result))
 
             # Add background task to log the tool call
-            logger.info(f"[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP {vmcp_id}")
+            logger.debug("[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP %s", vmcp_id)
             if user_id:
                 # Fire and forget - don't await, just call and let it run
                 asyncio.create_task(
@@ -276,7 +292,7 @@ async def get_prompt(
     Raises:
         ValueError: If vMCP not found or prompt not found
     """
-    logger.info(f"🔍 VMCP Config Manager: Searching for prompt '{prompt_id}' in vMCP '{vmcp_id}'")
+    logger.info("🔍 VMCP Config Manager: Searching for prompt '%s' in vMCP '%s'", prompt_id, vmcp_id)
 
     # Check for default system prompts first
     original_prompt_id = prompt_id
@@ -285,7 +301,7 @@ async def get_prompt(
     # Handle default prompts (these work without vMCP)
     default_prompt_names = ["vmcp_feedback"]  # Add more as needed
     if prompt_id in default_prompt_names:
-        logger.info(f"✅ VMCP Config Manager: Found default prompt '{prompt_id}'")
+        logger.debug("✅ VMCP Config Manager: Found default prompt '%s'", prompt_id)
         return await handle_default_prompt(original_prompt_id, user_id, vmcp_id, arguments)
 
     if not vmcp_id:
@@ -296,7 +312,7 @@ async def get_prompt(
         raise ValueError(f"vMCP config not found: {vmcp_id}")
 
     vmcp_servers = vmcp_config.vmcp_config.get('selected_servers', [])
-    logger.info(f"🔍 VMCP Config Manager: Found {len(vmcp_servers)} servers in vMCP config")
+    logger.debug("🔍 VMCP Config Manager: Found %s servers in vMCP config", len(vmcp_servers))
     vmcp_selected_prompts = vmcp_config.vmcp_config.get('selected_prompts', {})
 
     # Try to find the prompt in the servers
@@ -305,20 +321,20 @@ async def get_prompt(
         server_id = server.get('server_id')
         server_prompts = vmcp_selected_prompts.get(server_id, [])
 
-        logger.info(f"🔍 VMCP Config Manager: Checking server '{server_name}' with {len(server_prompts)} prompts: {server_prompts}")
+        logger.debug("🔍 VMCP Config Manager: Checking server '%s' with %s prompts: %s", server_name, len(server_prompts), server_prompts)
 
         # Check if this is a prefixed prompt name (server_promptname)
         expected_prefix = f"{server_name.replace('_', '')}_"
-        logger.info(f"🔍 VMCP Config Manager: Expected prefix for server '{server_name}': '{expected_prefix}'")
+        logger.debug("🔍 VMCP Config Manager: Expected prefix for server '%s': '%s'", server_name, expected_prefix)
 
         if prompt_id.startswith(expected_prefix):
             # Extract the original prompt name by removing the server prefix
             original_prompt_name = prompt_id[len(expected_prefix):]
-            logger.info(f"🔍 VMCP Config Manager: Detected prefixed prompt. Original name: '{original_prompt_name}'")
+            logger.debug("🔍 VMCP Config Manager: Detected prefixed prompt. Original name: '%s'", original_prompt_name)
 
             # Check if the original prompt name exists in the server's prompts
             if original_prompt_name in server_prompts:
-                logger.info(f"✅ VMCP Config Manager: Found prompt '{original_prompt_name}' in server '{server_name}'")
+                logger.debug("✅ VMCP Config Manager: Found prompt '%s' in server '%s'", original_prompt_name, server_name)
                 try:
                     result = await mcp_client_manager.get_prompt(
                         server_id,
@@ -326,7 +342,7 @@ async def get_prompt(
                         arguments,
                         connect_if_needed=connect_if_needed
                     )
-                    logger.info(f"[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP {vmcp_id}")
+                    logger.debug("[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP %s", vmcp_id)
                     if user_id:
                         # Fire and forget - don't await, just call and let it run
                         asyncio.create_task(
@@ -347,17 +363,17 @@ async def get_prompt(
             else:
                 logger.warning(f"⚠️ VMCP Config Manager: Original prompt name '{original_prompt_name}' not found in server '{server_name}' prompts list")
         else:
-            logger.info(f"🔍 VMCP Config Manager: Prompt '{prompt_id}' does not start with expected prefix '{expected_prefix}' for server '{server_name}'")
+            logger.debug("🔍 VMCP Config Manager: Prompt '%s' does not start with expected prefix '%s' for server '%s'", prompt_id, expected_prefix, server_name)
 
     # Check custom prompts
-    logger.info(f"🔍 VMCP Config Manager: Checking {len(vmcp_config.custom_prompts)} custom prompts")
+    logger.debug("🔍 VMCP Config Manager: Checking %s custom prompts", len(vmcp_config.custom_prompts))
     for prompt in vmcp_config.custom_prompts:
         custom_prompt_name = prompt.get('name')
-        logger.info(f"🔍 VMCP Config Manager: Checking custom prompt: '{custom_prompt_name}'")
+        logger.debug("🔍 VMCP Config Manager: Checking custom prompt: '%s'", custom_prompt_name)
         if custom_prompt_name == prompt_id:
-            logger.info(f"✅ VMCP Config Manager: Found custom prompt '{prompt_id}'")
+            logger.debug("✅ VMCP Config Manager: Found custom prompt '%s'", prompt_id)
             result = await get_custom_prompt_func(prompt_id, arguments)
-            logger.info(f"[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP {vmcp_id}")
+            logger.debug("[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP %s", vmcp_id)
             if user_id:
                 # Fire and forget - don't await, just call and let it run
                 asyncio.create_task(
@@ -375,11 +391,11 @@ async def get_prompt(
     # Check if this is a custom tool being used as a prompt
     for tool in vmcp_config.custom_tools:
         custom_tool_name = tool.get('name')
-        logger.info(f"🔍 VMCP Config Manager: Checking custom tool: '{custom_tool_name}'")
+        logger.debug("🔍 VMCP Config Manager: Checking custom tool: '%s'", custom_tool_name)
         if custom_tool_name == prompt_id:
-            logger.info(f"✅ VMCP Config Manager: Found custom tool '{prompt_id}'")
+            logger.debug("✅ VMCP Config Manager: Found custom tool '%s'", prompt_id)
             result = await call_custom_tool_func(prompt_id, arguments, tool_as_prompt=True)
-            logger.info(f"[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP {vmcp_id}")
+            logger.debug("[BACKGROUND TASK LOGGING] Adding background task to log tool call for vMCP %s", vmcp_id)
             if user_id:
                 # Fire and forget - don't await, just call and let it run
                 asyncio.create_task(
@@ -415,6 +431,9 @@ async def get_system_prompt(
     4. Parses and substitutes variables (@param, @config, @resource, @tool)
     5. Returns formatted GetPromptResult
 
+    Steps 2-4 are skipped when a render of a pure prompt with the same
+    arguments and environment version is memoized (see render_cache).
+
     Args:
         storage: Storage instance for loading vMCP config and environment
         vmcp_id: vMCP identifier
@@ -438,26 +457,38 @@ async def get_system_prompt(
 
     # Get the prompt text
     prompt_text = system_prompt.get('text', '')
-
-    # Read the corresponding environment variable file for the vmcp_id from storage if available
-    environment_variables = storage.load_vmcp_environment(vmcp_id)
-
-    # We also need to save the environment variables which are also part of argument
-    # Check for each environment variable if the key is present in the arguments
-    # We need to store these values in the vmcp environment file so that future use we can use them
-    for env_var in environment_variables:
-        if env_var in arguments:
-            environment_variables[env_var] = arguments[env_var]
-    storage.save_vmcp_environment(vmcp_id, environment_variables)
-
-    # Parse and substitute using regex patterns
-    prompt_text, _resource_content = await parse_vmcp_text_func(
-        prompt_text,
-        system_prompt,
-        arguments,
-        environment_variables,
-        is_prompt=True
-    )
+    if arguments is None:
+        arguments = {}
+
+    render_key = render_cache.render_key(storage.user_id, vmcp_id, prompt_text, arguments)
+    rendered_text = await render_cache.get_rendered(render_key)
+    if rendered_text is None:
+        # Read the corresponding environment variable file for the vmcp_id from storage if available
+        environment_variables = storage.load_vmcp_environment(vmcp_id)
+
+        # We also need to save the environment variables which are also part of argument
+        # Check for each environment variable if the key is present in the arguments
+        # We need to store these values in the vmcp environment file so that future use we can use them
+        # (only when they change it: a save invalidates memoized renders)
+        environment_changed = False
+        for env_var in environment_variables:
+            if env_var in arguments and environment_variables[env_var] != arguments[env_var]:
+                environment_variables[env_var] = arguments[env_var]
+                environment_changed = True
+        if environment_changed:
+            storage.save_vmcp_environment(vmcp_id, environment_variables)
+
+        # Parse and substitute using regex patterns
+        rendered_text, _resource_content = await parse_vmcp_text_func(
+            prompt_text,
+            system_prompt,
+            arguments,
+            environment_variables,
+            is_prompt=True
+        )
+        if not environment_changed:
+            render_cache.put_rendered(render_key, prompt_text, rendered_text, environment_variables)
+    prompt_text = rendered_text
 
     # Create the TextContent
     text_content = TextContent(
@@ -14,7 +14,10 @@ import traceback
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from pydantic import BaseModel
+
 from vmcp.storage.base import StorageBase
+from vmcp.storage.db_writer import get_db_writer
 
 
 from vmcp.utilities.logging import setup_logging
@@ -22,6 +25,20 @@ from vmcp.utilities.logging import setup_logging
 logger = setup_logging("1xN_vMCP_LOGGER")
 
 
+def _loggable_result(result: Any) -> Any:
+    """
+    Pick what to store for an operation result.
+
+    Dicts, lists and pydantic models are kept as-is and encoded once by the
+    storage JSON codec instead of being rendered with str().
+    """
+    if hasattr(result, 'to_dict'):
+        return result.to_dict()
+    if result is None or isinstance(result, (dict, list, tuple, BaseModel, str, int, float, bool)):
+        return result
+    return str(result)
+
+
 async def log_vmcp_operation(
     storage: StorageBase,
     vmcp_id: str,
@@ -71,7 +88,7 @@ async def log_vmcp_operation(
             "mcp_method": operation_type,
             "original_name": metadata.get("tool") if operation_type in ["tool_call"] else metadata.get("prompt") if operation_type in ["prompt_get"] else metadata.get("resource") if operation_type in ["resource_read"] else operation_type,
             "arguments": arguments,
-            "result": result.to_dict() if hasattr(result, 'to_dict') else (result if isinstance(result, dict) else str(result)),
+            "result": _loggable_result(result),
             "vmcp_id": vmcp_id,
             "vmcp_name": vmcp_config.name if vmcp_config else None,
             "total_tools": total_tools,
@@ -80,8 +97,8 @@ async def log_vmcp_operation(
             "total_prompts": total_prompts
         }
 
-        # Save to the appropriate log file with suffix
-        storage.save_user_vmcp_logs(log_entry)
+        # Save through the background writer so the event loop is not blocked
+        await get_db_writer().run(storage.save_user_vmcp_logs, log_entry)
         logger.info(f"[BACKGROUND TASK LOGGING] Successfully logged {operation_type} for user {user_id} ({user_id})")
     except Exception as e:
         # Silently fail for logging - don't affect the main request
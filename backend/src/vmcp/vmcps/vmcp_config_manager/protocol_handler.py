@@ -30,7 +30,7 @@ from vmcp.storage.base import StorageBase
 from vmcp.mcps.mcp_configmanager import MCPConfigManager
 from vmcp.vmcps.default_prompts import get_all_default_prompts
 from vmcp.vmcps.vmcp_config_manager.widget_utils import UIWidget, _tool_meta
-from vmcp.utilities.tracing import trace_method, add_event, log_to_span
+from vmcp.utilities.tracing import trace_method, add_event, log_to_span, TRACING_ENABLED
 
 logger = logging.getLogger("1xN_vMCP_PROTOCOL_HANDLER")
 
@@ -146,24 +146,30 @@ async def tools_list(
         List of Tool objects available in this vMCP
     """
     if not vmcp_id:
-        log_to_span(
-            "No vmcp_id provided for tools_list",
-            operation_type="tools_list",
-            operation_id="tools_list_no_vmcp_id",
-            result={"success": False, "error": "No vmcp_id provided"},
-            level="warning"
-        )
+        if TRACING_ENABLED:
+            log_to_span(lambda: (
+                "No vmcp_id provided for tools_list",
+                {
+                    "operation_type": "tools_list",
+                    "operation_id": "tools_list_no_vmcp_id",
+                    "result": {"success": False, "error": "No vmcp_id provided"},
+                    "level": "warning",
+                }
+            ))
         return []
 
     vmcp_config = storage.load_vmcp_config(vmcp_id)
     if not vmcp_config:
-        log_to_span(
-            f"VMCP config not found for {vmcp_id}",
-            operation_type="tools_list",
-            operation_id=f"tools_list_{vmcp_id}",
-            result={"success": False, "error": "VMCP config not found"},
-            level="warning"
-        )
+        if TRACING_ENABLED:
+            log_to_span(lambda: (
+                f"VMCP config not found for {vmcp_id}",
+                {
+                    "operation_type": "tools_list",
+                    "operation_id": f"tools_list_{vmcp_id}",
+                    "result": {"success": False, "error": "VMCP config not found"},
+                    "level": "warning",
+                }
+            ))
         return []
 
     vmcp_servers = vmcp_config.vmcp_config.get('selected_servers', [])
@@ -281,13 +287,16 @@ async def tools_list(
         )
 
     # Log success to span
-    log_to_span(
-        f"Successfully listed {len(all_tools)} tools for vMCP {vmcp_id}",
-        operation_type="tools_list",
-        operation_id=f"tools_list_{vmcp_id}",
-        result={"success": True, "tool_count": len(all_tools), "tools": [tool.name for tool in all_tools[:5]]},
-        level="info"
-    )
+    if TRACING_ENABLED:
+        log_to_span(lambda: (
+            f"Successfully listed {len(all_tools)} tools for vMCP {vmcp_id}",
+            {
+                "operation_type": "tools_list",
+                "operation_id": f"tools_list_{vmcp_id}",
+                "result": {"success": True, "tool_count": len(all_tools), "tools": [tool.name for tool in all_tools[:5]]},
+                "level": "info",
+            }
+        ))
 
     return all_tools
 
@@ -321,7 +330,7 @@ async def resources_list(
     if not vmcp_id:
         return []
 
-    logger.info(f"Fetching resources for vMCP: {vmcp_id}")
+    logger.debug("Fetching resources for vMCP: %s", vmcp_id)
     vmcp_config = storage.load_vmcp_config(vmcp_id)
     vmcp_name = vmcp_config.name
     if not vmcp_config:
@@ -329,11 +338,11 @@ async def resources_list(
 
     # Widgets not supported in OSS version
     vmcp_config.custom_widgets = []
-    logger.info(f"Widgets not supported in OSS version, skipping widget loading for vMCP: {vmcp_id}")
+    logger.debug("Widgets not supported in OSS version, skipping widget loading for vMCP: %s", vmcp_id)
 
     vmcp_servers = vmcp_config.vmcp_config.get('selected_servers', [])
     vmcp_selected_resources = vmcp_config.vmcp_config.get('selected_resources', {})
-    logger.info(f"VMCP Config Manager: Selected resources: {vmcp_selected_resources}")
+    logger.debug("VMCP Config Manager: Selected resources: %s", vmcp_selected_resources)
     all_resources = []
 
     # Process resources from each server
@@ -341,14 +350,14 @@ async def resources_list(
         server_name = server.get('name')
         server_id = server.get('server_id')
         server_resources = mcp_config_manager.resources_list(server_id)
-        logger.info(f"VMCP Config Manager: Server resources: {server_resources}")
+        logger.debug("VMCP Config Manager: Server resources: %s", server_resources)
 
         # Filter by selected resources if specified
         if server_id in vmcp_selected_resources:
             selected_resources = vmcp_selected_resources.get(server_id, [])
             server_resources = [resource for resource in server_resources if str(resource.uri) in selected_resources]
 
-        logger.info(f"VMCP Config Manager: Server resources: {server_resources}")
+        logger.debug("VMCP Config Manager: Server resources: %s", server_resources)
         for resource in server_resources:
             vmcp_resource = Resource(
                 name=f"{server_name.replace('_','')}_{resource.name}",
@@ -525,7 +534,7 @@ async def prompts_list(
     vmcp_selected_prompts = vmcp_config.vmcp_config.get('selected_prompts', {})
     all_prompts = []
 
-    logger.info(f"Collecting prompts from {len(vmcp_servers)} servers...")
+    logger.debug("Collecting prompts from %s servers...", len(vmcp_servers))
 
     # Add prompts from attached servers
     for server in vmcp_servers:
@@ -538,7 +547,7 @@ async def prompts_list(
             selected_prompts = vmcp_selected_prompts.get(server_id, [])
             server_prompts = [prompt for prompt in server_prompts if prompt.name in selected_prompts]
 
-        logger.info(f"Collected {len(server_prompts)} prompts from {server_name}...")
+        logger.debug("Collected %s prompts from %s...", len(server_prompts), server_name)
 
         for prompt in server_prompts:
             # Create a new Prompt object with vMCP-specific naming
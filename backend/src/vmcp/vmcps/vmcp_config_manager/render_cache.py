@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Prompt Render Cache
+===================
+
+Memoizes the rendered text of pure custom prompts and system prompts
+(templates without @resource/@tool/@prompt directives, see
+template_parser.is_pure_template), so a repeated ``prompts/get`` neither
+reloads the vMCP environment nor re-renders the template.
+
+Entries are keyed by (user, vMCP, environment version, template hash,
+argument hash). The environment version of a vMCP is bumped, and its entries
+dropped, whenever its config or environment is saved (``VMCP_CACHE_TOPIC``
+on the cache bus), so a render that raced a save is never served.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from vmcp.config import settings
+from vmcp.storage.base import VMCP_CACHE_TOPIC
+from vmcp.storage.cache_bus import ALL_KEYS, get_cache_bus
+from vmcp.storage.result_cache import ResultCache
+
+from .template_parser import is_pure_render
+
+logger = logging.getLogger("1xN_vMCP_RENDER_CACHE")
+
+_cache = ResultCache("prompt_render", settings.prompt_render_cache_memory_size)
+
+# (user_id, vmcp_id) -> environment version
+_versions: Dict[Tuple[str, str], int] = {}
+_versions_lock = threading.Lock()
+
+
+def _on_vmcp_changed(key: str) -> None:
+    if key == ALL_KEYS:
+        with _versions_lock:
+            for vmcp_key in _versions:
+                _versions[vmcp_key] += 1
+        _cache.clear()
+        return
+    user_id, _, vmcp_id = key.partition(":")
+    with _versions_lock:
+        _versions[(user_id, vmcp_id)] = _versions.get((user_id, vmcp_id), 0) + 1
+    prefix = f"{user_id}\x1f{vmcp_id}\x1f"
+    _cache.invalidate_where(lambda cache_key: cache_key.startswith(prefix))
+
+
+get_cache_bus().subscribe(VMCP_CACHE_TOPIC, _on_vmcp_changed)
+
+
+def environment_version(user_id: Any, vmcp_id: str) -> int:
+    """Current environment version of a vMCP in this process."""
+    # Bumped on the cache bus thread for saves in other workers
+    with _versions_lock:
+        return _versions.get((str(user_id), vmcp_id), 0)
+
+
+def render_key(user_id: Any, vmcp_id: str, text: str, arguments: Dict[str, Any]) -> Optional[str]:
+    """
+    Cache key for rendering text with arguments, or None if the render cannot be memoized.
+
+    Take the key before loading the environment: a save that lands in
+    between bumps the version, so the stale render is stored under a key
+    nobody looks up.
+    """
+    if settings.prompt_render_cache_ttl <= 0 or not is_pure_render(text, arguments.values()):
+        return None
+    try:
+        argument_hash = hashlib.sha256(
+            json.dumps(arguments, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+    except (TypeError, ValueError):
+        return None  # Arguments that do not serialize are not memoized
+    template_hash = hashlib.sha256(text.encode()).hexdigest()
+    version = environment_version(user_id, vmcp_id)
+    return "\x1f".join((str(user_id), vmcp_id, str(version), template_hash, argument_hash))
+
+
+async def get_rendered(key: Optional[str]) -> Optional[str]:
+    """Rendered text for key, if memoized."""
+    if key is None:
+        return None
+    entry = await _cache.aget(key)
+    return entry.data.decode() if entry is not None else None
+
+
+def put_rendered(key: Optional[str], text: str, rendered: str, environment_variables: Dict[str, Any]) -> None:
+    """Memoize a render (skipped when an environment value introduced a directive)."""
+    if key is None or not is_pure_render(text, environment_variables.values()):
+        return
+    _cache.put(key, rendered.encode(), settings.prompt_render_cache_ttl)
+    logger.debug("Memoized prompt render %s", key[-12:])
@@ -7,6 +7,7 @@ Handles resource CRUD operations and resource fetching for vMCP.
 """
 
 import asyncio
+import base64
 import logging
 import urllib.parse
 from datetime import datetime
@@ -165,7 +166,7 @@ async def get_resource(
                 # Find the custom resource by original_filename
                 for resource in custom_resources:
                     logger.info(f"🔍 VMCP Config Manager: Checking custom resource: '{resource.get('original_filename')}' against '{original_filename}'")
-                    if resource.get('resource_name') == original_filename:
+                    if resource.get('original_filename') == original_filename:
                         logger.info(f"✅ VMCP Config Manager: Found matching custom resource for '{original_filename}'")
                         result = await call_custom_resource(storage, vmcp_id, user_id, resource_id_str)
                         return result
@@ -309,6 +310,8 @@ async def call_custom_resource(
     # Direct database fetch for resource content
     # For Enterprise: check GlobalBlob for public vMCPs, then fall back to user's Blob table
     # For OSS: only check user's Blob table (no public vMCPs)
+    from vmcp.storage.blob_service import read_blob_bytes
+    from vmcp.storage.derived_cache import get_derived_rendition
     from vmcp.storage.database import get_db
     from vmcp.storage.models import Blob
 
@@ -335,6 +338,9 @@ async def call_custom_resource(
                         def __init__(self, global_blob):
                             self.id = global_blob.id
                             self.content = global_blob.content
+                            self.chunks = getattr(global_blob, 'chunks', None)
+                            self.storage_backend = getattr(global_blob, 'storage_backend', None)
+                            self.content_hash = getattr(global_blob, 'content_hash', None)
                             self.content_type = global_blob.content_type
                             self.original_filename = global_blob.original_filename
                             self.filename = global_blob.filename
@@ -361,23 +367,22 @@ async def call_custom_resource(
         # Handle content based on content type
         content_type = custom_resource.get('content_type') or blob.content_type
 
+        # Serve a cached derived rendition (e.g. xlsx as CSV) when one applies
+        rendition = get_derived_rendition(blob, content_type)
+        if rendition is not None:
+            resource_content, content_type = rendition
         # For text files, decode the binary data to string
-        if content_type and content_type.startswith('text/'):
+        elif content_type and content_type.startswith('text/'):
+            # Read raw bytes from the blob store (or legacy inline content)
+            content_bytes = read_blob_bytes(blob)
             try:
-                if isinstance(blob.content, bytes):
-                    resource_content = blob.content.decode('utf-8')
-                else:
-                    resource_content = str(blob.content)
+                resource_content = content_bytes.decode('utf-8')
             except UnicodeDecodeError:
                 # If UTF-8 decoding fails, fall back to base64 encoding
-                import base64
-                if isinstance(blob.content, bytes):
-                    resource_content = base64.b64encode(blob.content).decode('ascii')
-                else:
-                    resource_content = str(blob.content)
+                resource_content = base64.b64encode(content_bytes).decode('ascii')
         else:
-            # For binary files, return as-is or base64 encode if needed
-            resource_content = blob.content
+            # For binary files, return base64 encoded content
+            resource_content = base64.b64encode(read_blob_bytes(blob)).decode('ascii')
 
         # Construct proper URI if resource_id is not already a valid URI
         # TextResourceContents requires a valid URI, so we need to construct it properly
@@ -258,6 +258,10 @@ def create_server_from_vmcp_config(
             status=MCPConnectionStatus.DISCONNECTED,
             auto_connect=server_data.get('auto_connect', True),
             enabled=server_data.get('enabled', True),
+            max_in_flight=server_data.get('max_in_flight'),
+            endpoints=server_data.get('endpoints'),
+            balancing=server_data.get('balancing'),
+            hedge=server_data.get('hedge'),
             vmcps_using_server=[vmcp_id]  # Initialize with the vMCP that's creating it
         )
 
@@ -15,13 +15,44 @@ Handles parsing and processing of VMCP text templates with support for:
 import re
 import json
 import logging
-from typing import Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Tuple, Optional
 from jinja2 import Environment, DictLoader
 
 from .parameter_parser import parse_parameters
 
 logger = logging.getLogger("1xN_vMCP_TEMPLATE_PARSER")
 
+# Start of any @resource/@tool/@prompt directive (superset of the patterns in parse_vmcp_text)
+_DIRECTIVE_PATTERN = re.compile(r'@(?:resource|tool|prompt)\.\w+\.')
+
+
+@lru_cache(maxsize=1024)
+def is_pure_template(text: str) -> bool:
+    """
+    Check if rendering text has no side effects.
+
+    A pure template only uses @param/@config substitution and Jinja2, so its
+    output depends on nothing but the arguments and environment variables.
+    Templates with @resource/@tool/@prompt directives call upstream servers.
+    """
+    return _DIRECTIVE_PATTERN.search(text) is None
+
+
+def is_pure_render(text: str, *values: Iterable[Any]) -> bool:
+    """
+    Check if rendering text with the given argument/environment values has no side effects.
+
+    Directives are matched after @param/@config substitution, so a value can
+    introduce one into an otherwise pure template.
+    """
+    if not is_pure_template(text):
+        return False
+    return not any(
+        isinstance(value, str) and _DIRECTIVE_PATTERN.search(value)
+        for group in values for value in group
+    )
+
 
 def is_jinja_template(text: str, jinja_env: Environment) -> bool:
     """Check if text contains Jinja2 patterns (after @param variables have been substituted)"""
@@ -86,6 +86,7 @@ def mcp_servers():
     return {
         "everything": "http://localhost:8001/everything/mcp",
         "allfeature": "http://localhost:8001/allfeature/mcp",
+        "subscription": "http://localhost:8001/subscription/mcp",
         "context7": "https://mcp.context7.com/mcp"
     }
 
@@ -9,17 +9,21 @@ import contextlib
 import uvicorn
 from starlette.applications import Starlette
 from starlette.responses import JSONResponse
-from starlette.routing import Mount
+from starlette.routing import Mount, Route
 
 # Import the MCP servers
 try:
     # Try relative imports first (when used as a package)
     from .all_feature_server import mcp as all_feature_mcp  # type: ignore[import-untyped]
     from .everything_server import mcp as everything_mcp  # type: ignore[import-untyped]
+    from .subscription_server import failable_app, set_failing  # type: ignore[import-untyped]
+    from .subscription_server import mcp as subscription_mcp  # type: ignore[import-untyped]
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from all_feature_server import mcp as all_feature_mcp  # type: ignore[import-untyped]
     from everything_server import mcp as everything_mcp  # type: ignore[import-untyped]
+    from subscription_server import failable_app, set_failing  # type: ignore[import-untyped]
+    from subscription_server import mcp as subscription_mcp  # type: ignore[import-untyped]
 
 
 @contextlib.asynccontextmanager
@@ -29,6 +33,7 @@ async def lifespan(app: Starlette):
         # Start both session managers
         await stack.enter_async_context(all_feature_mcp.session_manager.run())
         await stack.enter_async_context(everything_mcp.session_manager.run())
+        await stack.enter_async_context(subscription_mcp.session_manager.run())
         yield
 
 
@@ -37,6 +42,8 @@ app = Starlette(
     routes=[
         Mount("/allfeature", all_feature_mcp.streamable_http_app()),
         Mount("/everything", everything_mcp.streamable_http_app()),
+        Route("/subscription/failing", set_failing, methods=["POST"]),
+        Mount("/subscription", failable_app()),
     ],
     lifespan=lifespan,
 )
@@ -50,7 +57,8 @@ async def health_check(request):
         "service": "mcp_servers",
         "endpoints": {
             "everything": "/everything",
-            "allfeature": "/allfeature"
+            "allfeature": "/allfeature",
+            "subscription": "/subscription"
         },
         "port": 8001
     })
@@ -66,6 +74,7 @@ async def root(request):
         "endpoints": {
             "everything": "http://localhost:8001/everything",
             "allfeature": "http://localhost:8001/allfeature",
+            "subscription": "http://localhost:8001/subscription",
             "health": "http://localhost:8001/health"
         },
         "usage": {
@@ -81,6 +90,7 @@ def main():
     print("🚀 Starting MCP Servers...")
     print("📊 Everything Server: http://localhost:8001/everything")
     print("🔧 All Feature Server: http://localhost:8001/allfeature")
+    print("🔔 Subscription Server: http://localhost:8001/subscription")
     print("❤️  Health Check: http://localhost:8001/health")
     print("=" * 60)
 
@@ -0,0 +1,107 @@
+"""
+Subscription MCP Server - a resource with update notifications.
+
+Serves ``counter://value``, advertises ``resources.subscribe`` and sends
+``notifications/resources/updated`` to every subscribed session when the
+``increment`` tool changes the counter.
+
+For failure tests, ``POST /subscription/failing`` with
+``{"tag": ..., "failing": true}`` makes MCP requests whose URL carries
+``?tag=<tag>`` answer 503 until it is turned off again.
+"""
+
+import logging
+from typing import Any, Dict, Set
+from urllib.parse import parse_qs
+
+from mcp.server.fastmcp import FastMCP
+from pydantic import AnyUrl
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+COUNTER_URI = "counter://value"
+
+mcp = FastMCP("Subscription Server", stateless_http=False)
+
+_state = {"value": 0}
+# Resource URI -> sessions subscribed to it
+_subscribers: Dict[str, Set[Any]] = {}
+# URL tags whose requests fail with 503
+_failing: Set[str] = set()
+
+
+@mcp.resource(COUNTER_URI, name="counter", description="A counter changed by the increment tool")
+def counter() -> str:
+    """Current counter value."""
+    return f"value={_state['value']}"
+
+
+@mcp.tool()
+async def increment() -> str:
+    """Increment the counter and notify subscribed sessions."""
+    _state["value"] += 1
+    for session in list(_subscribers.get(COUNTER_URI, ())):
+        try:
+            await session.send_resource_updated(AnyUrl(COUNTER_URI))
+        except Exception as e:
+            logger.info(f"Dropping closed subscriber: {e}")
+            _subscribers[COUNTER_URI].discard(session)
+    return f"value={_state['value']}"
+
+
+@mcp.tool()
+def subscriber_count() -> int:
+    """Number of sessions subscribed to the counter."""
+    return len(_subscribers.get(COUNTER_URI, ()))
+
+
+@mcp._mcp_server.subscribe_resource()
+async def subscribe(uri: AnyUrl) -> None:
+    _subscribers.setdefault(str(uri), set()).add(mcp._mcp_server.request_context.session)
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe(uri: AnyUrl) -> None:
+    _subscribers.get(str(uri), set()).discard(mcp._mcp_server.request_context.session)
+
+
+# The low-level server always reports subscribe=False
+_get_capabilities = mcp._mcp_server.get_capabilities
+
+
+def _get_subscribe_capabilities(*args: Any, **kwargs: Any):
+    capabilities = _get_capabilities(*args, **kwargs)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+
+mcp._mcp_server.get_capabilities = _get_subscribe_capabilities
+
+
+def failable_app():
+    """The streamable HTTP app, answering 503 for tags set failing."""
+    app = mcp.streamable_http_app()
+
+    async def wrapped(scope, receive, send):
+        if scope["type"] == "http":
+            tags = parse_qs(scope.get("query_string", b"").decode()).get("tag", [])
+            if any(tag in _failing for tag in tags):
+                response = JSONResponse({"error": "unavailable"}, status_code=503)
+                await response(scope, receive, send)
+                return
+        await app(scope, receive, send)
+
+    return wrapped
+
+
+async def set_failing(request: Request) -> JSONResponse:
+    """Turn 503 answers for a tag on or off."""
+    body = await request.json()
+    if body.get("failing"):
+        _failing.add(body["tag"])
+    else:
+        _failing.discard(body["tag"])
+    return JSONResponse({"failing": sorted(_failing)})
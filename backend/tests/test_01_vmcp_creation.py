@@ -124,3 +124,58 @@ class TestVMCPCreation:
         assert updated["success"]
         assert updated["vMCP"]["description"] == new_description
         print("✅ vMCP description updated successfully")
+
+    def test_list_vmcps_reflects_updates(self, base_url, create_vmcp, helpers):
+        """Test 1.6: List summaries follow vMCP updates"""
+        vmcp = create_vmcp
+        print(f"\n📦 Test 1.6 - Listing updated vMCP: {vmcp['id']}")
+
+        vmcp_data = helpers["get_vmcp"](vmcp["id"])
+        vmcp_data["description"] = "Listed description"
+        assert helpers["update_vmcp"](vmcp["id"], vmcp_data)["success"]
+
+        response = requests.get(base_url + "api/vmcps/list")
+        assert response.status_code == 200
+
+        listed = next((v for v in response.json()["private"] if v["id"] == vmcp["id"]), None)
+        assert listed is not None, "Updated vMCP should be listed"
+        assert listed["description"] == "Listed description"
+        assert listed["server_count"] == 0
+        assert listed["total_tools"] == vmcp_data.get("total_tools", 0)
+        assert listed["is_public"] is False
+        print("✅ vMCP list summary reflects the update")
+
+    def test_create_vmcp_duplicate_name(self, base_url, create_vmcp):
+        """Test 1.7: vMCP names are unique"""
+        vmcp = create_vmcp
+        print(f"\n📦 Test 1.7 - Creating a second vMCP named: {vmcp['name']}")
+
+        response = requests.post(
+            base_url + "api/vmcps/create",
+            json={"name": vmcp["name"], "description": "Duplicate"}
+        )
+
+        assert response.status_code == 409, f"Expected 409 for duplicate name, got {response.status_code}"
+        print("✅ Duplicate vMCP name rejected")
+
+    def test_fork_vmcp_names(self, base_url, create_vmcp):
+        """Test 1.8: Forks get free names, and a taken fork name is rejected"""
+        vmcp = create_vmcp
+        print(f"\n📦 Test 1.8 - Forking vMCP twice: {vmcp['id']}")
+
+        forked_ids = []
+        try:
+            for expected_name in (f"{vmcp['name']} (Fork)", f"{vmcp['name']} (Fork 2)"):
+                response = requests.post(base_url + f"api/vmcps/{vmcp['id']}/fork", json={})
+                assert response.status_code == 200, f"Fork failed: {response.status_code} {response.text}"
+                forked = response.json()["vMCP"]
+                forked_ids.append(forked["id"])
+                assert forked["name"] == expected_name
+
+            response = requests.post(base_url + f"api/vmcps/{vmcp['id']}/fork", json={"name": vmcp["name"]})
+            assert response.status_code == 409, f"Expected 409 for taken fork name, got {response.status_code}"
+        finally:
+            for forked_id in forked_ids:
+                requests.delete(base_url + f"api/vmcps/{forked_id}")
+
+        print("✅ Forks named without conflicts")
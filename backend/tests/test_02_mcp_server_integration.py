@@ -271,3 +271,519 @@ class TestMCPServerIntegration:
             headers=auth_headers  # Add auth headers here too
         )
         assert connection_result.status_code == 200, f"Failed to connect to server: {connection_result.text}"
+
+    def test_list_servers_summary(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.9: List servers without details and read stats from projected summaries"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.9 - Listing server summaries: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["everything"], "everything")
+
+        full = requests.get(base_url + "api/mcps/list", headers=auth_headers)
+        assert full.status_code == 200, f"Failed to list servers: {full.text}"
+        summary = requests.get(base_url + "api/mcps/list", params={"details": "false"}, headers=auth_headers)
+        assert summary.status_code == 200, f"Failed to list server summaries: {summary.text}"
+
+        full_servers = {server["id"]: server for server in full.json()["data"]}
+        summary_servers = {server["id"]: server for server in summary.json()["data"]}
+        assert summary_servers.keys() == full_servers.keys()
+
+        everything = next(server for server in summary_servers.values() if server["name"] == "everything")
+        assert everything["tool_details"] is None
+        assert everything["status"] == full_servers[everything["id"]]["status"]
+        assert everything["tools"] == full_servers[everything["id"]]["tools"]
+
+        stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+        assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+        assert stats.json()["data"]["servers"]["total"] == len(summary_servers)
+        print("✅ Server summaries match the full listing")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_reads_coalesced(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.10: Concurrent identical resource reads share upstream calls"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.10 - Concurrent identical resource reads: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["everything"], "everything")
+
+        def read_counts():
+            stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+            assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+            return stats.json()["data"]["upstream_requests"].get("resources/read", {"executed": 0, "coalesced": 0})
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                resources = (await session.list_resources()).resources
+                assert resources, "Expected at least one resource"
+                uri = resources[0].uri
+
+                before = read_counts()
+                results = await asyncio.gather(*(session.read_resource(uri) for _ in range(8)))
+                after = read_counts()
+
+        contents = [result.contents[0].model_dump() for result in results]
+        assert all(content == contents[0] for content in contents), "Coalesced reads returned different results"
+
+        executed = after["executed"] - before["executed"]
+        coalesced = after["coalesced"] - before["coalesced"]
+        print(f"📊 resources/read: {executed} executed, {coalesced} coalesced")
+        assert executed + coalesced == 8
+        assert executed >= 1
+
+        print("✅ Concurrent reads returned identical results")
+
+    @pytest.mark.asyncio
+    async def test_tool_result_cache_override(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.11: A cache_ttl tool override serves repeated calls from the result cache"""
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.11 - Tool result cache: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["allfeature"], "allfeature")
+
+        vmcp_data = helpers["get_vmcp"](vmcp["id"])
+        server_id = vmcp_data["vmcp_config"]["selected_servers"][0]["server_id"]
+        vmcp_data["vmcp_config"]["selected_tool_overrides"] = {
+            server_id: {"add": {"name": "add", "cache_ttl": 60}}
+        }
+        helpers["update_vmcp"](vmcp["id"], vmcp_data)
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                first = await session.call_tool("allfeature_add", arguments={"a": 2, "b": 40})
+                second = await session.call_tool("allfeature_add", arguments={"b": 40, "a": 2})
+                other = await session.call_tool("allfeature_add", arguments={"a": 1, "b": 1})
+
+        statuses = [result.meta["vmcp/cache"]["status"] for result in (first, second, other)]
+        print(f"📊 Cache statuses: {statuses}")
+        assert statuses == ["miss", "hit", "miss"]
+        assert second.content[0].text == first.content[0].text
+        assert "42" in second.content[0].text
+
+        print("✅ Repeated tool call served from cache")
+
+    @pytest.mark.asyncio
+    async def test_resource_content_cache(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.12: Repeated resource reads are served from the shared resource cache"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.12 - Resource content cache: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["allfeature"], "allfeature")
+
+        def cache_stats():
+            stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+            assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+            return stats.json()["data"]["result_caches"]["resource_content"]
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                resources = (await session.list_resources()).resources
+                assert resources, "Expected at least one resource"
+                uri = resources[0].uri
+
+                first = await session.read_resource(uri)
+                before = cache_stats()
+                repeats = [await session.read_resource(uri) for _ in range(3)]
+                after = cache_stats()
+
+        for result in repeats:
+            assert result.contents[0].model_dump() == first.contents[0].model_dump()
+        hits = after["hits"] - before["hits"]
+        print(f"📊 resource_content: {hits} hits for 3 repeated reads")
+        assert hits >= 3
+
+        print("✅ Repeated resource reads served from cache")
+
+    def test_status_reads_served_from_monitor(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.13: Repeated status checks are answered by the health monitor without pings or writes"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.13 - Status reads served from monitor: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["everything"], "everything")
+        server_id = helpers["get_vmcp"](vmcp["id"])["vmcp_config"]["selected_servers"][0]["server_id"]
+
+        def check_status(probe=False):
+            status = requests.get(
+                base_url + f"api/mcps/{server_id}/status",
+                params={"probe": "true"} if probe else None,
+                headers=auth_headers
+            )
+            assert status.status_code == 200, f"Failed to get status: {status.text}"
+            return status.json()["data"]
+
+        def monitor_stats():
+            stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+            assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+            return stats.json()["data"]["health_monitor"]
+
+        first = check_status()
+        assert first["status"] == "connected"
+        entry = helpers["get_vmcp"](vmcp["id"])["vmcp_config"]["selected_servers"][0]
+        before = monitor_stats()
+        cached = [check_status() for _ in range(3)]
+        after = monitor_stats()
+
+        print(f"📊 Health monitor: {before} → {after}")
+        assert [data["status"] for data in cached] == ["connected"] * 3
+        assert after["cache_hits"] - before["cache_hits"] >= 3
+        # No upstream ping was made for the cached answers
+        assert cached[-1]["circuit"]["succeeded"] == first["circuit"]["succeeded"]
+        assert cached[-1]["last_updated"] == first["last_updated"]
+
+        probed = check_status(probe=True)
+        assert probed["status"] == "connected"
+        assert probed["circuit"]["succeeded"] > first["circuit"]["succeeded"]
+
+        # An unchanged status is not written back
+        unchanged = helpers["get_vmcp"](vmcp["id"])["vmcp_config"]["selected_servers"][0]
+        assert {k: v for k, v in unchanged.items() if k != "session_id"} == \
+            {k: v for k, v in entry.items() if k != "session_id"}
+
+        print("✅ Status checks were served from the health monitor")
+
+    def test_circuit_breaker_fails_fast(self, base_url, create_vmcp, helpers, auth_headers):
+        """Test 2.14: Calls to an unreachable server fail fast once its circuit opens"""
+        import time
+        import uuid
+
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.14 - Circuit breaker: {vmcp['id']}")
+
+        # Nothing listens on the discard port; a unique path gives a fresh server id
+        helpers["add_server"](vmcp["id"], f"http://127.0.0.1:9/mcp/{uuid.uuid4().hex[:8]}", "unreachable")
+        server_id = helpers["get_vmcp"](vmcp["id"])["vmcp_config"]["selected_servers"][0]["server_id"]
+
+        def ping():
+            response = requests.post(base_url + f"api/mcps/{server_id}/ping", headers=auth_headers)
+            assert response.status_code == 200, f"Failed to ping: {response.text}"
+            assert response.json()["data"]["alive"] is False
+
+        def check_circuit():
+            status = requests.get(base_url + f"api/mcps/{server_id}/status", headers=auth_headers)
+            assert status.status_code == 200, f"Failed to get status: {status.text}"
+            return status.json()["data"]["circuit"]
+
+        for _ in range(10):
+            ping()
+            circuit = check_circuit()
+            if circuit["state"] == "open":
+                break
+        assert circuit["state"] == "open", f"Circuit never opened: {circuit}"
+        assert circuit["retry_in"] > 0
+
+        started = time.monotonic()
+        ping()
+        elapsed = time.monotonic() - started
+        after = check_circuit()
+        print(f"📊 Ping with open circuit took {elapsed * 1000:.0f} ms: {after}")
+        assert after["rejected"] > circuit["rejected"]
+        # Rejected without a connect attempt, nowhere near VMCP_UPSTREAM_TIMEOUT
+        assert elapsed < 2.0, f"Ping with open circuit took {elapsed:.1f}s"
+
+        print("✅ Open circuit failed fast")
+
+    @pytest.mark.asyncio
+    async def test_server_concurrency_limit(self, base_url, create_vmcp, mcp_servers, auth_headers):
+        """Test 2.15: A server's max_in_flight limit queues concurrent calls"""
+        import uuid
+
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.15 - Server concurrency limit: {vmcp['id']}")
+
+        # A unique query string gives this copy of the server its own id (and limiter)
+        response = requests.post(
+            base_url + f"api/vmcps/{vmcp['id']}/add-server",
+            json={"server_data": {
+                "name": "limited",
+                "url": f"{mcp_servers['allfeature']}?admission={uuid.uuid4().hex[:8]}",
+                "transport": "http",
+                "max_in_flight": 1
+            }},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, f"Failed to add server: {response.text}"
+        vmcp_data = requests.get(base_url + f"api/vmcps/{vmcp['id']}", headers=auth_headers).json()
+        server_id = vmcp_data["vmcp_config"]["selected_servers"][0]["server_id"]
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                results = await asyncio.gather(*(
+                    session.call_tool("limited_add", arguments={"a": i, "b": 1}) for i in range(6)
+                ))
+
+        assert [result.content[0].text for result in results] == [str(i + 1) for i in range(6)]
+
+        stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+        assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+        admission = stats.json()["data"]["admission"][server_id]
+        print(f"📊 Admission: {admission}")
+        assert admission["limit"] == 1
+        assert admission["peak_in_flight"] == 1
+        assert admission["queued"] >= 1
+        assert admission["rejected"] == 0
+
+        print("✅ Concurrent calls were queued behind the limit")
+
+    @pytest.mark.asyncio
+    async def test_replica_balancing_and_ejection(self, base_url, create_vmcp, mcp_servers, auth_headers):
+        """Test 2.16: Calls are spread over a server's replicas and a dead replica is ejected"""
+        import uuid
+
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.16 - Replica balancing: {vmcp['id']}")
+
+        # Query strings make two distinct replica URLs of the same test server;
+        # nothing listens on the discard port of the third
+        tag = uuid.uuid4().hex[:8]
+        replicas = [
+            f"{mcp_servers['allfeature']}?replica=a{tag}",
+            f"{mcp_servers['allfeature']}?replica=b{tag}",
+            f"http://127.0.0.1:9/mcp/{tag}",
+        ]
+        response = requests.post(
+            base_url + f"api/vmcps/{vmcp['id']}/add-server",
+            json={"server_data": {
+                "name": "replicated",
+                "url": replicas[0],
+                "endpoints": replicas[1:],
+                "balancing": "round_robin",
+                "transport": "http"
+            }},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, f"Failed to add server: {response.text}"
+        vmcp_data = requests.get(base_url + f"api/vmcps/{vmcp['id']}", headers=auth_headers).json()
+        server_id = vmcp_data["vmcp_config"]["selected_servers"][0]["server_id"]
+
+        def replica_stats():
+            status = requests.get(base_url + f"api/mcps/{server_id}/status", headers=auth_headers)
+            assert status.status_code == 200, f"Failed to get status: {status.text}"
+            return {replica["url"]: replica for replica in status.json()["data"]["replicas"]["replicas"]}
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                # Calls that land on the dead replica fail until it is ejected
+                for i in range(12):
+                    if replica_stats()[replicas[2]]["ejected"]:
+                        break
+                    try:
+                        await session.call_tool("replicated_add", arguments={"a": i, "b": 1})
+                    except Exception as e:
+                        print(f"   Call {i} failed: {e}")
+                assert replica_stats()[replicas[2]]["ejected"], "Dead replica was never ejected"
+
+                for i in range(4):
+                    result = await session.call_tool("replicated_add", arguments={"a": i, "b": 2})
+                    assert result.content[0].text == str(i + 2)
+
+        stats = replica_stats()
+        print(f"📊 Replicas: {stats}")
+        assert stats[replicas[0]]["requests"] > 0 and stats[replicas[1]]["requests"] > 0
+        assert stats[replicas[0]]["failures"] == 0 and stats[replicas[1]]["failures"] == 0
+        assert stats[replicas[2]]["ejections"] == 1
+
+        print("✅ Calls were balanced and the dead replica ejected")
+
+    @pytest.mark.asyncio
+    async def test_upstream_sessions_prewarmed(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.17: Agent sessions warm the vMCP's upstream sessions according to its prewarm policy"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.17 - Upstream session prewarming: {vmcp['id']}")
+
+        helpers["add_server"](vmcp["id"], mcp_servers["allfeature"], "allfeature")
+        vmcp_data = helpers["get_vmcp"](vmcp["id"])
+        vmcp_data["vmcp_config"]["prewarm"] = "lazy"
+        helpers["update_vmcp"](vmcp["id"], vmcp_data)
+
+        def prewarm_stats():
+            stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+            assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+            return stats.json()["data"]["prewarm"]
+
+        def handled(stats):
+            # The server may already be warm from an earlier test's session on it
+            return stats["warmed"] + stats["already_warm"]
+
+        async def settled(previous):
+            # Prewarms run in the background after the agent's request
+            for _ in range(50):
+                current = prewarm_stats()
+                if current["running"] == 0 and current != previous:
+                    return current
+                await asyncio.sleep(0.1)
+            return prewarm_stats()
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        before = prewarm_stats()
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                await asyncio.sleep(0.5)
+                # A lazy vMCP is not warmed by initialize alone
+                assert handled(prewarm_stats()) == handled(before)
+
+                await session.list_tools()
+                lazy = await settled(before)
+                print(f"📊 Prewarm after tools/list: {before} → {lazy}")
+                assert handled(lazy) - handled(before) == 1
+                assert lazy["failed"] == before["failed"]
+
+                result = await session.call_tool("allfeature_add", arguments={"a": 40, "b": 2})
+                assert "42" in result.content[0].text
+
+        vmcp_data = helpers["get_vmcp"](vmcp["id"])
+        vmcp_data["vmcp_config"]["prewarm"] = "eager"
+        helpers["update_vmcp"](vmcp["id"], vmcp_data)
+
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                eager = await settled(lazy)
+
+        # The server's session is still warm: nothing to ping
+        print(f"📊 Prewarm after initialize: {lazy} → {eager}")
+        assert eager["already_warm"] - lazy["already_warm"] == 1
+        assert eager["warmed"] == lazy["warmed"]
+
+        # Within VMCP_UPSTREAM_PREWARM_TTL another agent session starts no prewarm
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                again = await settled(eager)
+        print(f"📊 Prewarm after another initialize: {eager} → {again}")
+        assert again["recent"] - eager["recent"] == 1
+        assert again["started"] == eager["started"]
+
+        print("✅ Upstream sessions were prewarmed per the vMCP's policy")
+
+    @pytest.mark.asyncio
+    async def test_resource_update_invalidates_cache(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.18: A resources/updated notification from the server drops the cached resource"""
+        import uuid
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.18 - Resource update invalidation: {vmcp['id']}")
+
+        # A unique server, so no earlier watcher or cache entry applies
+        tag = uuid.uuid4().hex[:8]
+        server = f"sub{tag}"
+        helpers["add_server"](vmcp["id"], f"{mcp_servers['subscription']}?tag={tag}", server)
+
+        async def subscribers(session):
+            result = await session.call_tool(f"{server}_subscriber_count", arguments={})
+            return int(result.content[0].text)
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                resources = (await session.list_resources()).resources
+                assert resources, "Expected the counter resource"
+                uri = resources[0].uri
+
+                before = await subscribers(session)
+                first = (await session.read_resource(uri)).contents[0].text
+                # The read starts a watcher that subscribes to the resource in the background
+                for _ in range(50):
+                    if await subscribers(session) > before:
+                        break
+                    await asyncio.sleep(0.1)
+                assert await subscribers(session) > before, "The watcher never subscribed"
+                assert (await session.read_resource(uri)).contents[0].text == first
+
+                incremented = (await session.call_tool(f"{server}_increment", arguments={})).content[0].text
+                for _ in range(50):
+                    current = (await session.read_resource(uri)).contents[0].text
+                    if current != first:
+                        break
+                    await asyncio.sleep(0.1)
+
+        print(f"📊 Counter: {first} → {current}")
+        assert current == incremented, "The cached resource was not invalidated"
+
+        print("✅ Update notification invalidated the cached resource")
+
+    @pytest.mark.asyncio
+    async def test_resource_read_after_circuit_reopens(self, base_url, create_vmcp, mcp_servers, helpers, auth_headers):
+        """Test 2.19: A resource read after an open period is not blocked by its own resource watcher"""
+        import time
+        import uuid
+
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 2.19 - Resource read after open circuit: {vmcp['id']}")
+
+        tag = uuid.uuid4().hex[:8]
+        server = f"sub{tag}"
+        helpers["add_server"](vmcp["id"], f"{mcp_servers['subscription']}?tag={tag}", server)
+        server_id = helpers["get_vmcp"](vmcp["id"])["vmcp_config"]["selected_servers"][0]["server_id"]
+        failing_url = mcp_servers["subscription"].rsplit("/", 1)[0] + "/failing"
+
+        def set_failing(failing):
+            response = requests.post(failing_url, json={"tag": tag, "failing": failing})
+            assert response.status_code == 200, f"Failed to set failing: {response.text}"
+
+        def check_circuit():
+            status = requests.get(base_url + f"api/mcps/{server_id}/status", headers=auth_headers)
+            assert status.status_code == 200, f"Failed to get status: {status.text}"
+            return status.json()["data"]["circuit"]
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                uri = (await session.list_resources()).resources[0].uri
+
+                # The server answers 503 until its circuit opens
+                set_failing(True)
+                try:
+                    for _ in range(10):
+                        requests.post(base_url + f"api/mcps/{server_id}/ping", headers=auth_headers)
+                        circuit = check_circuit()
+                        if circuit["state"] == "open":
+                            break
+                finally:
+                    set_failing(False)
+                assert circuit["state"] == "open", f"Circuit never opened: {circuit}"
+
+                deadline = time.monotonic() + circuit["retry_in"] + 5
+                while check_circuit()["retry_in"] and time.monotonic() < deadline:
+                    await asyncio.sleep(0.5)
+
+                # A cache miss starts a watcher alongside the read; the read must be the probe
+                result = await session.read_resource(uri)
+                assert result.contents[0].text.startswith("value=")
+                count = await session.call_tool(f"{server}_subscriber_count", arguments={})
+                assert not count.isError
+
+        circuit = check_circuit()
+        print(f"📊 Circuit after the read: {circuit}")
+        assert circuit["state"] == "closed"
+
+        print("✅ Read after the open period went through")
@@ -793,3 +793,45 @@ Complete!""",
                 assert len(prompt_text) > 50, "Prompt should have substantial content from tool executions"
 
                 print("✅ Comprehensive prompt with all variations executed successfully")
+
+    @pytest.mark.asyncio
+    async def test_pure_prompt_render_memoized(self, base_url, create_vmcp, helpers, auth_headers):
+        """Test 3.18: Pure prompt renders are memoized and dropped when the environment is saved"""
+        import requests
+
+        vmcp = create_vmcp
+        print(f"\n📦 Test 3.18 - Memoized prompt rendering: {vmcp['id']}")
+
+        helpers["save_env_vars"](vmcp["id"], [{"name": "region", "value": "eu-west"}])
+        vmcp_data = helpers["get_vmcp"](vmcp["id"])
+        vmcp_data["custom_prompts"].append({
+            "name": "region_prompt",
+            "description": "Pure prompt using a param and a config value",
+            "text": "Deploy @param.service to @config.region",
+            "variables": [{"name": "service", "description": "Service", "required": True}],
+            "environment_variables": ["region"],
+            "tool_calls": []
+        })
+        helpers["update_vmcp"](vmcp["id"], vmcp_data)
+
+        def render_hits():
+            stats = requests.get(base_url + "api/mcps/stats", headers=auth_headers)
+            assert stats.status_code == 200, f"Failed to get stats: {stats.text}"
+            return stats.json()["data"]["result_caches"]["prompt_render"]["hits"]
+
+        mcp_url = f"{base_url}private/{vmcp['name']}/vmcp"
+        async with streamablehttp_client(mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+
+                first = await session.get_prompt("region_prompt", arguments={"service": "api"})
+                before = render_hits()
+                second = await session.get_prompt("region_prompt", arguments={"service": "api"})
+                assert render_hits() - before >= 1, "Repeated render was not served from the cache"
+                assert second.messages[0].content.text == first.messages[0].content.text == "Deploy api to eu-west"
+
+                helpers["save_env_vars"](vmcp["id"], [{"name": "region", "value": "us-east"}])
+                third = await session.get_prompt("region_prompt", arguments={"service": "api"})
+                assert third.messages[0].content.text == "Deploy api to us-east"
+
+        print("✅ Pure prompt render memoized and invalidated on environment save")
@@ -0,0 +1,115 @@
+"""
+Test Suite 9: Startup Time
+Tests that importing the server stays within a time budget without loading
+optional heavy modules, that startup skips migrations on a current schema,
+and that the blob migration works with the database chunk store
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Cumulative import time of vmcp.proxy_server under `python -X importtime`
+IMPORT_BUDGET_MS = int(os.getenv("VMCP_IMPORT_BUDGET_MS", "4000"))
+
+# Modules that must only load on first use (tracing is disabled by default)
+LAZY_MODULES = ("opentelemetry", "aiohttp", "pandas", "PIL", "openpyxl")
+
+
+def run_python(code: str, *args: str, **env_overrides: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter with the backend sources importable."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env["VMCP_ENABLE_TRACING"] = "false"
+    env.update(env_overrides)
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True, text=True, env=env, timeout=120
+    )
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map module name -> cumulative import time in microseconds."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.slow
+class TestStartupTime:
+    """Test cold start cost"""
+
+    def test_import_time_budget(self):
+        """Test 9.1: Server import stays within budget and defers optional modules"""
+        print("\n⏱️ Test 9.1: Import time of vmcp.proxy_server")
+
+        result = run_python("import vmcp.proxy_server", "-X", "importtime")
+        assert result.returncode == 0, f"Import failed: {result.stderr[-2000:]}"
+
+        times = parse_importtime(result.stderr)
+        total_ms = times["vmcp.proxy_server"] / 1000
+        slowest = sorted(
+            ((module, us) for module, us in times.items() if module.startswith("vmcp.")),
+            key=lambda item: item[1], reverse=True
+        )[:5]
+        print(f"   Total: {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+        for module, us in slowest:
+            print(f"   {module}: {us / 1000:.0f} ms")
+
+        eager = sorted({module.split(".")[0] for module in times if module.split(".")[0] in LAZY_MODULES})
+        assert not eager, f"Optional modules imported at startup: {eager}"
+        assert total_ms <= IMPORT_BUDGET_MS, f"Import took {total_ms:.0f} ms, budget is {IMPORT_BUDGET_MS} ms"
+
+        print("✅ Import time within budget")
+
+    def test_schema_current_after_startup(self):
+        """Test 9.2: The running server's database is recognised as up to date"""
+        print("\n🗄️ Test 9.2: Schema version check")
+
+        result = run_python(
+            "from vmcp.storage.migrations import schema_is_current; print(schema_is_current())"
+        )
+        assert result.returncode == 0, f"Check failed: {result.stderr[-2000:]}"
+        assert result.stdout.strip().splitlines()[-1] == "True"
+
+        print("✅ Startup will skip table creation and migrations")
+
+    def test_inline_blob_migration_database_store(self, tmp_path):
+        """Test 9.3: The content-hash migration moves several inline blobs into the database chunk store"""
+        print("\n🗄️ Test 9.3: Migration 004 with the database blob backend")
+
+        result = run_python(
+            "import base64\n"
+            "from sqlalchemy import text\n"
+            "from vmcp.storage.database import get_engine, init_db\n"
+            "from vmcp.storage.migrations import DatabaseMigrator\n"
+            "init_db()\n"
+            "with get_engine().begin() as conn:\n"
+            "    for i in range(3):\n"
+            "        conn.execute(text(\n"
+            "            \"INSERT INTO blobs (id, user_id, original_filename, filename, content, content_type, size, is_public)\"\n"
+            "            \" VALUES (:id, 1, :name, :name, :content, 'application/octet-stream', 5, 0)\"\n"
+            "        ), {'id': f'legacy-{i}', 'name': f'f{i}.bin', 'content': base64.b64encode(b'blob%d' % (i % 2)).decode()})\n"
+            "DatabaseMigrator()._migration_004_deduplicate_blob_content()\n"
+            "with get_engine().connect() as conn:\n"
+            "    rows = conn.execute(text(\"SELECT storage_backend, content_hash, content FROM blobs WHERE id LIKE 'legacy-%'\")).fetchall()\n"
+            "    refs = conn.execute(text('SELECT SUM(ref_count) FROM blob_contents')).scalar()\n"
+            "    chunks = conn.execute(text('SELECT COUNT(*) FROM blob_chunks')).scalar()\n"
+            "print(sorted(set(r[0] for r in rows)), all(r[1] and not r[2] for r in rows), refs, chunks)\n",
+            VMCP_DATABASE_URL=f"sqlite:///{tmp_path / 'migrate.db'}",
+            VMCP_BLOB_STORAGE_BACKEND="database",
+            VMCP_SQLITE_BUSY_TIMEOUT_MS="500",
+        )
+        assert result.returncode == 0, f"Migration failed: {result.stderr[-2000:]}"
+        assert result.stdout.strip().splitlines()[-1] == "['database'] True 3 2"
+
+        print("✅ Inline blobs moved into the database chunk store")
@@ -0,0 +1,104 @@
+"""
+Test Suite 10: Logging Controls
+Tests per-logger level overrides, rate limiting of per-request logs,
+header redaction and JSON output of the logging setup
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def run_python(code: str, **env_overrides: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter with the given VMCP_* settings."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env.update(env_overrides)
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, env=env, timeout=120
+    )
+
+
+class TestLogging:
+    """Test logging configuration"""
+
+    def test_levels_and_rate_limit(self):
+        """Test 10.1: Overrides pick the level per logger and INFO is rate limited per call site"""
+        print("\n📜 Test 10.1: Level overrides and rate limiting")
+
+        result = run_python(
+            "from vmcp.utilities.logging import setup_logging\n"
+            "hot = setup_logging('TEST_HOT')\n"
+            "for i in range(100): hot.info('request %d', i)\n"
+            "hot.warning('warning passes')\n"
+            "setup_logging('TEST_QUIET').warning('hidden')\n"
+            "setup_logging('TEST_LOUD.child').debug('debug shown')\n",
+            VMCP_LOG_LEVEL="INFO",
+            VMCP_LOG_RATE_LIMIT="5",
+            VMCP_LOG_LEVELS="TEST_QUIET=ERROR,TEST_LOUD=DEBUG",
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        lines = result.stdout.splitlines()
+
+        requests = [line for line in lines if "TEST_HOT - INFO - request" in line]
+        print(f"   {len(requests)} of 100 INFO records emitted")
+        assert 1 <= len(requests) < 100
+        assert any("warning passes" in line for line in lines)
+        assert not any("hidden" in line for line in lines)
+        assert any("debug shown" in line for line in lines)
+
+        print("✅ Levels and rate limit applied")
+
+    def test_redaction_and_json_output(self):
+        """Test 10.2: Credentials are masked and JSON records carry extra fields"""
+        print("\n📜 Test 10.2: Header redaction and JSON output")
+
+        result = run_python(
+            "from vmcp.utilities.logging import lazy, redact_headers, setup_logging\n"
+            "log = setup_logging('TEST_JSON')\n"
+            "headers = {'Authorization': 'Bearer secret-token', 'mcp-session-id': 'abc'}\n"
+            "log.info('headers %s', lazy(lambda: redact_headers(headers)), extra={'request_id': 'r-1'})\n",
+            VMCP_LOG_LEVEL="INFO",
+            VMCP_LOG_FORMAT="json",
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        record = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert record["logger"] == "TEST_JSON"
+        assert record["request_id"] == "r-1"
+        assert "secret-token" not in record["message"]
+        assert "abc" in record["message"]
+
+        print("✅ Headers redacted in JSON output")
+
+    def test_async_json_exception(self):
+        """Test 10.3: Exceptions logged through the async queue reach the JSON output"""
+        print("\n📜 Test 10.3: Async JSON exception output")
+
+        result = run_python(
+            "from vmcp.utilities.logging import flush_logging, setup_logging\n"
+            "log = setup_logging('TEST_ASYNC')\n"
+            "try:\n"
+            "    raise ValueError('boom')\n"
+            "except ValueError:\n"
+            "    log.exception('failed %s', 'call', extra={'request_id': 'r-2'})\n"
+            "flush_logging()\n",
+            VMCP_LOG_LEVEL="INFO",
+            VMCP_LOG_FORMAT="json",
+            VMCP_LOG_ASYNC="true",
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        record = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert record["logger"] == "TEST_ASYNC"
+        assert record["level"] == "ERROR"
+        assert record["message"] == "failed call"
+        assert record["request_id"] == "r-2"
+        assert "ValueError: boom" in record["exception"]
+
+        print("✅ Exception included in async JSON output")
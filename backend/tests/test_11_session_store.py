@@ -0,0 +1,62 @@
+"""
+Test Suite 11: Stateless Session Store
+Tests that stateless-mode MCP session ids are only accepted, and can only be
+terminated, by the user who created them
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Creates a session for user 1, then checks it as user 2 and as user 1
+OWNERSHIP_CHECK = (
+    "from vmcp.proxy_server.session_store import get_session_store, new_session_id\n"
+    "from vmcp.storage.database import SessionLocal, init_db\n"
+    "from vmcp.storage.models import User\n"
+    "init_db()\n"
+    "db = SessionLocal()\n"
+    "for uid in (1, 2):\n"
+    "    db.add(User(id=uid, username=f'user{uid}', email=f'user{uid}@example.com', first_name='Test', last_name='User'))\n"
+    "db.commit()\n"
+    "db.close()\n"
+    "store = get_session_store()\n"
+    "sid = new_session_id()\n"
+    "store.create(sid, 1, vmcp_name='demo')\n"
+    "print(store.exists(sid, 2), store.delete(sid, 2), store.exists(sid, 1),"
+    " store.delete(sid, 1), store.exists(sid, 1))\n"
+)
+
+
+def run_python(code: str, **env_overrides: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter with the given VMCP_* settings."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env.update(env_overrides)
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, env=env, timeout=120
+    )
+
+
+class TestSessionStore:
+    """Test session ownership in both session store backends"""
+
+    @pytest.mark.parametrize("backend", ["memory", "database"])
+    def test_session_owned_by_creator(self, backend, tmp_path):
+        """Test 11.1: Another user's session id is neither accepted nor terminated"""
+        print(f"\n🔐 Test 11.1: Session ownership ({backend} store)")
+
+        result = run_python(
+            OWNERSHIP_CHECK,
+            VMCP_DATABASE_URL=f"sqlite:///{tmp_path / 'sessions.db'}",
+            VMCP_SESSION_STORE=backend,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert result.stdout.strip().splitlines()[-1] == "False False True True False"
+
+        print(f"✅ {backend} store checks the session owner")